@@ -10,8 +10,10 @@ from dotenv import load_dotenv
 
 # 모듈 임포트
 from workflows.single_agent_flow import create_single_agent_workflow
+from workflows.workflow_factory import WorkflowFactory
 from modules.a2a_manager import get_a2a_manager
 from modules.mcp_module import load_mcp_tools_from_config
+from modules.recorder_store.store_factory import rollup_totals
 load_dotenv()
 
 def load_config(path):
@@ -63,7 +65,9 @@ async def run_agent_by_name(agent_name: str):
     agent_display_name = agent_info['name']
     port = agent_info['port']
     print(f"\n🚀 {agent_display_name} 서버 시작 중...")
+    config = load_config(os.path.join(os.path.dirname(__file__), 'config', 'config.yaml'))
     a2a_manager = get_a2a_manager()
+    a2a_manager.configure(config.get('a2a', {}))
     await a2a_manager.start_specific_server(agent_display_name)
     def cleanup_on_exit():
         try:
@@ -88,6 +92,16 @@ async def run_agent_by_name(agent_name: str):
                 break
             elif user_input.lower() == 'status':
                 print(f"📊 {agent_display_name} 상태: 실행 중 (포트 {port})")
+                stats = a2a_manager.get_stats()
+                transport = stats['transport']
+                print(f"  🔌 A2A 요청: {transport['requests']}회, 새 커넥션: {transport['new_connections']}개, 재사용률: {transport['reuse_ratio']}")
+                response_cache = stats['response_cache']
+                print(f"  🧠 응답 캐시: 적중 {response_cache['hits']}회, 공유 {response_cache['coalesced']}회, 미스 {response_cache['misses']}회, 항목 {response_cache['entries']}개")
+                storage = (agent_info['data'].get('executorParams') or {}).get('storage')
+                totals = rollup_totals(storage) if storage else None
+                if totals:
+                    for source, metrics in sorted(totals.items()):
+                        print(f"  🗂️ {source}: 기록 {metrics['count']}건, 입력 {metrics['input_chars']}자, 응답 {metrics['response_chars']}자, 토큰 {metrics['tokens']}개")
             elif user_input.lower() == 'info':
                 print(f"ℹ️ 에이전트 정보:")
                 print(f"  이름: {agent_display_name}")
@@ -119,6 +133,7 @@ async def main():
 
     # --- A2A Manager 초기화 및 시작 --- #
     a2a_manager = get_a2a_manager()
+    a2a_manager.configure(config.get('a2a', {}))
     print("\n🚀 A2A 시스템 시작 중...")
     await a2a_manager.start(start_servers=True)
     def cleanup_on_exit():
@@ -142,7 +157,8 @@ async def main():
     print("="*50)
 
     # --- 워크플로우 생성 --- #
-    workflow = create_single_agent_workflow(config, all_tools)
+    factory = WorkflowFactory(config, all_tools)
+    workflow = create_single_agent_workflow(config, all_tools, factory)
 
     memory_config = config.get('memory', {})
     user_id = memory_config.get('default_user_id', 'default_user')
@@ -165,6 +181,8 @@ async def main():
     except KeyboardInterrupt:
         print("\n\n👋 프로그램을 종료합니다.")
     finally:
+        # 진행 중인 대화 요약을 저장한 뒤 종료
+        await factory.aclose()
         await a2a_manager.close()
 
 def run_main():
@@ -5,23 +5,24 @@ A2A 클라이언트 모듈
 핵심 API
 - A2AClientModule.initialize(config_dir, except_file): 서버 카드 사전 로드(옵셔널)
 - A2AClientModule.send(agent_name, text): 메시지 전송(필요 시 지연 초기화 포함)
+- A2AClientModule.stream(agent_name, text): 상태 업데이트/아티팩트 청크를 도착하는 대로 반환
 - A2AClientModule.close(): 정리
+
+HTTP 커넥션은 a2a_core.transport의 프로세스 공유 풀을 사용합니다.
 """
 from __future__ import annotations
 
 import asyncio
-from typing import Optional, List
-
-import httpx
+from typing import Optional, List, AsyncIterator
 
-from .a2a_core.a2a_client import A2AClientAgent
+from .a2a_core.a2a_client import A2AClientAgent, StreamChunk
 from .a2a_core.config_loader import get_server_list
+from .a2a_core.resilience import CircuitOpenError
 
 
 class A2AClientModule:
 	def __init__(self) -> None:
 		self._client: Optional[A2AClientAgent] = None
-		self._httpx: Optional[httpx.AsyncClient] = None
 		self._entries = None
 
 	@property
@@ -37,36 +38,53 @@ class A2AClientModule:
 		if not self._entries:
 			print("ℹ️ 원격 서버 엔트리가 없어도 클라이언트는 지연 초기화로 동작합니다.")
 
-		self._httpx = httpx.AsyncClient()
-		self._client = A2AClientAgent(remote_agent_entries=self._entries or [], http_client=self._httpx)
+		# http_client 미지정 → 공유 전송 계층 사용
+		self._client = A2AClientAgent(remote_agent_entries=self._entries or [])
+
+	async def wait_until_ready(self, timeout: float | None = None) -> bool:
+		"""원격 에이전트 카드 수집 완료까지 대기"""
+		if not self._client:
+			return False
+		return await self._client.wait_until_ready(timeout)
 
 	async def ensure_initialized(self, config_dir: str, except_file: str | None = None) -> None:
 		if not self.ready:
 			await self.initialize(config_dir, except_file)
 
-	async def send(self, agent_name: str, text: str, *, config_dir: str, except_file: str | None = None) -> Optional[List[str]]:
+	async def send(self, agent_name: str, text: str, *, config_dir: str, except_file: str | None = None,
+				   timeout: float | None = None) -> Optional[List[str]]:
 		"""원격 에이전트로 메시지 전송. 필요 시 즉시 초기화.
 
+		timeout: 호출 전체 데드라인(초). None이면 에이전트 resilience 정책의 timeout 사용
+
 		Returns: List[str] | None
 		"""
 		await self.ensure_initialized(config_dir, except_file)
 
 		try:
-			response = await self._client.send_message(agent_name, text, task_id=None, context_id=None)
+			response = await self._client.send_message(agent_name, text, task_id=None, context_id=None, timeout=timeout)
 			if response:
 				return [str(p) for p in response]
 			return None
+		except CircuitOpenError as e:
+			# 서킷이 열려 있으면 원격 호출 없이 즉시 실패
+			print(f"⛔ 전송 생략: {e}")
+			return None
 		except Exception as e:
 			print(f"❌ 전송 실패: {e}")
 			return None
 
+	async def stream(self, agent_name: str, text: str, *, config_dir: str, except_file: str | None = None) -> AsyncIterator[StreamChunk]:
+		"""원격 에이전트로 메시지를 보내고 응답 청크를 도착하는 대로 yield. 필요 시 즉시 초기화."""
+		await self.ensure_initialized(config_dir, except_file)
+
+		async for chunk in self._client.stream_message(agent_name, text, task_id=None, context_id=None):
+			yield chunk
+
 	async def close(self) -> None:
 		if self._client:
 			await self._client.close()
-		if self._httpx:
-			await self._httpx.aclose()
 		self._client = None
-		self._httpx = None
 
 	# 내부 클라이언트에 접근(서버와 선택적 연동용)
 	@property
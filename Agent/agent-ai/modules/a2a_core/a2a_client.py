@@ -8,11 +8,14 @@ import uuid
 
 
 from uuid import uuid4
+from dataclasses import dataclass, field
 from typing import Any
+from typing import AsyncIterator
 from typing import Optional
 from a2a.client import A2ACardResolver, A2AClient
 from a2a.types import (
     AgentCard,
+    JSONRPCError,
     JSONRPCErrorResponse,
     Message,
     MessageSendParams,
@@ -29,6 +32,11 @@ from a2a.types import (
     TextPart,
 )
 from collections.abc import Callable
+
+from .transport import get_shared_http_client
+from .card_cache import get_card_cache
+from .response_cache import CachePolicy, card_version
+from .resilience import CircuitBreaker, Deadline, DeadlineExceeded, ResiliencePolicy
 #from google.generativeai import types
 #from google.genai import types
 
@@ -45,87 +53,168 @@ class A2AServerEntry(BaseModel):
     """A class to hold the information to the remote agents. """
     name: str
     url: HttpUrl
+    # config/a2a/*.json의 "resilience" 블록 (타임아웃/재시도/서킷 브레이커)
+    resilience: dict[str, Any] = {}
+    # config/a2a/*.json의 "responseCache" 블록 (응답 캐시 사용 여부/TTL)
+    response_cache: dict[str, Any] = {}
 
 class RemoteAgentConnections:
     """A class to hold the connections to the remote agents."""
 
-    def __init__(self, client: httpx.AsyncClient, agent_card: AgentCard):
-        self.agent_client = A2AClient(client, agent_card)
+    def __init__(self, client: httpx.AsyncClient | None, agent_card: AgentCard):
+        # client가 None이면 프로세스 공유 전송 계층(transport.py)을 사용
+        self._http_client = client
+        self._agent_client: A2AClient | None = None
+        self._agent_client_http: httpx.AsyncClient | None = None
         self.card = agent_card
         self.pending_tasks = set()
         print('A2AClient initialized : ', agent_card)
 
+    @property
+    def agent_client(self) -> A2AClient:
+        """현재 이벤트 루프의 공유 httpx 클라이언트에 묶인 A2AClient 반환"""
+        http_client = self._http_client or get_shared_http_client()
+        if self._agent_client is None or self._agent_client_http is not http_client:
+            self._agent_client = A2AClient(http_client, self.card)
+            self._agent_client_http = http_client
+        return self._agent_client
+
     def get_agent(self) -> AgentCard:
         return self.card
 
-    async def send_message(
+    async def stream_message(
         self,
         request: MessageSendParams,
-        task_callback: TaskUpdateCallback | None,
-    ) -> Task | Message | None:
+        task_callback: TaskUpdateCallback | None = None,
+    ) -> AsyncIterator[TaskCallbackArg | Message | JSONRPCError]:
+        """응답 이벤트를 도착하는 대로 yield 합니다.
+
+        스트리밍을 지원하지 않는 에이전트는 단일 응답(Task 또는 Message)을 yield 합니다.
+        """
         if self.card.capabilities.streaming:
-            task: Task = None
             print("send_message : streaming")
             async for response in self.agent_client.send_message_streaming(
                 SendStreamingMessageRequest(id=str(uuid4()), params=request)
             ):
-                print(f"응답 수신: {response}")
-
                 # 실패 응답인 경우
-                if hasattr(response, "root") and hasattr(response.root, "error"):
-                    return response.root.error                              
-
-                # BEGIN - 2025.08.20 task 관리 {              
-                # 성공 응답인 경우 
-                elif isinstance(response.root, SendStreamingMessageSuccessResponse) : 
-                    event = response.root.result
-
-                    if isinstance(event, Task):
-                        print(f"📌 Task 수신")
-                        continue
-                    elif isinstance(event, TaskStatusUpdateEvent):
-                        task = event
-                        if task.status.state == TaskState.failed : 
-                            print(f"🔄 Task 상태 실패 ")
-                            return task
-                        else : 
-                            print(f"🔄 Task 상태 업데이트 ") 
-                            continue 
-                    elif isinstance(event, TaskArtifactUpdateEvent):
-                        artifact = event.artifact
-                        print(f"📥 아티팩트 수신 ")
-                        return event
-                    # In the case a message is returned, that is the end of the interaction.
-                    elif isinstance(event, Message):
-                        print(f"💬 메시지 수신 ")
-                        return event
-                else:
+                if isinstance(response.root, JSONRPCErrorResponse):
+                    yield response.root.error
+                    return
+
+                # BEGIN - 2025.08.20 task 관리 {
+                if not isinstance(response.root, SendStreamingMessageSuccessResponse):
                     print(f"⚠️ 알 수 없는 응답 수신: {response}")
-                    return None
+                    return
+
+                event = response.root.result
+                if isinstance(event, Task):
+                    print(f"📌 Task 수신")
+                elif isinstance(event, TaskStatusUpdateEvent):
+                    print(f"🔄 Task 상태 업데이트: {event.status.state}")
+                elif isinstance(event, TaskArtifactUpdateEvent):
+                    print(f"📥 아티팩트 수신 (append={event.append}, last_chunk={event.last_chunk})")
+                elif isinstance(event, Message):
+                    print(f"💬 메시지 수신 ")
                 # END - 2025.08.20 task 관리}
-                
 
-                # Otherwise we are in the Task + TaskUpdate cycle.
-                if task_callback and event:
-                    task = task_callback(event, self.card)
-                if hasattr(event, 'final') and event.final:
-                    break
-            return task
-        
+                # Task + TaskUpdate cycle은 콜백으로도 전달
+                if task_callback and not isinstance(event, Message):
+                    task_callback(event, self.card)
+                yield event
+
+                # In the case a message is returned, that is the end of the interaction.
+                if isinstance(event, Message):
+                    return
+                if isinstance(event, TaskStatusUpdateEvent) and (
+                    event.final or event.status.state == TaskState.failed
+                ):
+                    return
+            return
+
         print("send_message : Non-streaming")
         # Non-streaming
         response = await self.agent_client.send_message(
             SendMessageRequest(id=str(uuid4()), params=request)
         )
         if isinstance(response.root, JSONRPCErrorResponse):
-            return response.root.error
-        if isinstance(response.root.result, Message):
-            return response.root.result
-
-        if task_callback:
-            task_callback(response.root.result, self.card)
-        return response.root.result
+            yield response.root.error
+            return
+        result = response.root.result
+        if task_callback and not isinstance(result, Message):
+            task_callback(result, self.card)
+        yield result
 
+    async def send_message(
+        self,
+        request: MessageSendParams,
+        task_callback: TaskUpdateCallback | None,
+    ) -> Task | Message | None:
+        """스트림을 끝까지 소비하고 마지막 이벤트를 반환 (호환용)"""
+        last_event = None
+        async for event in self.stream_message(request, task_callback):
+            last_event = event
+        return last_event
+
+
+@dataclass
+class StreamChunk:
+    """원격 에이전트 스트림의 이벤트 한 건 (텍스트로 변환된 형태)"""
+    kind: str                       # 'task' | 'status' | 'artifact' | 'message' | 'error'
+    agent_name: str
+    parts: list[Any] = field(default_factory=list)
+    state: str | None = None
+    artifact_id: str | None = None
+    append: bool = False
+    last_chunk: bool = False
+    final: bool = False
+    error: str | None = None
+
+    @property
+    def text(self) -> str:
+        return ''.join(p for p in self.parts if isinstance(p, str))
+
+
+class StreamAggregator:
+    """StreamChunk를 모아 send_message와 같은 최종 결과(list)를 만듭니다"""
+
+    def __init__(self):
+        self._artifacts: dict[str, list[Any]] = {}
+        self._message_parts: list[Any] | None = None
+        self._status_parts: list[Any] = []
+        self.failed = False
+        self.error: str | None = None
+
+    def add(self, chunk: StreamChunk) -> None:
+        if chunk.kind == 'error':
+            self.failed = True
+            self.error = chunk.error
+        elif chunk.kind == 'message':
+            self._message_parts = list(chunk.parts)
+        elif chunk.kind == 'artifact':
+            key = chunk.artifact_id or str(len(self._artifacts))
+            parts = self._artifacts.setdefault(key, [])
+            if chunk.append and parts and chunk.parts and isinstance(parts[-1], str) and isinstance(chunk.parts[0], str):
+                # 증분 청크: 이전 텍스트에 이어 붙임
+                parts[-1] += chunk.parts[0]
+                parts.extend(chunk.parts[1:])
+            else:
+                parts.extend(chunk.parts)
+        elif chunk.kind in ('status', 'task'):
+            if chunk.state == TaskState.failed.value:
+                self.failed = True
+                self.error = chunk.text or self.error
+            elif chunk.parts:
+                self._status_parts = list(chunk.parts)
+
+    def result(self) -> list[Any] | None:
+        if self.failed:
+            return None
+        if self._message_parts is not None:
+            return self._message_parts
+        result = list(self._status_parts) if not self._artifacts else []
+        for parts in self._artifacts.values():
+            result.extend(parts)
+        return result or None
 
 
 class A2AClientAgent:
@@ -143,15 +232,18 @@ class A2AClientAgent:
         auto_init: bool = True,
     ):
         self.task_callback = task_callback
-        self.httpx_client = http_client or httpx.AsyncClient()
+        # http_client를 주지 않으면 공유 전송 계층을 사용 (close 시 닫지 않음)
+        self.httpx_client = http_client
         self.remote_agent_connections: dict[str, RemoteAgentConnections] = {}
         self.cards: dict[str, AgentCard] = {}
         self.agents: str = ''
         self.remote_agent_entries = remote_agent_entries
+        self._breakers: dict[str, CircuitBreaker] = {}
         
+        self._init_task: asyncio.Task | None = None
         if auto_init : 
             loop = asyncio.get_running_loop()
-            loop.create_task(
+            self._init_task = loop.create_task(
                 self.init_remote_agents(self.remote_agent_entries)
             )
             #loop.create_task(
@@ -162,18 +254,32 @@ class A2AClientAgent:
     async def init_remote_agents(
         self, entries: list[A2AServerEntry]
     ):
-        async with asyncio.TaskGroup() as task_group:
-            for entry in entries:
-                task_group.create_task(self.retrieve_card(entry))
-        # The task groups run in the background and complete.
+        # 한 에이전트의 카드 조회 실패가 다른 에이전트 연결을 취소하지 않도록 gather 사용
+        results = await asyncio.gather(
+            *(self.retrieve_card(entry) for entry in entries),
+            return_exceptions=True,
+        )
+        for entry, result in zip(entries, results):
+            if isinstance(result, Exception):
+                print(f"⚠️ 에이전트 카드 조회 실패 ({entry.name}): {result}")
         # Once completed the self.agents string is set and the remote
         # connections are established
 
+    async def wait_until_ready(self, timeout: float | None = None) -> bool:
+        """초기 카드 수집이 끝날 때까지 대기 (고정 sleep 대체)"""
+        if self._init_task is None:
+            return bool(self.remote_agent_connections)
+        try:
+            await asyncio.wait_for(asyncio.shield(self._init_task), timeout)
+        except asyncio.TimeoutError:
+            print(f"⚠️ 에이전트 카드 수집이 {timeout}s 안에 끝나지 않았습니다.")
+        return self._init_task.done()
+
 
     async def retrieve_card(self, entry: A2AServerEntry):
         address = str(entry.url)
-        card_resolver = A2ACardResolver(self.httpx_client, address)
-        card = await card_resolver.get_agent_card()
+        # 디스크 카드 캐시 우선, 만료된 경우에만 조건부 요청으로 재검증
+        card = await get_card_cache().get_card(address, self.httpx_client)
         self.register_agent_card(card)
 
 
@@ -217,21 +323,7 @@ class A2AClientAgent:
 
 
 
-    async def send_message(self, agent_name:str, user_text: str, 
-                            task_id:Optional[str] = None, context_id:Optional[str] = None ) -> Any:
-        """Sends a task either streaming (if supported) or non-streaming.
-
-        This will send a message to the remote agent named agent_name.
-
-        Args:
-          agent_name: The name of the agent to send the task to.
-          message: The message to send to the agent for the task.
-          tool_context: The tool context this method runs in.
-
-        Yields:
-          A dictionary of JSON data.
-        """
-        
+    def _get_connection(self, agent_name: str) -> RemoteAgentConnections:
         # server list에서 agent_name을 찾는다. 
         if agent_name not in self.remote_agent_connections:
             raise ValueError(f'Agent {agent_name} not found')
@@ -239,20 +331,12 @@ class A2AClientAgent:
         client = self.remote_agent_connections[agent_name]
         if not client:
             raise ValueError(f'Client not available for {agent_name}')
+        return client
 
-
-        # setting request message
-        #if not task_id:
-        #    task_id = str(uuid.uuid4())
-                        
-        #if not context_id:
-        #    context_id = str(uuid.uuid4())
-        #print(f"task_id={task_id}, context_id={context_id}")
-       
-        #message_id = str(uuid.uuid4())
-
+    def _build_request(self, user_text: str, task_id: Optional[str], context_id: Optional[str],
+                       metadata: Optional[dict[str, Any]] = None) -> MessageSendParams:
         print(f"TextPart: {TextPart(text=user_text)}")
-        request: MessageSendParams = MessageSendParams(
+        return MessageSendParams(
             id=str(uuid.uuid4()),
             message=Message(
                 role='user',
@@ -260,50 +344,183 @@ class A2AClientAgent:
                 message_id=str(uuid.uuid4()),
                 #**{"messageId": message_id},   # alias 이름으로 명시적 전달
                 context_id=context_id,
-                task_id=task_id
+                task_id=task_id,
+                metadata=metadata,
             ),
             configuration=MessageSendConfiguration(
                 accepted_output_modes=['text', 'text/plain', 'image/png'],
             ),
         )
 
-        # message 전송 및 응답 수신
-        response = await client.send_message(request, task_callback=None)
-        print("Response :", response.model_dump(mode='json', exclude_none=True))
-
-        if isinstance(response, Message):
-            message_id = response.message_id
-            print(f"Message ID: {message_id}")
-            return await self.convert_parts(response.parts)
-        elif hasattr(response, 'artifact') and response.artifact:
-            # artifact-update 타입 처리
-            result = []
-            artifact = response.artifact
-            if hasattr(artifact, 'parts') and artifact.parts:
-                result.extend(await self.convert_parts(artifact.parts))
-            #print(f"artifact result: {result}")
-            return result
-        elif isinstance(response, Task):
-            task: Task = response
-            # TODO : task state 관리 
-
-            # Task Message or Artifacts 
-            result = []
-            if task.status.message:
-                # Assume the information is in the task message.
-                result.extend(
-                    await self.convert_parts(task.status.message.parts)
+    def get_policy(self, agent_name: str) -> ResiliencePolicy:
+        """에이전트 설정(JSON)의 resilience 정책 반환"""
+        entry = next((e for e in self.remote_agent_entries or [] if e.name == agent_name), None)
+        return ResiliencePolicy.from_dict(entry.resilience if entry else None)
+
+    def get_cache_policy(self, agent_name: str) -> CachePolicy:
+        """에이전트 카드의 응답 캐시 확장 선언 + 로컬 설정(JSON)으로 캐시 정책 결정"""
+        entry = next((e for e in self.remote_agent_entries or [] if e.name == agent_name), None)
+        return CachePolicy.resolve(self.cards.get(agent_name), entry.response_cache if entry else None)
+
+    def get_config_version(self, agent_name: str) -> str:
+        """응답 캐시 키에 쓰이는 에이전트 설정 버전 (카드가 바뀌면 달라짐)"""
+        card = self.cards.get(agent_name)
+        return card_version(card) if card else ""
+
+    def get_breaker(self, agent_name: str) -> CircuitBreaker:
+        if agent_name not in self._breakers:
+            self._breakers[agent_name] = CircuitBreaker(agent_name, self.get_policy(agent_name).circuit_breaker)
+        return self._breakers[agent_name]
+
+    def breaker_stats(self) -> dict[str, Any]:
+        return {name: breaker.to_dict() for name, breaker in self._breakers.items()}
+
+    async def stream_message(self, agent_name: str, user_text: str,
+                             task_id: Optional[str] = None, context_id: Optional[str] = None,
+                             deadline: Optional[Deadline] = None) -> AsyncIterator[StreamChunk]:
+        """원격 에이전트의 상태 업데이트와 아티팩트 청크를 도착하는 대로 StreamChunk로 yield 합니다.
+
+        서킷이 열려 있으면 CircuitOpenError로 즉시 실패하고, 데드라인을 넘기면 DeadlineExceeded를 발생시킵니다.
+        부분 출력이 이미 전달되었을 수 있으므로 스트리밍 전송은 재시도하지 않습니다.
+        """
+        client = self._get_connection(agent_name)
+        policy = self.get_policy(agent_name)
+        deadline = deadline or Deadline(policy.timeout)
+        breaker = self.get_breaker(agent_name)
+        breaker.allow()
+
+        recorded = False
+        try:
+            async with asyncio.timeout(deadline.remaining()):
+                async for chunk in self._stream_once(client, agent_name, user_text, task_id, context_id):
+                    yield chunk
+        except TimeoutError as e:
+            breaker.record_failure()
+            recorded = True
+            raise DeadlineExceeded(f"'{agent_name}' 응답이 데드라인을 넘었습니다.") from e
+        except (GeneratorExit, asyncio.CancelledError):
+            # 소비자가 중간에 멈춘 경우는 피어 장애가 아님 (finally에서 프로브 슬롯만 반환)
+            raise
+        except Exception:
+            breaker.record_failure()
+            recorded = True
+            raise
+        else:
+            breaker.record_success()
+            recorded = True
+        finally:
+            if not recorded:
+                breaker.release()
+
+    async def _stream_once(self, client: RemoteAgentConnections, agent_name: str, user_text: str,
+                           task_id: Optional[str], context_id: Optional[str],
+                           metadata: Optional[dict[str, Any]] = None) -> AsyncIterator[StreamChunk]:
+        request = self._build_request(user_text, task_id, context_id, metadata)
+
+        async for event in client.stream_message(request, task_callback=self.task_callback):
+            if isinstance(event, JSONRPCError):
+                yield StreamChunk(kind='error', agent_name=agent_name, error=event.message, final=True)
+            elif isinstance(event, Message):
+                yield StreamChunk(kind='message', agent_name=agent_name,
+                                  parts=await self.convert_parts(event.parts), final=True)
+            elif isinstance(event, TaskArtifactUpdateEvent):
+                yield StreamChunk(
+                    kind='artifact',
+                    agent_name=agent_name,
+                    parts=await self.convert_parts(event.artifact.parts),
+                    artifact_id=event.artifact.artifact_id,
+                    append=bool(event.append),
+                    last_chunk=bool(event.last_chunk),
                 )
-            if task.artifacts:
-                for artifact in task.artifacts:
-                    result.extend(
-                        await self.convert_parts(artifact.parts)
-                    )
-                print(f"artifact result: {result}")
-            return result
-       
+            elif isinstance(event, TaskStatusUpdateEvent):
+                parts = await self.convert_parts(event.status.message.parts) if event.status.message else []
+                yield StreamChunk(kind='status', agent_name=agent_name, parts=parts,
+                                  state=event.status.state.value, final=bool(event.final))
+            elif isinstance(event, Task):
+                task: Task = event
+                # Task Message or Artifacts 
+                parts = await self.convert_parts(task.status.message.parts) if task.status.message else []
+                yield StreamChunk(kind='task', agent_name=agent_name, parts=parts, state=task.status.state.value)
+                for artifact in task.artifacts or []:
+                    yield StreamChunk(kind='artifact', agent_name=agent_name,
+                                      parts=await self.convert_parts(artifact.parts),
+                                      artifact_id=artifact.artifact_id, last_chunk=True)
+
+    async def send_message(self, agent_name:str, user_text: str, 
+                            task_id:Optional[str] = None, context_id:Optional[str] = None,
+                            deadline: Optional[Deadline] = None, timeout: Optional[float] = None,
+                            metadata: Optional[dict[str, Any]] = None) -> Any:
+        """Sends a task either streaming (if supported) or non-streaming.
+
+        This will send a message to the remote agent named agent_name and
+        collect the streamed artifact chunks into the final result.
+
+        Idempotent agents are retried with jittered exponential backoff, and
+        every attempt shares the caller's deadline.
+
+        Args:
+          agent_name: The name of the agent to send the task to.
+          user_text: The message to send to the agent for the task.
+          deadline: Deadline propagated from the caller.
+          timeout: Used when no deadline is given (defaults to the agent policy).
+          metadata: Message metadata (e.g. {"source_agent": ...}) for the remote agent.
+
+        Returns:
+          A list of converted parts, or None if the task failed.
+        """
+        client = self._get_connection(agent_name)
+        policy = self.get_policy(agent_name)
+        deadline = deadline or Deadline(timeout if timeout is not None else policy.timeout)
+        breaker = self.get_breaker(agent_name)
+
+        last_error: Exception | None = None
+        aggregator = StreamAggregator()
+        for attempt in range(policy.max_attempts):
+            # 서킷이 열려 있으면 CircuitOpenError로 즉시 실패
+            breaker.allow()
+            aggregator = StreamAggregator()
+            recorded = False
+            try:
+                async with asyncio.timeout(deadline.remaining()):
+                    async for chunk in self._stream_once(client, agent_name, user_text, task_id, context_id, metadata):
+                        aggregator.add(chunk)
+            except TimeoutError as e:
+                breaker.record_failure()
+                recorded = True
+                last_error = DeadlineExceeded(f"'{agent_name}' 응답이 데드라인을 넘었습니다.")
+                last_error.__cause__ = e
+                break
+            except Exception as e:
+                breaker.record_failure()
+                recorded = True
+                last_error = e
+                delay = policy.retry.delay(attempt)
+                remaining = deadline.remaining()
+                if attempt + 1 >= policy.max_attempts or (remaining is not None and remaining <= delay):
+                    break
+                print(f"🔁 '{agent_name}' 전송 재시도 {attempt + 1}/{policy.max_attempts - 1} ({delay:.2f}s 후): {e}")
+                await asyncio.sleep(delay)
+                continue
+            else:
+                breaker.record_success()
+                recorded = True
+            finally:
+                # 취소(fan-out 데드라인의 wait_for 등)로 결과를 기록하지 못했으면 프로브 슬롯 반환
+                if not recorded:
+                    breaker.release()
+            last_error = None
+            break
+
+        if last_error is not None:
+            raise last_error
+
+        if aggregator.failed:
+            print(f"❌ '{agent_name}' 작업 실패: {aggregator.error}")
+            return None
+        result = aggregator.result()
+        print(f"artifact result: {result}")
+        return result
 
-        
     async def convert_parts(self, parts: list[Part]):
         rval = []
         for p in parts:
@@ -336,7 +553,8 @@ class A2AClientAgent:
         return f'Unknown type: {part.kind}'
 
     async def close(self):
-        await self.httpx_client.aclose()
+        if self.httpx_client is not None:
+            await self.httpx_client.aclose()
 
 
 
@@ -0,0 +1,324 @@
+"""
+에이전트 카드 캐시
+- /.well-known/agent-card.json 응답을 로컬 디스크(data/a2a_card_cache)에 보관
+- 항목별 TTL (서버의 Cache-Control max-age 우선, 없으면 기본값)
+- 만료된 항목은 ETag / If-Modified-Since 조건부 요청으로 재검증
+- 백그라운드 갱신 태스크와 hit/miss 카운터 제공
+
+서버 측은 AgentCardETagMiddleware를 통해 ETag/Last-Modified 헤더와 304 응답을 제공합니다.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict
+from email.utils import formatdate, parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import httpx
+from a2a.types import AgentCard
+
+from .transport import get_shared_http_client
+
+try:
+    from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH, PREV_AGENT_CARD_WELL_KNOWN_PATH
+except ImportError:
+    AGENT_CARD_WELL_KNOWN_PATH = '/.well-known/agent-card.json'
+    PREV_AGENT_CARD_WELL_KNOWN_PATH = '/.well-known/agent.json'
+
+_MAX_AGE_RE = re.compile(r'max-age=(\d+)')
+
+
+def _default_cache_dir() -> str:
+    base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    return os.path.join(base_dir, "data", "a2a_card_cache")
+
+
+@dataclass
+class CardCacheEntry:
+    """캐시된 카드 한 건"""
+    url: str
+    card: Dict[str, Any]
+    fetched_at: float
+    ttl: float
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+    def is_fresh(self, now: Optional[float] = None) -> bool:
+        return (now or time.time()) - self.fetched_at < self.ttl
+
+    def expires_in(self, now: Optional[float] = None) -> float:
+        return self.fetched_at + self.ttl - (now or time.time())
+
+
+@dataclass
+class CardCacheStats:
+    hits: int = 0
+    misses: int = 0
+    revalidations: int = 0
+    not_modified: int = 0
+    stale_served: int = 0
+    errors: int = 0
+
+
+class AgentCardCache:
+    """디스크 기반 에이전트 카드 캐시"""
+
+    def __init__(self, cache_dir: Optional[str] = None, default_ttl: float = 300.0,
+                 refresh_interval: float = 60.0, enabled: bool = True):
+        self.cache_dir = cache_dir or _default_cache_dir()
+        self.default_ttl = float(default_ttl)
+        self.refresh_interval = float(refresh_interval)
+        self.enabled = enabled
+        self.counters = CardCacheStats()
+        self._entries: Dict[str, CardCacheEntry] = {}
+        self._lock = threading.Lock()
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._load_from_disk()
+
+    # ---- 디스크 저장소 ----
+    def _path_for(self, url: str) -> str:
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + ".json")
+
+    def _load_from_disk(self) -> None:
+        if not self.enabled or not os.path.isdir(self.cache_dir):
+            return
+        for fname in os.listdir(self.cache_dir):
+            if not fname.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.cache_dir, fname), 'r', encoding='utf-8') as f:
+                    entry = CardCacheEntry(**json.load(f))
+                self._entries[entry.url] = entry
+            except Exception as e:
+                print(f"⚠️ 카드 캐시 로드 실패({fname}): {e}")
+
+    def _persist(self, entry: CardCacheEntry) -> None:
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._path_for(entry.url)
+            tmp_path = path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(asdict(entry), f, ensure_ascii=False)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"⚠️ 카드 캐시 저장 실패({entry.url}): {e}")
+
+    # ---- 조회 ----
+    @staticmethod
+    def card_url(base_url: str, card_path: str = AGENT_CARD_WELL_KNOWN_PATH) -> str:
+        return base_url.rstrip('/') + '/' + card_path.lstrip('/')
+
+    async def get_card(self, base_url: str, http_client: Optional[httpx.AsyncClient] = None,
+                       ttl: Optional[float] = None) -> AgentCard:
+        """캐시에서 카드를 반환하고, 없거나 만료된 경우에만 네트워크로 가져옵니다"""
+        url = self.card_url(base_url)
+        with self._lock:
+            entry = self._entries.get(url) if self.enabled else None
+
+        if entry and entry.is_fresh():
+            self.counters.hits += 1
+            return AgentCard.model_validate(entry.card)
+
+        if entry is None:
+            self.counters.misses += 1
+        try:
+            entry = await self._fetch(url, entry, http_client, ttl)
+        except Exception:
+            self.counters.errors += 1
+            if entry is not None:
+                # 재검증 실패 시 만료된 카드라도 반환 (stale-if-error)
+                self.counters.stale_served += 1
+                return AgentCard.model_validate(entry.card)
+            raise
+        return AgentCard.model_validate(entry.card)
+
+    async def _fetch(self, url: str, entry: Optional[CardCacheEntry],
+                     http_client: Optional[httpx.AsyncClient], ttl: Optional[float]) -> CardCacheEntry:
+        client = http_client or get_shared_http_client()
+        headers = {}
+        if entry is not None:
+            self.counters.revalidations += 1
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        response = await client.get(url, headers=headers)
+        ttl = self._ttl_from_response(response, ttl)
+
+        if response.status_code == 304 and entry is not None:
+            self.counters.not_modified += 1
+            entry.fetched_at = time.time()
+            entry.ttl = ttl
+        else:
+            response.raise_for_status()
+            card_data = response.json()
+            AgentCard.model_validate(card_data)
+            entry = CardCacheEntry(
+                url=url,
+                card=card_data,
+                fetched_at=time.time(),
+                ttl=ttl,
+                etag=response.headers.get("etag"),
+                last_modified=response.headers.get("last-modified"),
+            )
+
+        if self.enabled:
+            with self._lock:
+                self._entries[url] = entry
+            self._persist(entry)
+        return entry
+
+    def _ttl_from_response(self, response: httpx.Response, ttl: Optional[float]) -> float:
+        match = _MAX_AGE_RE.search(response.headers.get("cache-control", ""))
+        if match:
+            return float(match.group(1))
+        return float(ttl if ttl is not None else self.default_ttl)
+
+    # ---- 백그라운드 갱신 ----
+    def start_background_refresh(self) -> Optional[asyncio.Task]:
+        """만료가 임박한 항목을 주기적으로 재검증하는 태스크 시작"""
+        if not self.enabled or self.refresh_interval <= 0:
+            return None
+        if self._refresh_task and not self._refresh_task.done():
+            return self._refresh_task
+        self._refresh_task = asyncio.get_running_loop().create_task(self._refresh_loop())
+        return self._refresh_task
+
+    async def _refresh_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.refresh_interval)
+            with self._lock:
+                due = [e for e in self._entries.values() if e.expires_in() <= self.refresh_interval]
+            for entry in due:
+                try:
+                    await self._fetch(entry.url, entry, None, entry.ttl)
+                except Exception as e:
+                    self.counters.errors += 1
+                    print(f"⚠️ 카드 백그라운드 갱신 실패({entry.url}): {e}")
+
+    async def stop_background_refresh(self) -> None:
+        if self._refresh_task and not self._refresh_task.done():
+            self._refresh_task.cancel()
+            try:
+                await self._refresh_task
+            except asyncio.CancelledError:
+                pass
+        self._refresh_task = None
+
+    def invalidate(self, base_url: str) -> None:
+        url = self.card_url(base_url)
+        with self._lock:
+            self._entries.pop(url, None)
+        try:
+            os.remove(self._path_for(url))
+        except FileNotFoundError:
+            pass
+
+    def stats(self) -> Dict[str, Any]:
+        data = asdict(self.counters)
+        lookups = self.counters.hits + self.counters.misses + self.counters.revalidations
+        data["hit_ratio"] = round(self.counters.hits / lookups, 3) if lookups else 0.0
+        with self._lock:
+            data["entries"] = len(self._entries)
+        return data
+
+
+class AgentCardETagMiddleware:
+    """에이전트 카드 응답에 ETag/Last-Modified/Cache-Control을 붙이고 조건부 요청에 304로 응답하는 ASGI 미들웨어"""
+
+    CARD_PATHS = (AGENT_CARD_WELL_KNOWN_PATH, PREV_AGENT_CARD_WELL_KNOWN_PATH)
+
+    def __init__(self, app, max_age: int = 300):
+        self.app = app
+        self.max_age = int(max_age)
+        # 카드는 프로세스 수명 동안 바뀌지 않으므로 시작 시각을 Last-Modified로 사용
+        self._started_at = int(time.time())
+        self._last_modified = formatdate(self._started_at, usegmt=True)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or scope.get("method") != "GET" or scope.get("path") not in self.CARD_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        start_message: Dict[str, Any] = {}
+        body = bytearray()
+
+        async def capture(message):
+            if message["type"] == "http.response.start":
+                start_message.update(message)
+            elif message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+
+        await self.app(scope, receive, capture)
+
+        headers = [(k, v) for k, v in start_message.get("headers", [])
+                   if k.lower() not in (b"etag", b"last-modified", b"cache-control")]
+        if start_message.get("status") != 200:
+            await send({**start_message, "headers": headers})
+            await send({"type": "http.response.body", "body": bytes(body)})
+            return
+
+        etag = '"' + hashlib.sha1(bytes(body)).hexdigest() + '"'
+        headers += [
+            (b"etag", etag.encode()),
+            (b"last-modified", self._last_modified.encode()),
+            (b"cache-control", f"max-age={self.max_age}".encode()),
+        ]
+
+        if self._not_modified(scope, etag):
+            headers = [(k, v) for k, v in headers if k.lower() not in (b"content-length", b"content-type")]
+            await send({"type": "http.response.start", "status": 304, "headers": headers})
+            await send({"type": "http.response.body", "body": b""})
+            return
+
+        await send({**start_message, "headers": headers})
+        await send({"type": "http.response.body", "body": bytes(body)})
+
+    def _not_modified(self, scope, etag: str) -> bool:
+        request_headers = {k.lower(): v.decode('latin-1') for k, v in scope.get("headers", [])}
+        if_none_match = request_headers.get(b"if-none-match")
+        if if_none_match is not None:
+            return etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*'
+        if_modified_since = request_headers.get(b"if-modified-since")
+        if if_modified_since:
+            try:
+                return parsedate_to_datetime(if_modified_since).timestamp() >= self._started_at
+            except (TypeError, ValueError):
+                return False
+        return False
+
+
+# 전역 싱글톤 인스턴스
+_card_cache: Optional[AgentCardCache] = None
+
+
+def configure_card_cache(settings: Optional[Dict[str, Any]]) -> AgentCardCache:
+    """config.yaml의 a2a.card_cache 설정으로 전역 카드 캐시를 구성"""
+    global _card_cache
+    settings = settings or {}
+    cache_dir = settings.get("path")
+    if cache_dir and not os.path.isabs(cache_dir):
+        base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        cache_dir = os.path.join(base_dir, cache_dir)
+    _card_cache = AgentCardCache(
+        cache_dir=cache_dir,
+        default_ttl=settings.get("default_ttl", 300),
+        refresh_interval=settings.get("refresh_interval", 60),
+        enabled=settings.get("enabled", True),
+    )
+    return _card_cache
+
+
+def get_card_cache() -> AgentCardCache:
+    """전역 카드 캐시 인스턴스 반환"""
+    global _card_cache
+    if _card_cache is None:
+        _card_cache = AgentCardCache()
+    return _card_cache
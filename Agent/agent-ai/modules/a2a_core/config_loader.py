@@ -9,6 +9,25 @@ def load_a2a_config(path: str | Path) -> dict[str, Any]:
         return json.load(f)
 
 
+def find_a2a_config_by_name(config_dir: str, name: str) -> str | None:
+    """
+    설정 디렉터리에서 "name" 필드가 일치하는 JSON 설정 파일 경로를 찾습니다.
+
+    Returns:
+        str | None: 설정 파일 경로 또는 없을 경우 None
+    """
+    for filename in sorted(os.listdir(config_dir)):
+        if not filename.endswith(".json"):
+            continue
+        config_path = os.path.join(config_dir, filename)
+        try:
+            if load_a2a_config(config_path).get("name") == name:
+                return config_path
+        except Exception as e:
+            print(f"⚠️ 설정 로드 실패({filename}): {e}")
+    return None
+
+
 
 def load_a2a_server_addresses_from_config_dir(config_dir: str, except_file: str = None) -> list[A2AServerEntry]:
     """
@@ -44,7 +63,8 @@ def load_a2a_server_addresses_from_config_dir(config_dir: str, except_file: str
 
                 url = f"http://{host}:{port}/"
                 
-                entry = A2AServerEntry(name=name, url=url)
+                entry = A2AServerEntry(name=name, url=url, resilience=config.get("resilience", {}),
+                                       response_cache=config.get("responseCache", {}))
                 server_entries.append(entry)
 
             except (json.JSONDecodeError, FileNotFoundError) as e:
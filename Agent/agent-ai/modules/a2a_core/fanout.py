@@ -0,0 +1,119 @@
+"""
+A2A 동시 전송(fan-out)
+- 여러 에이전트에게, 또는 한 에이전트에게 여러 메시지를 동시에 전송
+- 전체 동시성 한도 / 에이전트별 동시성 한도 / 호출 전체 데드라인 지원
+- 결과는 완료되는 순서대로 반환 (async iterator)
+- 송신 함수에는 남은 데드라인을 timeout으로 넘기고, 실패하면 송신 함수가 던진 예외 메시지를 결과의 error로 전달
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Sequence, Union
+
+# (agent_name, text, timeout) -> 응답. timeout은 남은 데드라인(초, 데드라인이 없으면 None)
+SendFunc = Callable[[str, str, Optional[float]], Awaitable[Any]]
+
+
+@dataclass
+class FanOutRequest:
+    agent_name: str
+    text: str
+
+
+@dataclass
+class FanOutResult:
+    """fan-out 요청 한 건의 결과"""
+    index: int
+    agent_name: str
+    text: str
+    response: Any = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.response is not None
+
+
+async def fan_out(
+    send: SendFunc,
+    requests: Sequence[FanOutRequest],
+    *,
+    concurrency: Optional[int] = None,
+    per_agent_concurrency: Union[int, Dict[str, int], None] = None,
+    timeout: Optional[float] = None,
+) -> AsyncIterator[FanOutResult]:
+    """요청들을 동시에 실행하고 완료 순서대로 결과를 yield 합니다
+
+    Args:
+        send: (agent_name, text, timeout) -> 응답 을 수행하는 코루틴 함수 (실패는 예외로 알림)
+        requests: 전송할 요청 목록
+        concurrency: 전체 동시 실행 한도 (None이면 무제한)
+        per_agent_concurrency: 에이전트별 동시 실행 한도 (int 또는 {agent_name: n})
+        timeout: 호출 전체 데드라인(초). 넘기면 남은 요청은 오류 결과로 반환
+    """
+    if not requests:
+        return
+
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout if timeout else None
+    global_sem = asyncio.Semaphore(concurrency) if concurrency else None
+    agent_sems: Dict[str, asyncio.Semaphore] = {}
+
+    def _agent_sem(agent_name: str) -> Optional[asyncio.Semaphore]:
+        if isinstance(per_agent_concurrency, dict):
+            limit = per_agent_concurrency.get(agent_name)
+        else:
+            limit = per_agent_concurrency
+        if not limit:
+            return None
+        if agent_name not in agent_sems:
+            agent_sems[agent_name] = asyncio.Semaphore(limit)
+        return agent_sems[agent_name]
+
+    async def _run(index: int, req: FanOutRequest) -> FanOutResult:
+        result = FanOutResult(index=index, agent_name=req.agent_name, text=req.text)
+        begin = time.perf_counter()
+
+        async def _guarded():
+            sems = [s for s in (global_sem, _agent_sem(req.agent_name)) if s is not None]
+            for sem in sems:
+                await sem.acquire()
+            try:
+                # 동시성 한도를 기다린 시간을 뺀 나머지를 송신 쪽 데드라인으로 사용
+                remaining = None if deadline is None else deadline - loop.time()
+                if remaining is not None and remaining <= 0:
+                    raise asyncio.TimeoutError()
+                return await send(req.agent_name, req.text, remaining)
+            finally:
+                for sem in reversed(sems):
+                    sem.release()
+
+        try:
+            if deadline is not None:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise asyncio.TimeoutError()
+                result.response = await asyncio.wait_for(_guarded(), remaining)
+            else:
+                result.response = await _guarded()
+            if result.response is None:
+                result.error = "응답 없음"
+        except asyncio.TimeoutError:
+            result.error = f"데드라인 초과 ({timeout}s)"
+        except Exception as e:
+            result.error = str(e) or type(e).__name__
+        result.elapsed = time.perf_counter() - begin
+        return result
+
+    tasks: List[asyncio.Task] = [loop.create_task(_run(i, req)) for i, req in enumerate(requests)]
+    try:
+        for next_done in asyncio.as_completed(tasks):
+            yield await next_done
+    finally:
+        # 소비자가 중간에 멈추면 남은 요청 취소
+        for task in tasks:
+            if not task.done():
+                task.cancel()
@@ -0,0 +1,266 @@
+"""
+A2A 전달 outbox
+- 에이전트 간 후속 전달(예: Summarize → Recorder)을 로컬 디스크(data/a2a_outbox/<owner>)에 먼저 기록
+- 백그라운드 디스패처가 최대 batch_size건을 동시에 전송하고, 실패하면 지수 백오프로 재시도
+  (느린 전송 하나가 끝나기를 기다리지 않고 빈 자리마다 다음 메시지를 보냄)
+- 전송은 at-least-once: 메시지 ID(outbox_id)를 함께 보내 받는 쪽(Recorder)이 재전송을 걸러냄
+- max_attempts를 넘긴 메시지는 dead/ 디렉터리로 이동
+- 프로세스가 재시작되어도 디스크에 남은 메시지를 이어서 전송
+
+호출자는 enqueue()만 기다리므로 원격 에이전트의 응답을 기다리지 않고 바로 반환할 수 있습니다.
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import time
+import uuid
+from dataclasses import dataclass, asdict, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+# (agent_name, text, message_id) -> 응답 (None이면 실패로 간주해 재시도)
+OutboxSender = Callable[[str, str, str], Awaitable[Any]]
+
+
+def _base_dir() -> str:
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _owner_slug(owner: str) -> str:
+    return owner.lower().replace(' ', '_').replace('-', '_')
+
+
+@dataclass
+class OutboxMessage:
+    """전달 대기 중인 메시지 한 건"""
+    id: str
+    agent_name: str
+    text: str
+    created_at: float
+    attempts: int = 0
+    next_attempt_at: float = 0.0
+    last_error: Optional[str] = None
+
+
+@dataclass
+class OutboxStats:
+    enqueued: int = 0
+    delivered: int = 0
+    retries: int = 0
+    dead_lettered: int = 0
+    recovered: int = 0
+
+
+@dataclass
+class OutboxSettings:
+    """config.yaml의 a2a.outbox 설정"""
+    path: str = field(default_factory=lambda: os.path.join(_base_dir(), "data", "a2a_outbox"))
+    batch_size: int = 10
+    batch_window: float = 0.2
+    max_attempts: int = 8
+    retry_backoff: float = 1.0
+    max_backoff: float = 60.0
+
+
+class ForwardingOutbox:
+    """디스크 기반 전달 outbox + 백그라운드 디스패처 (이벤트 루프 하나에 묶임)"""
+
+    def __init__(self, owner: str, sender: OutboxSender, settings: Optional[OutboxSettings] = None):
+        settings = settings or OutboxSettings()
+        self.owner = owner
+        self.sender = sender
+        self.settings = settings
+        self.directory = os.path.join(settings.path, _owner_slug(owner))
+        self.dead_directory = os.path.join(self.directory, "dead")
+        self.counters = OutboxStats()
+        self._pending: Dict[str, OutboxMessage] = {}
+        # 전송 중인 메시지 ID -> 전송 태스크
+        self._inflight: Dict[str, asyncio.Task] = {}
+        self._task: Optional[asyncio.Task] = None
+        self._wakeup: Optional[asyncio.Event] = None
+
+    # ---- 디스크 저장소 ----
+    def _path_for(self, message_id: str, dead: bool = False) -> str:
+        return os.path.join(self.dead_directory if dead else self.directory, f"{message_id}.json")
+
+    def _persist(self, message: OutboxMessage) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._path_for(message.id)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(asdict(message), f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+    def _remove(self, message: OutboxMessage) -> None:
+        try:
+            os.remove(self._path_for(message.id))
+        except FileNotFoundError:
+            pass
+
+    def _move_to_dead(self, message: OutboxMessage) -> None:
+        os.makedirs(self.dead_directory, exist_ok=True)
+        self._persist(message)
+        os.replace(self._path_for(message.id), self._path_for(message.id, dead=True))
+
+    def _load_from_disk(self) -> List[OutboxMessage]:
+        if not os.path.isdir(self.directory):
+            return []
+        messages = []
+        for fname in os.listdir(self.directory):
+            if not fname.endswith(".json"):
+                continue
+            try:
+                with open(os.path.join(self.directory, fname), 'r', encoding='utf-8') as f:
+                    messages.append(OutboxMessage(**json.load(f)))
+            except Exception as e:
+                print(f"⚠️ outbox 메시지 로드 실패({fname}): {e}")
+        return messages
+
+    # ---- 공개 API ----
+    async def enqueue(self, agent_name: str, text: str) -> OutboxMessage:
+        """메시지를 디스크에 기록하고 디스패처를 깨웁니다 (원격 전송은 기다리지 않음)"""
+        message = OutboxMessage(id=f"{time.time_ns()}-{uuid.uuid4().hex[:8]}",
+                                agent_name=agent_name, text=text, created_at=time.time())
+        await asyncio.to_thread(self._persist, message)
+        self._pending[message.id] = message
+        self.counters.enqueued += 1
+        self.start()
+        self._wakeup.set()
+        return message
+
+    def start(self) -> None:
+        """현재 이벤트 루프에서 디스패처 시작 (디스크에 남은 메시지부터 전송)"""
+        if self._task is not None and not self._task.done():
+            return
+        self._wakeup = asyncio.Event()
+        self._task = asyncio.get_running_loop().create_task(self._run())
+
+    async def stop(self) -> None:
+        """디스패처 중지 (미전송 메시지는 디스크에 남아 다음 시작 때 전송)"""
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+        inflight = list(self._inflight.values())
+        for task in inflight:
+            task.cancel()
+        await asyncio.gather(*inflight, return_exceptions=True)
+        self._inflight.clear()
+
+    @property
+    def pending_count(self) -> int:
+        return len(self._pending)
+
+    def stats(self) -> Dict[str, Any]:
+        counters = asdict(self.counters)
+        counters["pending"] = len(self._pending)
+        counters["inflight"] = len(self._inflight)
+        counters["running"] = bool(self._task and not self._task.done())
+        return counters
+
+    # ---- 디스패처 ----
+    def _backoff(self, attempts: int) -> float:
+        return min(self.settings.retry_backoff * (2 ** (attempts - 1)), self.settings.max_backoff)
+
+    async def _run(self) -> None:
+        for message in await asyncio.to_thread(self._load_from_disk):
+            if message.id not in self._pending:
+                self._pending[message.id] = message
+                self.counters.recovered += 1
+        if self.counters.recovered:
+            print(f"📮 {self.owner} outbox: 미전송 메시지 {self.counters.recovered}건 복구")
+
+        while True:
+            # 대기 전에 clear 해야 계산과 대기 사이에 들어온 enqueue/전송 완료를 놓치지 않음
+            self._wakeup.clear()
+            now = time.time()
+            waiting = [m for m in self._pending.values() if m.id not in self._inflight]
+            slots = max(1, self.settings.batch_size) - len(self._inflight)
+            due = sorted((m for m in waiting if m.next_attempt_at <= now), key=lambda m: m.created_at)[:max(0, slots)]
+            for message in due:
+                task = asyncio.get_running_loop().create_task(self._deliver(message))
+                self._inflight[message.id] = task
+                task.add_done_callback(lambda _, message_id=message.id: self._on_delivered(message_id))
+            if due:
+                continue
+            # 빈 자리가 없으면 전송 완료를, 있으면 다음 재시도 시각까지 기다림
+            timeout = min((m.next_attempt_at for m in waiting), default=None) if slots > 0 else None
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), None if timeout is None else max(0.0, timeout - now))
+            except asyncio.TimeoutError:
+                continue
+            # 연속으로 들어오는 메시지를 한 배치로 모음
+            if self.settings.batch_window > 0 and not self._inflight:
+                await asyncio.sleep(self.settings.batch_window)
+
+    def _on_delivered(self, message_id: str) -> None:
+        self._inflight.pop(message_id, None)
+        if self._wakeup is not None:
+            self._wakeup.set()
+
+    async def _deliver(self, message: OutboxMessage) -> None:
+        message.attempts += 1
+        try:
+            response = await self.sender(message.agent_name, message.text, message.id)
+            error = None if response is not None else "응답 없음"
+        except Exception as e:
+            error = str(e) or type(e).__name__
+
+        try:
+            if error is None:
+                self._pending.pop(message.id, None)
+                await asyncio.to_thread(self._remove, message)
+                self.counters.delivered += 1
+                print(f"📮 {self.owner} outbox: '{message.agent_name}' 전달 완료 ({message.attempts}회 시도)")
+                return
+
+            message.last_error = error
+            if message.attempts >= self.settings.max_attempts:
+                self._pending.pop(message.id, None)
+                await asyncio.to_thread(self._move_to_dead, message)
+                self.counters.dead_lettered += 1
+                print(f"❌ {self.owner} outbox: '{message.agent_name}' 전달 포기 ({message.attempts}회 실패): {error}")
+                return
+
+            message.next_attempt_at = time.time() + self._backoff(message.attempts)
+            await asyncio.to_thread(self._persist, message)
+            self.counters.retries += 1
+            print(f"⚠️ {self.owner} outbox: '{message.agent_name}' 전달 실패, {self._backoff(message.attempts):.1f}s 후 재시도: {error}")
+        except Exception as e:
+            print(f"⚠️ {self.owner} outbox 상태 저장 실패({message.id}): {e}")
+
+
+# 전역 설정 (에이전트 프로세스마다 configure_outbox로 구성)
+_outbox_settings: Optional[OutboxSettings] = None
+
+
+def configure_outbox(settings: Optional[Dict[str, Any]]) -> OutboxSettings:
+    """config.yaml의 a2a.outbox 설정으로 outbox 기본값을 구성"""
+    global _outbox_settings
+    settings = settings or {}
+    defaults = OutboxSettings()
+    path = settings.get("path") or defaults.path
+    if not os.path.isabs(path):
+        path = os.path.join(_base_dir(), path)
+    _outbox_settings = OutboxSettings(
+        path=path,
+        batch_size=int(settings.get("batch_size", defaults.batch_size)),
+        batch_window=float(settings.get("batch_window", defaults.batch_window)),
+        max_attempts=int(settings.get("max_attempts", defaults.max_attempts)),
+        retry_backoff=float(settings.get("retry_backoff", defaults.retry_backoff)),
+        max_backoff=float(settings.get("max_backoff", defaults.max_backoff)),
+    )
+    return _outbox_settings
+
+
+def get_outbox_settings() -> OutboxSettings:
+    """전역 outbox 설정 반환"""
+    global _outbox_settings
+    if _outbox_settings is None:
+        _outbox_settings = OutboxSettings()
+    return _outbox_settings
@@ -0,0 +1,203 @@
+"""
+A2A 서버 멀티 프로세스 실행기
+- 각 에이전트를 별도 OS 프로세스(spawn)에서 동시에 실행 → 에이전트별 GIL 분리
+- config/a2a/*.json 설정을 그대로 사용
+- 비정상 종료된 에이전트를 백오프와 함께 재시작하는 감독(supervisor) 루프 제공
+  (에이전트별 재시작 예정 시각을 폴링마다 확인하므로 한 에이전트의 백오프가 다른 에이전트의 재시작을 막지 않음)
+"""
+from __future__ import annotations
+
+import asyncio
+import multiprocessing
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .config_loader import load_a2a_config, find_a2a_config_by_name
+from .readiness import ReadinessResult, wait_for_server
+
+
+def _run_agent_process(config_path: str, a2a_settings: Optional[Dict[str, Any]]) -> None:
+    """자식 프로세스 진입점: 자체 이벤트 루프에서 서버를 빌드하고 uvicorn으로 실행"""
+    import uvicorn
+    from .server_factory import build_server_from_config
+    from .transport import configure_transport
+    from .card_cache import configure_card_cache
+    from .outbox import configure_outbox
+
+    async def _serve():
+        settings = a2a_settings or {}
+        configure_transport(settings.get("transport"))
+        configure_card_cache(settings.get("card_cache"))
+        configure_outbox(settings.get("outbox"))
+        # 실행기 내부의 A2AClientAgent가 이 루프에 묶이도록 루프 안에서 빌드
+        server_config, app = build_server_from_config(config_path)
+        config = uvicorn.Config(
+            app,
+            host=server_config.get("host", "127.0.0.1"),
+            port=int(server_config.get("port", 8000)),
+            log_level="info",
+        )
+        await uvicorn.Server(config).serve()
+
+    try:
+        asyncio.run(_serve())
+    except KeyboardInterrupt:
+        pass
+
+
+@dataclass
+class AgentProcess:
+    """감독 대상 에이전트 프로세스 한 개"""
+    name: str
+    config_path: str
+    host: str
+    port: int
+    process: Optional[multiprocessing.Process] = None
+    restarts: int = 0
+    started_at: float = 0.0
+    last_exit_code: Optional[int] = None
+    restart_times: List[float] = field(default_factory=list)
+    # 종료가 감지되어 재시작을 기다리는 중이면 재시작 예정 시각 (time.time() 기준)
+    next_restart_at: Optional[float] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/"
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self.process and self.process.is_alive())
+
+    async def wait_until_ready(self, timeout: float = 10.0) -> ReadinessResult:
+        """프로세스 생존 여부 + 헬스 프로브로 준비 대기"""
+        return await wait_for_server(self.name, None, self.base_url, timeout,
+                                     is_alive=lambda: self.is_running)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "pid": self.process.pid if self.process else None,
+            "running": self.is_running,
+            "restarts": self.restarts,
+            "last_exit_code": self.last_exit_code,
+            "restart_pending": self.next_restart_at is not None,
+            "uptime": round(time.time() - self.started_at, 1) if self.is_running else 0.0,
+        }
+
+
+class A2AProcessSupervisor:
+    """에이전트 프로세스들을 동시에 띄우고 비정상 종료 시 재시작"""
+
+    def __init__(self, config_dir: str, a2a_settings: Optional[Dict[str, Any]] = None,
+                 max_restarts: int = 5, restart_window: float = 60.0,
+                 restart_backoff: float = 1.0, poll_interval: float = 0.5):
+        self.config_dir = config_dir
+        self.a2a_settings = a2a_settings or {}
+        self.max_restarts = max_restarts
+        self.restart_window = restart_window
+        self.restart_backoff = restart_backoff
+        self.poll_interval = poll_interval
+        self.agents: Dict[str, AgentProcess] = {}
+        self._ctx = multiprocessing.get_context("spawn")
+        self._monitor_task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+    def _spawn(self, agent: AgentProcess) -> None:
+        process = self._ctx.Process(
+            target=_run_agent_process,
+            args=(agent.config_path, self.a2a_settings),
+            name=f"a2a-{agent.name}",
+            daemon=True,
+        )
+        process.start()
+        agent.process = process
+        agent.started_at = time.time()
+        print(f"🚀 A2A 서버 프로세스 시작: {agent.name} (pid={process.pid}, {agent.base_url})")
+
+    def start(self, server_names: List[str]) -> List[AgentProcess]:
+        """모든 에이전트 프로세스를 한 번에 띄웁니다 (준비 대기는 호출 측에서 병렬로)"""
+        started = []
+        for name in server_names:
+            config_path = find_a2a_config_by_name(self.config_dir, name)
+            if not config_path:
+                print(f"❌ name='{name}' 설정을 찾지 못했습니다. ({self.config_dir})")
+                continue
+            cfg = load_a2a_config(config_path)
+            agent = AgentProcess(
+                name=name,
+                config_path=config_path,
+                host=cfg.get("host", "127.0.0.1"),
+                port=int(cfg.get("port", 8000)),
+            )
+            try:
+                self._spawn(agent)
+            except Exception as e:
+                print(f"❌ 서버 프로세스 시작 실패 ({name}): {e}")
+                continue
+            self.agents[name] = agent
+            started.append(agent)
+        return started
+
+    def start_monitor(self) -> asyncio.Task:
+        """비정상 종료 감시 루프 시작"""
+        if self._monitor_task is None or self._monitor_task.done():
+            self._stopping = False
+            self._monitor_task = asyncio.get_running_loop().create_task(self._monitor_loop())
+        return self._monitor_task
+
+    async def _monitor_loop(self) -> None:
+        while not self._stopping:
+            await asyncio.sleep(self.poll_interval)
+            if not self._stopping:
+                self._check_agents(time.time())
+
+    def _check_agents(self, now: float) -> None:
+        """폴링 한 번: 새로 종료된 에이전트는 재시작 시각을 정하고, 시각이 된 에이전트는 재시작"""
+        for agent in list(self.agents.values()):
+            if agent.process is None or agent.process.is_alive():
+                continue
+            if agent.next_restart_at is None:
+                agent.last_exit_code = agent.process.exitcode
+                agent.restart_times = [t for t in agent.restart_times if now - t < self.restart_window]
+                if len(agent.restart_times) >= self.max_restarts:
+                    print(f"❌ {agent.name} 재시작 한도 초과 ({self.max_restarts}회/{self.restart_window:.0f}s). 감시를 중단합니다.")
+                    agent.process = None
+                    continue
+                delay = self.restart_backoff * (2 ** len(agent.restart_times))
+                agent.next_restart_at = now + delay
+                print(f"⚠️ {agent.name} 프로세스 종료 감지 (exit={agent.last_exit_code}). {delay:.1f}s 후 재시작...")
+            if now < agent.next_restart_at:
+                continue
+            agent.next_restart_at = None
+            agent.restart_times.append(now)
+            agent.restarts += 1
+            try:
+                self._spawn(agent)
+            except Exception as e:
+                print(f"❌ {agent.name} 재시작 실패: {e}")
+
+    def stats(self) -> List[Dict[str, Any]]:
+        return [agent.to_dict() for agent in self.agents.values()]
+
+    async def stop(self, timeout: float = 5.0) -> None:
+        """감시 루프를 멈추고 모든 에이전트 프로세스를 종료"""
+        self._stopping = True
+        if self._monitor_task and not self._monitor_task.done():
+            self._monitor_task.cancel()
+            try:
+                await self._monitor_task
+            except asyncio.CancelledError:
+                pass
+        self._monitor_task = None
+
+        for agent in self.agents.values():
+            if agent.process and agent.process.is_alive():
+                agent.process.terminate()
+        for agent in self.agents.values():
+            if agent.process:
+                await asyncio.to_thread(agent.process.join, timeout)
+                if agent.process.is_alive():
+                    agent.process.kill()
+                print(f"🛑 A2A 서버 프로세스 중지 완료: {agent.name}")
+        self.agents.clear()
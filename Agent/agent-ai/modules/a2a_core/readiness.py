@@ -0,0 +1,145 @@
+"""
+A2A 서버 준비 상태(readiness) 확인
+- 고정 sleep 대신 uvicorn의 startup 완료 이벤트 + 헬스 프로브(에이전트 카드 조회)로 준비 여부 판단
+- 에이전트별 데드라인 지원
+- 부팅 시간이 어디에 쓰였는지 보여주는 StartupTimeline 제공
+"""
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .transport import get_shared_http_client
+
+try:
+    from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+except ImportError:
+    AGENT_CARD_WELL_KNOWN_PATH = '/.well-known/agent-card.json'
+
+
+@dataclass
+class TimelineEntry:
+    name: str
+    start: float
+    end: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        return (self.end or time.perf_counter()) - self.start
+
+
+class StartupTimeline:
+    """부팅 단계별 소요 시간 기록"""
+
+    def __init__(self):
+        self.origin = time.perf_counter()
+        self.entries: List[TimelineEntry] = []
+
+    def begin(self, name: str) -> TimelineEntry:
+        entry = TimelineEntry(name=name, start=time.perf_counter())
+        self.entries.append(entry)
+        return entry
+
+    def end(self, entry: TimelineEntry) -> None:
+        entry.end = time.perf_counter()
+
+    @contextmanager
+    def phase(self, name: str):
+        entry = self.begin(name)
+        try:
+            yield entry
+        finally:
+            self.end(entry)
+
+    def record(self, name: str, start: float, end: float) -> None:
+        self.entries.append(TimelineEntry(name=name, start=start, end=end))
+
+    @property
+    def total(self) -> float:
+        if not self.entries:
+            return 0.0
+        return max((e.end or time.perf_counter()) for e in self.entries) - self.origin
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total": round(self.total, 3),
+            "phases": [
+                {
+                    "name": e.name,
+                    "offset": round(e.start - self.origin, 3),
+                    "duration": round(e.duration, 3),
+                }
+                for e in self.entries
+            ],
+        }
+
+    def report(self) -> str:
+        lines = [f"⏱️ 시작 타임라인 (총 {self.total:.3f}s)"]
+        for e in self.entries:
+            offset = e.start - self.origin
+            lines.append(f"   +{offset:7.3f}s  {e.duration:7.3f}s  {e.name}")
+        return "\n".join(lines)
+
+
+@dataclass
+class ReadinessResult:
+    name: str
+    ready: bool
+    started_after: Optional[float] = None
+    healthy_after: Optional[float] = None
+    error: Optional[str] = None
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+
+async def probe_health(base_url: str, deadline: float, interval: float = 0.05) -> bool:
+    """에이전트 카드 엔드포인트가 200을 돌려줄 때까지 데드라인(monotonic) 안에서 재시도"""
+    client = get_shared_http_client()
+    url = base_url.rstrip('/') + AGENT_CARD_WELL_KNOWN_PATH
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        try:
+            response = await client.get(url, timeout=max(min(remaining, 2.0), 0.05))
+            if response.status_code == 200:
+                return True
+        except Exception:
+            pass
+        await asyncio.sleep(min(interval, max(deadline - time.monotonic(), 0)))
+
+
+async def wait_for_server(name: str, started_event: Optional[threading.Event], base_url: str,
+                          timeout: float, is_alive=None) -> ReadinessResult:
+    """서버 시작 이벤트와 헬스 프로브를 순서대로 기다립니다
+
+    Args:
+        name: 에이전트 이름
+        started_event: uvicorn startup 완료 시 set 되는 이벤트 (없으면 헬스 프로브만 수행)
+        base_url: http://host:port/
+        timeout: 이 에이전트의 데드라인(초)
+        is_alive: 서버가 아직 살아있는지 확인하는 콜백 (종료 시 즉시 실패 처리)
+    """
+    begin = time.monotonic()
+    deadline = begin + timeout
+
+    if started_event is not None:
+        while not started_event.is_set():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return ReadinessResult(name, False, error=f"{timeout:.1f}s 안에 시작되지 않음")
+            if is_alive is not None and not is_alive():
+                return ReadinessResult(name, False, error="서버가 시작 중 종료됨")
+            await asyncio.to_thread(started_event.wait, min(remaining, 0.5))
+        if is_alive is not None and not is_alive():
+            return ReadinessResult(name, False, error="서버가 시작 중 종료됨")
+    started_after = time.monotonic() - begin
+
+    if not await probe_health(base_url, deadline):
+        return ReadinessResult(name, False, started_after=started_after,
+                               error=f"{timeout:.1f}s 안에 헬스 프로브 실패")
+    return ReadinessResult(name, True, started_after=started_after,
+                           healthy_after=time.monotonic() - begin)
@@ -0,0 +1,179 @@
+"""
+A2A 전송 복원력(resilience) 정책
+- 에이전트별 서킷 브레이커 (closed → open → half-open 프로빙)
+- 멱등(idempotent) 전송에 한해 지터가 섞인 지수 백오프 재시도
+- 호출자에서 전달되는 데드라인
+
+설정은 config/a2a/*.json의 "resilience" 블록에서 읽습니다.
+    "resilience": {
+        "timeout": 60,
+        "idempotent": true,
+        "retry": {"max_attempts": 3, "base_delay": 0.2, "max_delay": 5.0},
+        "circuit_breaker": {"failure_threshold": 5, "recovery_timeout": 30, "half_open_max_calls": 1, "probe_timeout": 60}
+    }
+"""
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷이 열려 있어 호출을 즉시 거부할 때 발생"""
+
+    def __init__(self, agent_name: str, retry_after: float):
+        super().__init__(f"'{agent_name}' 서킷이 열려 있습니다. {retry_after:.1f}s 후 재시도 가능")
+        self.agent_name = agent_name
+        self.retry_after = retry_after
+
+
+class DeadlineExceeded(TimeoutError):
+    """호출자가 지정한 데드라인을 넘었을 때 발생"""
+
+
+class Deadline:
+    """monotonic 시계 기준 절대 데드라인 (하위 호출로 그대로 전달)"""
+
+    def __init__(self, timeout: Optional[float]):
+        self.expires_at = time.monotonic() + timeout if timeout else None
+
+    def remaining(self) -> Optional[float]:
+        if self.expires_at is None:
+            return None
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    @property
+    def expired(self) -> bool:
+        remaining = self.remaining()
+        return remaining is not None and remaining <= 0
+
+
+def _pick(data: Dict[str, Any], cls) -> Dict[str, Any]:
+    return {k: v for k, v in (data or {}).items() if k in cls.__dataclass_fields__}
+
+
+@dataclass
+class RetryPolicy:
+    max_attempts: int = 3
+    base_delay: float = 0.2
+    max_delay: float = 5.0
+
+    def delay(self, attempt: int) -> float:
+        """full jitter 지수 백오프: [0, min(max_delay, base * 2^attempt)]"""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+@dataclass
+class BreakerPolicy:
+    failure_threshold: int = 5
+    recovery_timeout: float = 30.0
+    half_open_max_calls: int = 1
+    # 결과가 기록되지 않은 half-open 프로브 슬롯을 이 시간(초) 뒤 다시 사용할 수 있게 함
+    probe_timeout: float = 60.0
+
+
+@dataclass
+class ResiliencePolicy:
+    """에이전트 한 개에 적용되는 전송 정책"""
+    timeout: Optional[float] = 60.0
+    # 부작용이 없는 에이전트만 재시도 (예: Recorder는 중복 기록 방지를 위해 false)
+    idempotent: bool = False
+    retry: RetryPolicy = field(default_factory=RetryPolicy)
+    circuit_breaker: BreakerPolicy = field(default_factory=BreakerPolicy)
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "ResiliencePolicy":
+        data = data or {}
+        return cls(
+            timeout=data.get("timeout", 60.0),
+            idempotent=bool(data.get("idempotent", False)),
+            retry=RetryPolicy(**_pick(data.get("retry"), RetryPolicy)),
+            circuit_breaker=BreakerPolicy(**_pick(data.get("circuit_breaker"), BreakerPolicy)),
+        )
+
+    @property
+    def max_attempts(self) -> int:
+        return max(self.retry.max_attempts, 1) if self.idempotent else 1
+
+
+class CircuitBreaker:
+    """에이전트별 서킷 브레이커 (여러 이벤트 루프/스레드에서 공유 가능)"""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, agent_name: str, policy: Optional[BreakerPolicy] = None):
+        self.agent_name = agent_name
+        self.policy = policy or BreakerPolicy()
+        self._state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        # 진행 중인 half-open 프로브의 시작 시각
+        self._probes: List[float] = []
+        self._lock = threading.Lock()
+        self.rejected = 0
+        self.trips = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._maybe_half_open()
+            return self._state
+
+    def _maybe_half_open(self) -> None:
+        if self._state == self.OPEN and time.monotonic() - self._opened_at >= self.policy.recovery_timeout:
+            self._state = self.HALF_OPEN
+            self._probes = []
+
+    def allow(self) -> None:
+        """호출 가능 여부 확인. 열려 있으면 CircuitOpenError로 즉시 실패"""
+        with self._lock:
+            self._maybe_half_open()
+            if self._state == self.OPEN:
+                self.rejected += 1
+                retry_after = self.policy.recovery_timeout - (time.monotonic() - self._opened_at)
+                raise CircuitOpenError(self.agent_name, max(retry_after, 0.0))
+            if self._state == self.HALF_OPEN:
+                now = time.monotonic()
+                # 결과 없이 끝난(취소 등) 채로 오래된 프로브 슬롯은 다시 사용
+                self._probes = [t for t in self._probes if now - t < self.policy.probe_timeout]
+                if len(self._probes) >= self.policy.half_open_max_calls:
+                    self.rejected += 1
+                    raise CircuitOpenError(self.agent_name, 0.0)
+                # half-open 프로브 호출
+                self._probes.append(now)
+
+    def release(self) -> None:
+        """allow() 후 성공/실패를 기록하지 못하고 끝난 호출(취소 등)의 프로브 슬롯 반환"""
+        with self._lock:
+            if self._state == self.HALF_OPEN and self._probes:
+                self._probes.pop(0)
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._state = self.CLOSED
+            self._failures = 0
+            self._probes = []
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            if self._state == self.HALF_OPEN or self._failures >= self.policy.failure_threshold:
+                if self._state != self.OPEN:
+                    self.trips += 1
+                    print(f"⛔ '{self.agent_name}' 서킷 열림 (연속 실패 {self._failures}회)")
+                self._state = self.OPEN
+                self._opened_at = time.monotonic()
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "failures": self._failures,
+            "trips": self.trips,
+            "rejected": self.rejected,
+            "policy": asdict(self.policy),
+        }
@@ -0,0 +1,222 @@
+"""
+A2A 응답 캐시
+- (에이전트, 정규화된 텍스트, 에이전트 설정 버전)을 키로 하는 콘텐츠 주소 캐시
+- TTL 만료 + LRU 축출
+- single-flight: 동시에 들어온 같은 요청은 원격 작업 하나를 공유
+
+부작용이 있는 에이전트(예: Recorder)는 캐시에서 제외할 수 있습니다.
+- 에이전트 카드: capabilities.extensions 에 RESPONSE_CACHE_EXTENSION_URI 확장을 params {"cacheable": false} 로 선언
+- 로컬 설정: config/a2a/*.json 의 "responseCache": {"enabled": false} (카드보다 우선)
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
+
+from a2a.types import AgentCard
+
+RESPONSE_CACHE_EXTENSION_URI = "urn:aiffelton:a2a:response-cache"
+
+_WHITESPACE_RE = re.compile(r'\s+')
+
+CacheKey = Tuple[str, str, str]
+
+
+def normalize_text(text: str) -> str:
+    """유니코드 NFC 정규화 + 연속 공백 축약 + 앞뒤 공백 제거"""
+    return _WHITESPACE_RE.sub(' ', unicodedata.normalize('NFC', text or '')).strip()
+
+
+def card_version(card: AgentCard) -> str:
+    """카드 내용 해시 기반 설정 버전 (카드 version 또는 스킬/설명이 바뀌면 달라짐)"""
+    payload = card.model_dump_json(exclude_none=True)
+    return f"{card.version}-{hashlib.sha1(payload.encode('utf-8')).hexdigest()[:12]}"
+
+
+@dataclass
+class CachePolicy:
+    """에이전트 한 개에 대한 응답 캐시 정책"""
+    enabled: bool = True
+    ttl: Optional[float] = None
+
+    @classmethod
+    def resolve(cls, card: Optional[AgentCard], overrides: Optional[Dict[str, Any]]) -> "CachePolicy":
+        """카드 확장 선언 → 로컬 설정 순으로 적용"""
+        policy = cls()
+        extensions = card.capabilities.extensions if card and card.capabilities else None
+        for ext in extensions or []:
+            if ext.uri == RESPONSE_CACHE_EXTENSION_URI:
+                params = ext.params or {}
+                policy.enabled = bool(params.get("cacheable", True))
+                policy.ttl = params.get("ttl", policy.ttl)
+        if overrides:
+            policy.enabled = bool(overrides.get("enabled", policy.enabled))
+            policy.ttl = overrides.get("ttl", policy.ttl)
+        return policy
+
+
+@dataclass
+class ResponseCacheStats:
+    hits: int = 0
+    misses: int = 0
+    coalesced: int = 0
+    bypassed: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class ResponseCache:
+    """메모리 기반 A2A 응답 캐시 (TTL + LRU + single-flight)"""
+
+    def __init__(self, enabled: bool = False, ttl: float = 300.0, max_entries: int = 256):
+        self.enabled = enabled
+        self.ttl = float(ttl)
+        self.max_entries = int(max_entries)
+        self.counters = ResponseCacheStats()
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # 진행 중인 원격 작업 (이벤트 루프에 묶이므로 루프별로 분리, send/stream이 같은 키로 공유)
+        self._inflight: Dict[Tuple[int, CacheKey], asyncio.Future] = {}
+
+    @staticmethod
+    def make_key(agent_name: str, text: str, version: str = "") -> CacheKey:
+        return (agent_name, hashlib.sha256(normalize_text(text).encode('utf-8')).hexdigest(), version)
+
+    def get(self, key: CacheKey) -> Optional[Any]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.counters.expirations += 1
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def put(self, key: CacheKey, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else float(ttl)
+        if ttl <= 0 or self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.counters.evictions += 1
+
+    def invalidate(self, agent_name: Optional[str] = None) -> int:
+        """에이전트의 캐시 항목 삭제 (None이면 전체)"""
+        with self._lock:
+            keys = [k for k in self._entries if agent_name is None or k[0] == agent_name]
+            for k in keys:
+                del self._entries[k]
+            return len(keys)
+
+    def lookup(self, key: CacheKey) -> Optional[Any]:
+        """캐시 조회 (적중이면 hits 집계)"""
+        cached = self.get(key)
+        if cached is not None:
+            self.counters.hits += 1
+        return cached
+
+    def join(self, key: CacheKey) -> Tuple["asyncio.Future", bool]:
+        """진행 중인 같은 요청이 있으면 (그 작업, False), 없으면 새 Future를 등록해 (Future, True)
+
+        True를 받은 호출자(리더)는 끝날 때 반드시 finish()를 호출해야 합니다.
+        """
+        loop = asyncio.get_running_loop()
+        inflight_key = (id(loop), key)
+        shared = self._inflight.get(inflight_key)
+        if shared is not None:
+            self.counters.coalesced += 1
+            return shared, False
+        self.counters.misses += 1
+        future = loop.create_future()
+        self._inflight[inflight_key] = future
+        return future, True
+
+    def finish(self, key: CacheKey, future: "asyncio.Future", value: Any, ttl: Optional[float] = None) -> None:
+        """join()으로 등록한 요청 완료: 기다리던 호출자에게 결과를 넘기고 (None이 아니면) 캐시에 저장"""
+        inflight_key = (id(asyncio.get_running_loop()), key)
+        if self._inflight.get(inflight_key) is future:
+            del self._inflight[inflight_key]
+        if value is not None:
+            self.put(key, value, ttl)
+        if not future.done():
+            future.set_result(value)
+
+    async def get_or_load(self, agent_name: str, text: str, loader: Callable[[], Awaitable[Any]], *,
+                          version: str = "", policy: Optional[CachePolicy] = None) -> Any:
+        """캐시에 있으면 반환, 없으면 loader를 한 번만 실행해 결과를 공유/저장
+
+        None 응답(실패)은 캐시하지 않습니다. 같은 키의 스트리밍 요청(A2AManager.stream)과도 결과를 공유합니다.
+        """
+        policy = policy or CachePolicy()
+        if not self.enabled or not policy.enabled:
+            self.counters.bypassed += 1
+            return await loader()
+
+        key = self.make_key(agent_name, text, version)
+        cached = self.lookup(key)
+        if cached is not None:
+            return cached
+
+        future, leader = self.join(key)
+        if leader:
+            task = asyncio.get_running_loop().create_task(loader())
+
+            def _done(t: asyncio.Task) -> None:
+                if t.cancelled():
+                    self.finish(key, future, None)
+                elif t.exception() is not None:
+                    future.set_exception(t.exception())
+                    self.finish(key, future, None)
+                else:
+                    self.finish(key, future, t.result(), policy.ttl)
+
+            task.add_done_callback(_done)
+
+        # 호출자 하나가 취소되어도 공유 작업은 계속 진행
+        return await asyncio.shield(future)
+
+    def stats(self) -> Dict[str, Any]:
+        counters = asdict(self.counters)
+        lookups = self.counters.hits + self.counters.misses + self.counters.coalesced
+        counters["hit_ratio"] = round((self.counters.hits + self.counters.coalesced) / lookups, 3) if lookups else 0.0
+        counters["entries"] = len(self._entries)
+        counters["inflight"] = len(self._inflight)
+        counters["enabled"] = self.enabled
+        return counters
+
+
+# 전역 싱글톤 인스턴스
+_response_cache: Optional[ResponseCache] = None
+
+
+def configure_response_cache(settings: Optional[Dict[str, Any]]) -> ResponseCache:
+    """config.yaml의 a2a.response_cache 설정으로 전역 응답 캐시를 구성"""
+    global _response_cache
+    settings = settings or {}
+    _response_cache = ResponseCache(
+        enabled=settings.get("enabled", False),
+        ttl=settings.get("ttl", 300),
+        max_entries=settings.get("max_entries", 256),
+    )
+    return _response_cache
+
+
+def get_response_cache() -> ResponseCache:
+    """전역 응답 캐시 인스턴스 반환"""
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache()
+    return _response_cache
@@ -1,6 +1,7 @@
 import os
 import asyncio
 import json
+import time
 from datetime import datetime
 from a2a.server.agent_execution import AgentExecutor, RequestContext
 from a2a.server.events import EventQueue
@@ -30,6 +31,9 @@ from uuid import uuid4
 
 from .a2a_client import A2AClientAgent
 from .a2a_client import A2AServerEntry
+from .outbox import ForwardingOutbox, get_outbox_settings
+from ..recorder_store.store_factory import create_record_writer
+from ..recorder_store.search import search_records
 from dataclasses import dataclass
 from typing import TypedDict, Optional
 
@@ -49,6 +53,122 @@ class LLMResponse:
     is_complete: bool
     error_occur: bool
     error_message: Optional[str] = None
+    # 아티팩트가 이미 증분 청크로 전송되었는지 여부
+    streamed: bool = False
+
+
+def can_stream_llm(agent_name: str) -> bool:
+    """에이전트 LLM 핸들러가 토큰 스트리밍(stream_message)을 지원하는지 확인"""
+    if not LLM_AVAILABLE:
+        return False
+    try:
+        return hasattr(get_agent_llm_handler(agent_name), 'stream_message')
+    except Exception:
+        return False
+
+
+async def stream_llm_response(agent_name: str, user_message: str, updater: TaskUpdater) -> LLMResponse:
+    """LLM 토큰을 같은 artifact_id의 append 청크로 전송하고 전체 응답을 반환
+
+    마지막 청크를 last_chunk=True로 보내기 위해 토큰 하나를 늦춰서 전송합니다.
+    """
+    artifact_id = str(uuid4())
+    name = f'{agent_name}-result'
+    tokens: list[str] = []
+    pending: Optional[str] = None
+
+    async def _push(token: str, append: bool, last_chunk: bool) -> None:
+        await updater.add_artifact(
+            parts = [Part(root=TextPart(text=token))],
+            artifact_id = artifact_id,
+            name = name,
+            append = append,
+            last_chunk = last_chunk,
+        )
+
+    try:
+        llm_handler = get_agent_llm_handler(agent_name)
+        async for token in llm_handler.stream_message(user_message):
+            if pending is not None:
+                await _push(pending, append=len(tokens) > 1, last_chunk=False)
+            tokens.append(token)
+            pending = token
+        if pending is not None:
+            await _push(pending, append=len(tokens) > 1, last_chunk=True)
+        return LLMResponse(
+            response=''.join(tokens),
+            is_complete=True,
+            error_occur=False,
+            streamed=bool(tokens),
+        )
+
+    except Exception as e:
+        print(f"❌ {agent_name} LLM 스트리밍 응답 생성 실패: {e}")
+        return LLMResponse(
+            response=''.join(tokens),
+            is_complete=False,
+            error_occur=True,
+            error_message=str(e)
+        )
+
+
+RECORD_QUERY_FIELDS = ("start", "end", "agent", "source_agent", "context_id", "limit", "descending")
+RECORD_SEARCH_FIELDS = ("text", "start", "end", "limit")
+RECORD_STATS_FIELDS = ("bucket", "start", "end", "agent")
+RECORD_QUERY_MAX_LIMIT = 1000
+# 요청 키 -> 허용 조건
+RECORD_REQUEST_KINDS = {"query": RECORD_QUERY_FIELDS, "search": RECORD_SEARCH_FIELDS, "stats": RECORD_STATS_FIELDS}
+
+
+def extract_record_request(context: RequestContext) -> Optional[tuple[str, dict]]:
+    """메시지에서 Recorder 조회/검색/집계 요청({"query": {...}}, {"search": {...}}, {"stats": {...}})을 찾음
+
+    DataPart를 우선 확인하고, 없으면 JSON 텍스트를 확인합니다.
+    """
+    def _match(data) -> Optional[tuple[str, dict]]:
+        if isinstance(data, dict):
+            for kind in RECORD_REQUEST_KINDS:
+                if isinstance(data.get(kind), dict):
+                    return kind, data[kind]
+        return None
+
+    message = context.message
+    for part in (message.parts if message else None) or []:
+        root = part.root
+        if isinstance(root, DataPart) and _match(root.data):
+            return _match(root.data)
+
+    text = (context.get_user_input() or "").strip()
+    if not text.startswith("{"):
+        return None
+    try:
+        return _match(json.loads(text))
+    except ValueError:
+        return None
+
+
+def normalize_record_request(kind: str, params: dict) -> dict:
+    """조회/검색 조건 검증 (알 수 없는 키는 거부, limit은 RECORD_QUERY_MAX_LIMIT로 제한)"""
+    unknown = set(params) - set(RECORD_REQUEST_KINDS[kind])
+    if unknown:
+        raise ValueError(f"알 수 없는 조건입니다: {', '.join(sorted(unknown))}")
+    params = {k: v for k, v in params.items() if v is not None}
+    if kind == "search" and not str(params.get("text", "")).strip():
+        raise ValueError("검색어(text)가 비어 있습니다")
+    if kind == "stats":
+        return params
+    params["limit"] = max(1, min(int(params.get("limit", 100 if kind == "query" else 10)), RECORD_QUERY_MAX_LIMIT))
+    return params
+
+
+def _forward_metadata(agent_name: str, message_id: Optional[str]) -> dict:
+    """다른 에이전트로 보내는 메시지의 metadata (outbox 메시지 ID가 있으면 중복 제거용으로 포함)"""
+    metadata = {"source_agent": agent_name}
+    if message_id:
+        metadata["outbox_id"] = message_id
+    return metadata
+
+
 class SimpleStateManager:
     ''' Context 단위로 State를 관리한다 '''
     def __init__(self):
@@ -68,13 +188,19 @@ class SimpleStateManager:
 
 class A2AServerAgentExecutor(AgentExecutor):
 
-    def __init__(self, remote_agent_entries: list[A2AServerEntry], agent_name: str = None, **kwargs):
+    def __init__(self, remote_agent_entries: list[A2AServerEntry], agent_name: str = None,
+                 storage: Optional[dict] = None, **kwargs):
         # 에이전트 이름 저장
         self.agent_name = agent_name or "Unknown Agent"
         self.remote_agent_entries = remote_agent_entries
+        # Recorder 레코드 저장소 + write-behind 큐 (첫 저장 시 생성)
+        self.storage_settings = storage or {}
+        self._record_writer = None
         # BEGIN - 2025.08.22 task state 관리 {
         self.state_manager = SimpleStateManager() 
         # END - 2025.08.22 task state관리 }
+        # 다른 에이전트로의 후속 전달은 outbox를 거쳐 백그라운드에서 전송
+        self.outbox = ForwardingOutbox(self.agent_name, self.send_to_other, get_outbox_settings())
         print(f"🤖 {self.agent_name} 실행기 초기화 완료")
 
     async def execute(
@@ -110,18 +236,32 @@ class A2AServerAgentExecutor(AgentExecutor):
         # if not current_state 
         # END - 2025.08.22 task state관리 }
 
+        # Recorder 조회/검색 스킬: LLM 없이 저장소 인덱스로 바로 응답
+        request = extract_record_request(context) if "Recorder" in agent_name else None
+        if request is not None:
+            await self._answer_record_request(*request, updater)
+            return
         
-        # 3. LLM으로 응답 생성
-        result = await self._generate_llm_response(agent_name, text)
+        # 3. LLM으로 응답 생성 (스트리밍 가능하면 토큰을 증분 아티팩트 청크로 바로 전송)
+        if can_stream_llm(agent_name):
+            result = await stream_llm_response(agent_name, text, updater)
+        else:
+            result = await self._generate_llm_response(agent_name, text)
         if not result.error_occur : 
             response_text = result.response
 
             self.state_manager.set_response(task.id, response_text)
     
             # 4. 특별한 처리 (에이전트별 로직)
-            await self._handle_agent_specific_logic(agent_name, text, response_text)
+            await self._handle_agent_specific_logic(agent_name, text, response_text,
+                                                    record_source=self._record_source(context, task))
 
-            if result.is_complete : 
+            if result.streamed :
+                # 아티팩트는 스트리밍 중에 이미 전송됨
+                await updater.complete()
+                print(f"📤 스트리밍 응답 전송 완료: {response_text[:100]}...")
+
+            elif result.is_complete : 
                 # 성공적으로 완료된 경우 - artifact로 결과 전송
                 part = TextPart(text=response_text)
                 await updater.add_artifact(
@@ -154,7 +294,7 @@ class A2AServerAgentExecutor(AgentExecutor):
                     ),
                     final = True,
                 )
-            print(f"📤 실패 응답 전송: {response_text[:100]}...")
+            print(f"📤 실패 응답 전송: {error_text[:100]}...")
 
         
     
@@ -193,60 +333,103 @@ class A2AServerAgentExecutor(AgentExecutor):
                 error_message=str(e)
             )
     
-    async def _handle_agent_specific_logic(self, agent_name: str, user_message: str, response: str):
+    async def _handle_agent_specific_logic(self, agent_name: str, user_message: str, response: str,
+                                           record_source: Optional[dict] = None):
         """에이전트별 특별한 로직 처리"""
         try:
             if "Recorder" in agent_name:
                 # Recorder Agent: 데이터 저장
-                await self._save_to_database(user_message, response)
+                await self._save_to_database(user_message, response, record_source)
                 
             elif "Summarize" in agent_name:
-                # Summarize Agent: 요약 결과를 Recorder Agent에게 전송
-                if a2a_client:
-                    forward_message = f"요약 결과: {response}"
-                    await self.send_to_other("Recorder Agent", forward_message)
+                # Summarize Agent: 요약 결과를 outbox에 기록 (Recorder Agent 전송은 백그라운드)
+                forward_message = f"요약 결과: {response}"
+                await self.outbox.enqueue("Recorder Agent", forward_message)
                     
         except Exception as e:
             print(f"⚠️ {agent_name} 특별 로직 처리 실패: {e}")
     
-    async def _save_to_database(self, input_text: str, response: str):
-        """데이터베이스에 저장 (Recorder Agent용)"""
+    def _get_record_writer(self):
+        if self._record_writer is None:
+            self._record_writer = create_record_writer(self.storage_settings)
+        return self._record_writer
+
+    @staticmethod
+    def _record_source(context: RequestContext, task: Task) -> dict:
+        """레코드의 출처 (보낸 에이전트, A2A 컨텍스트, 보낸 쪽 outbox 메시지 ID)"""
+        metadata = (context.message.metadata if context.message else None) or {}
+        source = {"source_agent": metadata.get("source_agent"), "context_id": task.context_id}
+        if metadata.get("outbox_id"):
+            # 재전송된 같은 메시지는 write-behind 큐가 전달 기록으로 걸러냄
+            source["outbox_id"] = metadata["outbox_id"]
+        return source
+
+    def _run_record_request(self, kind: str, params: dict) -> list:
+        writer = self._get_record_writer()
+        if kind == "search":
+            if writer.index is None:
+                raise RuntimeError("검색 인덱스가 비활성화되어 있습니다")
+            return search_records(writer.store, writer.index, **params)
+        if kind == "stats":
+            if writer.rollups is None:
+                raise RuntimeError("집계가 비활성화되어 있습니다")
+            return writer.rollups.query(**params)
+        return writer.store.query(**params)
+
+    async def _answer_record_request(self, kind: str, params: dict, updater: TaskUpdater) -> None:
+        """조회 스킬(시간 범위/에이전트/컨텍스트), 검색 스킬(BM25 전문 검색), 집계 스킬(시간/일 단위) 결과를 DataPart로 응답"""
+        try:
+            params = normalize_record_request(kind, params)
+            started = time.perf_counter()
+            records = await asyncio.to_thread(self._run_record_request, kind, params)
+            elapsed_ms = round((time.perf_counter() - started) * 1000, 3)
+        except Exception as e:
+            await updater.update_status(
+                TaskState.failed,
+                new_agent_text_message(f"{kind} 실패: {e}", updater.context_id, updater.task_id),
+                final = True,
+            )
+            print(f"📤 {kind} 실패 응답 전송: {e}")
+            return
+
+        await updater.add_artifact(
+            parts = [Part(root=DataPart(data={"records": records, "count": len(records), "elapsed_ms": elapsed_ms}))],
+            name = f'{self.agent_name}-{kind}-result'
+        )
+        await updater.complete()
+        print(f"📤 {kind} 응답 전송 완료: {len(records)}건 ({elapsed_ms}ms)")
+
+    async def _save_to_database(self, input_text: str, response: str, record_source: Optional[dict] = None):
+        """write-behind 큐에 레코드를 넣고 바로 반환 (Recorder Agent용)
+
+        실제 기록은 writer 스레드가 배치로 처리하므로 응답 지연이 디스크 지연과 무관합니다.
+        """
         try:
-            # 데이터 저장 로직
-            timestamp = datetime.now().isoformat()
             record = {
-                "timestamp": timestamp,
+                "timestamp": datetime.now().isoformat(),
                 "input": input_text,
                 "response": response,
-                "agent": "Recorder Agent"
+                "agent": "Recorder Agent",
+                **(record_source or {}),
             }
             
-            # 파일로 저장 (임시)
-            base_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-            save_dir = os.path.join(base_dir, "data", "recorder_memory")
-            os.makedirs(save_dir, exist_ok=True)
-            
-            filename = f"record_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-            filepath = os.path.join(save_dir, filename)
-            
-            with open(filepath, 'w', encoding='utf-8') as f:
-                json.dump(record, f, ensure_ascii=False, indent=2)
-            
-            print(f"💾 데이터 저장 완료: {filepath}")
+            await self._get_record_writer().submit(record)
+            print(f"💾 데이터 저장 요청 완료 (대기 {self._record_writer.pending}건)")
             
         except Exception as e:
             print(f"❌ 데이터 저장 실패: {e}")
     
-    async def send_to_other(agent_name:str, user_text:str) -> None:
+    async def send_to_other(self, agent_name:str, user_text:str, message_id: Optional[str] = None) -> Optional[list]:
         if a2a_client is None:
             raise RuntimeError("A2AClientAgent is not initialized.")
 
         if agent_name not in a2a_client.remote_agent_connections:
             print(f"❌ 에이전트 '{agent_name}' 을 찾을 수 없습니다.")
-            return
+            return None
 
     
-        response = await a2a_client.send_message(agent_name,user_text, task_id=None, context_id=None)
+        response = await a2a_client.send_message(agent_name,user_text, task_id=None, context_id=None,
+                                                 metadata=_forward_metadata(self.agent_name, message_id))
         print("Response:")
         if response : 
             for i, item in enumerate(response):
@@ -255,7 +438,18 @@ class A2AServerAgentExecutor(AgentExecutor):
         else : 
             print("⚠️ 응답이 없습니다 (response is None).")
             print()
+        return response
 
+    async def startup(self) -> None:
+        """서버 시작 시 outbox 디스패처 시작 (재시작 전 미전송 메시지 포함)"""
+        self.outbox.start()
+
+    async def shutdown(self) -> None:
+        """서버 종료 시 디스패처 중지 (미전송 메시지는 디스크에 남음) 및 레코드 flush"""
+        await self.outbox.stop()
+        if self._record_writer is not None:
+            # 남은 레코드를 모두 기록한 뒤 저장소를 닫음
+            await asyncio.to_thread(self._record_writer.close)
 
     async def cancel(
         self, context: RequestContext, event_queue: EventQueue
@@ -269,6 +463,8 @@ class A2ACombinedAgentExecutor(AgentExecutor):
         # 에이전트 이름 저장
         self.agent_name = agent_name or "Unknown Agent"
         self.client_agent = A2AClientAgent(remote_agent_entries)
+        # 다른 에이전트로의 후속 전달은 outbox를 거쳐 백그라운드에서 전송
+        self.outbox = ForwardingOutbox(self.agent_name, self.send_to_other, get_outbox_settings())
         print(f"🤖 {self.agent_name} Combined 실행기 초기화 완료")
         
     async def execute(
@@ -290,6 +486,11 @@ class A2ACombinedAgentExecutor(AgentExecutor):
         agent_name = self.agent_name
         print(f"🤖 에이전트: {agent_name}")
         
+        # 3. 스트리밍 가능하면 task를 만들고 토큰을 증분 아티팩트 청크로 전송
+        if can_stream_llm(agent_name):
+            await self._execute_streaming(context, event_queue, agent_name, text)
+            return
+
         # 3. LLM으로 응답 생성
         response_text = await self._generate_llm_response(agent_name, text)
         
@@ -300,6 +501,34 @@ class A2ACombinedAgentExecutor(AgentExecutor):
         await event_queue.enqueue_event(new_agent_text_message(response_text))
         print(f"📤 응답 전송 완료: {response_text[:100]}...")
     
+    async def _execute_streaming(self, context: RequestContext, event_queue: EventQueue, agent_name: str, text: str) -> None:
+        """task + 증분 아티팩트 청크로 응답 (여러 요청을 같은 이벤트 루프에서 동시에 처리)"""
+        task = context.current_task
+        if not task:
+            task = new_task(context.message)
+            await event_queue.enqueue_event(task)
+        updater = TaskUpdater(event_queue, task.id, task.context_id)
+
+        result = await stream_llm_response(agent_name, text, updater)
+        if result.error_occur:
+            error_text = result.error_message or "알 수 없는 오류가 발생했습니다."
+            await updater.update_status(
+                TaskState.failed,
+                new_agent_text_message(error_text, task.context_id, task.id),
+                final = True,
+            )
+            print(f"📤 실패 응답 전송: {error_text[:100]}...")
+            return
+
+        await self._handle_agent_specific_logic(agent_name, text, result.response)
+        if not result.streamed:
+            await updater.add_artifact(
+                parts = [Part(root=TextPart(text=result.response))],
+                name = f'{agent_name}-result'
+            )
+        await updater.complete()
+        print(f"📤 스트리밍 응답 전송 완료: {result.response[:100]}...")
+
     async def _generate_llm_response(self, agent_name: str, user_message: str) -> str:
         """LLM을 사용하여 응답 생성"""
         if not LLM_AVAILABLE:
@@ -322,16 +551,15 @@ class A2ACombinedAgentExecutor(AgentExecutor):
         """에이전트별 특별한 로직 처리"""
         try:
             if "Summarize" in agent_name:
-                # Summarize Agent: 요약 결과를 Recorder Agent에게 전송
-                if self.client_agent:
-                    forward_message = f"요약 결과: {response}"
-                    await self.send_to_other("Recorder Agent", forward_message)
+                # Summarize Agent: 요약 결과를 outbox에 기록 (Recorder Agent 전송은 백그라운드)
+                forward_message = f"요약 결과: {response}"
+                await self.outbox.enqueue("Recorder Agent", forward_message)
                     
         except Exception as e:
             print(f"⚠️ {agent_name} 특별 로직 처리 실패: {e}")
     
     
-    async def send_to_other(self, agent_name:str, user_text:str) -> None:
+    async def send_to_other(self, agent_name:str, user_text:str, message_id: Optional[str] = None) -> Optional[list]:
         
         if agent_name not in self.client_agent.remote_agent_connections:
             print(f"❌ 에이전트 '{agent_name}' 을 찾을 수 없습니다.")
@@ -342,19 +570,20 @@ class A2ACombinedAgentExecutor(AgentExecutor):
                 await self.client_agent.retrieve_card_by_name(agent_name)
             except ValueError as e:
                 print(f"❌ 에이전트 연결 실패: {e}")
-                return
+                return None
             
             # TODO : 바로 연결 돠니??
 
             # 연결 성공 여부 재확인
             if agent_name not in self.client_agent.remote_agent_connections:
                 print(f"❌ 에이전트 '{agent_name}' 연결 실패 (등록 후에도 연결 없음).")
-                return
+                return None
             else:
                 print(f"✅ 에이전트 '{agent_name}' 연결 완료.")
 
            
-        response = await self.client_agent.send_message(agent_name, user_text, task_id=None, context_id=None)
+        response = await self.client_agent.send_message(agent_name, user_text, task_id=None, context_id=None,
+                                                        metadata=_forward_metadata(self.agent_name, message_id))
         print("Response:")
         if response : 
             for i, item in enumerate(response):
@@ -363,7 +592,15 @@ class A2ACombinedAgentExecutor(AgentExecutor):
         else : 
             print("⚠️ 응답이 없습니다 (response is None).")
             print()
+        return response
+
+    async def startup(self) -> None:
+        """서버 시작 시 outbox 디스패처 시작 (재시작 전 미전송 메시지 포함)"""
+        self.outbox.start()
 
+    async def shutdown(self) -> None:
+        """서버 종료 시 디스패처 중지 (미전송 메시지는 디스크에 남음)"""
+        await self.outbox.stop()
 
     async def cancel(
         self, context: RequestContext, event_queue: EventQueue
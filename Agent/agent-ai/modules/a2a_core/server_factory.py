@@ -18,6 +18,7 @@ from .config_loader import get_server_list
 from .server_executor import A2AServerAgentExecutor
 from .server_executor import A2ACombinedAgentExecutor
 from .a2a_client import A2AServerEntry
+from .card_cache import AgentCardETagMiddleware
 
 AGENT_EXECUTOR_CLASSES = {
     "MainAgentExecutor": A2ACombinedAgentExecutor,  # 메인 에이전트는 송신/수신 모두 가능
@@ -96,4 +97,12 @@ def build_agent_from_config(config: dict, other_server_entries: list[A2AServerEn
     print(f"Starting {config['name']} server on  http://{host}:{port}")
     print(f"executorClass : {executor_class_name}:{executor_params}/")
 
-    return app.build()
+    built_app = app.build()
+    # 에이전트 카드 조건부 요청(ETag/If-Modified-Since) 지원
+    built_app.add_middleware(AgentCardETagMiddleware, max_age=config.get("cardCacheTtl", 300))
+    # 실행기 백그라운드 작업(outbox 디스패처 등)을 서버 이벤트 루프에서 시작/중지
+    if hasattr(executor, "startup"):
+        built_app.add_event_handler("startup", executor.startup)
+    if hasattr(executor, "shutdown"):
+        built_app.add_event_handler("shutdown", executor.shutdown)
+    return built_app
@@ -0,0 +1,182 @@
+"""
+A2A 공유 HTTP 전송 계층
+- 프로세스 전체의 A2A 클라이언트 트래픽이 하나의 커넥션 풀을 공유하도록 관리
+- 풀 크기, HTTP/2 멀티플렉싱, keep-alive 만료 시간을 설정으로 조정
+- 커넥션 재사용 통계 제공
+
+httpx 커넥션은 생성된 이벤트 루프에 묶이므로, uvicorn 서버 스레드처럼
+별도 루프에서 호출되면 해당 루프 전용 클라이언트를 만들어 같은 설정으로 공유합니다.
+"""
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import threading
+import weakref
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+
+import httpx
+
+
+@dataclass
+class TransportConfig:
+    """공유 전송 계층 설정 (config.yaml의 a2a.transport)"""
+    http2: bool = True
+    max_connections: int = 100
+    max_keepalive_connections: int = 20
+    keepalive_expiry: float = 30.0
+    connect_timeout: float = 5.0
+    timeout: float = 60.0
+
+    @classmethod
+    def from_dict(cls, data: Optional[Dict[str, Any]]) -> "TransportConfig":
+        data = data or {}
+        known = {k: v for k, v in data.items() if k in cls.__dataclass_fields__}
+        return cls(**known)
+
+
+@dataclass
+class TransportStats:
+    """커넥션 재사용 통계"""
+    requests: int = 0
+    new_connections: int = 0
+    http2_requests: int = 0
+    errors: int = 0
+
+    @property
+    def reused_requests(self) -> int:
+        return max(self.requests - self.new_connections, 0)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["reused_requests"] = self.reused_requests
+        data["reuse_ratio"] = round(self.reused_requests / self.requests, 3) if self.requests else 0.0
+        return data
+
+
+class _CountingTransport(httpx.AsyncHTTPTransport):
+    """요청마다 새 커넥션이 열렸는지 기록하는 httpx 전송 계층"""
+
+    def __init__(self, stats: TransportStats, **kwargs):
+        super().__init__(**kwargs)
+        self._stats = stats
+        self._known_connections: "weakref.WeakSet[Any]" = weakref.WeakSet()
+
+    @property
+    def active_connections(self) -> int:
+        return len(self._pool.connections)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self._stats.requests += 1
+        try:
+            response = await super().handle_async_request(request)
+        except Exception:
+            self._stats.errors += 1
+            raise
+
+        # 풀에 새로 등장한 커넥션 = 이번 요청이 새로 연 커넥션
+        for conn in self._pool.connections:
+            if conn not in self._known_connections:
+                self._known_connections.add(conn)
+                self._stats.new_connections += 1
+
+        if response.extensions.get("http_version") == b"HTTP/2":
+            self._stats.http2_requests += 1
+        return response
+
+
+class SharedTransport:
+    """이벤트 루프별 httpx.AsyncClient를 같은 설정으로 공유하는 레지스트리"""
+
+    def __init__(self, config: Optional[TransportConfig] = None):
+        self.config = config or TransportConfig()
+        self._lock = threading.Lock()
+        self._clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, tuple[httpx.AsyncClient, _CountingTransport]]" = weakref.WeakKeyDictionary()
+        self._stats = TransportStats()
+
+    def configure(self, config: TransportConfig) -> None:
+        """설정 변경 (이미 생성된 클라이언트에는 적용되지 않음)"""
+        with self._lock:
+            if self._clients:
+                print("⚠️ 공유 전송 계층이 이미 사용 중입니다. 새 설정은 이후 생성되는 클라이언트에만 적용됩니다.")
+            self.config = config
+
+    def _http2_enabled(self) -> bool:
+        if not self.config.http2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            print("⚠️ h2 패키지가 없어 HTTP/1.1로 동작합니다.")
+            return False
+        return True
+
+    def _build_client(self) -> tuple[httpx.AsyncClient, _CountingTransport]:
+        cfg = self.config
+        limits = httpx.Limits(
+            max_connections=cfg.max_connections,
+            max_keepalive_connections=cfg.max_keepalive_connections,
+            keepalive_expiry=cfg.keepalive_expiry,
+        )
+        transport = _CountingTransport(
+            self._stats,
+            http2=self._http2_enabled(),
+            limits=limits,
+        )
+        client = httpx.AsyncClient(
+            transport=transport,
+            timeout=httpx.Timeout(cfg.timeout, connect=cfg.connect_timeout),
+        )
+        return client, transport
+
+    def get_client(self) -> httpx.AsyncClient:
+        """현재 이벤트 루프에서 사용할 공유 클라이언트 반환"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._clients.get(loop)
+            if entry is None or entry[0].is_closed:
+                entry = self._build_client()
+                self._clients[loop] = entry
+            return entry[0]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            active = sum(t.active_connections for c, t in self._clients.values() if not c.is_closed)
+            loops = len(self._clients)
+        data = self._stats.to_dict()
+        data["active_connections"] = active
+        data["event_loops"] = loops
+        data["config"] = asdict(self.config)
+        return data
+
+    async def aclose(self) -> None:
+        """현재 이벤트 루프의 공유 클라이언트를 닫습니다"""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            entry = self._clients.pop(loop, None)
+        if entry is not None:
+            await entry[0].aclose()
+
+
+# 전역 싱글톤 인스턴스
+_shared_transport = SharedTransport()
+
+
+def configure_transport(settings: Optional[Dict[str, Any]]) -> TransportConfig:
+    """config.yaml의 a2a.transport 설정을 공유 전송 계층에 적용"""
+    config = TransportConfig.from_dict(settings)
+    _shared_transport.configure(config)
+    return config
+
+
+def get_shared_http_client() -> httpx.AsyncClient:
+    """프로세스 공유 httpx.AsyncClient 반환 (현재 이벤트 루프 기준)"""
+    return _shared_transport.get_client()
+
+
+def get_transport_stats() -> Dict[str, Any]:
+    """커넥션 재사용 통계 반환"""
+    return _shared_transport.stats()
+
+
+async def close_shared_http_client() -> None:
+    await _shared_transport.aclose()
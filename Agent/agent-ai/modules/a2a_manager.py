@@ -5,10 +5,18 @@ A2AManager: A2A 서버/클라이언트 라이프사이클과 전송을 관리하
 """
 import os
 import asyncio
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, AsyncIterator, Sequence, Tuple, Union
 
 from .a2a_client_module import A2AClientModule
 from .a2a_server_module import A2AServerModule
+from .a2a_core.transport import configure_transport, get_transport_stats, close_shared_http_client
+from .a2a_core.card_cache import configure_card_cache, get_card_cache
+from .a2a_core.readiness import StartupTimeline, ReadinessResult
+from .a2a_core.process_supervisor import A2AProcessSupervisor
+from .a2a_core.fanout import FanOutRequest, FanOutResult, fan_out
+from .a2a_core.a2a_client import StreamChunk, StreamAggregator
+from .a2a_core.response_cache import CacheKey, configure_response_cache, get_response_cache
+from .a2a_core.outbox import configure_outbox
 
 
 class A2AManager:
@@ -22,34 +30,83 @@ class A2AManager:
         self._servers: List[A2AServerModule] = []
         self._client: Optional[A2AClientModule] = None
         self._ready = False
+        self._readiness: Dict[str, Any] = {}
+        self._a2a_config: Dict[str, Any] = {}
+        # 서버 실행 방식: "thread" (같은 인터프리터의 uvicorn 스레드) | "process" (에이전트별 OS 프로세스)
+        self.launch_mode = "thread"
+        self._supervisor: Optional[A2AProcessSupervisor] = None
+        self.timeline = StartupTimeline()
 
     @property
     def ready(self) -> bool:
         """A2A 시스템이 준비되었는지 확인"""
         return self._ready and self._client is not None and self._client.ready
 
+    def configure(self, a2a_config: Optional[Dict[str, Any]]) -> None:
+        """config.yaml의 a2a 섹션을 적용합니다 (start 이전에 호출)"""
+        a2a_config = a2a_config or {}
+        self._a2a_config = a2a_config
+        self.launch_mode = a2a_config.get("launch_mode", "thread")
+        transport = configure_transport(a2a_config.get("transport"))
+        print(f"🔌 A2A 전송 계층 설정: HTTP/2={transport.http2}, 최대 커넥션={transport.max_connections}, keep-alive={transport.keepalive_expiry}s")
+        card_cache = configure_card_cache(a2a_config.get("card_cache"))
+        print(f"🗂️ 에이전트 카드 캐시: {'활성화' if card_cache.enabled else '비활성화'} (TTL {card_cache.default_ttl}s)")
+        response_cache = configure_response_cache(a2a_config.get("response_cache"))
+        print(f"🧠 A2A 응답 캐시: {'활성화' if response_cache.enabled else '비활성화'} (TTL {response_cache.ttl}s, 최대 {response_cache.max_entries}개)")
+        outbox = configure_outbox(a2a_config.get("outbox"))
+        print(f"📮 A2A 전달 outbox: 배치 {outbox.batch_size}개, 최대 {outbox.max_attempts}회 시도 ({outbox.path})")
+        self._readiness = a2a_config.get("readiness", {}) or {}
+
+    def _readiness_timeout(self, server_name: str) -> float:
+        """에이전트별 준비 데드라인(초)"""
+        timeouts = self._readiness.get("timeouts", {}) or {}
+        return float(timeouts.get(server_name, self._readiness.get("default_timeout", 10)))
+
+    def get_stats(self) -> Dict[str, Any]:
+        """A2A 통계 정보 반환"""
+        return {
+            "launch_mode": self.launch_mode,
+            "servers": len(self._servers),
+            "processes": self._supervisor.stats() if self._supervisor else [],
+            "client_ready": bool(self._client and self._client.ready),
+            "transport": get_transport_stats(),
+            "card_cache": get_card_cache().stats(),
+            "response_cache": get_response_cache().stats(),
+            "circuit_breakers": self._client.client_agent.breaker_stats() if self._client and self._client.client_agent else {},
+            "startup": self.timeline.to_dict(),
+        }
+
     async def start(self, start_servers: bool = False) -> None:
         """A2A 환경을 시작합니다"""
         print("🚀 A2A Manager 시작 중...")
+        self.timeline = StartupTimeline()
         
         if start_servers:
             # 서버 시작
             await self._start_servers()
         
         # 클라이언트 초기화
-        await self._initialize_client()
+        with self.timeline.phase("client.initialize"):
+            await self._initialize_client()
         
         self._ready = True
         print(f"✅ A2A Manager 준비 완료 (서버: {len(self._servers)}개, 클라이언트: {'준비됨' if self.ready else '실패'})")
+        print(self.timeline.report())
 
     async def _start_servers(self) -> None:
         """A2A 서버들을 시작합니다"""
         server_names = ["LabAssistant", "Summarize Agent", "Recorder Agent"]
+
+        if self.launch_mode == "process":
+            await self._start_server_processes(server_names)
+            return
         
         for server_name in server_names:
             try:
-                server = A2AServerModule()
-                if server.start_by_name(server_name, self.config_dir):
+                with self.timeline.phase(f"launch:{server_name}"):
+                    server = A2AServerModule()
+                    started = server.start_by_name(server_name, self.config_dir)
+                if started:
                     self._servers.append(server)
                     print(f"  ✅ 서버 시작됨: {server_name}")
                 else:
@@ -58,8 +115,44 @@ class A2AManager:
                 print(f"  ❌ 서버 오류 ({server_name}): {e}")
         
         if self._servers:
-            print(f"  ⏳ 서버 준비 대기 중... (3초)")
-            await asyncio.sleep(3)
+            await self._wait_for_servers(self._servers)
+
+    async def _start_server_processes(self, server_names: List[str]) -> None:
+        """각 에이전트를 별도 프로세스로 동시에 시작하고 감독 루프를 붙입니다"""
+        supervisor_config = self._a2a_config.get("supervisor", {}) or {}
+        self._supervisor = A2AProcessSupervisor(
+            self.config_dir,
+            a2a_settings=self._a2a_config,
+            max_restarts=supervisor_config.get("max_restarts", 5),
+            restart_window=supervisor_config.get("restart_window", 60),
+            restart_backoff=supervisor_config.get("restart_backoff", 1.0),
+        )
+        with self.timeline.phase("launch:processes"):
+            agents = self._supervisor.start(server_names)
+        if agents:
+            await self._wait_for_servers(agents)
+            self._supervisor.start_monitor()
+
+    async def _wait_for_servers(self, servers: List[Any]) -> List[ReadinessResult]:
+        """필수 에이전트가 모두 준비되는 즉시 반환 (에이전트별 데드라인 적용)
+
+        servers: A2AServerModule 또는 AgentProcess (name, wait_until_ready 제공)
+        """
+        required = set(self._readiness.get("required") or [s.name for s in servers])
+        targets = [s for s in servers if s.name in required]
+        print(f"  ⏳ 서버 준비 대기 중... ({', '.join(s.name for s in targets)})")
+
+        async def _wait(server: A2AServerModule) -> ReadinessResult:
+            entry = self.timeline.begin(f"ready:{server.name}")
+            result = await server.wait_until_ready(self._readiness_timeout(server.name))
+            self.timeline.end(entry)
+            if result.ready:
+                print(f"  ✅ {server.name} 준비 완료 ({result.healthy_after:.3f}s)")
+            else:
+                print(f"  ⚠️ {server.name} 준비 실패: {result.error}")
+            return result
+
+        return list(await asyncio.gather(*(_wait(s) for s in targets)))
 
     async def start_specific_server(self, server_name: str) -> bool:
         """특정 A2A 서버만 시작합니다"""
@@ -69,9 +162,9 @@ class A2AManager:
                 self._servers.append(server)
                 print(f"  ✅ 서버 시작됨: {server_name}")
                 
-                # 서버 준비 대기
-                print(f"  ⏳ 서버 준비 대기 중... (3초)")
-                await asyncio.sleep(3)
+                # 서버 준비 대기 (startup 이벤트 + 헬스 프로브)
+                await self._wait_for_servers([server])
+                print(self.timeline.report())
                 
                 # 무한 대기 (서버 유지)
                 print(f"  🔄 {server_name} 서버 실행 중...")
@@ -90,9 +183,10 @@ class A2AManager:
         try:
             self._client = A2AClientModule()
             await self._client.initialize(self.config_dir)
+            get_card_cache().start_background_refresh()
             
-            # 에이전트 카드 수집 대기
-            await asyncio.sleep(1.5)
+            # 에이전트 카드 수집 완료까지 대기
+            await self._client.wait_until_ready(float(self._readiness.get("client_timeout", 5)))
             
             if self._client.ready:
                 print("  ✅ A2A 클라이언트 준비 완료")
@@ -102,8 +196,11 @@ class A2AManager:
         except Exception as e:
             print(f"  ❌ A2A 클라이언트 초기화 오류: {e}")
 
-    async def send(self, agent_name: str, text: str) -> Optional[List[str]]:
-        """다른 에이전트에게 메시지를 전송합니다"""
+    async def send(self, agent_name: str, text: str, timeout: Optional[float] = None) -> Optional[List[str]]:
+        """다른 에이전트에게 메시지를 전송합니다
+
+        timeout을 주면 재시도를 포함한 전체 호출이 그 안에 끝나야 합니다 (미지정 시 에이전트 정책 사용)
+        """
         if not self.ready:
             print(f"⚠️ A2A Manager가 준비되지 않음. 자동 초기화 시도...")
             await self.start()
@@ -114,13 +211,132 @@ class A2AManager:
 
         try:
             print(f"📤 A2A 전송 중: '{agent_name}'에게 → {text[:50]}...")
-            response = await self._client.send(agent_name, text, config_dir=self.config_dir)
+            response = await self._send_cached(agent_name, text, timeout)
             print(f"📥 A2A 응답 받음: {response}")
             return response
         except Exception as e:
             print(f"❌ A2A 전송 오류: {e}")
             return None
 
+    def _cache_lookup(self, agent_name: str, text: str) -> Optional[Tuple[CacheKey, Any]]:
+        """응답 캐시를 쓸 수 있는 에이전트면 (키, 정책) 반환"""
+        cache = get_response_cache()
+        client_agent = self._client.client_agent if self._client else None
+        if not cache.enabled or client_agent is None:
+            return None
+        policy = client_agent.get_cache_policy(agent_name)
+        if not policy.enabled:
+            return None
+        return cache.make_key(agent_name, text, client_agent.get_config_version(agent_name)), policy
+
+    async def _send_cached(self, agent_name: str, text: str, timeout: Optional[float]) -> Optional[List[str]]:
+        """응답 캐시 조회 → 없으면 원격 전송 (동시에 들어온 같은 요청은 한 번만 전송)"""
+        async def _load() -> Optional[List[str]]:
+            return await self._client.send(agent_name, text, config_dir=self.config_dir, timeout=timeout)
+
+        client_agent = self._client.client_agent
+        if client_agent is None:
+            return await _load()
+        return await get_response_cache().get_or_load(
+            agent_name, text, _load,
+            version=client_agent.get_config_version(agent_name),
+            policy=client_agent.get_cache_policy(agent_name),
+        )
+
+    async def stream(self, agent_name: str, text: str) -> AsyncIterator[StreamChunk]:
+        """다른 에이전트에게 메시지를 보내고 상태 업데이트/아티팩트 청크를 도착하는 대로 반환합니다
+
+        오류는 kind='error' 청크로 전달됩니다.
+        """
+        if not self.ready:
+            print(f"⚠️ A2A Manager가 준비되지 않음. 자동 초기화 시도...")
+            await self.start()
+
+        if not self._client or not self._client.ready:
+            yield StreamChunk(kind="error", agent_name=agent_name, error="A2A 클라이언트가 준비되지 않음", final=True)
+            return
+
+        cache = get_response_cache()
+        lookup = self._cache_lookup(agent_name, text)
+        future, leader = None, False
+        if lookup is not None:
+            key, policy = lookup
+            cached = cache.lookup(key)
+            if cached is None:
+                # 같은 요청(send/stream)이 진행 중이면 원격 호출 없이 그 결과를 기다림
+                future, leader = cache.join(key)
+                if not leader:
+                    try:
+                        cached = await asyncio.shield(future)
+                    except Exception:
+                        cached = None
+            if cached is not None:
+                # 캐시 적중/공유 결과: 원격 호출 없이 전체 응답을 한 청크로 반환
+                yield StreamChunk(kind="artifact", agent_name=agent_name, parts=list(cached), last_chunk=True)
+                yield StreamChunk(kind="status", agent_name=agent_name, state="completed", final=True)
+                return
+            # 리더가 실패/중단된 경우 공유 없이 직접 스트리밍
+
+        print(f"📤 A2A 스트리밍 전송 중: '{agent_name}'에게 → {text[:50]}...")
+        aggregator = StreamAggregator()
+        value = None
+        try:
+            async for chunk in self._client.stream(agent_name, text, config_dir=self.config_dir):
+                aggregator.add(chunk)
+                yield chunk
+            result = aggregator.result()
+            value = [str(p) for p in result] if result else None
+        except Exception as e:
+            print(f"❌ A2A 스트리밍 오류: {e}")
+            yield StreamChunk(kind="error", agent_name=agent_name, error=str(e), final=True)
+        finally:
+            if leader:
+                # 기다리던 호출자에게 집계 결과 전달 (스트림이 중간에 닫혀도 대기가 풀리도록 항상 호출)
+                cache.finish(key, future, value, policy.ttl)
+
+    async def send_many(
+        self,
+        requests: Sequence[Tuple[str, str]],
+        *,
+        concurrency: Optional[int] = None,
+        per_agent_concurrency: Union[int, Dict[str, int], None] = None,
+        timeout: Optional[float] = None,
+    ) -> AsyncIterator[FanOutResult]:
+        """여러 (agent_name, text) 요청을 동시에 전송하고 완료 순서대로 결과를 반환합니다
+
+        한도를 지정하지 않으면 config.yaml의 a2a.fanout 기본값을 사용합니다.
+
+        사용 예:
+            async for result in manager.send_many([("Summarize Agent", t1), ("Recorder Agent", t2)]):
+                print(result.agent_name, result.response)
+        """
+        if not self.ready:
+            # 동시 요청들이 각자 자동 초기화를 시도하지 않도록 한 번만 시작
+            await self.start()
+
+        fanout_config = self._a2a_config.get("fanout", {}) or {}
+        fanout_requests = [FanOutRequest(agent_name=a, text=t) for a, t in requests]
+        async for result in fan_out(
+            self._fan_out_send,
+            fanout_requests,
+            concurrency=concurrency if concurrency is not None else fanout_config.get("max_concurrency"),
+            per_agent_concurrency=(per_agent_concurrency if per_agent_concurrency is not None
+                                   else fanout_config.get("per_agent_concurrency")),
+            timeout=timeout if timeout is not None else fanout_config.get("timeout"),
+        ):
+            yield result
+
+    async def _fan_out_send(self, agent_name: str, text: str, timeout: Optional[float]) -> Optional[List[str]]:
+        """fan-out용 전송: send()와 달리 예외를 그대로 올려 실패 원인(회로 차단, 연결 거부 등)이 결과에 남음"""
+        if not self._client or not self._client.ready:
+            raise RuntimeError("A2A 클라이언트가 준비되지 않음")
+        return await self._send_cached(agent_name, text, timeout)
+
+    async def broadcast(self, agent_names: Sequence[str], text: str, **kwargs) -> AsyncIterator[FanOutResult]:
+        """같은 메시지를 여러 에이전트에게 동시에 전송합니다 (send_many와 같은 옵션)"""
+        async for result in self.send_many([(name, text) for name in agent_names], **kwargs):
+            yield result
+
     async def close(self) -> None:
         """A2A 환경을 정리합니다"""
         print("🛑 A2A Manager 종료 중...")
@@ -130,12 +346,25 @@ class A2AManager:
                 await self._client.close()
             except Exception as e:
                 print(f"클라이언트 종료 오류: {e}")
+
+        try:
+            await get_card_cache().stop_background_refresh()
+            await close_shared_http_client()
+        except Exception as e:
+            print(f"전송 계층 종료 오류: {e}")
         
         for server in self._servers:
             try:
                 server.stop()
             except Exception as e:
                 print(f"서버 종료 오류: {e}")
+
+        if self._supervisor:
+            try:
+                await self._supervisor.stop()
+            except Exception as e:
+                print(f"서버 프로세스 종료 오류: {e}")
+            self._supervisor = None
         
         self._servers.clear()
         self._client = None
@@ -8,6 +8,7 @@ A2A 서버 모듈
 - A2AServerModule.stop(): 서버 중지
 - A2AServerModule.is_running: 실행 상태
 - A2AServerModule.start_by_name(name, config_dir): 이름으로 설정 선택 후 실행
+- A2AServerModule.wait_until_ready(timeout): uvicorn 시작 이벤트 + 헬스 프로브로 준비 대기
 """
 from __future__ import annotations
 
@@ -19,8 +20,21 @@ from typing import Optional
 import uvicorn
 
 from .a2a_core.server_factory import build_server_from_config
-from .a2a_core.config_loader import load_a2a_config
+from .a2a_core.config_loader import find_a2a_config_by_name
 from .a2a_core import server_executor as _server_executor_mod
+from .a2a_core.readiness import ReadinessResult, wait_for_server
+
+
+class _ReadyServer(uvicorn.Server):
+	"""startup 완료(또는 종료) 시 threading.Event를 set 하는 uvicorn.Server"""
+
+	def __init__(self, config: uvicorn.Config):
+		super().__init__(config)
+		self.started_event = threading.Event()
+
+	async def startup(self, sockets=None) -> None:
+		await super().startup(sockets=sockets)
+		self.started_event.set()
 
 
 class A2AServerModule:
@@ -33,6 +47,17 @@ class A2AServerModule:
 		self._host: Optional[str] = None
 		self._port: Optional[int] = None
 		self._config_path: Optional[str] = None
+		self._name: Optional[str] = None
+
+	@property
+	def name(self) -> Optional[str]:
+		return self._name
+
+	@property
+	def base_url(self) -> Optional[str]:
+		if not self._host or not self._port:
+			return None
+		return f"http://{self._host}:{self._port}/"
 
 	@property
 	def is_running(self) -> bool:
@@ -72,10 +97,14 @@ class A2AServerModule:
 			port = int(server_config.get("port", 8000))
 
 			config = uvicorn.Config(app, host=host, port=port, log_level="info")
-			server = uvicorn.Server(config)
+			server = _ReadyServer(config)
 
 			def _run():
-				server.run()
+				try:
+					server.run()
+				finally:
+					# 바인딩 실패 등으로 종료되면 대기 중인 쪽을 깨운다
+					server.started_event.set()
 
 			th = threading.Thread(target=_run, daemon=True)
 			th.start()
@@ -86,6 +115,7 @@ class A2AServerModule:
 			self._host = host
 			self._port = port
 			self._config_path = config_path
+			self._name = server_config.get("name")
 
 			print(f"🚀 A2A 서버 시작: http://{host}:{port} (config: {os.path.basename(config_path)})")
 			return True
@@ -93,6 +123,20 @@ class A2AServerModule:
 			print(f"❌ 서버 시작 실패: {e}")
 			return False
 
+	async def wait_until_ready(self, timeout: float = 10.0) -> ReadinessResult:
+		"""uvicorn startup 완료 이벤트와 헬스 프로브로 서버 준비를 기다립니다"""
+		name = self._name or "unknown"
+		if not self._server or not self.base_url:
+			return ReadinessResult(name, False, error="서버가 시작되지 않았습니다")
+		server = self._server
+		return await wait_for_server(
+			name,
+			server.started_event,
+			self.base_url,
+			timeout,
+			is_alive=lambda: bool(self._thread and self._thread.is_alive()) and not server.should_exit,
+		)
+
 	def start_by_name(self, name: str, config_dir: str) -> bool:
 		"""설정 디렉터리에서 name이 일치하는 JSON을 찾아 서버 실행.
 
@@ -102,16 +146,9 @@ class A2AServerModule:
 			print(f"❌ 디렉터리를 찾을 수 없습니다: {config_dir}")
 			return False
 
-		for fname in os.listdir(config_dir):
-			if not fname.endswith(".json"):
-				continue
-			fpath = os.path.join(config_dir, fname)
-			try:
-				cfg = load_a2a_config(fpath)
-				if cfg.get("name") == name:
-					return self.start(fpath)
-			except Exception as e:
-				print(f"⚠️ 설정 로드 실패({fname}): {e}")
+		fpath = find_a2a_config_by_name(config_dir, name)
+		if fpath:
+			return self.start(fpath)
 
 		print(f"❌ name='{name}' 설정을 찾지 못했습니다. ({config_dir})")
 		return False
@@ -134,6 +171,7 @@ class A2AServerModule:
 			self._host = None
 			self._port = None
 			self._config_path = None
+			self._name = None
 
 	def attach_client_agent(self, client_agent) -> None:
 		"""A2AServerAgentExecutor가 사용하는 글로벌 클라이언트를 주입.
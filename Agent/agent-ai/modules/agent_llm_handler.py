@@ -5,12 +5,15 @@ Agent-specific LLM Handler
 import os
 import yaml
 import re
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, AsyncIterator, List
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 
+from modules.llm_core.fake_llm import create_fake_llm
+from modules.llm_core.response_cache import cache_key, get_response_cache, tools_hash
+
 load_dotenv()
 
 class AgentLLMHandler:
@@ -18,10 +21,13 @@ class AgentLLMHandler:
         self.agent_name = agent_name
         self.config = self._load_agent_config(config_path)
         self.llm = self._initialize_llm()
+        # llm.response_cache.enabled가 켜진 에이전트만 응답을 디스크에 캐시
+        self.response_cache = get_response_cache(self.config.get('llm', {}).get('response_cache'))
         
         print(f"🤖 {agent_name} LLM 핸들러 초기화 완료:")
         print(f"   - 모델: {self.config.get('llm', {}).get('model', 'gemini-2.5-flash')}")
         print(f"   - 온도: {self.config.get('llm', {}).get('temperature', 0.7)}")
+        print(f"   - 응답 캐시: {'활성화' if self.response_cache else '비활성화'}")
     
     def _load_agent_config(self, config_path: Optional[str] = None) -> Dict[str, Any]:
         """에이전트별 설정 파일 로드"""
@@ -81,35 +87,66 @@ class AgentLLMHandler:
                 if not api_key:
                     raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
                 return ChatOpenAI(model=model, temperature=temperature, openai_api_key=api_key)
+            elif provider == 'fake':
+                # 오프라인 결정적 가짜 모델 (부하/지연 테스트용, API 키 불필요)
+                return create_fake_llm(llm_config.get('fake'), model)
             else:
                 raise ValueError(f"지원하지 않는 LLM 공급자입니다: {provider}")
         except Exception as e:
             print(f"⚠️ {self.agent_name} LLM 초기화 실패: {e}")
             raise
     
+    def _build_messages(self, user_message: str, context: Optional[str] = None) -> List[Any]:
+        """시스템 메시지 + 사용자 메시지 구성"""
+        llm_config = self.config.get('llm', {})
+        system_content = llm_config.get('system_message', f"당신은 {self.agent_name}입니다.")
+        
+        # 컨텍스트가 있으면 추가
+        if context:
+            system_content += f"\n\n[컨텍스트]\n{context}"
+        
+        return [
+            SystemMessage(content=system_content),
+            HumanMessage(content=user_message)
+        ]
+    
+    @staticmethod
+    def _content_text(content: Any) -> str:
+        """LLM 응답 content(str 또는 파트 리스트)를 텍스트로 변환"""
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            return ''.join(p if isinstance(p, str) else p.get('text', '') for p in content if isinstance(p, (str, dict)))
+        return str(content)
+    
+    def _cache_key(self, messages: List[Any]) -> Optional[str]:
+        if self.response_cache is None:
+            return None
+        llm_config = self.config.get('llm', {})
+        return cache_key(llm_config.get('provider', 'google'), llm_config.get('model', 'gemini-2.5-flash'),
+                         llm_config.get('temperature', 0.7), tools_hash(None), messages)
+
+    def cache_stats(self) -> Optional[Dict[str, Any]]:
+        """응답 캐시 적중/실패 통계 (캐시가 꺼져 있으면 None)"""
+        return self.response_cache.stats() if self.response_cache is not None else None
+
     async def process_message(self, user_message: str, context: Optional[str] = None) -> str:
-        """사용자 메시지를 처리하고 LLM 응답 생성"""
+        """사용자 메시지를 처리하고 LLM 응답 생성 (이벤트 루프를 막지 않는 ainvoke 사용)"""
         try:
-            # 시스템 메시지 구성
-            llm_config = self.config.get('llm', {})
-            system_content = llm_config.get('system_message', f"당신은 {self.agent_name}입니다.")
-            
-            # 컨텍스트가 있으면 추가
-            if context:
-                system_content += f"\n\n[컨텍스트]\n{context}"
-            
-            # 메시지 구성
-            messages = [
-                SystemMessage(content=system_content),
-                HumanMessage(content=user_message)
-            ]
+            messages = self._build_messages(user_message, context)
+            key = self._cache_key(messages)
+            cached = await self.response_cache.aget(key) if key else None
+            if cached is not None:
+                return self._content_text(cached.get('content', ''))
             
             # LLM 호출
-            response = self.llm.invoke(messages)
+            response = await self.llm.ainvoke(messages)
+            if key:
+                await self.response_cache.aput(key, {"content": self._content_text(getattr(response, 'content', response))})
             
             # 응답 내용 추출
             if hasattr(response, 'content'):
-                return response.content
+                return self._content_text(response.content)
             else:
                 return str(response)
                 
@@ -117,6 +154,30 @@ class AgentLLMHandler:
             print(f"❌ {self.agent_name} 메시지 처리 오류: {e}")
             return f"죄송합니다. {self.agent_name}에서 오류가 발생했습니다: {str(e)}"
     
+    async def stream_message(self, user_message: str, context: Optional[str] = None) -> AsyncIterator[str]:
+        """LLM 응답을 토큰(청크) 단위로 yield (astream 사용)
+
+        process_message와 달리 오류를 문자열로 바꾸지 않고 그대로 발생시킵니다.
+        """
+        messages = self._build_messages(user_message, context)
+        key = self._cache_key(messages)
+        cached = await self.response_cache.aget(key) if key else None
+        if cached is not None:
+            # 캐시된 응답은 한 청크로 바로 전달
+            text = self._content_text(cached.get('content', ''))
+            if text:
+                yield text
+            return
+        tokens = []
+        async for chunk in self.llm.astream(messages):
+            text = self._content_text(getattr(chunk, 'content', chunk))
+            if text:
+                tokens.append(text)
+                yield text
+        # 스트림이 끝까지 완료된 경우에만 캐시에 저장
+        if key and tokens:
+            await self.response_cache.aput(key, {"content": ''.join(tokens)})
+    
     def get_agent_info(self) -> Dict[str, Any]:
         """에이전트 정보 반환"""
         agent_config = self.config.get('agent', {})
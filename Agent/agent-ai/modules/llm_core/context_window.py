@@ -0,0 +1,239 @@
+"""
+토큰 예산 기반 LLM 컨텍스트 구성
+- 프롬프트를 max_tokens(응답용 reserve_tokens 제외) 안에 맞춤
+- 우선순위: 시스템 메시지 > 마지막 사용자 메시지 > 이전 대화 요약 > 관련 메모리 > RAG 컨텍스트 > 최근 대화 기록
+    메모리/RAG 컨텍스트는 각자 상한(memory_tokens, context_tokens)까지 자름
+    도구 결과(ToolMessage)는 하나당 tool_result_tokens까지 자름
+    대화 기록은 최신부터 예산이 남는 만큼 포함 (tool_calls 메시지와 그 ToolMessage는 함께 넣거나 함께 뺌)
+- 토큰 수는 tiktoken으로 세고 텍스트별로 LRU 캐시 (같은 기록을 매 턴 다시 세지 않음)
+    tiktoken(또는 인코딩 파일)을 쓸 수 없으면 글자 수 기반 보수적 추정으로 대체
+"""
+from __future__ import annotations
+
+import math
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage, ToolMessage
+
+# 메시지 하나당 역할/구분자 토큰 (OpenAI chat 형식 기준 근사값)
+MESSAGE_OVERHEAD = 4
+TRUNCATED_MARK = "\n...(생략)"
+
+
+@dataclass
+class ContextWindowSettings:
+    """llm.context_window 설정"""
+    # 프롬프트 + 응답 전체 예산 (토큰)
+    max_tokens: int = 8000
+    # 응답 생성용으로 남겨 둘 토큰
+    reserve_tokens: int = 1024
+    # 관련 메모리 / RAG 컨텍스트 / 도구 결과(하나당) 상한
+    memory_tokens: int = 800
+    context_tokens: int = 2000
+    tool_result_tokens: int = 1500
+    # 포함할 대화 기록 최대 메시지 수 (None이면 예산만으로 결정)
+    max_history_messages: Optional[int] = 50
+    # tiktoken 인코딩 이름
+    encoding: str = "cl100k_base"
+    # 토큰 수 캐시 크기 (텍스트 개수)
+    count_cache_size: int = 4096
+
+
+def content_text(content: Any) -> str:
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return ''.join(p if isinstance(p, str) else p.get('text', '') for p in content if isinstance(p, (str, dict)))
+    return str(content)
+
+
+class TokenCounter:
+    """텍스트 토큰 수 (LRU 캐시, 스레드 안전)"""
+
+    def __init__(self, encoding: str = "cl100k_base", cache_size: int = 4096):
+        self.cache_size = max(1, cache_size)
+        self._lock = threading.Lock()
+        self._cache: "OrderedDict[str, int]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        try:
+            import tiktoken
+            self._encoding = tiktoken.get_encoding(encoding)
+        except Exception as e:
+            print(f"⚠️ tiktoken 인코딩을 불러오지 못해 글자 수로 토큰을 추정합니다: {e}")
+            self._encoding = None
+
+    def _encode_len(self, text: str) -> int:
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        # 한글은 대략 글자당 1토큰, 영어는 4글자당 1토큰 → 2글자당 1토큰으로 넉넉하게 추정
+        return math.ceil(len(text) / 2)
+
+    def count(self, text: str) -> int:
+        if not text:
+            return 0
+        with self._lock:
+            cached = self._cache.get(text)
+            if cached is not None:
+                self._cache.move_to_end(text)
+                self.hits += 1
+                return cached
+        tokens = self._encode_len(text)
+        with self._lock:
+            self.misses += 1
+            self._cache[text] = tokens
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        return tokens
+
+    def count_message(self, message: Any) -> int:
+        tokens = MESSAGE_OVERHEAD + self.count(content_text(getattr(message, 'content', message)))
+        for call in getattr(message, 'tool_calls', None) or []:
+            # 도구 호출 인자도 프롬프트에 포함됨
+            tokens += self.count(str(call.get('name', '')) + str(call.get('args', {}))
+                                 if isinstance(call, dict) else str(call))
+        return tokens
+
+    def truncate(self, text: str, max_tokens: int) -> str:
+        """앞에서부터 max_tokens 토큰까지만 남김"""
+        if max_tokens <= 0:
+            return ""
+        if self.count(text) <= max_tokens:
+            return text
+        # 생략 표시까지 max_tokens 안에 들어가도록
+        keep = max(0, max_tokens - self.count(TRUNCATED_MARK))
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            return self._encoding.decode(tokens[:keep]) + TRUNCATED_MARK
+        return text[:keep * 2] + TRUNCATED_MARK
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._cache),
+                    "tiktoken": self._encoding is not None}
+
+
+def _with_content(message: BaseMessage, content: str) -> BaseMessage:
+    return message.model_copy(update={"content": content})
+
+
+def _history_groups(messages: Sequence[BaseMessage]) -> List[List[BaseMessage]]:
+    """ToolMessage를 앞의 tool_calls 메시지와 한 묶음으로 나눔"""
+    groups: List[List[BaseMessage]] = []
+    for message in messages:
+        if isinstance(message, ToolMessage) and groups:
+            groups[-1].append(message)
+        else:
+            groups.append([message])
+    # 앞 메시지가 잘려 나간 ToolMessage만 있는 묶음은 뺌
+    return [group for group in groups if not isinstance(group[0], ToolMessage)]
+
+
+class ContextWindowManager:
+    """시스템 메시지, 메모리, RAG 컨텍스트, 대화 기록을 토큰 예산에 맞춰 구성"""
+
+    def __init__(self, settings: Optional[ContextWindowSettings] = None):
+        self.settings = settings or ContextWindowSettings()
+        self.counter = TokenCounter(self.settings.encoding, self.settings.count_cache_size)
+        self.last_report: Dict[str, Any] = {}
+
+    @property
+    def budget(self) -> int:
+        return max(256, self.settings.max_tokens - self.settings.reserve_tokens)
+
+    def _fit_memories(self, memories: List[str]) -> List[str]:
+        """중요한(앞쪽) 메모리부터 memory_tokens까지"""
+        fitted, used = [], 0
+        for memory in memories:
+            tokens = self.counter.count(memory) + 1
+            if used + tokens > self.settings.memory_tokens:
+                break
+            fitted.append(memory)
+            used += tokens
+        return fitted
+
+    def _fit_tool_message(self, message: BaseMessage) -> BaseMessage:
+        if not isinstance(message, ToolMessage):
+            return message
+        text = content_text(message.content)
+        truncated = self.counter.truncate(text, self.settings.tool_result_tokens)
+        return message if truncated == text else _with_content(message, truncated)
+
+    def pack(self, system_message: str, history: Sequence[BaseMessage],
+             memories: Optional[List[str]] = None, context: str = "",
+             summary: str = "") -> List[BaseMessage]:
+        """예산에 맞춘 LLM 입력 메시지 목록
+
+        system_message에는 summary(이전 대화 요약)/memories/context 블록이 붙고, history는 최신부터 채웁니다.
+        """
+        settings = self.settings
+        count = self.counter.count
+
+        history = list(history)
+        if settings.max_history_messages:
+            history = history[-settings.max_history_messages:]
+        groups = _history_groups(history)
+
+        # 마지막 사용자 메시지가 있는 묶음부터는 반드시 포함
+        required_from = len(groups)
+        for index in range(len(groups) - 1, -1, -1):
+            if isinstance(groups[index][0], HumanMessage):
+                required_from = index
+                break
+        required = [self._fit_tool_message(m) for group in groups[required_from:] for m in group]
+        required_tokens = sum(self.counter.count_message(m) for m in required)
+
+        # 시스템 메시지 블록
+        system_content = system_message
+        if summary:
+            system_content += f"\n\n[이전 대화 요약]\n{summary}"
+        fitted_memories = self._fit_memories(memories or [])
+        if fitted_memories:
+            memory_context = "\n".join(f"- {memory}" for memory in fitted_memories)
+            system_content += f"\n\n📝 이전 대화에서 기억할 내용:\n{memory_context}\n\n위 정보를 참고해서 답변해주세요."
+        remaining = self.budget - required_tokens - count(system_content) - MESSAGE_OVERHEAD
+        if context and remaining > 0:
+            context = self.counter.truncate(context, min(settings.context_tokens, remaining))
+            if context:
+                system_content += f"\n\n[참고 컨텍스트]\n{context}"
+        if count(system_content) > self.budget - required_tokens - MESSAGE_OVERHEAD:
+            # 시스템 메시지만으로 예산을 넘으면 시스템 메시지를 자름
+            system_content = self.counter.truncate(
+                system_content, max(64, self.budget - required_tokens - MESSAGE_OVERHEAD))
+        remaining = self.budget - required_tokens - count(system_content) - MESSAGE_OVERHEAD
+
+        # 이전 대화 기록: 최신 묶음부터 예산이 남는 만큼 (중간이 비지 않도록 넘치면 중단)
+        included: List[BaseMessage] = []
+        dropped = 0
+        for position in range(required_from - 1, -1, -1):
+            group = [self._fit_tool_message(m) for m in groups[position]]
+            tokens = sum(self.counter.count_message(m) for m in group)
+            if tokens > remaining:
+                dropped = position + 1
+                break
+            included[:0] = group
+            remaining -= tokens
+
+        messages = [SystemMessage(content=system_content)] + included + required
+        self.last_report = {
+            "budget": self.budget,
+            "tokens": self.budget - remaining,
+            "history_messages": len(included) + len(required),
+            "dropped_groups": dropped,
+            "memories": len(fitted_memories),
+        }
+        return messages
+
+    def tool_results_block(self, results: List[str]) -> str:
+        """도구 결과 여러 개를 context_tokens 안에서 나눠 담음 (결과마다 같은 몫)"""
+        if not results:
+            return ""
+        share = max(32, min(self.settings.tool_result_tokens, self.settings.context_tokens // len(results)))
+        return ', '.join(self.counter.truncate(result, share) for result in results)
+
+    def stats(self) -> Dict[str, Any]:
+        return {"settings": asdict(self.settings), "last": dict(self.last_report),
+                "token_cache": self.counter.stats()}
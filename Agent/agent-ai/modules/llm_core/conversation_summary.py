@@ -0,0 +1,241 @@
+"""
+대화 롤링 요약
+- 상태의 대화 기록이 trigger_messages개를 넘으면 최근 keep_messages개를 뺀 오래된 메시지를
+  백그라운드에서 기존 요약에 합쳐 새 요약으로 만듦 (대화 턴을 막지 않음)
+    밀려난 메시지는 요약 갱신이 끝난 뒤의 compact()에서 상태에서 뺌 (항상 프롬프트나 요약 중 한 곳에 있음)
+- 요약은 세션(user_id)별로 path/<세션>.json에 저장되어 재시작 후에도 이어짐
+- 요약은 LLM 시스템 메시지의 [이전 대화 요약] 블록으로 들어감 (최대 summary_tokens)
+- LLM 요약이 꺼져 있거나 실패하면 발화를 짧게 자른 추출 요약으로 대체
+    추출 요약이 summary_tokens를 넘으면 오래된 줄부터 버림
+"""
+from __future__ import annotations
+
+import asyncio
+import json
+import os
+import re
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Sequence
+
+from langchain_core.messages import BaseMessage, HumanMessage, ToolMessage
+
+from .context_window import TokenCounter, content_text
+
+_SESSION_RE = re.compile(r'[^\w.-]')
+
+SUMMARY_PROMPT = """다음은 사용자와 AI 어시스턴트의 이전 대화 요약과, 그 뒤에 이어진 대화입니다.
+두 내용을 합쳐 갱신된 요약을 한국어로 작성하세요.
+- 사용자에 대한 사실, 요청, 결정된 사항, 아직 끝나지 않은 작업을 우선해서 남기세요.
+- 인사말이나 반복되는 내용은 빼고, 글머리표로 간결하게 작성하세요.
+- 요약 외의 다른 말은 하지 마세요.
+
+[이전 요약]
+{summary}
+
+[이어진 대화]
+{transcript}
+
+[갱신된 요약]"""
+
+
+@dataclass
+class SummarySettings:
+    """llm.summary 설정"""
+    enabled: bool = True
+    # 대화 기록이 이 개수를 넘으면 오래된 메시지를 요약으로 넘김
+    trigger_messages: int = 30
+    # 요약 후 상태에 그대로 남길 최근 메시지 수
+    keep_messages: int = 20
+    # 요약 최대 길이 (토큰)
+    summary_tokens: int = 600
+    # 요약에 넣을 메시지 하나의 최대 길이 (토큰)
+    message_tokens: int = 300
+    # LLM으로 요약 (false면 추출 요약만 사용)
+    use_llm: bool = True
+    # 세션별 요약 저장 위치 (agent-ai 기준 상대 경로, 비우면 저장하지 않음)
+    path: Optional[str] = "data/sessions"
+
+
+@dataclass
+class SummaryStats:
+    updates: int = 0
+    summarized_messages: int = 0
+    llm_failures: int = 0
+    last_update_ms: float = 0.0
+
+
+def split_history(messages: Sequence[BaseMessage], keep: int) -> tuple:
+    """(요약으로 넘길 메시지, 남길 메시지)
+
+    남는 기록이 사용자 메시지로 시작하도록 경계를 뒤로 옮깁니다 (ToolMessage만 남지 않도록).
+    """
+    messages = list(messages)
+    cut = max(0, len(messages) - max(1, keep))
+    while cut < len(messages) and not isinstance(messages[cut], HumanMessage):
+        cut += 1
+    if cut >= len(messages):
+        return [], messages
+    return messages[:cut], messages[cut:]
+
+
+class SessionSummaryStore:
+    """세션별 요약 파일 (JSON, 원자적 교체)"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def _path_for(self, session_id: str) -> str:
+        return os.path.join(self.path, _SESSION_RE.sub('_', session_id) + ".json")
+
+    def load(self, session_id: str) -> Dict[str, Any]:
+        try:
+            with open(self._path_for(session_id), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"⚠️ 대화 요약 로드 실패({session_id}): {e}")
+            return {}
+
+    def save(self, session_id: str, data: Dict[str, Any]) -> None:
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            path = self._path_for(session_id)
+            with open(path + ".tmp", 'w', encoding='utf-8') as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(path + ".tmp", path)
+        except Exception as e:
+            print(f"⚠️ 대화 요약 저장 실패({session_id}): {e}")
+
+
+class RollingSummary:
+    """세션별 롤링 요약 관리"""
+
+    def __init__(self, llm: Any = None, settings: Optional[SummarySettings] = None,
+                 counter: Optional[TokenCounter] = None):
+        self.llm = llm
+        self.settings = settings or SummarySettings()
+        self.counter = counter or TokenCounter()
+        path = self.settings.path
+        if path and not os.path.isabs(path):
+            path = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), path)
+        self.store = SessionSummaryStore(path) if path else None
+        self.counters = SummaryStats()
+        self._sessions: Dict[str, Dict[str, Any]] = {}
+        self._tasks: Dict[str, asyncio.Task] = {}
+        # 세션별로 요약에 반영 중인 메시지 (상태 기록의 앞부분과 같은지 확인하는 키)
+        self._evicting: Dict[str, List[tuple]] = {}
+
+    def _session(self, session_id: str) -> Dict[str, Any]:
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self.store.load(session_id) if self.store else {}
+            session.setdefault("summary", "")
+            session.setdefault("summarized_messages", 0)
+            self._sessions[session_id] = session
+        return session
+
+    def get(self, session_id: str) -> str:
+        """현재 요약 (갱신 중이면 직전 요약)"""
+        return self._session(session_id)["summary"]
+
+    @staticmethod
+    def _key(message: BaseMessage) -> tuple:
+        return type(message).__name__, content_text(getattr(message, 'content', ''))
+
+    def compact(self, session_id: str, messages: Sequence[BaseMessage]) -> Optional[List[BaseMessage]]:
+        """요약에 반영된 메시지를 뺀 기록을 반환 (줄일 것이 없으면 None)
+
+        기록이 길면 오래된 메시지의 요약 갱신을 시작하고, 그 메시지들은 갱신이 끝난 뒤의 호출에서 뺍니다.
+        """
+        if not self.settings.enabled:
+            return None
+        messages = list(messages)
+        changed = False
+        task = self._tasks.get(session_id)
+        if task is not None:
+            if not task.done():
+                # 요약이 끝날 때까지는 밀려난 메시지도 상태(프롬프트)에 남겨 둠
+                return None
+            del self._tasks[session_id]
+            evicted = self._evicting.pop(session_id, [])
+            summarized = not task.cancelled() and task.exception() is None and task.result()
+            # 그 사이 기록이 바뀌었으면(대화 초기화 등) 빼지 않음
+            if summarized and [self._key(m) for m in messages[:len(evicted)]] == evicted:
+                messages = messages[len(evicted):]
+                changed = True
+
+        if len(messages) > self.settings.trigger_messages:
+            evicted, _ = split_history(messages, self.settings.keep_messages)
+            if evicted:
+                self._evicting[session_id] = [self._key(m) for m in evicted]
+                self._tasks[session_id] = asyncio.get_running_loop().create_task(
+                    self._update(session_id, evicted))
+        return messages if changed else None
+
+    async def flush(self) -> None:
+        """진행 중인 요약 갱신을 모두 기다림 (종료 시)"""
+        tasks = [task for task in self._tasks.values() if not task.done()]
+        if tasks:
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def transcript(self, messages: Sequence[BaseMessage]) -> List[str]:
+        lines = []
+        for message in messages:
+            text = " ".join(content_text(getattr(message, 'content', '')).split())
+            if isinstance(message, HumanMessage):
+                role = "사용자"
+            elif isinstance(message, ToolMessage):
+                role = "도구 결과"
+            else:
+                role = "에이전트"
+                if not text and getattr(message, 'tool_calls', None):
+                    names = [call.get('name', '') if isinstance(call, dict) else str(call)
+                             for call in message.tool_calls]
+                    text = f"(도구 호출: {', '.join(names)})"
+            if text:
+                lines.append(f"{role}: {self.counter.truncate(text, self.settings.message_tokens)}")
+        return lines
+
+    def _fit(self, lines: List[str]) -> str:
+        """summary_tokens를 넘으면 오래된 줄부터 버림"""
+        while len(lines) > 1 and self.counter.count("\n".join(lines)) > self.settings.summary_tokens:
+            lines = lines[1:]
+        return self.counter.truncate("\n".join(lines), self.settings.summary_tokens)
+
+    async def _summarize(self, summary: str, evicted: Sequence[BaseMessage]) -> str:
+        lines = self.transcript(evicted)
+        if self.settings.use_llm and self.llm is not None:
+            try:
+                prompt = SUMMARY_PROMPT.format(summary=summary or "(없음)", transcript="\n".join(lines))
+                response = await self.llm.ainvoke(prompt)
+                text = content_text(getattr(response, 'content', response)).strip()
+                if text:
+                    return self._fit(text.splitlines())
+            except Exception as e:
+                self.counters.llm_failures += 1
+                print(f"⚠️ LLM 대화 요약 실패, 추출 요약을 사용합니다: {e}")
+        return self._fit((summary.splitlines() if summary else []) + [f"- {line}" for line in lines])
+
+    async def _update(self, session_id: str, evicted: Sequence[BaseMessage]) -> bool:
+        """밀려난 메시지를 요약에 합쳐 저장 (성공하면 True)"""
+        started = time.perf_counter()
+        session = self._session(session_id)
+        try:
+            session["summary"] = await self._summarize(session["summary"], evicted)
+        except Exception as e:
+            print(f"⚠️ 대화 요약 갱신 실패({session_id}): {e}")
+            return False
+        session["summarized_messages"] += len(evicted)
+        session["updated_at"] = time.time()
+        if self.store:
+            # 요약 파일 쓰기는 작업 스레드에서 (이벤트 루프를 막지 않음)
+            await asyncio.to_thread(self.store.save, session_id, session)
+        self.counters.updates += 1
+        self.counters.summarized_messages += len(evicted)
+        self.counters.last_update_ms = round((time.perf_counter() - started) * 1000, 3)
+        return True
+
+    def stats(self) -> Dict[str, Any]:
+        return asdict(self.counters)
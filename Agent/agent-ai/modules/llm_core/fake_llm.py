@@ -0,0 +1,209 @@
+"""
+오프라인 결정적 가짜 LLM (provider: "fake")
+- API 키/네트워크 없이 A2A 서버와 LangGraph 워크플로우를 부하·지연 테스트하기 위한 공급자
+- 같은 seed와 같은 프롬프트면 항상 같은 응답/도구 호출/지연을 냄 (프롬프트 해시로 난수 시드를 정함)
+- 지연: 첫 토큰까지 latency(초), 이후 throughput(토큰/초) 속도로 토큰을 보냄
+    분포: fixed(value) | uniform(min, max) | normal(mean, stddev) | lognormal(mean, stddev)
+- 도구 호출: tool_rules의 match 문자열이 마지막 사용자 메시지에 있으면 그 도구를 호출,
+    아니면 tool_call_rate 확률로 바인딩된 도구 중 하나를 스키마에 맞춘 인자로 호출
+    (마지막 메시지가 사용자 메시지일 때만, 문자열 프롬프트에는 텍스트로만 답함)
+- ainvoke/astream/invoke/bind_tools를 지원 (LLMNode, AgentLLMHandler에서 그대로 사용)
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import math
+import random
+import time
+from dataclasses import dataclass, field, asdict
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, AIMessageChunk
+
+from .context_window import content_text
+
+_WORDS = ("요청하신 내용을 확인했습니다 관련 자료를 정리하면 다음과 같습니다 "
+          "먼저 핵심 개념을 살펴보고 이어서 세부 사항과 예시를 설명드리겠습니다 "
+          "추가로 궁금한 점이 있으면 말씀해 주세요").split()
+
+
+@dataclass
+class FakeLLMSettings:
+    """llm.fake 설정"""
+    seed: int = 0
+    # 첫 토큰까지 지연 (초)
+    latency: Dict[str, Any] = field(default_factory=lambda: {"distribution": "fixed", "value": 0.0})
+    # 토큰 생성 속도 (토큰/초, 0 이하이면 지연 없이 한 번에)
+    throughput: Dict[str, Any] = field(default_factory=lambda: {"distribution": "fixed", "value": 0.0})
+    # 응답 토큰(단어) 수
+    response_tokens: Dict[str, Any] = field(default_factory=lambda: {"distribution": "fixed", "value": 40})
+    # 규칙에 걸리지 않을 때 도구를 호출할 확률 (도구가 바인딩된 경우)
+    tool_call_rate: float = 0.0
+    # [{"match": "기록", "name": "a2a_send", "args": {"agent_name": "Recorder Agent", "text": "{input}"}}]
+    tool_rules: List[Dict[str, Any]] = field(default_factory=list)
+    # 응답 앞에 마지막 사용자 메시지를 되풀이
+    echo: bool = True
+
+
+@dataclass
+class FakeLLMStats:
+    calls: int = 0
+    streamed_calls: int = 0
+    tool_calls: int = 0
+    tokens: int = 0
+
+
+def sample(spec: Any, rng: random.Random) -> float:
+    """분포 설정에서 값 하나를 뽑음 (숫자면 그대로)"""
+    if isinstance(spec, (int, float)):
+        return float(spec)
+    spec = spec or {}
+    distribution = spec.get("distribution", "fixed")
+    if distribution == "fixed":
+        value = spec.get("value", spec.get("mean", 0.0))
+    elif distribution == "uniform":
+        value = rng.uniform(spec.get("min", 0.0), spec.get("max", 0.0))
+    elif distribution == "normal":
+        value = rng.gauss(spec.get("mean", 0.0), spec.get("stddev", 0.0))
+    elif distribution == "lognormal":
+        # 결과 분포의 평균/표준편차가 mean/stddev가 되도록 mu/sigma 변환
+        mean, stddev = spec.get("mean", 0.0), spec.get("stddev", 0.0)
+        if mean <= 0:
+            return 0.0
+        sigma = math.sqrt(math.log(1 + (stddev / mean) ** 2))
+        value = rng.lognormvariate(math.log(mean) - sigma ** 2 / 2, sigma)
+    else:
+        raise ValueError(f"지원하지 않는 분포입니다: {distribution}")
+    return max(0.0, float(value))
+
+
+def _last_user_text(prompt: Any) -> str:
+    if isinstance(prompt, str):
+        return prompt
+    for message in reversed(list(prompt)):
+        if getattr(message, "type", "") == "human":
+            return content_text(message.content)
+    return content_text(getattr(prompt[-1], "content", "")) if prompt else ""
+
+
+def _tool_schema(tool: Any) -> Dict[str, Any]:
+    """OpenAI 형식 도구 스펙 또는 BaseTool에서 (이름, 파라미터 스키마) 추출"""
+    if isinstance(tool, dict):
+        function = tool.get("function", tool)
+        return {"name": function.get("name", "tool"), "parameters": function.get("parameters") or {}}
+    return {"name": getattr(tool, "name", type(tool).__name__),
+            "parameters": {"properties": getattr(tool, "args", None) or {}}}
+
+
+def _fake_args(parameters: Dict[str, Any], text: str) -> Dict[str, Any]:
+    """스키마의 필수 인자를 타입에 맞는 값으로 채움 (문자열은 사용자 입력)"""
+    properties = parameters.get("properties") or {}
+    required = parameters.get("required") or list(properties)
+    defaults = {"string": text, "integer": 1, "number": 1.0, "boolean": True, "array": [], "object": {}}
+    return {name: defaults.get((properties.get(name) or {}).get("type", "string"), text) for name in required}
+
+
+class FakeChatModel:
+    """LangChain 채팅 모델과 같은 방식(ainvoke/astream/bind_tools)으로 쓰는 결정적 가짜 모델"""
+
+    def __init__(self, settings: Optional[FakeLLMSettings] = None, model: str = "fake",
+                 tools: Optional[List[Any]] = None, counters: Optional[FakeLLMStats] = None):
+        self.settings = settings or FakeLLMSettings()
+        self.model = model
+        self.tools = list(tools or [])
+        self.counters = counters or FakeLLMStats()
+
+    def bind_tools(self, tools: List[Any], **kwargs) -> "FakeChatModel":
+        return FakeChatModel(self.settings, self.model, tools, self.counters)
+
+    def _rng(self, prompt: Any) -> random.Random:
+        if isinstance(prompt, str):
+            payload = prompt
+        else:
+            payload = json.dumps([[getattr(m, "type", ""), content_text(getattr(m, "content", m))] for m in prompt],
+                                 ensure_ascii=False)
+        digest = hashlib.sha256(f"{self.settings.seed}:{self.model}:{payload}".encode('utf-8')).digest()
+        return random.Random(int.from_bytes(digest[:8], 'little'))
+
+    def _plan(self, prompt: Any) -> Dict[str, Any]:
+        """응답 텍스트, 도구 호출, 지연을 프롬프트로부터 결정"""
+        rng = self._rng(prompt)
+        user_text = _last_user_text(prompt)
+        tool_calls = []
+        # 도구 결과를 받은 뒤의 호출이나 문자열 프롬프트(후처리)에는 텍스트로만 답함
+        awaiting_answer = isinstance(prompt, str) or not prompt or getattr(prompt[-1], "type", "") != "human"
+        schemas = [] if awaiting_answer else [_tool_schema(tool) for tool in self.tools]
+        names = {schema["name"] for schema in schemas}
+        for rule in self.settings.tool_rules:
+            if rule.get("match", "") in user_text and rule.get("name") in names:
+                args = {k: v.replace("{input}", user_text) if isinstance(v, str) else v
+                        for k, v in (rule.get("args") or {}).items()}
+                tool_calls.append({"name": rule["name"], "args": args, "id": f"fake-{rng.getrandbits(48):x}"})
+                break
+        if not tool_calls and schemas and rng.random() < self.settings.tool_call_rate:
+            schema = schemas[rng.randrange(len(schemas))]
+            tool_calls.append({"name": schema["name"], "args": _fake_args(schema["parameters"], user_text),
+                               "id": f"fake-{rng.getrandbits(48):x}"})
+
+        tokens: List[str] = []
+        if not tool_calls:
+            if self.settings.echo and user_text:
+                tokens.append(f"[{self.model}] {user_text[:100]} →")
+            count = int(sample(self.settings.response_tokens, rng))
+            tokens.extend(_WORDS[rng.randrange(len(_WORDS))] for _ in range(count))
+            tokens = [token if i == 0 else " " + token for i, token in enumerate(tokens)]
+        return {
+            "tokens": tokens,
+            "tool_calls": tool_calls,
+            "latency": sample(self.settings.latency, rng),
+            "throughput": sample(self.settings.throughput, rng),
+        }
+
+    def _record(self, plan: Dict[str, Any], streamed: bool) -> None:
+        self.counters.calls += 1
+        self.counters.streamed_calls += int(streamed)
+        self.counters.tool_calls += len(plan["tool_calls"])
+        self.counters.tokens += len(plan["tokens"])
+
+    @staticmethod
+    def _generation_time(plan: Dict[str, Any]) -> float:
+        throughput = plan["throughput"]
+        return plan["latency"] + (len(plan["tokens"]) / throughput if throughput > 0 else 0.0)
+
+    async def ainvoke(self, prompt: Any, *args, **kwargs) -> AIMessage:
+        plan = self._plan(prompt)
+        await asyncio.sleep(self._generation_time(plan))
+        self._record(plan, streamed=False)
+        return AIMessage(content="".join(plan["tokens"]), tool_calls=plan["tool_calls"])
+
+    def invoke(self, prompt: Any, *args, **kwargs) -> AIMessage:
+        plan = self._plan(prompt)
+        time.sleep(self._generation_time(plan))
+        self._record(plan, streamed=False)
+        return AIMessage(content="".join(plan["tokens"]), tool_calls=plan["tool_calls"])
+
+    async def astream(self, prompt: Any, *args, **kwargs) -> AsyncIterator[AIMessageChunk]:
+        plan = self._plan(prompt)
+        await asyncio.sleep(plan["latency"])
+        interval = 1.0 / plan["throughput"] if plan["throughput"] > 0 else 0.0
+        for index, token in enumerate(plan["tokens"]):
+            if index and interval:
+                await asyncio.sleep(interval)
+            yield AIMessageChunk(content=token)
+        if plan["tool_calls"]:
+            # 청크를 더하면 tool_call_chunks가 tool_calls로 합쳐짐
+            yield AIMessageChunk(content="", tool_call_chunks=[
+                {"name": call["name"], "args": json.dumps(call["args"], ensure_ascii=False),
+                 "id": call["id"], "index": index} for index, call in enumerate(plan["tool_calls"])])
+        self._record(plan, streamed=True)
+
+    def stats(self) -> Dict[str, Any]:
+        return asdict(self.counters)
+
+
+def create_fake_llm(settings: Optional[Dict[str, Any]] = None, model: Optional[str] = None) -> FakeChatModel:
+    """llm.fake 설정으로 가짜 모델 생성"""
+    settings = {k: v for k, v in (settings or {}).items() if k in FakeLLMSettings.__dataclass_fields__}
+    return FakeChatModel(FakeLLMSettings(**settings), model or "fake")
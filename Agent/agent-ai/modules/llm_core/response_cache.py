@@ -0,0 +1,240 @@
+"""
+LLM 응답 디스크 캐시 (SQLite, WAL)
+- 키: (공급자, 모델, 온도, 도구 스키마 해시, 메시지 해시)의 SHA-256
+    메시지는 역할/텍스트/도구 호출/tool_call_id만 사용 (메시지 id 등 매번 달라지는 값은 제외)
+- 값: 응답 텍스트와 tool_calls (JSON)
+- ttl초가 지나면 만료, max_entries / max_bytes를 넘으면 가장 오래 조회되지 않은 항목부터 삭제 (LRU)
+- 같은 path를 쓰는 캐시는 프로세스 안에서 한 인스턴스를 공유 (get_response_cache)
+    여러 프로세스(launch_mode: process)가 같은 파일을 쓸 수 있으므로 항목 수/크기는 DB의 합계 행(llm_cache_totals)에 두고
+    트리거로 같은 트랜잭션 안에서 갱신 (쓰기마다 전체 테이블을 세지 않음)
+- 이벤트 루프에서는 aget/aput으로 호출 (SQLite 입출력은 작업 스레드에서 실행)
+
+에이전트별로 config/agents/*.yaml (또는 config.yaml)의 llm.response_cache 에서 켭니다.
+"""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import AIMessage
+
+from .context_window import content_text
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS llm_cache (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_llm_cache_accessed ON llm_cache(accessed);
+CREATE TABLE IF NOT EXISTS llm_cache_totals (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    entries INTEGER NOT NULL,
+    bytes INTEGER NOT NULL
+);
+CREATE TRIGGER IF NOT EXISTS llm_cache_totals_insert AFTER INSERT ON llm_cache BEGIN
+    UPDATE llm_cache_totals SET entries = entries + 1, bytes = bytes + NEW.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS llm_cache_totals_delete AFTER DELETE ON llm_cache BEGIN
+    UPDATE llm_cache_totals SET entries = entries - 1, bytes = bytes - OLD.size WHERE id = 1;
+END;
+CREATE TRIGGER IF NOT EXISTS llm_cache_totals_update AFTER UPDATE OF size ON llm_cache BEGIN
+    UPDATE llm_cache_totals SET bytes = bytes + NEW.size - OLD.size WHERE id = 1;
+END;
+"""
+
+# 합계 행이 없으면(새 DB 또는 이전 버전 DB) 현재 내용으로 한 번 계산
+_INIT_TOTALS = """
+INSERT OR IGNORE INTO llm_cache_totals (id, entries, bytes)
+SELECT 1, COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache
+"""
+
+
+@dataclass
+class LLMCacheSettings:
+    """llm.response_cache 설정"""
+    enabled: bool = False
+    # agent-ai 기준 상대 경로
+    path: str = "data/llm_cache.db"
+    # 항목 유효 시간 (초, None이면 만료 없음)
+    ttl: Optional[float] = 86400.0
+    max_entries: int = 10000
+    max_bytes: int = 64 * 1024 * 1024
+
+
+@dataclass
+class LLMCacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        counters = asdict(self)
+        lookups = self.hits + self.misses
+        counters["hit_rate"] = round(self.hits / lookups, 3) if lookups else 0.0
+        return counters
+
+
+def _tool_repr(tool: Any) -> Any:
+    """도구 스펙(dict) 외의 도구 객체(BaseTool 등)를 해시용 값으로 변환"""
+    return {"name": getattr(tool, "name", type(tool).__name__),
+            "description": getattr(tool, "description", ""),
+            "args": getattr(tool, "args", None)}
+
+
+def tools_hash(tools: Optional[List[Any]]) -> str:
+    payload = json.dumps(tools or [], sort_keys=True, ensure_ascii=False, default=_tool_repr)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _message_repr(message: Any) -> Any:
+    if isinstance(message, str):
+        return message
+    calls = [(call.get("name"), call.get("args")) if isinstance(call, dict) else str(call)
+             for call in getattr(message, "tool_calls", None) or []]
+    return [getattr(message, "type", type(message).__name__),
+            content_text(getattr(message, "content", message)),
+            calls, getattr(message, "tool_call_id", None)]
+
+
+def cache_key(provider: str, model: str, temperature: Any, tool_schema_hash: str, prompt: Any) -> str:
+    """(공급자, 모델, 온도, 도구 스키마 해시, 메시지 해시) 캐시 키"""
+    messages = [_message_repr(m) for m in prompt] if isinstance(prompt, (list, tuple)) else _message_repr(prompt)
+    messages_hash = hashlib.sha256(json.dumps(messages, ensure_ascii=False, sort_keys=True,
+                                              default=str).encode('utf-8')).hexdigest()
+    payload = json.dumps([provider, model, temperature, tool_schema_hash, messages_hash], default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+def response_to_value(response: Any) -> Dict[str, Any]:
+    return {"content": getattr(response, "content", str(response)),
+            "tool_calls": list(getattr(response, "tool_calls", None) or [])}
+
+
+def value_to_response(value: Dict[str, Any]) -> AIMessage:
+    return AIMessage(content=value.get("content", ""), tool_calls=value.get("tool_calls") or [])
+
+
+class LLMResponseCache:
+    """SQLite 기반 LLM 응답 캐시 (TTL + LRU, 스레드 안전)"""
+
+    def __init__(self, settings: Optional[LLMCacheSettings] = None):
+        self.settings = settings or LLMCacheSettings()
+        self.counters = LLMCacheStats()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(self.settings.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(self.settings.path, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # 여러 프로세스가 동시에 처음 열어도 합계 행을 한 번만 계산
+        self._conn.executescript(f"BEGIN IMMEDIATE;{_SCHEMA}{_INIT_TOTALS};COMMIT;")
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """캐시된 응답 (없거나 만료되면 None)"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute("SELECT value, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is not None and self.settings.ttl is not None and now - row[1] > self.settings.ttl:
+                self._conn.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+                self.counters.expired += 1
+                row = None
+            if row is None:
+                self.counters.misses += 1
+                return None
+            self._conn.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (now, key))
+            self.counters.hits += 1
+        return json.loads(row[0])
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        data = json.dumps(value, ensure_ascii=False, default=str)
+        size = len(data.encode('utf-8'))
+        if size > self.settings.max_bytes:
+            return
+        now = time.time()
+        with self._lock:
+            # 다른 프로세스의 쓰기/축출과 겹치지 않도록 쓰기 트랜잭션으로 묶음
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                # REPLACE는 삭제 트리거를 실행하지 않으므로 UPSERT로 갱신 (합계 행 유지)
+                self._conn.execute("INSERT INTO llm_cache (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?) "
+                                   "ON CONFLICT(key) DO UPDATE SET value = excluded.value, size = excluded.size, "
+                                   "created = excluded.created, accessed = excluded.accessed",
+                                   (key, data, size, now, now))
+                self._evict()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self.counters.writes += 1
+
+    async def aget(self, key: str) -> Optional[Dict[str, Any]]:
+        """get()을 작업 스레드에서 실행 (이벤트 루프를 막지 않음)"""
+        return await asyncio.to_thread(self.get, key)
+
+    async def aput(self, key: str, value: Dict[str, Any]) -> None:
+        """put()을 작업 스레드에서 실행 (이벤트 루프를 막지 않음)"""
+        await asyncio.to_thread(self.put, key, value)
+
+    def _totals(self) -> tuple:
+        return self._conn.execute("SELECT entries, bytes FROM llm_cache_totals WHERE id = 1").fetchone()
+
+    def _evict(self) -> None:
+        """max_entries / max_bytes를 넘으면 가장 오래 조회되지 않은 항목부터 삭제 (잠금/트랜잭션 안에서 호출)"""
+        while True:
+            entries, total = self._totals()
+            if entries <= self.settings.max_entries and total <= self.settings.max_bytes:
+                return
+            excess = max(1, entries - self.settings.max_entries)
+            rows = self._conn.execute("SELECT key FROM llm_cache ORDER BY accessed ASC LIMIT ?",
+                                      (excess,)).fetchall()
+            if not rows:
+                return
+            self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", rows)
+            self.counters.evictions += len(rows)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            counters = self.counters.as_dict()
+            counters["entries"], counters["bytes"] = self._totals()
+            return counters
+
+
+_caches: Dict[str, LLMResponseCache] = {}
+_caches_lock = threading.Lock()
+
+
+def get_response_cache(settings: Optional[Dict[str, Any]] = None) -> Optional[LLMResponseCache]:
+    """llm.response_cache 설정으로 캐시 반환 (꺼져 있으면 None, 같은 path는 한 인스턴스 공유)"""
+    settings = LLMCacheSettings(**{k: v for k, v in (settings or {}).items()
+                                   if k in LLMCacheSettings.__dataclass_fields__})
+    if not settings.enabled:
+        return None
+    if not os.path.isabs(settings.path):
+        settings.path = os.path.join(
+            os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), settings.path)
+    with _caches_lock:
+        cache = _caches.get(settings.path)
+        if cache is None:
+            cache = _caches[settings.path] = LLMResponseCache(settings)
+        return cache
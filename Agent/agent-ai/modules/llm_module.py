@@ -1,20 +1,53 @@
 import os
-from typing import Dict, Any
-from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+import time
+from collections import deque
+from typing import Dict, Any, Callable, Optional
+from langchain_core.messages import BaseMessage, HumanMessage, message_chunk_to_message
 from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 
+from modules.llm_core.context_window import ContextWindowManager, ContextWindowSettings
+from modules.llm_core.conversation_summary import RollingSummary, SummarySettings
+from modules.llm_core.fake_llm import create_fake_llm
+from modules.llm_core.response_cache import (
+    cache_key, get_response_cache, response_to_value, tools_hash, value_to_response,
+)
+from modules.memory_store.search import aresolve_related_memories
+
 load_dotenv()
 
+
+def _has_text(message: Any) -> bool:
+    content = getattr(message, 'content', '')
+    return bool(content.strip()) if isinstance(content, str) else bool(content)
+
 class LLMNode:
-    def __init__(self, config, tools):
+    def __init__(self, config, tools, stream_sink: Optional[Callable[[str], Any]] = None):
         self.config = config.get('llm', {})
         self.tools = tools
+        # 응답 토큰을 도착하는 대로 출력할 출력기 팩토리 (예: OutputNode.open_stream)
+        self.stream_sink = stream_sink
+        self.streaming = self.config.get('streaming', True) and stream_sink is not None
+        # 최근 턴의 응답 지연 (첫 토큰/전체, ms)
+        self.turn_metrics = deque(maxlen=100)
+        # 프롬프트를 토큰 예산에 맞춰 구성
+        window = self.config.get('context_window') or {}
+        self.context_window = ContextWindowManager(ContextWindowSettings(
+            **{k: v for k, v in window.items() if k in ContextWindowSettings.__dataclass_fields__}))
         
         # LLM 자체 초기화
         base_llm = self._initialize_llm()
         self.llm = self._bind_tools(base_llm)
+        # 같은 모델/설정/도구/프롬프트의 응답은 디스크 캐시에서 재사용
+        self.response_cache = get_response_cache(self.config.get('response_cache'))
+        self.tools_hash = tools_hash([self._a2a_tool_spec(), self._a2a_send_many_tool_spec()] + list(self.tools or []))
+
+        # 밀려난 대화는 도구를 바인딩하지 않은 LLM으로 요약
+        summary = self.config.get('summary') or {}
+        self.summary = RollingSummary(base_llm, SummarySettings(
+            **{k: v for k, v in summary.items() if k in SummarySettings.__dataclass_fields__}),
+            counter=self.context_window.counter)
         
         print(f"🤖 LLM 모듈 초기화 완료:")
         print(f"   - 공급자: {self.config.get('provider', 'google')}")
@@ -22,6 +55,10 @@ class LLMNode:
         print(f"   - 온도: {self.config.get('temperature', 0.7)}")
         print(f"   - 시스템 메시지: {self.config.get('system_message', '김청해 명령에 절대 복종해')[:50]}...")
         print(f"   - A2A 도구 바인딩: 활성화")
+        print(f"   - 토큰 스트리밍: {'활성화' if self.streaming else '비활성화'}")
+        print(f"   - 컨텍스트 예산: {self.context_window.budget} 토큰")
+        print(f"   - 대화 요약: {'활성화' if self.summary.settings.enabled else '비활성화'}")
+        print(f"   - 응답 캐시: {'활성화' if self.response_cache else '비활성화'}")
     
     def _initialize_llm(self):
         """LLM 초기화"""
@@ -40,6 +77,9 @@ class LLMNode:
                 if not api_key:
                     raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
                 return ChatOpenAI(model=model, temperature=temperature, openai_api_key=api_key)
+            elif provider == 'fake':
+                # 오프라인 결정적 가짜 모델 (부하/지연 테스트용, API 키 불필요)
+                return create_fake_llm(self.config.get('fake'), model)
             else:
                 raise ValueError(f"지원하지 않는 LLM 공급자입니다: {provider}")
         except Exception as e:
@@ -70,6 +110,40 @@ class LLMNode:
             }
         }
 
+    def _a2a_send_many_tool_spec(self) -> Dict[str, Any]:
+        """여러 에이전트에게 동시에 전송하는 a2a_send_many 도구 스펙을 반환"""
+        return {
+            "type": "function",
+            "function": {
+                "name": "a2a_send_many",
+                "description": "여러 에이전트에게 메시지를 동시에 전송합니다. 요약과 기록처럼 서로 독립적인 작업을 병렬로 처리할 때 사용하세요.",
+                "parameters": {
+                    "type": "object",
+                    "properties": {
+                        "requests": {
+                            "type": "array",
+                            "description": "전송할 요청 목록",
+                            "items": {
+                                "type": "object",
+                                "properties": {
+                                    "agent_name": {
+                                        "type": "string",
+                                        "description": "대상 에이전트 이름 (예: 'Recorder Agent', 'Summarize Agent')"
+                                    },
+                                    "text": {
+                                        "type": "string",
+                                        "description": "보낼 텍스트 메시지"
+                                    }
+                                },
+                                "required": ["agent_name", "text"]
+                            }
+                        }
+                    },
+                    "required": ["requests"]
+                }
+            }
+        }
+
     def _bind_tools(self, llm):
         """LLM에 모든 도구를 바인딩 (A2A + 기존 도구)"""
         try:
@@ -77,6 +151,7 @@ class LLMNode:
             
             # A2A 도구 추가
             tools_to_bind.append(self._a2a_tool_spec())
+            tools_to_bind.append(self._a2a_send_many_tool_spec())
             
             # 기존 도구들 추가
             if self.tools:
@@ -94,8 +169,83 @@ class LLMNode:
             print(f"⚠️ 도구 바인딩 실패: {e}")
             return llm
         
-    def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """LLM 노드 처리 로직"""
+    @staticmethod
+    def _content_text(content: Any) -> str:
+        """LLM 응답 content(str 또는 파트 리스트)를 텍스트로 변환"""
+        if isinstance(content, str):
+            return content
+        if isinstance(content, list):
+            return ''.join(p if isinstance(p, str) else p.get('text', '') for p in content if isinstance(p, (str, dict)))
+        return str(content)
+
+    async def _generate(self, prompt: Any) -> tuple:
+        """LLM 응답 생성 (스트리밍이 켜져 있으면 astream으로 받으면서 토큰을 바로 출력)
+
+        (응답 메시지, 텍스트를 스트리밍으로 이미 출력했는지 여부, 지연 지표)를 반환합니다.
+        """
+        started = time.perf_counter()
+        metrics = {"ttft_ms": None, "total_ms": None, "chunks": 0, "streamed": False, "cached": False}
+        key = None
+        if self.response_cache is not None:
+            key = cache_key(self.config.get('provider', 'google'), self.config.get('model', 'gemini-2.5-flash'),
+                            self.config.get('temperature', 0.7), self.tools_hash, prompt)
+            cached = await self.response_cache.aget(key)
+            if cached is not None:
+                response = value_to_response(cached)
+                text = self._content_text(response.content)
+                if self.streaming and text:
+                    printer = self.stream_sink("에이전트")
+                    printer.write(text)
+                    printer.close()
+                    metrics["chunks"] = 1
+                metrics.update(cached=True, streamed=metrics["chunks"] > 0)
+                metrics["total_ms"] = metrics["ttft_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                self.turn_metrics.append(metrics)
+                return response, metrics["streamed"], metrics
+
+        if not self.streaming:
+            response = await self.llm.ainvoke(prompt)
+        else:
+            printer = self.stream_sink("에이전트")
+            response = None
+            try:
+                async for chunk in self.llm.astream(prompt):
+                    # 청크를 더하면 tool_call_chunks도 tool_calls로 합쳐짐
+                    response = chunk if response is None else response + chunk
+                    text = self._content_text(getattr(chunk, 'content', ''))
+                    if text:
+                        if metrics["ttft_ms"] is None:
+                            metrics["ttft_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                        printer.write(text)
+                        metrics["chunks"] += 1
+            finally:
+                printer.close()
+            if response is None:
+                raise ValueError("LLM 스트림이 비어 있습니다.")
+            response = message_chunk_to_message(response)
+            metrics["streamed"] = metrics["chunks"] > 0
+        metrics["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        if metrics["ttft_ms"] is None:
+            # 스트리밍하지 않았으면 전체 응답 시간이 곧 첫 토큰 시간
+            metrics["ttft_ms"] = metrics["total_ms"]
+        if key is not None:
+            await self.response_cache.aput(key, response_to_value(response))
+        self.turn_metrics.append(metrics)
+        return response, metrics["streamed"], metrics
+
+    def latency_stats(self) -> Dict[str, Any]:
+        """최근 턴들의 첫 토큰/전체 응답 시간 평균 (ms)과 응답 캐시 적중률"""
+        turns = list(self.turn_metrics)
+        stats = {"turns": len(turns)}
+        if turns:
+            stats["avg_ttft_ms"] = round(sum(m["ttft_ms"] for m in turns) / len(turns), 1)
+            stats["avg_total_ms"] = round(sum(m["total_ms"] for m in turns) / len(turns), 1)
+        if self.response_cache is not None:
+            stats["response_cache"] = self.response_cache.stats()
+        return stats
+
+    async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """LLM 노드 처리 로직 (응답 토큰은 출력 노드를 기다리지 않고 도착하는 대로 출력)"""
         messages = state.get("messages", [])
         context = state.get("context", "")
         memory_data = state.get("memory", {})
@@ -106,50 +256,32 @@ class LLMNode:
             "당신은 사용자와의 대화를 기억할 수 있는 AI 어시스턴트입니다.\n사용자가 이전에 말한 내용이나 요청한 정보를 기억하고 활용해서 답변하세요."
         )
 
-        # 메모리에서 관련 정보 추가
-        if memory_data.get('status') == 'active' and memory_data.get('related_memories'):
-            related_memories = memory_data['related_memories']
-            if related_memories and isinstance(related_memories, list):
-                memory_items = []
-                for memory in related_memories[:5]:  # 최대 5개의 관련 메모리
-                    if isinstance(memory, dict):
-                        memory_text = memory.get('memory', '')
-                    else:
-                        memory_text = str(memory)
-                    if memory_text.strip():
-                        memory_items.append(f"- {memory_text}")
-                if memory_items:
-                    memory_context = "\n".join(memory_items)
-                    system_content += f"\n\n📝 이전 대화에서 기억할 내용:\n{memory_context}\n\n위 정보를 참고해서 답변해주세요."
-
-        # RAG 컨텍스트 추가
-        if context:
-            system_content += f"\n\n[참고 컨텍스트]\n{context}"
-
-        # 메시지 구성 (시스템 메시지는 config에서 가져옴)
-        enhanced_messages = [SystemMessage(content=system_content)]
-
-        # 기존 메시지들 추가 (최근 대화만)
-        if messages:
-            # 최근 5개 메시지만 포함 (메모리 효율성)
-            recent_messages = messages[-5:] if len(messages) > 5 else messages
-            enhanced_messages.extend(recent_messages)
-        else:
-            # 메시지가 없을 때 기본 메시지 추가
-            default_message = HumanMessage(content="안녕하세요.")
-            enhanced_messages.append(default_message)
-        
-        # 메시지 유효성 검사
-        if not enhanced_messages or all(not msg.content.strip() for msg in enhanced_messages if hasattr(msg, 'content')):
-            print("⚠️ 유효한 메시지가 없습니다. 기본 메시지를 사용합니다.")
-            enhanced_messages = [
-                SystemMessage(content=system_content),
-                HumanMessage(content="안녕하세요.")
-            ]
-        
+        # 메모리에서 관련 정보 추가 (메모리 노드가 시작한 검색이 끝나지 않았으면 여기서 대기)
+        memory_items = []
+        related_memories = await aresolve_related_memories(memory_data)
+        if related_memories and isinstance(related_memories, list):
+            for memory in related_memories:
+                if isinstance(memory, dict):
+                    memory_text = memory.get('memory', '')
+                else:
+                    memory_text = str(memory)
+                if memory_text.strip():
+                    memory_items.append(memory_text)
+
+        # 메시지가 없거나 모두 비어 있으면 기본 메시지 사용
+        history = list(messages)
+        if not any(_has_text(msg) for msg in history):
+            if history:
+                print("⚠️ 유효한 메시지가 없습니다. 기본 메시지를 사용합니다.")
+            history = [HumanMessage(content="안녕하세요.")]
+
+        # 시스템 메시지 + 메모리 + RAG 컨텍스트 + 대화 기록을 토큰 예산에 맞춰 구성
+        summary = self.summary.get(state.get("user_id", "default_user")) if self.summary.settings.enabled else ""
+        enhanced_messages = self.context_window.pack(system_content, history, memory_items, context, summary)
+
         try:
             # 자체 초기화된 LLM 호출
-            response = self.llm.invoke(enhanced_messages)
+            response, streamed, metrics = await self._generate(enhanced_messages)
             
             # 도구 호출 여부 확인 및 로깅
             tool_calls = getattr(response, "tool_calls", None)
@@ -164,7 +296,9 @@ class LLMNode:
                         args = getattr(call, "args", {})
                     print(f"  도구 {i+1}: {name} - {args}")
             else:
-                print("💬 LLM이 일반 텍스트 응답을 생성했습니다")
+                print(f"💬 LLM이 일반 텍스트 응답을 생성했습니다 "
+                      f"(첫 토큰 {metrics['ttft_ms']}ms, 전체 {metrics['total_ms']}ms"
+                      f"{', 캐시 적중' if metrics['cached'] else ''})")
             
             # 응답을 상태에 추가
             updated_messages = list(messages) + [response] if messages else [response]
@@ -172,7 +306,9 @@ class LLMNode:
             return {
                 "messages": updated_messages,
                 "last_response": response.content if hasattr(response, 'content') else str(response),
-                "should_exit": state.get("should_exit", False)
+                "should_exit": state.get("should_exit", False),
+                "streamed": streamed,
+                "llm_metrics": metrics
             }
             
         except Exception as e:
@@ -182,9 +318,19 @@ class LLMNode:
             return {
                 "messages": list(messages) + [error_message] if messages else [error_message],
                 "last_response": "오류가 발생했습니다.",
-                "should_exit": state.get("should_exit", False)
+                "should_exit": state.get("should_exit", False),
+                "streamed": False
             }
 
+    def compact_history(self, state: Dict[str, Any]) -> Dict[str, Any]:
+        """턴이 끝난 뒤 오래된 대화의 요약을 시작하고, 요약에 반영이 끝난 메시지는 상태의 기록에서 뺌"""
+        messages = state.get("messages", [])
+        kept = self.summary.compact(state.get("user_id", "default_user"), messages)
+        if kept is None:
+            return {}
+        print(f"🗒️ 요약에 반영된 이전 대화 {len(messages) - len(kept)}개를 기록에서 뺐습니다")
+        return {"messages": kept}
+
     async def post_process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """도구 실행 결과를 자연스러운 언어로 후처리하고, 대화 기록을 관리합니다."""
         messages = state.get("messages", [])
@@ -197,18 +343,20 @@ class LLMNode:
             if isinstance(msg, HumanMessage):
                 user_question = msg.content
                 last_human_message_index = i
+                # 이번 질문 이후의 도구 결과만 사용 (이전 턴의 결과는 제외)
+                tool_results_content = []
             elif hasattr(msg, 'tool_call_id'):
                 tool_results_content.append(str(msg.content))
         
         if not tool_results_content:
-            return state
+            return {**state, "streamed": False}
 
         prompt = f"""Based on the following user question and the data received from a tool, provide a final, comprehensive, and user-friendly answer in Korean.
         Original Question: {user_question}
-        Tool-provided Data: {', '.join(tool_results_content)}
+        Tool-provided Data: {self.context_window.tool_results_block(tool_results_content)}
         Final Answer:"""
         
-        final_response = await self.llm.ainvoke(prompt)
+        final_response, streamed, metrics = await self._generate(prompt)
 
         # 마지막 사용자 질문까지의 기록을 유지하고, 그 뒤에 최종 답변을 추가합니다.
         # 이렇게 하면 tool_call, ToolMessage 같은 중간 과정이 정리됩니다.
@@ -217,4 +365,5 @@ class LLMNode:
         else: # 예외적인 경우
             final_messages = messages + [final_response]
 
-        return {"messages": final_messages, "last_response": final_response.content}
\ No newline at end of file
+        return {"messages": final_messages, "last_response": final_response.content,
+                "streamed": streamed, "llm_metrics": metrics}
\ No newline at end of file
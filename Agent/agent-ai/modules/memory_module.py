@@ -1,14 +1,29 @@
 import os
 import warnings
+from concurrent.futures import Future, ThreadPoolExecutor
 from typing import Dict, Any, List, Optional
 from mem0 import Memory, MemoryClient
 from dotenv import load_dotenv
 
+from modules.memory_store.bulk import BulkSettings, MemoryCounters, clear_all
+from modules.memory_store.consolidation import (
+    AccessTracker, ConsolidationScheduler, ConsolidationSettings, MemoryConsolidator
+)
+from modules.memory_store.search import PendingSearch, normalize_search_result
+from modules.memory_store.search_cache import MemorySearchCache, SearchCacheSettings, add_changed_memory
+from modules.memory_store.vector_store import create_local_memory
+from modules.memory_store.write_behind import MemoryWriteBehind, MemoryWriteSettings
+
 # mem0 라이브러리의 DeprecationWarning 숨기기
 warnings.filterwarnings("ignore", category=DeprecationWarning, module="mem0")
 
 load_dotenv()
 
+
+def _pick(data: Optional[Dict[str, Any]], cls) -> Dict[str, Any]:
+    return {k: v for k, v in (data or {}).items() if k in cls.__dataclass_fields__}
+
+
 class MemoryNode:
     def __init__(self, config):
         self.config = config.get('memory', {})
@@ -23,10 +38,38 @@ class MemoryNode:
         self.history_limit = self.settings.get('history_limit', 50)
         self.auto_save = self.settings.get('auto_save', True)
         self.compression_threshold = self.settings.get('compression_threshold', 1000)
+        self.search_timeout = self.settings.get('search_timeout', 5.0)
         
         self.memory = None
         if self.memory_type == 'mem0':
             self._initialize_memory()
+        elif self.memory_type == 'in_memory':
+            self._initialize_local_memory()
+
+        # 저장은 write-behind 큐, 검색은 스레드 풀에서 턴 진행과 병렬로 처리
+        self.writer = None
+        if self.memory is not None:
+            self.writer = MemoryWriteBehind(self._add_batch, MemoryWriteSettings(
+                **_pick(self.settings.get('write_behind'), MemoryWriteSettings)))
+        # 일괄 처리 설정과 사용자별 메모리 개수 (통계 O(1))
+        self.bulk_settings = BulkSettings(**_pick(self.settings.get('bulk'), BulkSettings))
+        self.counters = MemoryCounters(self.memory, self.bulk_settings.page_size)
+        # 사용자별 검색 결과 캐시 (그 사용자의 메모리가 바뀌면 무효화)
+        self.search_cache = MemorySearchCache(SearchCacheSettings(
+            **_pick(self.settings.get('search_cache'), SearchCacheSettings)))
+        # 중요도 기반 정리: 주기적으로, 또는 임계값을 넘은 사용자에 대해 백그라운드에서 실행
+        self.access = AccessTracker()
+        self.consolidation_settings = ConsolidationSettings(
+            **_pick(self.settings.get('consolidation'), ConsolidationSettings))
+        self.consolidator = None
+        self.scheduler = None
+        if self.memory is not None:
+            self.consolidator = MemoryConsolidator(self.memory, self.compression_threshold,
+                                                   self.consolidation_settings, self.bulk_settings, self.access)
+            if self.consolidation_settings.enabled:
+                self.scheduler = ConsolidationScheduler(self._consolidate, self.consolidation_settings)
+        self._search_pool = ThreadPoolExecutor(max_workers=self.settings.get('search_workers', 2),
+                                               thread_name_prefix="memory-search")
         
         print(f"🧠 메모리 모듈 초기화 완료:")
         print(f"   - 타입: {self.memory_type}")
@@ -35,6 +78,7 @@ class MemoryNode:
         print(f"   - 기록 제한: {self.history_limit}")
         print(f"   - 자동 저장: {self.auto_save}")
         print(f"   - 압축 임계값: {self.compression_threshold}")
+        print(f"   - 비동기 저장/검색: 활성화 (검색 대기 최대 {self.search_timeout}s)")
         
     def _initialize_memory(self):
         try:
@@ -56,12 +100,76 @@ class MemoryNode:
             print("기본 메모리 모드로 실행합니다.")
             self.memory = None
     
+    def _add_batch(self, user_id: str, contents: List[str]):
+        """한 사용자의 메시지 목록을 한 번의 add로 저장 (write-behind writer 스레드에서 호출)"""
+        # MemoryClient와 Memory 모두 messages 리스트를 받음
+        add_result = self.memory.add(
+            messages=[{"role": "user", "content": content} for content in contents],
+            user_id=user_id
+        )
+        if add_changed_memory(add_result):
+            self.search_cache.invalidate(user_id)
+            self.counters.apply_add(user_id, add_result)
+        if self.scheduler is not None:
+            self.scheduler.track(user_id)
+            if self.counters.get(user_id) > self.compression_threshold:
+                self.scheduler.request(user_id)
+        return add_result
+
+    def _consolidate(self, user_id: str) -> Dict[str, Any]:
+        """비슷한 메모리 병합 + 중요도가 낮은 메모리 삭제 (정리 스레드 또는 compress_memory에서 호출)"""
+        report = self.consolidator.consolidate(user_id)
+        if report.get("deleted") or report["after"] != report["before"]:
+            # 정리하는 동안 write-behind가 추가한 메모리가 있을 수 있으므로 변화량만 반영
+            self.counters.adjust(user_id, report["after"] - report["before"])
+            self.search_cache.invalidate(user_id)
+            print(f"🧹 메모리 정리 [{user_id}]: 병합 {report['merged']}개, 삭제 {report['evicted']}개 "
+                  f"({report['before']} → {report['after']})")
+        return report
+
+    def _search(self, content: str, user_id: str) -> List[Dict]:
+        """메모리 검색 후 결과를 캐시에 저장 (검색 스레드 풀에서 호출)"""
+        generation = self.search_cache.generation(user_id)
+        related_memories = normalize_search_result(self.memory.search(
+            query=content,
+            user_id=user_id,
+            limit=self.search_limit
+        ))
+        self.search_cache.put(user_id, content, self.search_limit, related_memories, generation)
+        self.access.record(related_memories)
+        return related_memories
+
+    def _start_search(self, content: str, user_id: str) -> PendingSearch:
+        """캐시에 있으면 완료된 검색을, 없으면 백그라운드 검색을 반환"""
+        cached = self.search_cache.get(user_id, content, self.search_limit)
+        if cached is not None:
+            self.access.record(cached)
+            future = Future()
+            future.set_result(cached)
+        else:
+            future = self._search_pool.submit(self._search, content, user_id)
+        return PendingSearch(future, timeout=self.search_timeout)
+
+    def _initialize_local_memory(self):
+        try:
+            self.memory = create_local_memory(self.config.get('local'))
+            stats = self.memory.stats()
+            print(f"✅ 로컬 벡터 메모리가 초기화되었습니다. (사용자 {stats['users']}명, 메모리 {stats['memories']}개, 임베딩 {stats['dim']}차원)")
+        except Exception as e:
+            print(f"⚠️ 로컬 벡터 메모리 초기화 실패: {e}")
+            print("기본 메모리 모드로 실행합니다.")
+            self.memory = None
+
     def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
-        """메모리 노드 처리 로직"""
+        """메모리 노드 처리 로직
+
+        저장은 write-behind 큐에 넣고, 검색은 백그라운드에서 시작만 한 뒤 바로 반환합니다.
+        검색 결과는 LLM 노드가 필요할 때 기다립니다 (aresolve_related_memories).
+        """
         messages = state.get("messages", [])
         
-        # mem0 타입이 아니면 기본 처리
-        if self.memory_type != 'mem0' or not self.memory:
+        # 메모리 백엔드가 없으면 기본 처리
+        if not self.memory:
             return {**state, "memory": {"status": "disabled", "type": self.memory_type}}
         
         # 자동 저장이 비활성화된 경우 저장하지 않음
@@ -76,49 +184,20 @@ class MemoryNode:
                 content = latest_message.content if hasattr(latest_message, 'content') else str(latest_message)
                 
                 if content and content.strip():
-                    print(f"💾 메모리에 저장 중: [{user_id}] {content[:50]}...")
-                    
-                    # MemoryClient와 Memory의 API 차이 처리
+                    print(f"💾 메모리 저장 예약: [{user_id}] {content[:50]}...")
                     try:
-                        if isinstance(self.memory, MemoryClient):
-                            # MemoryClient는 messages를 리스트로 기대
-                            add_result = self.memory.add(
-                                messages=[{"role": "user", "content": content}],
-                                user_id=user_id
-                            )
-                        else:
-                            # 기본 Memory는 문자열도 허용
-                            add_result = self.memory.add(
-                                messages=content,
-                                user_id=user_id
-                            )
-                        print(f"💾 메모리 저장 결과: {add_result}")
+                        self.writer.submit(user_id, content)
                     except Exception as add_error:
                         print(f"⚠️ 메모리 저장 실패: {add_error}")
-                        add_result = None
-                    
-                    # 관련 메모리 검색 (설정된 제한값 사용)
-                    search_result = self.memory.search(
-                        query=content, 
-                        user_id=user_id,
-                        limit=self.search_limit
-                    )
                     
-                    # mem0 검색 결과가 딕셔너리 형태일 경우 리스트로 변환
-                    if isinstance(search_result, dict) and 'results' in search_result:
-                        related_memories = search_result['results']
-                    elif isinstance(search_result, list):
-                        related_memories = search_result
-                    else:
-                        related_memories = []
-                    
-                    print(f"🔍 관련 메모리 검색 결과: {len(related_memories)}개")
+                    # 관련 메모리 검색 (설정된 제한값 사용, 결과는 LLM 노드에서 대기)
+                    pending_search = self._start_search(content, user_id)
                     
                     return {
                         **state,  # 기존 상태 유지
                         "memory": {
                             "status": "active",
-                            "related_memories": related_memories,
+                            "pending_search": pending_search,
                             "user_id": user_id
                         }
                     }
@@ -129,6 +208,16 @@ class MemoryNode:
             print(f"⚠️ 메모리 처리 중 오류: {e}")
             return {**state, "memory": {"status": "error", "error": str(e)}}
 
+    def close(self) -> None:
+        """남은 저장 요청을 모두 처리하고 백그라운드 작업 종료"""
+        if self.writer is not None:
+            self.writer.close()
+        if self.scheduler is not None:
+            self.scheduler.close()
+        self._search_pool.shutdown(wait=False)
+        if hasattr(self.memory, 'close'):
+            self.memory.close()
+
     def get_conversation_history(self, user_id: Optional[str] = None, limit: Optional[int] = None) -> List[Dict]:
         """대화 기록 조회"""
         if not self.memory:
@@ -145,33 +234,34 @@ class MemoryNode:
             return []
     
     def clear_memory(self, user_id: Optional[str] = None) -> bool:
-        """특정 사용자의 메모리 삭제"""
+        """특정 사용자의 메모리 삭제 (delete_all 또는 페이지 조회 + 일괄 삭제)"""
         if not self.memory:
             return False
         
         user_id = user_id or self.default_user_id
         
         try:
-            memories = self.memory.get_all(user_id=user_id)
-            for memory in memories:
-                if 'id' in memory:
-                    self.memory.delete(memory['id'])
-            print(f"🗑️ 사용자 '{user_id}'의 메모리가 삭제되었습니다.")
+            deleted = clear_all(self.memory, user_id, self.bulk_settings)
+            self.counters.reset(user_id)
+            self.search_cache.invalidate(user_id)
+            count_text = f" ({deleted}개)" if deleted >= 0 else ""
+            print(f"🗑️ 사용자 '{user_id}'의 메모리가 삭제되었습니다.{count_text}")
             return True
         except Exception as e:
+            # 일부만 지워졌을 수 있으므로 다음 통계 조회 때 다시 셈
+            self.counters.apply_delete(user_id, -1)
             print(f"⚠️ 메모리 삭제 중 오류: {e}")
             return False
 
     def get_memory_stats(self, user_id: Optional[str] = None) -> Dict[str, Any]:
-        """메모리 통계 정보 반환"""
+        """메모리 통계 정보 반환 (유지 중인 사용자별 개수 사용)"""
         if not self.memory:
             return {"status": "disabled"}
         
         user_id = user_id or self.default_user_id
         
         try:
-            memories = self.memory.get_all(user_id=user_id)
-            memory_count = len(memories)
+            memory_count = self.counters.get(user_id)
             
             return {
                 "user_id": user_id,
@@ -182,36 +272,33 @@ class MemoryNode:
                     "history_limit": self.history_limit,
                     "auto_save": self.auto_save,
                     "compression_threshold": self.compression_threshold
-                }
+                },
+                "search_cache": self.search_cache.stats(user_id),
+                "writer": self.writer.stats() if self.writer is not None else None
             }
         except Exception as e:
             print(f"⚠️ 메모리 통계 조회 중 오류: {e}")
             return {"status": "error", "error": str(e)}
 
     def compress_memory(self, user_id: Optional[str] = None) -> bool:
-        """메모리 압축 (오래된 메모리 정리)"""
+        """메모리 압축 (비슷한 메모리 병합 + 중요도가 낮은 메모리 삭제)"""
         if not self.memory:
             return False
         
         user_id = user_id or self.default_user_id
         
         try:
-            memories = self.memory.get_all(user_id=user_id)
+            memory_count = self.counters.get(user_id)
             
-            if len(memories) <= self.compression_threshold:
-                print(f"📊 압축이 필요하지 않습니다. 현재 메모리 수: {len(memories)}")
+            if memory_count <= self.compression_threshold:
+                print(f"📊 압축이 필요하지 않습니다. 현재 메모리 수: {memory_count}")
                 return True
             
-            # 오래된 메모리의 절반을 삭제
-            memories_to_delete = memories[self.compression_threshold//2:]
-            
-            for memory in memories_to_delete:
-                if 'id' in memory:
-                    self.memory.delete(memory['id'])
-            
-            print(f"🗜️ 메모리 압축 완료: {len(memories_to_delete)}개 삭제")
+            report = self._consolidate(user_id)
+            print(f"🗜️ 메모리 압축 완료: {report.get('deleted', 0)}개 삭제")
             return True
             
         except Exception as e:
+            self.counters.apply_delete(user_id, -1)
             print(f"⚠️ 메모리 압축 중 오류: {e}")
-            return False
\ No newline at end of file
+            return False
@@ -0,0 +1,159 @@
+"""
+메모리 일괄 처리 (clear/compress/stats)
+- iter_memories(): 사용자의 메모리를 page_size개씩 스트리밍
+    로컬 벡터 메모리는 iter_memories, mem0 클라우드(MemoryClient)는 page/page_size 페이지 조회,
+    그 외(mem0 Memory)는 get_all 한 번으로 받아 페이지로 나눔
+- bulk_delete(): batch_size개씩 묶어 workers개 요청을 동시에 보냄
+    delete_many(로컬) > batch_delete(mem0 클라우드, 요청당 최대 1000개) > 개별 delete 병렬 호출 순으로 사용
+- clear_all(): delete_all이 있으면 한 번에, 없으면 페이지 조회 + bulk_delete
+- MemoryCounters: 사용자별 메모리 개수를 유지해 통계를 O(1)로 제공
+    처음 한 번만 셈(count가 있으면 그대로)하고 이후 add/delete 결과로 갱신
+"""
+from __future__ import annotations
+
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from .search import normalize_search_result
+
+
+@dataclass
+class BulkSettings:
+    """memory.settings.bulk 설정"""
+    # 페이지 조회 크기
+    page_size: int = 500
+    # 일괄 삭제 요청당 메모리 수 (mem0 클라우드 batch_delete, 최대 1000)
+    batch_size: int = 100
+    # 동시에 보낼 삭제 요청 수
+    workers: int = 8
+
+
+def _is_paginated_client(memory: Any) -> bool:
+    # mem0 MemoryClient (클라우드 API)는 page/page_size 조회와 batch_delete를 지원
+    return hasattr(memory, "batch_delete") and hasattr(memory, "api_key")
+
+
+def iter_memories(memory: Any, user_id: str, page_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+    """사용자의 메모리를 페이지 단위로 반환"""
+    if hasattr(memory, "iter_memories"):
+        yield from memory.iter_memories(user_id, page_size)
+        return
+    if _is_paginated_client(memory):
+        page = 1
+        while True:
+            results = normalize_search_result(memory.get_all(
+                version="v2", filters={"user_id": user_id}, page=page, page_size=page_size))
+            if results:
+                yield results
+            if len(results) < page_size:
+                return
+            page += 1
+    # 페이지 조회가 없는 백엔드: 한 번에 받아서 나눔
+    results = normalize_search_result(memory.get_all(user_id=user_id, limit=2 ** 31 - 1))
+    for start in range(0, len(results), max(1, page_size)):
+        yield results[start:start + page_size]
+
+
+def count_memories(memory: Any, user_id: str, page_size: int = 500) -> int:
+    if hasattr(memory, "count"):
+        return memory.count(user_id)
+    return sum(len(page) for page in iter_memories(memory, user_id, page_size))
+
+
+def bulk_delete(memory: Any, memory_ids: List[str], settings: Optional[BulkSettings] = None) -> int:
+    """메모리 ID 목록을 묶음 단위로 동시에 삭제 (삭제한 개수 반환)"""
+    settings = settings or BulkSettings()
+    if not memory_ids:
+        return 0
+    if hasattr(memory, "delete_many"):
+        return memory.delete_many(memory_ids)
+
+    if _is_paginated_client(memory):
+        size = max(1, min(settings.batch_size, 1000))
+        batches = [memory_ids[start:start + size] for start in range(0, len(memory_ids), size)]
+
+        def _delete(batch: List[str]) -> int:
+            memory.batch_delete([{"memory_id": memory_id} for memory_id in batch])
+            return len(batch)
+    else:
+        # 개별 delete만 가능: workers개 스레드로 동시에 호출
+        batches = [[memory_id] for memory_id in memory_ids]
+
+        def _delete(batch: List[str]) -> int:
+            memory.delete(batch[0])
+            return 1
+
+    with ThreadPoolExecutor(max_workers=max(1, settings.workers), thread_name_prefix="memory-bulk") as pool:
+        return sum(pool.map(_delete, batches))
+
+
+def clear_all(memory: Any, user_id: str, settings: Optional[BulkSettings] = None) -> int:
+    """사용자의 메모리를 모두 삭제 (삭제한 개수 반환, 알 수 없으면 -1)"""
+    settings = settings or BulkSettings()
+    if hasattr(memory, "delete_all"):
+        result = memory.delete_all(user_id=user_id)
+        return result if isinstance(result, int) else -1
+    memory_ids = [item["id"] for page in iter_memories(memory, user_id, settings.page_size)
+                  for item in page if isinstance(item, dict) and "id" in item]
+    return bulk_delete(memory, memory_ids, settings)
+
+
+class MemoryCounters:
+    """사용자별 메모리 개수 (스레드 안전)"""
+
+    def __init__(self, memory: Any, page_size: int = 500):
+        self.memory = memory
+        self.page_size = page_size
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+
+    def get(self, user_id: str) -> int:
+        with self._lock:
+            if user_id in self._counts:
+                return self._counts[user_id]
+        # 처음 조회하는 사용자만 셈 (잠금 밖에서)
+        count = count_memories(self.memory, user_id, self.page_size)
+        with self._lock:
+            return self._counts.setdefault(user_id, count)
+
+    def apply_add(self, user_id: str, add_result: Any) -> None:
+        """add 결과의 ADD/DELETE 이벤트를 반영"""
+        with self._lock:
+            if user_id not in self._counts:
+                return
+            results = normalize_search_result(add_result)
+            if not results and not isinstance(add_result, (dict, list)):
+                # 결과 형식을 알 수 없으면 다음 조회 때 다시 셈
+                del self._counts[user_id]
+                return
+            for item in results:
+                event = item.get("event") if isinstance(item, dict) else None
+                if event == "ADD":
+                    self._counts[user_id] += 1
+                elif event == "DELETE":
+                    self._counts[user_id] -= 1
+            self._counts[user_id] = max(0, self._counts[user_id])
+
+    def apply_delete(self, user_id: str, deleted: int) -> None:
+        with self._lock:
+            if user_id not in self._counts:
+                return
+            if deleted < 0:
+                del self._counts[user_id]
+            else:
+                self._counts[user_id] = max(0, self._counts[user_id] - deleted)
+
+    def adjust(self, user_id: str, delta: int) -> None:
+        """개수를 delta만큼 바꿈 (그 사이에 반영된 add/delete를 덮어쓰지 않음)"""
+        with self._lock:
+            if user_id in self._counts:
+                self._counts[user_id] = max(0, self._counts[user_id] + delta)
+
+    def set(self, user_id: str, count: int) -> None:
+        with self._lock:
+            self._counts[user_id] = max(0, count)
+
+    def reset(self, user_id: str) -> None:
+        self.set(user_id, 0)
@@ -0,0 +1,271 @@
+"""
+메모리 백그라운드 정리(consolidation)
+- 중요도 = 최근성(반감기 half_life_days) × w_recency + 조회 빈도 × w_frequency + 고유성(1 - 최대 유사도) × w_uniqueness
+- 유사도가 cluster_threshold 이상인 메모리 묶음을 하나로 합침
+    summarizer가 없으면 묶음에서 가장 중요한 메모리를 대표로 남기고 나머지를 삭제
+    merge_strategy="concat"(또는 summarizer 지정)이면 요약문을 새 메모리로 저장하고 묶음을 삭제
+- 합친 뒤에도 compression_threshold를 넘으면 중요도가 낮은 메모리부터 target_ratio × threshold개까지 삭제
+- 전용 스레드에서 interval초마다 또는 임계값을 넘은 사용자가 생기면 바로 실행 (대화 턴을 막지 않음)
+- 유사도 병합/고유성은 의미 기반 임베더(google/openai)를 쓰는 로컬 벡터 메모리에서만 사용
+    mem0는 저장된 임베딩을 꺼낼 수 없고, 글자 기반 hashing 임베딩(로컬 메모리 기본값)은 한 단어만 다른 사실
+    ("서울에 산다"/"부산에 산다")도 같은 메모리로 보므로 병합하지 않고 최근성/조회 빈도로만 줄임
+"""
+from __future__ import annotations
+
+import math
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional, Set
+
+import numpy as np
+
+from .bulk import BulkSettings, bulk_delete, iter_memories
+from .embeddings import HashingEmbedder
+
+
+@dataclass
+class ConsolidationSettings:
+    """memory.settings.consolidation 설정"""
+    enabled: bool = True
+    # 주기 실행 간격 (초)
+    interval: float = 3600.0
+    # 이 유사도 이상인 메모리들을 하나로 합침
+    cluster_threshold: float = 0.9
+    # 임계값 초과 시 threshold × target_ratio개까지 줄임
+    target_ratio: float = 0.8
+    half_life_days: float = 30.0
+    w_recency: float = 0.5
+    w_frequency: float = 0.3
+    w_uniqueness: float = 0.2
+    # 묶음 처리 방식: "representative" (대표만 남김) | "concat" (서로 다른 문장을 합친 요약문으로 교체)
+    merge_strategy: str = "representative"
+
+
+@dataclass
+class ConsolidationStats:
+    runs: int = 0
+    merged: int = 0
+    evicted: int = 0
+    last_run_ms: float = 0.0
+
+
+def _age_days(created_at: Any, now: datetime) -> float:
+    try:
+        created = datetime.fromisoformat(str(created_at).replace("Z", "+00:00"))
+    except (TypeError, ValueError):
+        return 0.0
+    if created.tzinfo is not None:
+        # mem0 timestamp(타임존 포함)는 로컬 시각으로 맞춤
+        created = created.astimezone().replace(tzinfo=None)
+    return max(0.0, (now - created).total_seconds() / 86400)
+
+
+def concat_summary(texts: List[str], max_sentences: int = 20) -> str:
+    """묶음의 문장을 순서대로 모으되 이미 나온 문장은 빼고 합침 (최대 max_sentences문장)"""
+    seen, sentences = set(), []
+    for text in texts:
+        for sentence in re.split(r'(?<=[.!?。])\s+|\n+', text or ""):
+            key = " ".join(sentence.lower().split())
+            if key and key not in seen:
+                seen.add(key)
+                sentences.append(sentence.strip())
+    return " ".join(sentences[:max_sentences])
+
+
+class AccessTracker:
+    """메모리별 검색 노출 횟수 (스레드 안전, 프로세스 메모리에만 유지)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+
+    def record(self, memories: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            for memory in memories:
+                if isinstance(memory, dict) and memory.get("id"):
+                    self._counts[memory["id"]] = self._counts.get(memory["id"], 0) + 1
+
+    def get(self, memory_id: str) -> int:
+        with self._lock:
+            return self._counts.get(memory_id, 0)
+
+    def forget(self, memory_ids: List[str]) -> None:
+        with self._lock:
+            for memory_id in memory_ids:
+                self._counts.pop(memory_id, None)
+
+
+class MemoryConsolidator:
+    """한 사용자의 메모리를 중요도 기준으로 합치고 줄임"""
+
+    def __init__(self, memory: Any, threshold: int, settings: Optional[ConsolidationSettings] = None,
+                 bulk_settings: Optional[BulkSettings] = None, access: Optional[AccessTracker] = None,
+                 summarizer: Optional[Callable[[List[str]], str]] = None):
+        self.memory = memory
+        self.threshold = threshold
+        self.settings = settings or ConsolidationSettings()
+        self.bulk_settings = bulk_settings or BulkSettings()
+        self.access = access or AccessTracker()
+        if summarizer is None and self.settings.merge_strategy == "concat":
+            summarizer = concat_summary
+        self.summarizer = summarizer
+        # 백엔드에 의미 기반 임베딩이 없으면(mem0, hashing) 병합하지 않음
+        embedder = getattr(memory, "embedder", None)
+        self.embedder = None if isinstance(embedder, HashingEmbedder) else embedder
+        self.counters = ConsolidationStats()
+        self._lock = threading.Lock()
+
+    def _similarity(self, vectors: np.ndarray) -> tuple:
+        """행렬 곱을 1024행씩 나눠 계산해서 (각 메모리의 최대 유사도, cluster_threshold 이상인 이웃 목록) 반환"""
+        count = len(vectors)
+        max_sim = np.zeros(count)
+        neighbors: List[np.ndarray] = []
+        for start in range(0, count, 1024):
+            sims = vectors[start:start + 1024] @ vectors.T
+            rows = np.arange(len(sims))
+            sims[rows, start + rows] = -1.0
+            max_sim[start:start + len(sims)] = np.clip(sims.max(axis=1), 0.0, 1.0)
+            neighbors.extend(np.flatnonzero(row >= self.settings.cluster_threshold) for row in sims)
+        return max_sim, neighbors
+
+    def score(self, memories: List[Dict[str, Any]], max_sim: np.ndarray,
+              now: Optional[datetime] = None) -> np.ndarray:
+        """메모리별 중요도 (0~1)"""
+        now = now or datetime.now()
+        settings = self.settings
+        decay = math.log(2) / max(settings.half_life_days, 1e-6)
+        recency = np.array([math.exp(-decay * _age_days(memory.get("created_at"), now)) for memory in memories])
+        hits = np.array([self.access.get(memory.get("id", "")) for memory in memories], dtype=np.float64)
+        frequency = np.log1p(hits) / math.log1p(hits.max()) if hits.max() > 0 else np.zeros(len(memories))
+        return (settings.w_recency * recency + settings.w_frequency * frequency
+                + settings.w_uniqueness * (1.0 - max_sim))
+
+    @staticmethod
+    def _clusters(neighbors: List[np.ndarray], order: np.ndarray) -> List[List[int]]:
+        """중요도 순으로 훑으면서 아직 묶이지 않은 비슷한 메모리를 모음 (첫 원소가 대표)"""
+        assigned = np.zeros(len(neighbors), dtype=bool)
+        clusters = []
+        for i in order.tolist():
+            if assigned[i]:
+                continue
+            members = [i] + [j for j in neighbors[i].tolist() if not assigned[j]]
+            assigned[members] = True
+            if len(members) > 1:
+                clusters.append(members)
+        return clusters
+
+    def consolidate(self, user_id: str, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """비슷한 메모리를 합치고, 임계값을 넘으면 중요도가 낮은 메모리를 삭제"""
+        with self._lock:
+            started = time.perf_counter()
+            memories = [memory for page in iter_memories(self.memory, user_id, self.bulk_settings.page_size)
+                        for memory in page if isinstance(memory, dict) and memory.get("id")]
+            report = {"user_id": user_id, "before": len(memories), "merged": 0, "evicted": 0, "after": len(memories)}
+            if len(memories) < 2:
+                return report
+
+            if self.embedder is not None:
+                vectors = self.embedder.embed_documents([memory.get("memory", "") for memory in memories])
+                max_sim, neighbors = self._similarity(vectors)
+            else:
+                max_sim = np.zeros(len(memories))
+                neighbors = [np.zeros(0, dtype=np.int64) for _ in memories]
+            order = np.argsort(-self.score(memories, max_sim, now))
+
+            delete_ids: List[str] = []
+            removed: Set[int] = set()
+            summaries: List[tuple] = []
+            for members in self._clusters(neighbors, order):
+                if self.summarizer is not None:
+                    summaries.append((self.summarizer([memories[j].get("memory", "") for j in members]), len(members)))
+                    merged = members
+                else:
+                    # 대표(가장 중요한 메모리)만 남김
+                    merged = members[1:]
+                delete_ids.extend(memories[j]["id"] for j in merged)
+                removed.update(merged)
+                report["merged"] += len(merged)
+
+            remaining = [i for i in order.tolist() if i not in removed]
+            remaining_total = len(remaining) + len(summaries)
+            if remaining_total > self.threshold:
+                # 중요도가 낮은 순서로 threshold × target_ratio개까지 삭제
+                keep = max(0, int(self.threshold * self.settings.target_ratio) - len(summaries))
+                evicted = remaining[keep:]
+                delete_ids.extend(memories[i]["id"] for i in evicted)
+                report["evicted"] = len(evicted)
+
+            deleted = bulk_delete(self.memory, delete_ids, self.bulk_settings)
+            self.access.forget(delete_ids)
+            # 요약문은 원본을 지운 뒤 저장 (원본과 거의 같은 요약이 중복으로 걸러지지 않도록)
+            for summary, size in summaries:
+                self.memory.add(messages=[{"role": "user", "content": summary}], user_id=user_id,
+                                infer=False, metadata={"consolidated_from": size})
+            report["deleted"] = deleted
+            report["after"] = len(memories) - deleted + len(summaries)
+            self.counters.runs += 1
+            self.counters.merged += report["merged"]
+            self.counters.evicted += report["evicted"]
+            self.counters.last_run_ms = round((time.perf_counter() - started) * 1000, 3)
+            return report
+
+    def stats(self) -> Dict[str, Any]:
+        counters = asdict(self.counters)
+        counters["merging"] = self.embedder is not None
+        return counters
+
+
+class ConsolidationScheduler:
+    """주기적으로, 또는 요청된 사용자에 대해 바로 consolidation을 실행하는 백그라운드 스레드"""
+
+    def __init__(self, run: Callable[[str], Any], settings: Optional[ConsolidationSettings] = None,
+                 name: str = "memory"):
+        self.run = run
+        self.settings = settings or ConsolidationSettings()
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._requested: Set[str] = set()
+        self._known: Set[str] = set()
+        self._stopped = False
+        self._thread = threading.Thread(target=self._loop, name=f"{name}-consolidation", daemon=True)
+        self._thread.start()
+
+    def track(self, user_id: str) -> None:
+        """주기 실행 대상 사용자 등록"""
+        with self._lock:
+            self._known.add(user_id)
+
+    def request(self, user_id: str) -> None:
+        """해당 사용자에 대해 가능한 빨리 실행"""
+        with self._lock:
+            self._known.add(user_id)
+            self._requested.add(user_id)
+        self._wake.set()
+
+    def close(self) -> None:
+        self._stopped = True
+        self._wake.set()
+        self._thread.join(5)
+
+    def _loop(self) -> None:
+        next_run = time.monotonic() + self.settings.interval
+        while not self._stopped:
+            self._wake.wait(max(0.0, next_run - time.monotonic()))
+            self._wake.clear()
+            if self._stopped:
+                return
+            with self._lock:
+                if time.monotonic() >= next_run:
+                    users = set(self._known)
+                    next_run = time.monotonic() + self.settings.interval
+                else:
+                    users = set(self._requested)
+                self._requested.clear()
+            for user_id in sorted(users):
+                try:
+                    self.run(user_id)
+                except Exception as e:
+                    print(f"⚠️ 메모리 정리 실패 [{user_id}]: {e}")
@@ -0,0 +1,97 @@
+"""
+로컬 벡터 메모리용 임베딩
+- "hashing" (기본): 외부 호출 없는 feature hashing 임베딩. Recorder 검색과 같은 토큰화
+  (영어/숫자 단어, 한글 음절 bigram)를 dim 차원에 부호 있는 해시로 누적한 뒤 L2 정규화
+- "google" / "openai": langchain 임베딩 모델 사용 (API 키 필요, 의미 기반 검색)
+
+모든 임베더는 L2 정규화된 float32 행렬을 반환하므로 내적이 곧 코사인 유사도입니다.
+"""
+from __future__ import annotations
+
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import List, Optional
+
+import numpy as np
+
+from modules.recorder_store.text_index import tokenize
+
+
+@dataclass
+class EmbeddingSettings:
+    """memory.local.embedding 설정"""
+    provider: str = "hashing"
+    # hashing 임베딩 차원 (google/openai는 모델 차원을 그대로 사용)
+    dim: int = 512
+    # google/openai 임베딩 모델 이름
+    model: Optional[str] = None
+
+
+def _normalize(matrix: np.ndarray) -> np.ndarray:
+    matrix = np.asarray(matrix, dtype=np.float32)
+    if matrix.ndim == 1:
+        matrix = matrix[None, :]
+    norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+class HashingEmbedder:
+    """토큰을 해시해서 고정 차원 벡터로 만드는 오프라인 임베더"""
+
+    def __init__(self, dim: int = 512):
+        self.dim = dim
+
+    def _embed(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dim, dtype=np.float32)
+        for token in tokenize(text):
+            digest = hashlib.blake2b(token.encode('utf-8'), digest_size=8).digest()
+            value = int.from_bytes(digest, 'little')
+            vector[value % self.dim] += 1.0 if (value >> 63) & 1 else -1.0
+        return vector
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        return _normalize(np.stack([self._embed(text) for text in texts]) if texts
+                          else np.zeros((0, self.dim), dtype=np.float32))
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return self.embed_documents([text])[0]
+
+
+class LangChainEmbedder:
+    """langchain 임베딩 모델을 L2 정규화된 numpy 행렬로 감쌈"""
+
+    def __init__(self, model):
+        self.model = model
+        self.dim = len(model.embed_query("dimension probe"))
+
+    def embed_documents(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.zeros((0, self.dim), dtype=np.float32)
+        return _normalize(self.model.embed_documents(texts))
+
+    def embed_query(self, text: str) -> np.ndarray:
+        return _normalize(self.model.embed_query(text))[0]
+
+
+def create_embedder(settings: Optional[EmbeddingSettings] = None):
+    """embedding 설정으로 임베더 생성"""
+    settings = settings or EmbeddingSettings()
+    if settings.provider == "hashing":
+        return HashingEmbedder(settings.dim)
+    if settings.provider == "google":
+        from langchain_google_genai import GoogleGenerativeAIEmbeddings
+        api_key = os.getenv("GOOGLE_API_KEY")
+        if not api_key:
+            raise ValueError("Google API 키가 설정되지 않았습니다.")
+        return LangChainEmbedder(GoogleGenerativeAIEmbeddings(
+            model=settings.model or "models/text-embedding-004", google_api_key=api_key))
+    if settings.provider == "openai":
+        from langchain_openai import OpenAIEmbeddings
+        api_key = os.getenv("OPENAI_API_KEY")
+        if not api_key:
+            raise ValueError("OpenAI API 키가 설정되지 않았습니다.")
+        return LangChainEmbedder(OpenAIEmbeddings(
+            model=settings.model or "text-embedding-3-small", openai_api_key=api_key))
+    raise ValueError(f"지원하지 않는 임베딩 공급자입니다: {settings.provider}")
@@ -0,0 +1,94 @@
+"""
+메모리 비동기 검색
+- MemoryNode는 검색을 스레드 풀에 넘기고 PendingSearch 핸들만 state["memory"]에 넣음
+- 검색은 RAG 노드 등이 도는 동안 백그라운드에서 진행되고, LLM 노드가 결과가 필요할 때 기다림
+    이벤트 루프에서는 aresult()/aresolve_related_memories()로 기다림 (다른 요청 처리를 막지 않음)
+- 시간 초과/오류 시 빈 목록으로 처리 (메모리 없이 답변)
+"""
+from __future__ import annotations
+
+import asyncio
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Any, Dict, List, Optional
+
+
+def normalize_search_result(search_result: Any) -> List[Dict[str, Any]]:
+    """mem0 검색 결과(딕셔너리 {"results": [...]} 또는 리스트)를 리스트로 변환"""
+    if isinstance(search_result, dict) and 'results' in search_result:
+        return search_result['results']
+    if isinstance(search_result, list):
+        return search_result
+    return []
+
+
+class PendingSearch:
+    """진행 중인 메모리 검색 (여러 번 result()를 호출해도 한 번만 기다림)"""
+
+    def __init__(self, future: Future, timeout: Optional[float] = 5.0):
+        self.future = future
+        self.timeout = timeout
+        self.started = time.perf_counter()
+        self._result: Optional[List[Dict[str, Any]]] = None
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def result(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """검색 결과를 기다려서 반환 (시간 초과/오류 시 빈 목록, 호출한 스레드를 막음)"""
+        if self._result is not None:
+            return self._result
+        waited = time.perf_counter()
+        try:
+            self._result = normalize_search_result(
+                self.future.result(self.timeout if timeout is None else timeout))
+        except FutureTimeoutError:
+            print(f"⚠️ 메모리 검색 시간 초과 ({self.timeout}s): 메모리 없이 진행합니다.")
+            self._result = []
+        except Exception as e:
+            print(f"⚠️ 메모리 검색 실패: {e}")
+            self._result = []
+        return self._finish(waited)
+
+    async def aresult(self, timeout: Optional[float] = None) -> List[Dict[str, Any]]:
+        """result()와 같지만 이벤트 루프를 막지 않고 기다림"""
+        if self._result is not None:
+            return self._result
+        waited = time.perf_counter()
+        try:
+            # 시간 초과로 기다리기를 그만둬도 검색 스레드의 작업은 취소하지 않음
+            self._result = normalize_search_result(await asyncio.wait_for(
+                asyncio.shield(asyncio.wrap_future(self.future)), self.timeout if timeout is None else timeout))
+        except asyncio.TimeoutError:
+            print(f"⚠️ 메모리 검색 시간 초과 ({self.timeout}s): 메모리 없이 진행합니다.")
+            self._result = []
+        except Exception as e:
+            print(f"⚠️ 메모리 검색 실패: {e}")
+            self._result = []
+        return self._finish(waited)
+
+    def _finish(self, waited: float) -> List[Dict[str, Any]]:
+        now = time.perf_counter()
+        print(f"🔍 관련 메모리 검색 결과: {len(self._result)}개 "
+              f"(검색 {(now - self.started) * 1000:.0f}ms, 대기 {(now - waited) * 1000:.0f}ms)")
+        return self._result
+
+
+def resolve_related_memories(memory_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """state["memory"]에서 관련 메모리 목록을 꺼냄 (검색이 진행 중이면 완료까지 대기)"""
+    if memory_data.get('status') != 'active':
+        return []
+    pending = memory_data.get('pending_search')
+    if isinstance(pending, PendingSearch):
+        return pending.result()
+    return memory_data.get('related_memories') or []
+
+
+async def aresolve_related_memories(memory_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """resolve_related_memories의 비동기 버전 (이벤트 루프를 막지 않고 검색 완료를 기다림)"""
+    if memory_data.get('status') != 'active':
+        return []
+    pending = memory_data.get('pending_search')
+    if isinstance(pending, PendingSearch):
+        return await pending.aresult()
+    return memory_data.get('related_memories') or []
@@ -0,0 +1,142 @@
+"""
+사용자별 메모리 검색 캐시 (LRU + TTL)
+- 키: (정규화된 질의, search_limit). 질의는 NFC 정규화 + 소문자 + 공백 정리
+- 사용자별로 최대 max_entries개, ttl초가 지나면 만료
+- 사용자의 메모리가 바뀌면(add/delete/clear/compress) 그 사용자의 캐시만 무효화
+- 무효화 세대(generation)를 두어, 무효화 전에 시작된 검색 결과가 나중에 캐시에 들어가지 않도록 함
+"""
+from __future__ import annotations
+
+import re
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+_SPACE_RE = re.compile(r'\s+')
+
+
+def normalize_query(query: str) -> str:
+    return _SPACE_RE.sub(' ', unicodedata.normalize('NFC', query or '').lower()).strip()
+
+
+def add_changed_memory(add_result: Any) -> bool:
+    """add 결과로 메모리가 실제로 바뀌었는지 판단 (모든 항목이 event "NONE"이면 변경 없음)"""
+    if isinstance(add_result, dict) and isinstance(add_result.get('results'), list):
+        return any(item.get('event') != 'NONE' for item in add_result['results'] if isinstance(item, dict))
+    return True
+
+
+@dataclass
+class SearchCacheSettings:
+    """memory.settings.search_cache 설정"""
+    enabled: bool = True
+    # 사용자별 최대 항목 수
+    max_entries: int = 128
+    # 항목 유효 시간 (초, None이면 무효화될 때까지 유지)
+    ttl: Optional[float] = 300.0
+
+
+@dataclass
+class SearchCacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    invalidations: int = 0
+    stale_skips: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        counters = asdict(self)
+        lookups = self.hits + self.misses
+        counters["hit_rate"] = round(self.hits / lookups, 3) if lookups else 0.0
+        return counters
+
+
+class _UserCache:
+    def __init__(self):
+        self.entries: "OrderedDict[Tuple[str, int], Tuple[float, List[Dict[str, Any]]]]" = OrderedDict()
+        self.generation = 0
+        self.counters = SearchCacheStats()
+
+
+class MemorySearchCache:
+    """사용자별 검색 결과 캐시 (스레드 안전)"""
+
+    def __init__(self, settings: Optional[SearchCacheSettings] = None):
+        self.settings = settings or SearchCacheSettings()
+        self.counters = SearchCacheStats()
+        self._lock = threading.Lock()
+        self._users: Dict[str, _UserCache] = {}
+
+    def _user(self, user_id: str) -> _UserCache:
+        cache = self._users.get(user_id)
+        if cache is None:
+            cache = self._users[user_id] = _UserCache()
+        return cache
+
+    def get(self, user_id: str, query: str, limit: int) -> Optional[List[Dict[str, Any]]]:
+        """캐시된 검색 결과 (없거나 만료되면 None)"""
+        if not self.settings.enabled:
+            return None
+        key = (normalize_query(query), limit)
+        with self._lock:
+            cache = self._user(user_id)
+            entry = cache.entries.get(key)
+            if entry is not None and self.settings.ttl is not None \
+                    and time.monotonic() - entry[0] > self.settings.ttl:
+                del cache.entries[key]
+                entry = None
+                for counters in (cache.counters, self.counters):
+                    counters.expired += 1
+            for counters in (cache.counters, self.counters):
+                if entry is None:
+                    counters.misses += 1
+                else:
+                    counters.hits += 1
+            if entry is None:
+                return None
+            cache.entries.move_to_end(key)
+            return entry[1]
+
+    def generation(self, user_id: str) -> int:
+        """검색을 시작하기 전에 읽어 두었다가 put()에 넘기는 무효화 세대"""
+        with self._lock:
+            return self._user(user_id).generation
+
+    def put(self, user_id: str, query: str, limit: int, results: List[Dict[str, Any]], generation: int) -> None:
+        """검색 결과 저장 (검색 중에 무효화되었으면 버림)"""
+        if not self.settings.enabled:
+            return
+        with self._lock:
+            cache = self._user(user_id)
+            if cache.generation != generation:
+                for counters in (cache.counters, self.counters):
+                    counters.stale_skips += 1
+                return
+            key = (normalize_query(query), limit)
+            cache.entries[key] = (time.monotonic(), results)
+            cache.entries.move_to_end(key)
+            while len(cache.entries) > max(1, self.settings.max_entries):
+                cache.entries.popitem(last=False)
+
+    def invalidate(self, user_id: str) -> None:
+        """사용자의 메모리가 바뀌었을 때 호출"""
+        with self._lock:
+            cache = self._user(user_id)
+            cache.generation += 1
+            cache.entries.clear()
+            for counters in (cache.counters, self.counters):
+                counters.invalidations += 1
+
+    def stats(self, user_id: Optional[str] = None) -> Dict[str, Any]:
+        with self._lock:
+            if user_id is None:
+                counters = self.counters.as_dict()
+                counters["entries"] = sum(len(cache.entries) for cache in self._users.values())
+                return counters
+            cache = self._user(user_id)
+            counters = cache.counters.as_dict()
+            counters["entries"] = len(cache.entries)
+            return counters
@@ -0,0 +1,567 @@
+"""
+로컬 벡터 메모리 (memory.type = "in_memory")
+- 사용자별 파티션 디렉터리 (<path>/<사용자 slug>-<해시>/)
+    meta.json     사용자 ID, 임베딩 차원, 파일 세대
+    vectors.f32   L2 정규화된 float32 임베딩 행렬 (np.memmap, 가득 차면 두 배로 확장)
+    items.jsonl   메모리 본문/생성 시각 추가·삭제 로그 (append-only, 시작 시 재생)
+- 삭제된 행이 살아 있는 행보다 많아지면(또는 전부 삭제되면) 파티션을 새 세대 파일(vectors-<세대>.f32, items-<세대>.jsonl)로
+  다시 쓰고 meta.json 교체로 전환 (중간에 죽어도 이전 세대가 그대로 유효)
+- 검색: 파티션 행렬과 질의 벡터의 내적(코사인 유사도)을 한 번에 계산하고 argpartition으로 top-k
+- 행이 ivf.min_rows를 넘으면 IVF 인덱스(spherical k-means, nlist≈√N)를 학습해 nprobe개 리스트만 탐색
+- 거의 같은 내용(유사도 ≥ dedupe_threshold)은 다시 저장하지 않음. hashing 임베딩은 단어 겹침만 보므로
+  ("땅콩 알레르기가 있다" / "땅콩 알레르기가 없다"도 0.95 이상) 공백/대소문자만 다른 같은 본문일 때만 중복으로 봄
+- 임베딩 차원이 바뀌면(임베더 변경) 저장된 본문으로 다시 임베딩
+
+MemoryNode가 쓰는 mem0 Memory와 같은 add/search/get_all/delete 인터페이스를 제공합니다.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+import uuid
+from dataclasses import dataclass, asdict, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import numpy as np
+
+from .embeddings import EmbeddingSettings, HashingEmbedder, create_embedder
+
+VECTOR_FILE = "vectors.f32"
+ITEMS_FILE = "items.jsonl"
+META_FILE = "meta.json"
+# hashing 임베더로 중복을 볼 때 본문을 비교할 후보 수 (구두점만 다른 본문은 같은 벡터라 동점이 생김)
+_LEXICAL_CANDIDATES = 4
+
+
+def _partition_name(user_id: str) -> str:
+    slug = re.sub(r'[^0-9A-Za-z_.-]+', '_', user_id)[:40] or "user"
+    return f"{slug}-{hashlib.sha1(user_id.encode('utf-8')).hexdigest()[:8]}"
+
+
+def _normalize_text(text: str) -> str:
+    return " ".join(text.split()).casefold()
+
+
+def message_contents(messages: Any) -> List[str]:
+    """mem0 add 형식(문자열, 메시지 딕셔너리, 메시지 리스트)에서 저장할 본문 목록을 꺼냄"""
+    if isinstance(messages, str):
+        messages = [messages]
+    elif isinstance(messages, dict):
+        messages = [messages]
+    contents = []
+    for message in messages or []:
+        if isinstance(message, dict):
+            if message.get("role") == "system":
+                continue
+            message = message.get("content") or ""
+        text = str(message).strip()
+        if text:
+            contents.append(text)
+    return contents
+
+
+@dataclass
+class IVFSettings:
+    """memory.local.ivf 설정"""
+    enabled: bool = True
+    # 파티션의 행 수가 이 값 이상이면 IVF 인덱스 사용 (미만이면 전체 행렬 검색)
+    min_rows: int = 20000
+    # 검색 시 탐색할 리스트 수
+    nprobe: int = 8
+    # 마지막 학습 이후 행 수가 이 배율만큼 늘면 다시 학습
+    retrain_growth: float = 2.0
+    # k-means 반복 횟수 / 학습 표본 수
+    iterations: int = 10
+    sample_size: int = 50000
+
+
+@dataclass
+class LocalMemorySettings:
+    """memory.local 설정"""
+    path: str = field(default_factory=lambda: os.path.join(_base_dir(), "data", "memory"))
+    # 이 유사도 이상인 기존 메모리가 있으면 저장하지 않음 (1.0 초과면 비활성화)
+    dedupe_threshold: float = 0.95
+    # 새 파티션의 초기 행 수
+    initial_capacity: int = 1024
+    # 삭제된 행이 이 수 이상이고 살아 있는 행보다 많으면(또는 모두 삭제되면) 파티션 compact
+    compact_min_deleted: int = 1024
+
+
+@dataclass
+class LocalMemoryStats:
+    added: int = 0
+    deduplicated: int = 0
+    deleted: int = 0
+    searches: int = 0
+    ivf_searches: int = 0
+
+
+class _IVFIndex:
+    """spherical k-means 기반 inverted file 인덱스 (메모리에만 유지, 필요할 때 다시 학습)"""
+
+    def __init__(self, vectors: np.ndarray, rows: np.ndarray, settings: IVFSettings):
+        self.settings = settings
+        self.trained_rows = len(rows)
+        nlist = int(min(4096, max(16, np.sqrt(len(rows)))))
+        rng = np.random.default_rng(0)
+        sample = rows if len(rows) <= settings.sample_size else rng.choice(rows, settings.sample_size, replace=False)
+        data = np.asarray(vectors[sample])
+        centroids = data[rng.choice(len(data), nlist, replace=False)].copy()
+        for _ in range(settings.iterations):
+            assign = np.argmax(data @ centroids.T, axis=1)
+            for k in range(nlist):
+                members = data[assign == k]
+                centroids[k] = members.sum(axis=0) if len(members) else data[rng.integers(len(data))]
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+        self.centroids = centroids
+        self.lists: List[List[int]] = [[] for _ in range(nlist)]
+        self.assign(vectors, rows)
+
+    def assign(self, vectors: np.ndarray, rows: np.ndarray) -> None:
+        if len(rows) == 0:
+            return
+        for row, k in zip(rows.tolist(), np.argmax(np.asarray(vectors[rows]) @ self.centroids.T, axis=1).tolist()):
+            self.lists[k].append(row)
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        nprobe = min(self.settings.nprobe, len(self.lists))
+        probe = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+        return np.fromiter((row for k in probe for row in self.lists[k]), dtype=np.int64)
+
+
+class _Partition:
+    """한 사용자의 임베딩 행렬 + 메모리 본문"""
+
+    def __init__(self, directory: str, user_id: str, dim: int, settings: LocalMemorySettings,
+                 ivf_settings: IVFSettings):
+        self.directory = directory
+        self.user_id = user_id
+        self.dim = dim
+        self.settings = settings
+        self.ivf_settings = ivf_settings
+        self.lock = threading.RLock()
+        self.rows = 0
+        self.generation = 0
+        self.row_ids: List[str] = []
+        self.row_of: Dict[str, int] = {}
+        self.items: Dict[str, Dict[str, Any]] = {}
+        self.alive = np.zeros(0, dtype=bool)
+        self.vectors: Optional[np.memmap] = None
+        self.ivf: Optional[_IVFIndex] = None
+        self._items_file = None
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self.vectors is None else self.vectors.shape[0]
+
+    @property
+    def deleted(self) -> int:
+        return self.rows - len(self.items)
+
+    def _path(self, name: str, generation: Optional[int] = None) -> str:
+        generation = self.generation if generation is None else generation
+        if generation:
+            stem, ext = os.path.splitext(name)
+            name = f"{stem}-{generation}{ext}"
+        return os.path.join(self.directory, name)
+
+    def _write_meta(self) -> None:
+        meta_path = os.path.join(self.directory, META_FILE)
+        with open(meta_path + ".tmp", 'w', encoding='utf-8') as f:
+            json.dump({"user_id": self.user_id, "dim": self.dim, "generation": self.generation}, f,
+                      ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(meta_path + ".tmp", meta_path)
+
+    # ---- 영속화 ----
+    def open(self, embedder) -> None:
+        os.makedirs(self.directory, exist_ok=True)
+        meta_path = os.path.join(self.directory, META_FILE)
+        stored_dim = None
+        if os.path.exists(meta_path):
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            stored_dim = meta.get("dim")
+            self.generation = meta.get("generation", 0)
+
+        items_path = self._path(ITEMS_FILE)
+        skipped = 0
+        if os.path.exists(items_path):
+            valid_end = 0
+            with open(items_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # 충돌로 잘린 마지막 줄 (아래에서 잘라냄)
+                        break
+                    valid_end += len(line)
+                    try:
+                        entry = json.loads(line)
+                        op, item_id = entry.pop("op"), entry["id"]
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        skipped += 1
+                        continue
+                    if op == "add":
+                        self.items[item_id] = entry
+                        self.row_ids.append(item_id)
+                    elif op == "del":
+                        self.items.pop(item_id, None)
+            if os.path.getsize(items_path) != valid_end:
+                # 잘린 줄 뒤에 이어 쓰면 다음 항목까지 한 줄로 합쳐져 유실되므로 마지막 정상 줄까지 잘라냄
+                print(f"⚠️ 로컬 메모리 [{self.user_id}]: items 로그 끝의 불완전한 줄을 잘라냅니다.")
+                with open(items_path, 'r+b') as f:
+                    f.truncate(valid_end)
+            if skipped:
+                print(f"⚠️ 로컬 메모리 [{self.user_id}]: 읽을 수 없는 items 로그 {skipped}줄을 건너뜁니다.")
+        self.rows = len(self.row_ids)
+        self.row_of = {item_id: row for row, item_id in enumerate(self.row_ids)}
+
+        vector_path = self._path(VECTOR_FILE)
+        stored_rows = os.path.getsize(vector_path) // (self.dim * 4) if os.path.exists(vector_path) else 0
+        if stored_dim not in (None, self.dim) or stored_rows < self.rows or skipped:
+            # 임베더가 바뀌었거나, 벡터 파일이 본문보다 짧거나, 건너뛴 줄 때문에 행 순서를 믿을 수 없음:
+            # 본문으로 다시 임베딩
+            self._rebuild(embedder)
+        else:
+            self._map(max(stored_rows, self.settings.initial_capacity))
+        self._write_meta()
+        self.alive = np.zeros(self.capacity, dtype=bool)
+        self.alive[[row for row, item_id in enumerate(self.row_ids) if item_id in self.items]] = True
+        self._items_file = open(items_path, 'a', encoding='utf-8')
+
+    def _map(self, capacity: int) -> None:
+        vector_path = self._path(VECTOR_FILE)
+        if self.vectors is not None:
+            self.vectors.flush()
+            del self.vectors
+        with open(vector_path, 'ab') as f:
+            f.truncate(capacity * self.dim * 4)
+        self.vectors = np.memmap(vector_path, dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+
+    def _rebuild(self, embedder) -> None:
+        print(f"🔁 로컬 메모리 [{self.user_id}]: 임베딩 {self.rows}건을 다시 계산합니다.")
+        vector_path = self._path(VECTOR_FILE)
+        if os.path.exists(vector_path):
+            os.remove(vector_path)
+        self._map(max(self.rows, self.settings.initial_capacity))
+        texts = [(self.items.get(item_id) or {}).get("memory", "") for item_id in self.row_ids]
+        for start in range(0, len(texts), 256):
+            batch = texts[start:start + 256]
+            self.vectors[start:start + len(batch)] = embedder.embed_documents(batch)
+        self.vectors.flush()
+
+    def _log(self, entries: List[Dict[str, Any]]) -> None:
+        self._items_file.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+        self._items_file.flush()
+
+    def close(self) -> None:
+        with self.lock:
+            if self.vectors is not None:
+                self.vectors.flush()
+            if self._items_file is not None:
+                self._items_file.close()
+                self._items_file = None
+
+    # ---- 갱신 ----
+    def add(self, texts: List[str], vectors: np.ndarray) -> List[Dict[str, Any]]:
+        with self.lock:
+            needed = self.rows + len(texts)
+            if needed > self.capacity:
+                capacity = max(self.capacity, 1)
+                while capacity < needed:
+                    capacity *= 2
+                self._map(capacity)
+                self.alive = np.concatenate([self.alive, np.zeros(capacity - len(self.alive), dtype=bool)])
+            start = self.rows
+            # 벡터를 먼저 기록해야 본문 로그만 남고 벡터가 없는 행이 생기지 않음
+            self.vectors[start:needed] = vectors
+            self.vectors.flush()
+            now = datetime.now().isoformat()
+            items = [{"id": uuid.uuid4().hex, "memory": text, "created_at": now} for text in texts]
+            self._log([{"op": "add", **item} for item in items])
+            for row, item in enumerate(items, start):
+                self.items[item["id"]] = item
+                self.row_ids.append(item["id"])
+                self.row_of[item["id"]] = row
+            self.rows = needed
+            self.alive[start:needed] = True
+            self._maintain_ivf(np.arange(start, needed))
+            return items
+
+    def delete(self, item_ids: List[str]) -> int:
+        with self.lock:
+            removed = [item_id for item_id in item_ids if item_id in self.items]
+            if not removed:
+                return 0
+            self._log([{"op": "del", "id": item_id} for item_id in removed])
+            for item_id in removed:
+                del self.items[item_id]
+            self.alive[[self.row_of[item_id] for item_id in removed]] = False
+            if not self.items or self.deleted >= max(self.settings.compact_min_deleted, len(self.items)):
+                self.compact()
+            return len(removed)
+
+    def compact(self) -> None:
+        """살아 있는 행만 새 세대 파일로 다시 쓰고 meta.json 교체로 전환"""
+        with self.lock:
+            live_rows = np.flatnonzero(self.alive[:self.rows])
+            old_generation = self.generation
+            generation = old_generation + 1
+            capacity = max(len(live_rows), self.settings.initial_capacity)
+            vector_path = self._path(VECTOR_FILE, generation)
+            with open(vector_path, 'wb') as f:
+                f.truncate(capacity * self.dim * 4)
+            vectors = np.memmap(vector_path, dtype=np.float32, mode='r+', shape=(capacity, self.dim))
+            for start in range(0, len(live_rows), 4096):
+                chunk = live_rows[start:start + 4096]
+                vectors[start:start + len(chunk)] = self.vectors[chunk]
+            vectors.flush()
+            row_ids = [self.row_ids[row] for row in live_rows.tolist()]
+            with open(self._path(ITEMS_FILE, generation), 'w', encoding='utf-8') as f:
+                f.write("".join(json.dumps({"op": "add", **self.items[item_id]}, ensure_ascii=False) + "\n"
+                                for item_id in row_ids))
+                f.flush()
+                os.fsync(f.fileno())
+
+            # meta.json 교체가 커밋 지점
+            self.generation = generation
+            self._write_meta()
+            self._items_file.close()
+            self.vectors.flush()
+            self.vectors = vectors
+            for name in (VECTOR_FILE, ITEMS_FILE):
+                try:
+                    os.remove(self._path(name, old_generation))
+                except OSError:
+                    pass
+            self._items_file = open(self._path(ITEMS_FILE), 'a', encoding='utf-8')
+            removed = self.rows - len(row_ids)
+            self.row_ids = row_ids
+            self.row_of = {item_id: row for row, item_id in enumerate(row_ids)}
+            self.rows = len(row_ids)
+            self.alive = np.zeros(capacity, dtype=bool)
+            self.alive[:self.rows] = True
+            self.ivf = None
+            self._maintain_ivf(np.zeros(0, dtype=np.int64))
+            print(f"🗜️ 로컬 메모리 [{self.user_id}]: 삭제된 행 {removed}개 정리 (남은 메모리 {self.rows}개)")
+
+    def _maintain_ivf(self, new_rows: np.ndarray) -> None:
+        settings = self.ivf_settings
+        live = len(self.items)
+        if not settings.enabled or live < settings.min_rows:
+            self.ivf = None
+            return
+        if self.ivf is None or live >= self.ivf.trained_rows * settings.retrain_growth:
+            self.ivf = _IVFIndex(self.vectors, np.flatnonzero(self.alive[:self.rows]), settings)
+            print(f"🧭 로컬 메모리 [{self.user_id}]: IVF 인덱스 학습 ({live}건, 리스트 {len(self.ivf.lists)}개)")
+        else:
+            self.ivf.assign(self.vectors, new_rows)
+
+    # ---- 검색 ----
+    def search_batch(self, queries: np.ndarray, limit: int) -> List[List[tuple]]:
+        """질의 행렬의 각 행에 대해 (item, score) 목록을 유사도 순으로 반환"""
+        with self.lock:
+            if not self.items:
+                return [[] for _ in range(len(queries))]
+            if self.ivf is None:
+                # 재시작 후 첫 검색 등: 인덱스가 필요한데 아직 없으면 학습
+                self._maintain_ivf(np.zeros(0, dtype=np.int64))
+            if self.ivf is not None:
+                return [self._top_k(self.ivf.candidates(query), query[None, :], limit)[0] for query in queries]
+            return self._top_k(np.arange(self.rows), queries, limit)
+
+    def search(self, query: np.ndarray, limit: int) -> List[tuple]:
+        return self.search_batch(query[None, :], limit)[0]
+
+    def _top_k(self, rows: np.ndarray, queries: np.ndarray, limit: int) -> List[List[tuple]]:
+        rows = rows[self.alive[rows]]
+        if len(rows) == 0:
+            return [[] for _ in range(len(queries))]
+        # (질의 수 x 후보 행 수) 유사도를 한 번의 행렬 곱으로 계산
+        scores = queries @ np.asarray(self.vectors[rows]).T
+        k = min(limit, len(rows))
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        results = []
+        for q, candidates in enumerate(top):
+            ordered = candidates[np.argsort(-scores[q, candidates])]
+            results.append([(self.items[self.row_ids[rows[i]]], float(scores[q, i])) for i in ordered])
+        return results
+
+
+class LocalVectorMemory:
+    """사용자별 파티션으로 나뉜 로컬 벡터 메모리 (mem0 Memory 호환 인터페이스, 스레드 안전)"""
+
+    def __init__(self, settings: Optional[LocalMemorySettings] = None,
+                 embedding: Optional[EmbeddingSettings] = None, ivf: Optional[IVFSettings] = None):
+        self.settings = settings or LocalMemorySettings()
+        self.ivf_settings = ivf or IVFSettings()
+        self.embedder = create_embedder(embedding)
+        # 의미 기반 임베더일 때만 유사도만으로 중복 판단 (hashing은 본문이 같아야 중복)
+        self.semantic = not isinstance(self.embedder, HashingEmbedder)
+        self.counters = LocalMemoryStats()
+        self._lock = threading.Lock()
+        self._partitions: Dict[str, _Partition] = {}
+        # 메모리 ID -> 사용자 ID (delete(memory_id)용)
+        self._owners: Dict[str, str] = {}
+        os.makedirs(self.settings.path, exist_ok=True)
+        for name in sorted(os.listdir(self.settings.path)):
+            meta_path = os.path.join(self.settings.path, name, META_FILE)
+            if os.path.exists(meta_path):
+                with open(meta_path, 'r', encoding='utf-8') as f:
+                    self._partition(json.load(f)["user_id"])
+
+    def _partition(self, user_id: str) -> _Partition:
+        with self._lock:
+            partition = self._partitions.get(user_id)
+            if partition is None:
+                partition = _Partition(os.path.join(self.settings.path, _partition_name(user_id)),
+                                       user_id, self.embedder.dim, self.settings, self.ivf_settings)
+                partition.open(self.embedder)
+                self._partitions[user_id] = partition
+                self._owners.update(dict.fromkeys(partition.items, user_id))
+            return partition
+
+    @staticmethod
+    def _format(item: Dict[str, Any], user_id: str, score: Optional[float] = None) -> Dict[str, Any]:
+        result = {**item, "user_id": user_id}
+        if score is not None:
+            result["score"] = round(score, 4)
+        return result
+
+    # ---- mem0 호환 API ----
+    def add(self, messages: Any, user_id: str, metadata: Optional[Dict[str, Any]] = None, **kwargs) -> Dict[str, Any]:
+        """메시지 본문을 임베딩해서 저장 (거의 같은 내용이 이미 있으면 건너뜀)"""
+        texts = message_contents(messages)
+        if not texts:
+            return {"results": []}
+        partition = self._partition(user_id)
+        vectors = self.embedder.embed_documents(texts)
+        # 기존 메모리 중 가장 비슷한 것 (모든 본문을 한 번에 검색)
+        nearest = partition.search_batch(vectors, 1 if self.semantic else _LEXICAL_CANDIDATES)
+        threshold = self.settings.dedupe_threshold
+
+        def _same(text: str, other: str, score: float) -> bool:
+            return score >= threshold and (self.semantic or _normalize_text(text) == _normalize_text(other))
+
+        keep, results = [], []
+        for i, text in enumerate(texts):
+            duplicate = any(_same(text, item["memory"], score) for item, score in nearest[i])
+            duplicate = duplicate or any(_same(text, texts[j], float(vectors[i] @ vectors[j])) for j in keep)
+            if duplicate:
+                self.counters.deduplicated += 1
+                results.append({"memory": text, "event": "NONE"})
+            else:
+                keep.append(i)
+        if keep:
+            items = partition.add([texts[i] for i in keep], vectors[keep])
+            with self._lock:
+                self._owners.update(dict.fromkeys((item["id"] for item in items), user_id))
+            self.counters.added += len(items)
+            results.extend({"id": item["id"], "memory": item["memory"], "event": "ADD"} for item in items)
+        return {"results": results}
+
+    def search(self, query: str, user_id: str, limit: int = 5, **kwargs) -> Dict[str, Any]:
+        """질의와 코사인 유사도가 높은 메모리 top-k"""
+        self.counters.searches += 1
+        with self._lock:
+            partition = self._partitions.get(user_id)
+        if partition is None:
+            return {"results": []}
+        hits = partition.search(self.embedder.embed_query(query), max(1, int(limit)))
+        if partition.ivf is not None:
+            self.counters.ivf_searches += 1
+        return {"results": [self._format(item, user_id, score) for item, score in hits]}
+
+    def get_all(self, user_id: str, limit: int = 100, **kwargs) -> Dict[str, Any]:
+        """사용자의 메모리를 저장 순서대로 반환"""
+        with self._lock:
+            partition = self._partitions.get(user_id)
+        if partition is None:
+            return {"results": []}
+        with partition.lock:
+            items = list(partition.items.values())
+        return {"results": [self._format(item, user_id) for item in items[:limit]]}
+
+    def delete(self, memory_id: str) -> Dict[str, Any]:
+        if not self.delete_many([memory_id]):
+            raise ValueError(f"메모리를 찾을 수 없습니다: {memory_id}")
+        return {"message": "Memory deleted successfully!"}
+
+    # ---- 일괄 처리 API ----
+    def count(self, user_id: str) -> int:
+        with self._lock:
+            partition = self._partitions.get(user_id)
+        return 0 if partition is None else len(partition.items)
+
+    def iter_memories(self, user_id: str, page_size: int = 500) -> Iterator[List[Dict[str, Any]]]:
+        """사용자의 메모리를 저장 순서대로 page_size개씩 반환"""
+        with self._lock:
+            partition = self._partitions.get(user_id)
+        if partition is None:
+            return
+        with partition.lock:
+            item_ids = list(partition.items)
+        for start in range(0, len(item_ids), max(1, page_size)):
+            with partition.lock:
+                page = [partition.items[item_id] for item_id in item_ids[start:start + page_size]
+                        if item_id in partition.items]
+            if page:
+                yield [self._format(item, user_id) for item in page]
+
+    def delete_many(self, memory_ids: Iterable[str]) -> int:
+        """여러 메모리를 파티션별로 한 번에 삭제 (삭제된 개수 반환)"""
+        by_user: Dict[str, List[str]] = {}
+        with self._lock:
+            for memory_id in memory_ids:
+                user_id = self._owners.pop(memory_id, None)
+                if user_id is not None:
+                    by_user.setdefault(user_id, []).append(memory_id)
+            partitions = {user_id: self._partitions[user_id] for user_id in by_user}
+        removed = sum(partitions[user_id].delete(ids) for user_id, ids in by_user.items())
+        self.counters.deleted += removed
+        return removed
+
+    def delete_all(self, user_id: str) -> int:
+        with self._lock:
+            partition = self._partitions.get(user_id)
+        if partition is None:
+            return 0
+        with partition.lock:
+            item_ids = list(partition.items)
+        return self.delete_many(item_ids)
+
+    def close(self) -> None:
+        with self._lock:
+            for partition in self._partitions.values():
+                partition.close()
+
+    def stats(self) -> Dict[str, Any]:
+        counters = asdict(self.counters)
+        with self._lock:
+            counters["users"] = len(self._partitions)
+            counters["memories"] = sum(len(p.items) for p in self._partitions.values())
+        counters["dim"] = self.embedder.dim
+        return counters
+
+
+def _base_dir() -> str:
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _pick(data: Dict[str, Any], cls) -> Dict[str, Any]:
+    return {k: v for k, v in (data or {}).items() if k in cls.__dataclass_fields__}
+
+
+def create_local_memory(settings: Optional[Dict[str, Any]] = None) -> LocalVectorMemory:
+    """memory.local 설정으로 로컬 벡터 메모리 생성 (상대 경로는 agent-ai 기준)"""
+    settings = dict(settings or {})
+    path = settings.get("path")
+    if path and not os.path.isabs(path):
+        settings["path"] = os.path.join(_base_dir(), path)
+    return LocalVectorMemory(LocalMemorySettings(**_pick(settings, LocalMemorySettings)),
+                             EmbeddingSettings(**_pick(settings.get("embedding"), EmbeddingSettings)),
+                             IVFSettings(**_pick(settings.get("ivf"), IVFSettings)))
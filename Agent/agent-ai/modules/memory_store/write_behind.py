@@ -0,0 +1,143 @@
+"""
+메모리 write-behind 큐
+- MemoryNode는 저장할 메시지를 큐에 넣기만 하고 바로 반환 (mem0 add의 임베딩/추출 LLM 호출이 턴 지연에서 빠짐)
+- 전용 writer 스레드가 flush_interval초 동안 모인 메시지를 사용자별로 묶어 한 번의 add로 저장
+- 큐가 가득 차면 put_timeout초까지 기다리고, 그래도 자리가 없으면 MemoryWriteFull 발생
+- close() 시 남은 메시지를 모두 저장한 뒤 종료 (atexit에도 등록)
+"""
+from __future__ import annotations
+
+import atexit
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from dataclasses import dataclass, asdict
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+_STOP = object()
+
+
+class MemoryWriteFull(RuntimeError):
+    """큐가 가득 차서 put_timeout 안에 메시지를 넣지 못했을 때 발생"""
+
+
+@dataclass
+class MemoryWriteSettings:
+    """memory.settings.write_behind 설정"""
+    max_pending: int = 256
+    # 한 번에 모을 최대 메시지 수 (사용자별로 나눠 add 호출)
+    batch_size: int = 16
+    # 첫 메시지 이후 같은 배치로 모으는 시간 (초)
+    flush_interval: float = 0.5
+    # 큐가 가득 찼을 때 기다리는 최대 시간 (초, None이면 무기한)
+    put_timeout: Optional[float] = 2.0
+
+
+@dataclass
+class MemoryWriteStats:
+    submitted: int = 0
+    written: int = 0
+    add_calls: int = 0
+    rejected: int = 0
+    errors: int = 0
+
+
+class MemoryWriteBehind:
+    """메모리 백엔드 add 앞단의 비동기 쓰기 큐
+
+    add_batch(user_id, contents)는 한 사용자의 메시지 목록을 한 번에 저장하는 함수입니다.
+    """
+
+    def __init__(self, add_batch: Callable[[str, List[str]], Any],
+                 settings: Optional[MemoryWriteSettings] = None, name: str = "memory"):
+        self.add_batch = add_batch
+        self.settings = settings or MemoryWriteSettings()
+        self.counters = MemoryWriteStats()
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, self.settings.max_pending))
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"{name}-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    # ---- 공개 API ----
+    def submit(self, user_id: str, content: str) -> Future:
+        """메시지를 큐에 넣고 바로 반환 (Future는 저장 후 add 결과로 완료)"""
+        if self._closed:
+            raise RuntimeError("메모리 쓰기 큐가 닫혔습니다.")
+        future: Future = Future()
+        try:
+            self._queue.put((user_id, content, future), True, self.settings.put_timeout)
+        except queue.Full:
+            self.counters.rejected += 1
+            raise MemoryWriteFull(
+                f"메모리 쓰기 큐가 가득 찼습니다 ({self.settings.max_pending}건 대기 중)") from None
+        self.counters.submitted += 1
+        return future
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """남은 메시지를 모두 저장하고 writer 스레드를 종료"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"⚠️ 메모리 writer가 {timeout}s 안에 끝나지 않았습니다 (남은 메시지 {self.pending}건)")
+            return
+        atexit.unregister(self.close)
+
+    def stats(self) -> Dict[str, Any]:
+        counters = asdict(self.counters)
+        counters["pending"] = self.pending
+        counters["max_pending"] = self.settings.max_pending
+        return counters
+
+    # ---- writer 스레드 ----
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch: List[Tuple[str, str, Future]] = []
+            deadline = time.monotonic() + self.settings.flush_interval
+            while True:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+                if stopping or len(batch) >= self.settings.batch_size:
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[Tuple[str, str, Future]]) -> None:
+        by_user: Dict[str, List[Tuple[str, Future]]] = {}
+        for user_id, content, future in batch:
+            by_user.setdefault(user_id, []).append((content, future))
+        for user_id, items in by_user.items():
+            try:
+                result = self.add_batch(user_id, [content for content, _ in items])
+            except Exception as e:
+                self.counters.errors += 1
+                print(f"⚠️ 메모리 저장 실패 ([{user_id}] {len(items)}건): {e}")
+                for _, future in items:
+                    future.set_exception(e)
+                continue
+            self.counters.add_calls += 1
+            self.counters.written += len(items)
+            print(f"💾 메모리 저장 완료: [{user_id}] {len(items)}건")
+            for _, future in items:
+                future.set_result(result)
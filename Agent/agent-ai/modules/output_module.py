@@ -1,8 +1,40 @@
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+
+class StreamPrinter:
+    """원격 에이전트의 부분 응답을 도착하는 대로 터미널에 출력"""
+
+    # 마지막으로 출력 중인 스트림 (여러 스트림이 번갈아 출력될 때 줄 구분용)
+    _active: Optional["StreamPrinter"] = None
+
+    def __init__(self, label: str):
+        self.label = label
+        self.chunks = 0
+
+    def write(self, text: str) -> None:
+        if not text:
+            return
+        if StreamPrinter._active is not self:
+            if StreamPrinter._active is not None:
+                print(flush=True)
+            print(f"{self.label}: ", end="", flush=True)
+            StreamPrinter._active = self
+        print(text, end="", flush=True)
+        self.chunks += 1
+
+    def close(self) -> None:
+        if StreamPrinter._active is self:
+            print(flush=True)
+            StreamPrinter._active = None
+
 
 class OutputNode:
     def __init__(self, config):
         self.config = config
+
+    def open_stream(self, label: str) -> StreamPrinter:
+        """부분 출력을 즉시 보여주는 스트림 출력기 생성 (ToolNode 등에서 사용)"""
+        return StreamPrinter(label)
     
     def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         messages = state.get("messages", [])
@@ -22,7 +54,9 @@ class OutputNode:
             last_message = messages[-1]
             # AI 메시지인 경우 출력
             if hasattr(last_message, 'content') and last_message.content:
-                print(f"에이전트: {last_message.content}")
+                # LLM 노드가 토큰을 이미 스트리밍으로 출력했으면 다시 출력하지 않음
+                if not state.get("streamed", False):
+                    print(f"에이전트: {last_message.content}")
             elif hasattr(last_message, 'content'):
                 # tool_calls만 있고 content가 없는 경우
                 if hasattr(last_message, 'tool_calls') and last_message.tool_calls:
@@ -39,5 +73,6 @@ class OutputNode:
             **state,
             "should_exit": explicit_exit,
             # tool_results 초기화 (한 번 출력 후 제거)
-            "tool_results": []
+            "tool_results": [],
+            "streamed": False
         }
@@ -0,0 +1,118 @@
+"""
+Recorder 전달 기록 (outbox 재전송 중복 제거)
+- 다른 에이전트의 outbox가 보낸 레코드는 A2A metadata의 outbox_id를 레코드에 함께 저장
+- outbox_id -> 레코드 ID를 최근 max_entries건까지 보관해서, 응답이 유실되어 같은 메시지가 다시 오면 기록을 건너뜀
+- 레코드가 저장될 때마다 증분 갱신 (write-behind writer 스레드에서 호출)
+- <저장소 경로>.deliveries.json 에 원자적으로 저장, 시작 시 마지막 반영 ID 이후 레코드를 따라잡음
+  (파일 저장 전에 죽어도 저장소의 outbox_id로 다시 채워짐)
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, Optional
+
+DELIVERIES_VERSION = 1
+
+
+@dataclass
+class DeliveryLedgerStats:
+    recorded: int = 0
+    saves: int = 0
+
+
+class DeliveryLedger:
+    """최근 outbox_id -> 레코드 ID (스레드 안전)"""
+
+    def __init__(self, path: str, max_entries: int = 10000):
+        self.path = path
+        self.max_entries = max(1, int(max_entries))
+        self.counters = DeliveryLedgerStats()
+        self._lock = threading.Lock()
+        self._ids: "OrderedDict[str, int]" = OrderedDict()
+        self._last_id = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get("version") == DELIVERIES_VERSION:
+                self._ids.update(saved.get("ids", {}))
+                self._last_id = saved.get("last_id", 0)
+        except Exception as e:
+            print(f"⚠️ 전달 기록 파일 로드 실패 (저장소에서 다시 채웁니다): {e}")
+
+    # ---- 조회 ----
+    def get(self, outbox_id: Optional[str]) -> Optional[int]:
+        """이미 기록된 outbox_id면 그 레코드 ID, 아니면 None"""
+        if not outbox_id:
+            return None
+        with self._lock:
+            return self._ids.get(outbox_id)
+
+    # ---- 갱신 ----
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """id가 있는 레코드들의 outbox_id를 기록 (마지막 반영 ID 이하는 건너뜀)"""
+        recorded, applied = 0, 0
+        with self._lock:
+            for record in records:
+                if record["id"] <= self._last_id:
+                    continue
+                self._last_id = record["id"]
+                applied += 1
+                outbox_id = record.get("outbox_id")
+                if not outbox_id:
+                    continue
+                self._ids[outbox_id] = record["id"]
+                self._ids.move_to_end(outbox_id)
+                recorded += 1
+            while len(self._ids) > self.max_entries:
+                self._ids.popitem(last=False)
+            if applied:
+                self._dirty = True
+            self.counters.recorded += recorded
+        return recorded
+
+    def catch_up(self, store: Any, batch_size: int = 1000) -> int:
+        """저장소에서 마지막 반영 ID 이후 레코드의 outbox_id를 기록"""
+        recorded, batch = 0, []
+        for record in store.iter_records(self._last_id + 1):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                recorded += self.add_many(batch)
+                batch = []
+        recorded += self.add_many(batch)
+        return recorded
+
+    # ---- 영속화 ----
+    def flush(self) -> None:
+        """변경된 경우에만 파일을 원자적으로 다시 씀"""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {"version": DELIVERIES_VERSION, "last_id": self._last_id, "ids": dict(self._ids)}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            self.counters.saves += 1
+
+    def close(self) -> None:
+        self.flush()
+
+    def stats(self) -> Dict[str, Any]:
+        counters = asdict(self.counters)
+        counters["entries"] = len(self._ids)
+        counters["last_id"] = self._last_id
+        return counters
@@ -0,0 +1,549 @@
+"""
+Recorder 세그먼트 로그 저장소 (append-only)
+- 레코드를 JSON Lines로 현재 세그먼트(segment-<첫 ID>.log)에 덧붙여 기록
+- 단조 증가하는 레코드 ID (재시작 시 마지막 세그먼트에서 이어서 발급)
+- 그룹 커밋: 동시에 들어온 append를 한 번의 write(+fsync)로 묶어서 처리
+- fsync 정책: "always" (커밋마다) | "batch" (fsync_batch건 또는 fsync_interval초마다) | "never"
+- 세그먼트 크기가 segment_size를 넘으면 봉인(seal)하고 새 세그먼트로 교체
+- 봉인된 세그먼트는 선택적으로 zstd 압축 (zstandard 패키지 필요)
+- compact(cutoff): 봉인된 작은 세그먼트를 segment_size 단위로 병합하면서 cutoff 이전 레코드를 제거
+    세그먼트별 timestamp 범위/크기를 segments.meta.json에 기록해 두고, 병합할 것도 만료된 레코드도 없는
+    세그먼트는 읽지 않음. 현재 세그먼트에 만료된 레코드가 있으면 봉인해서 함께 정리
+
+파일 하나에 레코드 하나를 쓰는 방식과 달리 파일 생성 비용 없이 디스크 처리량만큼 기록할 수 있습니다.
+"""
+from __future__ import annotations
+
+import io
+import json
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict, Iterator, List, Optional
+
+try:
+    import zstandard as zstd
+except ImportError:
+    zstd = None
+
+_SEGMENT_RE = re.compile(r'^segment-(\d{20})\.log(\.zst)?$')
+
+FSYNC_POLICIES = ("always", "batch", "never")
+
+_META_FILE = "segments.meta.json"
+
+
+def _segment_name(first_id: int) -> str:
+    return f"segment-{first_id:020d}.log"
+
+
+@dataclass
+class LogStoreSettings:
+    """executorParams.storage 설정"""
+    path: str = field(default_factory=lambda: os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "recorder_log"))
+    # 세그먼트 교체 기준 크기 (바이트)
+    segment_size: int = 64 * 1024 * 1024
+    fsync: str = "batch"
+    # fsync="batch"일 때 이 건수 또는 시간(초)이 지나면 fsync
+    fsync_batch: int = 64
+    fsync_interval: float = 1.0
+    # 봉인된 세그먼트 zstd 압축 여부
+    compress: bool = False
+    compression_level: int = 3
+
+
+@dataclass
+class LogStoreStats:
+    appended: int = 0
+    commits: int = 0
+    fsyncs: int = 0
+    segments_sealed: int = 0
+    segments_compressed: int = 0
+    segments_merged: int = 0
+    bytes_written: int = 0
+
+
+class _CommitGroup:
+    """한 번의 write로 함께 커밋될 레코드 묶음"""
+    __slots__ = ("lines", "first_id", "last_id", "min_ts", "max_ts", "done", "error")
+
+    def __init__(self):
+        self.lines: List[bytes] = []
+        self.first_id = 0
+        self.last_id = 0
+        self.min_ts: Optional[str] = None
+        self.max_ts: Optional[str] = None
+        self.done = False
+        self.error: Optional[BaseException] = None
+
+
+def _merge_range(meta: Dict[str, Any], min_ts: Optional[str], max_ts: Optional[str]) -> None:
+    """meta의 timestamp 범위(min_ts/max_ts)를 넓힘"""
+    if min_ts is not None and (meta.get("min_ts") is None or min_ts < meta["min_ts"]):
+        meta["min_ts"] = min_ts
+    if max_ts is not None and (meta.get("max_ts") is None or max_ts > meta["max_ts"]):
+        meta["max_ts"] = max_ts
+
+
+class SegmentedLogStore:
+    """세그먼트 단위 append-only 레코드 로그 (스레드 안전)"""
+
+    def __init__(self, settings: Optional[LogStoreSettings] = None):
+        self.settings = settings or LogStoreSettings()
+        if self.settings.fsync not in FSYNC_POLICIES:
+            raise ValueError(f"지원하지 않는 fsync 정책입니다: {self.settings.fsync}")
+        if self.settings.compress and zstd is None:
+            print("⚠️ zstandard 패키지가 없어 세그먼트 압축을 비활성화합니다.")
+            self.settings.compress = False
+        self.directory = self.settings.path
+        self.counters = LogStoreStats()
+        self._cond = threading.Condition()
+        self._open_group = _CommitGroup()
+        self._committing = False
+        self._file = None
+        self._segment_first_id = 0
+        self._segment_size = 0
+        # 현재 세그먼트의 timestamp 범위 (봉인 시 세그먼트 메타로 저장)
+        self._segment_range: Dict[str, Any] = {}
+        self._unsynced = 0
+        self._last_fsync = time.monotonic()
+        self._closed = False
+        # 압축/병합처럼 봉인된 세그먼트 파일을 바꾸는 작업은 하나씩만 실행
+        self._maintenance_lock = threading.Lock()
+        # 봉인된 세그먼트별 {"min_ts", "max_ts", "bytes"(압축 전 크기), "file_size"(파일 크기)}
+        self._meta_lock = threading.Lock()
+        os.makedirs(self.directory, exist_ok=True)
+        self._meta: Dict[str, Dict[str, Any]] = self._load_meta()
+        self._next_id = self._recover() + 1
+
+    # ---- 세그먼트 관리 ----
+    def _segments(self) -> List[tuple]:
+        """(첫 ID, 경로) 목록 (ID 순). 압축 중이라 .log와 .zst가 함께 있으면 .log 우선"""
+        found: Dict[int, str] = {}
+        for fname in os.listdir(self.directory):
+            match = _SEGMENT_RE.match(fname)
+            if not match:
+                continue
+            first_id = int(match.group(1))
+            if match.group(2) and first_id in found:
+                continue
+            found[first_id] = os.path.join(self.directory, fname)
+        return sorted(found.items())
+
+    # ---- 세그먼트 메타 (timestamp 범위/크기) ----
+    def _load_meta(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(os.path.join(self.directory, _META_FILE), 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            print(f"⚠️ 세그먼트 메타를 읽지 못해 다시 계산합니다: {e}")
+            return {}
+
+    def _save_meta(self) -> None:
+        """남아 있는 세그먼트의 메타만 원자적으로 저장"""
+        with self._meta_lock:
+            live = {str(first_id) for first_id, _ in self._segments()}
+            self._meta = {key: meta for key, meta in self._meta.items() if key in live}
+            path = os.path.join(self.directory, _META_FILE)
+            try:
+                with open(path + ".tmp", 'w', encoding='utf-8') as f:
+                    json.dump(self._meta, f)
+                os.replace(path + ".tmp", path)
+            except OSError as e:
+                print(f"⚠️ 세그먼트 메타 저장 실패: {e}")
+
+    def _set_meta(self, first_id: int, path: str, min_ts: Optional[str], max_ts: Optional[str],
+                  size: int, save: bool = True) -> None:
+        with self._meta_lock:
+            self._meta[str(first_id)] = {"min_ts": min_ts, "max_ts": max_ts, "bytes": size,
+                                         "file_size": os.path.getsize(path)}
+        if save:
+            self._save_meta()
+
+    def _move_meta(self, old_path: str, new_path: str) -> None:
+        """압축으로 파일이 바뀐 세그먼트의 메타 갱신"""
+        match = _SEGMENT_RE.match(os.path.basename(old_path))
+        with self._meta_lock:
+            meta = self._meta.get(str(int(match.group(1)))) if match else None
+            if meta is None:
+                return
+            meta["file_size"] = os.path.getsize(new_path)
+        self._save_meta()
+
+    def _segment_meta(self, first_id: int, path: str) -> Dict[str, Any]:
+        """봉인된 세그먼트의 메타 (없거나 파일이 바뀌었으면 한 번 읽어서 계산)"""
+        with self._meta_lock:
+            meta = self._meta.get(str(first_id))
+        if meta is not None and meta.get("file_size") == os.path.getsize(path):
+            return meta
+        segment_range: Dict[str, Any] = {}
+        size = 0
+        for record in self._read_segment(path):
+            timestamp = record.get("timestamp") or ""
+            _merge_range(segment_range, timestamp, timestamp)
+            size += len(json.dumps(record, ensure_ascii=False).encode('utf-8')) + 1
+        self._set_meta(first_id, path, segment_range.get("min_ts"), segment_range.get("max_ts"), size, save=False)
+        with self._meta_lock:
+            return self._meta[str(first_id)]
+
+    def _recover(self) -> int:
+        """마지막 세그먼트를 열고, 충돌로 잘린 마지막 줄을 잘라낸 뒤 마지막 레코드 ID를 반환"""
+        segments = self._segments()
+        last_id = 0
+        active = segments[-1] if segments and not segments[-1][1].endswith(".zst") else None
+        active_range: Dict[str, Any] = {}
+        for first_id, path in reversed(segments):
+            if path.endswith(".zst"):
+                for record in self._read_segment(path):
+                    last_id = max(last_id, record["id"])
+                if last_id:
+                    break
+                continue
+            valid_end = 0
+            segment_range: Dict[str, Any] = {}
+            with open(path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    try:
+                        record = json.loads(line)
+                        last_id = max(last_id, record["id"])
+                    except (ValueError, KeyError):
+                        break
+                    timestamp = record.get("timestamp") or ""
+                    _merge_range(segment_range, timestamp, timestamp)
+                    valid_end += len(line)
+            if active is not None and first_id == active[0]:
+                active_range = segment_range
+            if os.path.getsize(path) != valid_end:
+                print(f"⚠️ 세그먼트 끝의 불완전한 레코드를 잘라냅니다: {os.path.basename(path)}")
+                with open(path, 'r+b') as f:
+                    f.truncate(valid_end)
+            if last_id:
+                break
+
+        if active is not None:
+            self._open_segment(active[0], active[1])
+            self._segment_range = active_range
+        return last_id
+
+    def _open_segment(self, first_id: int, path: Optional[str] = None) -> None:
+        path = path or os.path.join(self.directory, _segment_name(first_id))
+        self._file = open(path, 'ab')
+        self._segment_first_id = first_id
+        self._segment_size = self._file.tell()
+        self._segment_range = {}
+
+    def _seal_segment(self) -> None:
+        """현재 세그먼트를 fsync 후 닫고, 설정되어 있으면 백그라운드에서 압축"""
+        if self._file is None:
+            return
+        self._fsync()
+        path = self._file.name
+        self._file.close()
+        self._file = None
+        self.counters.segments_sealed += 1
+        self._set_meta(self._segment_first_id, path, self._segment_range.get("min_ts"),
+                       self._segment_range.get("max_ts"), self._segment_size)
+        if self.settings.compress:
+            threading.Thread(target=self._compress_segment, args=(path,), daemon=True).start()
+
+    def _compress_segment(self, path: str) -> None:
+        with self._maintenance_lock:
+            if os.path.exists(path):
+                self._compress_segment_locked(path)
+
+    def _compress_segment_locked(self, path: str) -> None:
+        try:
+            tmp_path = path + ".zst.tmp"
+            compressor = zstd.ZstdCompressor(level=self.settings.compression_level)
+            with open(path, 'rb') as src, open(tmp_path, 'wb') as dst:
+                compressor.copy_stream(src, dst)
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.replace(tmp_path, path + ".zst")
+            os.remove(path)
+            self.counters.segments_compressed += 1
+            self._move_meta(path, path + ".zst")
+        except Exception as e:
+            print(f"⚠️ 세그먼트 압축 실패({os.path.basename(path)}): {e}")
+
+    def _fsync(self) -> None:
+        if self._file is None or self._unsynced == 0:
+            return
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_fsync = time.monotonic()
+        self.counters.fsyncs += 1
+
+    # ---- 쓰기 ----
+    def _write_group(self, group: _CommitGroup) -> None:
+        """커밋 그룹 하나를 한 번의 write로 기록 (커밋 담당 스레드 하나만 호출)"""
+        payload = b"".join(group.lines)
+        if self._file is not None and self._segment_size > 0 \
+                and self._segment_size + len(payload) > self.settings.segment_size:
+            self._seal_segment()
+        if self._file is None:
+            self._open_segment(group.first_id)
+
+        self._file.write(payload)
+        self._segment_size += len(payload)
+        _merge_range(self._segment_range, group.min_ts, group.max_ts)
+        self._unsynced += len(group.lines)
+        self.counters.commits += 1
+        self.counters.bytes_written += len(payload)
+
+        policy = self.settings.fsync
+        if policy == "always" or (policy == "batch" and (
+                self._unsynced >= self.settings.fsync_batch
+                or time.monotonic() - self._last_fsync >= self.settings.fsync_interval)):
+            self._fsync()
+        else:
+            self._file.flush()
+
+    def append_many(self, records: List[Dict[str, Any]]) -> List[int]:
+        """레코드들을 기록하고 발급된 ID 목록을 반환 (같은 커밋 그룹의 다른 호출과 함께 기록됨)"""
+        if not records:
+            return []
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("로그 저장소가 닫혔습니다.")
+            group = self._open_group
+            ids = []
+            for record in records:
+                record_id = self._next_id
+                self._next_id += 1
+                line = json.dumps({**record, "id": record_id}, ensure_ascii=False) + "\n"
+                if not group.lines:
+                    group.first_id = record_id
+                timestamp = record.get("timestamp") or ""
+                if group.min_ts is None or timestamp < group.min_ts:
+                    group.min_ts = timestamp
+                if group.max_ts is None or timestamp > group.max_ts:
+                    group.max_ts = timestamp
+                group.lines.append(line.encode('utf-8'))
+                group.last_id = record_id
+                ids.append(record_id)
+
+            while not group.done:
+                if self._committing:
+                    self._cond.wait()
+                    continue
+                # 커밋 담당: 열린 그룹을 통째로 가져가 잠금 밖에서 기록
+                self._committing = True
+                batch, self._open_group = self._open_group, _CommitGroup()
+                self._cond.release()
+                try:
+                    self._write_group(batch)
+                except BaseException as e:
+                    batch.error = e
+                finally:
+                    self._cond.acquire()
+                    batch.done = True
+                    self._committing = False
+                    self.counters.appended += len(batch.lines)
+                    self._cond.notify_all()
+
+            if group.error is not None:
+                raise OSError(f"레코드 기록 실패: {group.error}") from group.error
+        return ids
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """레코드 한 건을 기록하고 ID를 반환"""
+        return self.append_many([record])[0]
+
+    # ---- 읽기 ----
+    def _read_segment(self, path: str) -> Iterator[Dict[str, Any]]:
+        if path.endswith(".zst"):
+            if zstd is None:
+                raise RuntimeError(f"압축 세그먼트를 읽으려면 zstandard 패키지가 필요합니다: {path}")
+            with open(path, 'rb') as raw:
+                stream = io.BufferedReader(zstd.ZstdDecompressor().stream_reader(raw))
+                for line in stream:
+                    if line.strip():
+                        yield json.loads(line)
+            return
+        with open(path, 'rb') as f:
+            for line in f:
+                # 기록 중인 마지막 줄은 건너뜀
+                if line.endswith(b"\n"):
+                    yield json.loads(line)
+
+    def iter_records(self, start_id: int = 1) -> Iterator[Dict[str, Any]]:
+        """start_id 이상인 레코드를 ID 순으로 반환"""
+        with self._cond:
+            if self._file is not None:
+                self._file.flush()
+        segments = self._segments()
+        # 병합 도중 중단되어 같은 레코드가 두 세그먼트에 남아 있어도 한 번만 반환
+        last_yielded = start_id - 1
+        for index, (first_id, path) in enumerate(segments):
+            next_first = segments[index + 1][0] if index + 1 < len(segments) else None
+            if next_first is not None and next_first <= start_id:
+                continue
+            if not os.path.exists(path):
+                # 목록을 읽은 뒤 압축이 끝나 .log가 사라졌거나 병합으로 제거된 경우
+                path = path + ".zst"
+                if not os.path.exists(path):
+                    continue
+            for record in self._read_segment(path):
+                if record["id"] > last_yielded:
+                    last_yielded = record["id"]
+                    yield record
+
+    def get_many(self, ids: List[int]) -> List[Dict[str, Any]]:
+        """ID 목록에 해당하는 레코드를 주어진 순서대로 반환 (가장 작은 ID의 세그먼트부터 스캔)"""
+        if not ids:
+            return []
+        wanted = set(ids)
+        found: Dict[int, Dict[str, Any]] = {}
+        for record in self.iter_records(min(wanted)):
+            if record["id"] in wanted:
+                found[record["id"]] = record
+                if len(found) == len(wanted):
+                    break
+        return [found[i] for i in ids if i in found]
+
+    def query(self, start: Optional[str] = None, end: Optional[str] = None, agent: Optional[str] = None,
+              source_agent: Optional[str] = None, context_id: Optional[str] = None,
+              limit: int = 100, descending: bool = True) -> List[Dict[str, Any]]:
+        """시간 범위 [start, end) 및 에이전트/컨텍스트 조건으로 조회 (인덱스 없이 전체 스캔)"""
+        matches = []
+        for record in self.iter_records():
+            timestamp = record.get("timestamp") or ""
+            if (start is not None and timestamp < start) or (end is not None and timestamp >= end):
+                continue
+            if agent is not None and record.get("agent") != agent:
+                continue
+            if source_agent is not None and record.get("source_agent") != source_agent:
+                continue
+            if context_id is not None and record.get("context_id") != context_id:
+                continue
+            matches.append(record)
+        matches.sort(key=lambda r: (r.get("timestamp") or "", r["id"]), reverse=descending)
+        return matches[:int(limit)]
+
+    # ---- 유지 관리 ----
+    def compact(self, cutoff: Optional[str] = None) -> List[int]:
+        """봉인된 세그먼트를 병합하고 timestamp가 cutoff 이전인 레코드를 제거, 제거된 ID 반환
+
+        현재 세그먼트에 만료된 레코드가 있으면 먼저 봉인합니다. 세그먼트 메타로 병합 묶음을 정하고,
+        병합할 것도 만료된 레코드도 없는 세그먼트는 읽지 않습니다.
+        """
+        with self._maintenance_lock:
+            with self._cond:
+                while self._committing:
+                    self._cond.wait()
+                active_min = self._segment_range.get("min_ts")
+                if cutoff is not None and self._file is not None and active_min is not None and active_min < cutoff:
+                    self._seal_segment()
+                # 이 시점 이후에 쓰기 스레드가 여는 세그먼트는 boundary 이상의 ID로 시작하므로 건드리지 않음
+                boundary = self._segment_first_id if self._file is not None else self._next_id
+                segments = [(first_id, path) for first_id, path in self._segments() if first_id < boundary]
+            removed: List[int] = []
+            group: List[tuple] = []
+            group_size = 0
+
+            def _expired(meta: Dict[str, Any], key: str) -> bool:
+                return cutoff is not None and meta.get(key) is not None and meta[key] < cutoff
+
+            def _finish_group() -> None:
+                nonlocal group, group_size
+                if len(group) > 1 or (group and _expired(group[0][2], "min_ts")):
+                    removed.extend(self._compact_group(group, cutoff))
+                group, group_size = [], 0
+
+            for first_id, path in segments:
+                if path.endswith(".zst") and zstd is None:
+                    _finish_group()
+                    continue
+                meta = self._segment_meta(first_id, path)
+                # 모두 만료된 세그먼트는 병합 후 크기에 포함하지 않음
+                size = 0 if _expired(meta, "max_ts") else meta["bytes"]
+                if group and group_size + size > self.settings.segment_size:
+                    _finish_group()
+                group.append((first_id, path, meta))
+                group_size += size
+            _finish_group()
+            self._save_meta()
+            return removed
+
+    def _compact_group(self, group: List[tuple], cutoff: Optional[str]) -> List[int]:
+        """group의 세그먼트를 읽어 만료된 레코드를 빼고 하나로 합침, 제거된 ID 반환"""
+        removed: List[int] = []
+        kept: List[bytes] = []
+        segment_range: Dict[str, Any] = {}
+        for _, path, _ in group:
+            for record in self._read_segment(path):
+                timestamp = record.get("timestamp") or ""
+                if cutoff is not None and timestamp < cutoff:
+                    removed.append(record["id"])
+                    continue
+                kept.append((json.dumps(record, ensure_ascii=False) + "\n").encode('utf-8'))
+                _merge_range(segment_range, timestamp, timestamp)
+        path = self._rewrite_segments([(first_id, path) for first_id, path, _ in group], kept)
+        if path is not None:
+            self._set_meta(group[0][0], path, segment_range.get("min_ts"), segment_range.get("max_ts"),
+                           sum(len(line) for line in kept), save=False)
+        return removed
+
+    def _rewrite_segments(self, group: List[tuple], lines: List[bytes]) -> Optional[str]:
+        """group의 세그먼트들을 첫 세그먼트 이름의 새 파일 하나로 교체하고 그 경로를 반환 (남은 레코드가 없으면 삭제)"""
+        first_id = group[0][0]
+        target = os.path.join(self.directory, _segment_name(first_id))
+        if lines:
+            tmp_path = target + ".compact.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(b"".join(lines))
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, target)
+        # 새 파일이 자리 잡은 뒤에 이전 파일 삭제 (중간에 중단되면 iter_records가 중복을 걸러냄)
+        for _, path in group:
+            if path != target or not lines:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+        self.counters.segments_merged += len(group)
+        if not lines:
+            return None
+        if self.settings.compress:
+            self._compress_segment_locked(target)
+            if not os.path.exists(target):
+                return target + ".zst"
+        return target
+
+    @property
+    def last_id(self) -> int:
+        return self._next_id - 1
+
+    def flush(self) -> None:
+        """버퍼를 비우고 fsync"""
+        with self._cond:
+            while self._committing:
+                self._cond.wait()
+            self._fsync()
+
+    def close(self) -> None:
+        with self._cond:
+            while self._committing:
+                self._cond.wait()
+            self._closed = True
+            if self._file is not None:
+                self._fsync()
+                self._file.close()
+                self._file = None
+
+    def stats(self) -> Dict[str, Any]:
+        counters = asdict(self.counters)
+        counters["last_id"] = self.last_id
+        counters["segments"] = len(self._segments())
+        counters["fsync"] = self.settings.fsync
+        return counters
@@ -0,0 +1,93 @@
+"""
+기존 Recorder 레코드 마이그레이션
+- data/recorder_memory/*.json (레코드당 파일 하나) 을 설정된 저장소로 일괄 import
+- batch_size건씩 append_many (SQLite는 배치당 트랜잭션 하나)
+- 레코드에 legacy_file 을 남겨 두고, 이미 import된 파일은 건너뜀 (여러 번 실행해도 안전)
+
+사용법 (Agent/agent-ai 에서):
+    python -m modules.recorder_store.migrate
+    python -m modules.recorder_store.migrate --source data/recorder_memory --config config/a2a/recorder_agent.json
+"""
+from __future__ import annotations
+
+import argparse
+import glob
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from .store_factory import RecordStore, create_record_store
+
+
+def _base_dir() -> str:
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def load_storage_settings(config_path: str) -> Dict[str, Any]:
+    """Recorder A2A 설정 파일에서 executorParams.storage 블록을 읽음"""
+    with open(config_path, 'r', encoding='utf-8') as f:
+        config = json.load(f)
+    return (config.get("executorParams") or {}).get("storage") or {}
+
+
+def migrate_legacy_records(store: RecordStore, source_dir: str, batch_size: int = 500) -> Dict[str, int]:
+    """source_dir의 레코드 파일을 store로 import 하고 건수를 반환"""
+    imported_files = {r.get("legacy_file") for r in store.iter_records() if r.get("legacy_file")}
+    counts = {"imported": 0, "skipped": 0, "failed": 0}
+    batch: List[Dict[str, Any]] = []
+
+    def _flush() -> None:
+        if batch:
+            store.append_many(batch)
+            counts["imported"] += len(batch)
+            batch.clear()
+
+    for path in sorted(glob.glob(os.path.join(source_dir, "*.json"))):
+        fname = os.path.basename(path)
+        if fname in imported_files:
+            counts["skipped"] += 1
+            continue
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                record = json.load(f)
+            if not isinstance(record, dict):
+                raise ValueError("JSON 객체가 아닙니다")
+        except Exception as e:
+            print(f"⚠️ 레코드 파일 읽기 실패({fname}): {e}")
+            counts["failed"] += 1
+            continue
+        record.pop("id", None)
+        record["legacy_file"] = fname
+        batch.append(record)
+        if len(batch) >= batch_size:
+            _flush()
+    _flush()
+    return counts
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="data/recorder_memory/*.json 레코드를 Recorder 저장소로 import")
+    parser.add_argument("--source", default=os.path.join(_base_dir(), "data", "recorder_memory"),
+                        help="기존 레코드 파일 디렉터리")
+    parser.add_argument("--config", default=os.path.join(_base_dir(), "config", "a2a", "recorder_agent.json"),
+                        help="Recorder A2A 설정 파일 (executorParams.storage 사용)")
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args(argv)
+
+    if not os.path.isdir(args.source):
+        print(f"❌ 디렉터리를 찾을 수 없습니다: {args.source}")
+        return
+
+    store = create_record_store(load_storage_settings(args.config))
+    started = time.perf_counter()
+    try:
+        counts = migrate_legacy_records(store, args.source, args.batch_size)
+    finally:
+        store.close()
+    print(f"✅ 마이그레이션 완료: import {counts['imported']}건, 건너뜀 {counts['skipped']}건, "
+          f"실패 {counts['failed']}건 ({time.perf_counter() - started:.2f}s)")
+
+
+if __name__ == "__main__":
+    main()
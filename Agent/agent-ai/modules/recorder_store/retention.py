@@ -0,0 +1,105 @@
+"""
+Recorder 보존 기간 정리 + 백그라운드 compaction
+- max_age_days가 지난 레코드를 저장소에서 삭제하고, 검색 인덱스에서도 제거
+- 저장소 compact: 로그 저장소는 작은 세그먼트 병합, SQLite는 incremental vacuum
+- 시간 단위 집계는 hourly_rollup_days 이후 정리 (일 단위 집계는 유지)
+- write-behind writer 스레드가 interval초마다 run_if_due()를 호출하면 별도 스레드에서 실행
+    (세그먼트를 읽고 다시 쓰는 동안 레코드 기록이 막히지 않음, 한 번에 하나만 실행)
+"""
+from __future__ import annotations
+
+import threading
+import time
+from dataclasses import dataclass, asdict
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+
+@dataclass
+class RetentionSettings:
+    """executorParams.storage.retention 설정"""
+    enabled: bool = True
+    # 원본 레코드 보존 기간 (일, None이면 무기한)
+    max_age_days: Optional[float] = None
+    # 시간 단위 집계 보존 기간 (일, None이면 무기한)
+    hourly_rollup_days: Optional[float] = 30
+    # 정리/compaction 실행 주기 (초)
+    interval: float = 3600.0
+
+
+@dataclass
+class RetentionStats:
+    runs: int = 0
+    removed: int = 0
+    errors: int = 0
+    last_run_ms: float = 0.0
+
+
+def _cutoff(days: Optional[float], now: Optional[datetime] = None) -> Optional[str]:
+    if days is None:
+        return None
+    # 레코드 timestamp와 같은 형식 (datetime.now().isoformat())
+    return ((now or datetime.now()) - timedelta(days=float(days))).isoformat()
+
+
+class RetentionManager:
+    """저장소/인덱스/집계에 보존 정책을 적용"""
+
+    def __init__(self, store: Any, settings: Optional[RetentionSettings] = None,
+                 index: Optional[Any] = None, rollups: Optional[Any] = None):
+        self.store = store
+        self.settings = settings or RetentionSettings()
+        self.index = index
+        self.rollups = rollups
+        self.counters = RetentionStats()
+        # 시작 직후 한 번 실행
+        self._last_run: Optional[float] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def run_if_due(self) -> None:
+        """주기가 되었으면 백그라운드 스레드에서 run() 실행 (이전 실행이 끝나지 않았으면 건너뜀)"""
+        if not self.settings.enabled:
+            return
+        if self._thread is not None and self._thread.is_alive():
+            return
+        if self._last_run is not None and time.monotonic() - self._last_run < self.settings.interval:
+            return
+        self._last_run = time.monotonic()
+        self._thread = threading.Thread(target=self.run, name="recorder-retention", daemon=True)
+        self._thread.start()
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """실행 중인 정리 작업이 끝날 때까지 대기 (저장소를 닫기 전에 호출), 끝났으면 True"""
+        thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+            return not thread.is_alive()
+        return True
+
+    def run(self, now: Optional[datetime] = None) -> Dict[str, Any]:
+        """보존 정책 적용 + compaction"""
+        self._last_run = time.monotonic()
+        started = time.perf_counter()
+        result = {"removed": 0, "pruned_hours": 0}
+        try:
+            removed = self.store.compact(_cutoff(self.settings.max_age_days, now))
+            if removed and self.index is not None:
+                self.index.remove_many(removed)
+            result["removed"] = len(removed)
+            hourly_cutoff = _cutoff(self.settings.hourly_rollup_days, now)
+            if self.rollups is not None and hourly_cutoff is not None:
+                result["pruned_hours"] = self.rollups.prune_hourly(hourly_cutoff)
+            self.counters.removed += len(removed)
+            if removed:
+                print(f"🧹 Recorder 보존 기간 정리: 레코드 {len(removed)}건 삭제")
+        except Exception as e:
+            self.counters.errors += 1
+            print(f"⚠️ Recorder 보존 기간 정리 실패: {e}")
+        self.counters.runs += 1
+        self.counters.last_run_ms = round((time.perf_counter() - started) * 1000, 3)
+        return result
+
+    def stats(self) -> Dict[str, Any]:
+        counters = asdict(self.counters)
+        counters["max_age_days"] = self.settings.max_age_days
+        return counters
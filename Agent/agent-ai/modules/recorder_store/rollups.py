@@ -0,0 +1,180 @@
+"""
+Recorder 사전 집계(rollup)
+- 시간(hour) / 일(day) 버킷 × 에이전트별로 건수, 입력/응답 글자 수, 토큰 수를 누적
+- 레코드가 저장될 때마다 증분 갱신 (write-behind writer 스레드에서 호출)
+- <저장소 경로>.rollups.json 에 원자적으로 저장, 시작 시 마지막 집계 ID 이후 레코드를 따라잡음
+- 원본 레코드가 보존 기간으로 삭제되어도 집계는 유지 (시간 단위 집계만 hourly_days 이후 정리)
+
+대시보드와 status 명령은 원본 레코드를 스캔하지 않고 이 집계를 읽습니다.
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, List, Optional
+
+from .text_index import tokenize
+
+ROLLUP_VERSION = 1
+
+# 버킷 -> timestamp 접두어 길이 ("2025-08-10T13" / "2025-08-10")
+BUCKETS = {"hour": 13, "day": 10}
+
+METRICS = ("count", "input_chars", "response_chars", "tokens")
+
+
+def record_agent(record: Dict[str, Any]) -> str:
+    """집계 기준 에이전트 (보낸 에이전트가 있으면 그쪽)"""
+    return record.get("source_agent") or record.get("agent") or "unknown"
+
+
+def record_tokens(record: Dict[str, Any]) -> int:
+    """레코드의 토큰 수 (tokens 필드가 없으면 색인 토큰 수로 추정)"""
+    tokens = record.get("tokens")
+    if isinstance(tokens, (int, float)):
+        return int(tokens)
+    return len(tokenize(record.get("input") or "")) + len(tokenize(record.get("response") or ""))
+
+
+@dataclass
+class RollupStats:
+    applied: int = 0
+    saves: int = 0
+    pruned_hours: int = 0
+
+
+class RecordRollups:
+    """시간/일 단위 에이전트별 집계 (스레드 안전)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.counters = RollupStats()
+        self._lock = threading.Lock()
+        # bucket -> period -> agent -> metric -> value
+        self._data: Dict[str, Dict[str, Dict[str, Dict[str, int]]]] = {bucket: {} for bucket in BUCKETS}
+        self._last_id = 0
+        self._dirty = False
+        self._load()
+
+    def _load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+            if saved.get("version") == ROLLUP_VERSION:
+                self._data.update(saved.get("buckets", {}))
+                self._last_id = saved.get("last_id", 0)
+        except Exception as e:
+            print(f"⚠️ 집계 파일 로드 실패 (저장소에서 다시 집계합니다): {e}")
+
+    # ---- 갱신 ----
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """id가 있는 레코드들을 집계 (마지막 집계 ID 이하는 이미 반영된 것으로 보고 건너뜀)"""
+        applied = 0
+        with self._lock:
+            for record in records:
+                if record["id"] <= self._last_id:
+                    continue
+                timestamp = record.get("timestamp") or ""
+                agent = record_agent(record)
+                values = {
+                    "count": 1,
+                    "input_chars": len(record.get("input") or ""),
+                    "response_chars": len(record.get("response") or ""),
+                    "tokens": record_tokens(record),
+                }
+                for bucket, width in BUCKETS.items():
+                    row = self._data[bucket].setdefault(timestamp[:width], {}).setdefault(
+                        agent, dict.fromkeys(METRICS, 0))
+                    for metric, value in values.items():
+                        row[metric] += value
+                self._last_id = record["id"]
+                applied += 1
+            if applied:
+                self._dirty = True
+                self.counters.applied += applied
+        return applied
+
+    def catch_up(self, store: Any, batch_size: int = 1000) -> int:
+        """저장소에서 마지막 집계 ID 이후 레코드를 집계"""
+        applied, batch = 0, []
+        for record in store.iter_records(self._last_id + 1):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                applied += self.add_many(batch)
+                batch = []
+        applied += self.add_many(batch)
+        return applied
+
+    def prune_hourly(self, before: str) -> int:
+        """before 이전의 시간 단위 집계 삭제 (일 단위 집계는 유지)"""
+        with self._lock:
+            expired = [period for period in self._data["hour"] if period < before[:BUCKETS["hour"]]]
+            for period in expired:
+                del self._data["hour"][period]
+            if expired:
+                self._dirty = True
+                self.counters.pruned_hours += len(expired)
+        return len(expired)
+
+    # ---- 조회 ----
+    def query(self, bucket: str = "day", start: Optional[str] = None, end: Optional[str] = None,
+              agent: Optional[str] = None) -> List[Dict[str, Any]]:
+        """버킷별 집계 행 목록 (period, agent 순). start/end는 timestamp 범위 [start, end)"""
+        if bucket not in BUCKETS:
+            raise ValueError(f"지원하지 않는 집계 단위입니다: {bucket} (hour | day)")
+        width = BUCKETS[bucket]
+        rows = []
+        with self._lock:
+            for period, agents in self._data[bucket].items():
+                # 버킷이 [start, end)와 겹치면 포함
+                if (start is not None and period < start[:width]) or (end is not None and period >= end):
+                    continue
+                for name, metrics in agents.items():
+                    if agent is None or name == agent:
+                        rows.append({"period": period, "agent": name, **metrics})
+        rows.sort(key=lambda row: (row["period"], row["agent"]))
+        return rows
+
+    def totals(self, start: Optional[str] = None, end: Optional[str] = None) -> Dict[str, Dict[str, int]]:
+        """에이전트별 합계 (일 단위 집계 기준)"""
+        totals: Dict[str, Dict[str, int]] = {}
+        for row in self.query("day", start, end):
+            agent_totals = totals.setdefault(row["agent"], dict.fromkeys(METRICS, 0))
+            for metric in METRICS:
+                agent_totals[metric] += row[metric]
+        return totals
+
+    # ---- 영속화 ----
+    def flush(self) -> None:
+        """변경된 경우에만 집계 파일을 원자적으로 다시 씀"""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = {"version": ROLLUP_VERSION, "last_id": self._last_id, "buckets": self._data}
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            tmp_path = self.path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(payload, f, ensure_ascii=False)
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+            self.counters.saves += 1
+
+    def close(self) -> None:
+        self.flush()
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def stats(self) -> Dict[str, Any]:
+        counters = asdict(self.counters)
+        counters["last_id"] = self._last_id
+        counters["hours"] = len(self._data["hour"])
+        counters["days"] = len(self._data["day"])
+        return counters
@@ -0,0 +1,67 @@
+"""
+Recorder 레코드 전문 검색 (로컬 API)
+- search_records(): 인덱스에서 BM25 상위 문서를 찾고 저장소에서 레코드를 가져와 점수와 함께 반환
+- Recorder Agent의 recorder_search 스킬과 아래 CLI가 같은 함수를 사용
+
+사용법 (Agent/agent-ai 에서, 인덱스를 갱신하므로 Recorder 서버가 꺼져 있을 때 실행):
+    python -m modules.recorder_store.search "diffusion 모델" --start 2025-08-18 --limit 5
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import time
+from typing import Any, Dict, List, Optional
+
+from .store_factory import RecordStore, create_record_store, create_text_index
+from .text_index import TextIndex
+
+
+def _base_dir() -> str:
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def search_records(store: RecordStore, index: TextIndex, text: str, limit: int = 10,
+                   start: Optional[str] = None, end: Optional[str] = None) -> List[Dict[str, Any]]:
+    """text와 관련된 레코드를 BM25 점수 순으로 반환 (각 레코드에 score 포함)"""
+    hits = index.search(text, limit=limit, start=start, end=end)
+    scores = dict(hits)
+    return [{**record, "score": scores[record["id"]]} for record in store.get_many([doc_id for doc_id, _ in hits])]
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Recorder 레코드 전문 검색")
+    parser.add_argument("text", help="검색어")
+    parser.add_argument("--start", help="시작 시각 (ISO 8601, 포함)")
+    parser.add_argument("--end", help="끝 시각 (ISO 8601, 제외)")
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--config", default=os.path.join(_base_dir(), "config", "a2a", "recorder_agent.json"),
+                        help="Recorder A2A 설정 파일 (executorParams.storage 사용)")
+    args = parser.parse_args(argv)
+
+    with open(args.config, 'r', encoding='utf-8') as f:
+        settings = ((json.load(f).get("executorParams") or {}).get("storage")) or {}
+    store = create_record_store(settings)
+    index = create_text_index(store, settings.get("text_index"))
+    if index is None:
+        print("❌ 검색 인덱스가 비활성화되어 있습니다 (storage.text_index.enabled).")
+        store.close()
+        return
+    try:
+        index.catch_up(store)
+        started = time.perf_counter()
+        results = search_records(store, index, args.text, args.limit, args.start, args.end)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        for record in results:
+            print(f"[{record['score']:.3f}] #{record['id']} {record.get('timestamp', '')} "
+                  f"({record.get('source_agent') or record.get('agent', '')})")
+            print(f"    {(record.get('input') or '')[:200]}")
+        print(f"🔎 {len(results)}건 ({elapsed_ms:.2f}ms)")
+    finally:
+        index.close()
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Recorder SQLite 저장소 (WAL)
+- WAL 모드 + synchronous=NORMAL: 쓰기 중에도 읽기(조회 스킬)가 막히지 않음
+- append_many는 한 트랜잭션 안에서 executemany로 일괄 삽입
+- timestamp / (agent, timestamp) / (source_agent, timestamp) / (context_id, timestamp) 인덱스로
+  시간 범위·에이전트별 조회를 인덱스 스캔으로 처리
+- 원본 레코드는 payload(JSON) 컬럼에 그대로 보관
+- compact(cutoff): 보존 기간이 지난 레코드를 삭제하고 incremental vacuum으로 빈 페이지 반환
+
+SegmentedLogStore와 같은 인터페이스(append/append_many/iter_records/get_many/query/compact/flush/close/stats)를 제공합니다.
+"""
+from __future__ import annotations
+
+import json
+import os
+import sqlite3
+import threading
+from dataclasses import dataclass, asdict, field
+from typing import Any, Dict, Iterator, List, Optional
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    timestamp TEXT NOT NULL,
+    agent TEXT,
+    source_agent TEXT,
+    context_id TEXT,
+    payload TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_records_timestamp ON records(timestamp);
+CREATE INDEX IF NOT EXISTS idx_records_agent ON records(agent, timestamp);
+CREATE INDEX IF NOT EXISTS idx_records_source_agent ON records(source_agent, timestamp);
+CREATE INDEX IF NOT EXISTS idx_records_context ON records(context_id, timestamp);
+"""
+
+
+@dataclass
+class SQLiteStoreSettings:
+    """executorParams.storage 설정 (backend: "sqlite")"""
+    path: str = field(default_factory=lambda: os.path.join(
+        os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data", "recorder.db"))
+    # WAL에서는 NORMAL이면 커밋 시 fsync를 생략해도 손상되지 않음 (체크포인트 때 fsync)
+    synchronous: str = "NORMAL"
+    busy_timeout: float = 5.0
+
+
+@dataclass
+class SQLiteStoreStats:
+    appended: int = 0
+    transactions: int = 0
+    queries: int = 0
+
+
+class SQLiteRecordStore:
+    """인덱스가 있는 SQLite 레코드 저장소 (쓰기/읽기 커넥션 분리, 스레드 안전)"""
+
+    def __init__(self, settings: Optional[SQLiteStoreSettings] = None):
+        self.settings = settings or SQLiteStoreSettings()
+        self.counters = SQLiteStoreStats()
+        directory = os.path.dirname(self.settings.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._write_lock = threading.Lock()
+        self._read_lock = threading.Lock()
+        self._writer = self._connect()
+        self._writer.executescript(_SCHEMA)
+        self._reader = self._connect()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.settings.path, timeout=self.settings.busy_timeout,
+                               check_same_thread=False, isolation_level=None)
+        # 새 DB에만 적용됨 (WAL 전환 전에 설정해야 함, 삭제 후 incremental_vacuum으로 파일 크기 축소)
+        conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(f"PRAGMA synchronous={self.settings.synchronous}")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    # ---- 쓰기 ----
+    @staticmethod
+    def _row(record: Dict[str, Any]) -> tuple:
+        return (
+            record.get("timestamp") or "",
+            record.get("agent"),
+            record.get("source_agent"),
+            record.get("context_id"),
+            json.dumps(record, ensure_ascii=False),
+        )
+
+    def append_many(self, records: List[Dict[str, Any]]) -> List[int]:
+        """레코드들을 한 트랜잭션으로 삽입하고 발급된 ID 목록을 반환"""
+        if not records:
+            return []
+        rows = [self._row(record) for record in records]
+        with self._write_lock:
+            cursor = self._writer.cursor()
+            cursor.execute("BEGIN IMMEDIATE")
+            try:
+                # 단일 writer이므로 AUTOINCREMENT ID가 연속으로 발급됨
+                cursor.executemany(
+                    "INSERT INTO records (timestamp, agent, source_agent, context_id, payload) VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+                last_id = cursor.execute("SELECT last_insert_rowid()").fetchone()[0]
+                cursor.execute("COMMIT")
+            except BaseException:
+                cursor.execute("ROLLBACK")
+                raise
+            self.counters.appended += len(rows)
+            self.counters.transactions += 1
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """레코드 한 건을 삽입하고 ID를 반환"""
+        return self.append_many([record])[0]
+
+    # ---- 읽기 ----
+    @staticmethod
+    def _decode(row: sqlite3.Row) -> Dict[str, Any]:
+        return {**json.loads(row["payload"]), "id": row["id"]}
+
+    def iter_records(self, start_id: int = 1) -> Iterator[Dict[str, Any]]:
+        """start_id 이상인 레코드를 ID 순으로 반환"""
+        with self._read_lock:
+            rows = self._reader.execute(
+                "SELECT id, payload FROM records WHERE id >= ? ORDER BY id", (start_id,)).fetchall()
+        for row in rows:
+            yield self._decode(row)
+
+    def get_many(self, ids: List[int]) -> List[Dict[str, Any]]:
+        """ID 목록에 해당하는 레코드를 주어진 순서대로 반환 (없는 ID는 생략)"""
+        if not ids:
+            return []
+        placeholders = ",".join("?" * len(ids))
+        with self._read_lock:
+            rows = self._reader.execute(
+                f"SELECT id, payload FROM records WHERE id IN ({placeholders})", list(ids)).fetchall()
+        found = {row["id"]: self._decode(row) for row in rows}
+        return [found[i] for i in ids if i in found]
+
+    def query(self, start: Optional[str] = None, end: Optional[str] = None, agent: Optional[str] = None,
+              source_agent: Optional[str] = None, context_id: Optional[str] = None,
+              limit: int = 100, descending: bool = True) -> List[Dict[str, Any]]:
+        """시간 범위 [start, end) 및 에이전트/컨텍스트 조건으로 레코드 조회 (timestamp 순)"""
+        clauses, params = [], []
+        for column, value in (("agent", agent), ("source_agent", source_agent), ("context_id", context_id)):
+            if value is not None:
+                clauses.append(f"{column} = ?")
+                params.append(value)
+        if start is not None:
+            clauses.append("timestamp >= ?")
+            params.append(start)
+        if end is not None:
+            clauses.append("timestamp < ?")
+            params.append(end)
+        where = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        order = "DESC" if descending else "ASC"
+        sql = f"SELECT id, payload FROM records {where} ORDER BY timestamp {order}, id {order} LIMIT ?"
+        params.append(int(limit))
+        with self._read_lock:
+            rows = self._reader.execute(sql, params).fetchall()
+            self.counters.queries += 1
+        return [self._decode(row) for row in rows]
+
+    @property
+    def last_id(self) -> int:
+        with self._read_lock:
+            return self._reader.execute("SELECT COALESCE(MAX(id), 0) FROM records").fetchone()[0]
+
+    def compact(self, cutoff: Optional[str] = None) -> List[int]:
+        """timestamp가 cutoff 이전인 레코드를 삭제하고 빈 페이지를 반환, 삭제된 ID 반환"""
+        removed: List[int] = []
+        with self._write_lock:
+            if cutoff is not None:
+                cursor = self._writer.cursor()
+                cursor.execute("BEGIN IMMEDIATE")
+                try:
+                    removed = [row[0] for row in cursor.execute(
+                        "SELECT id FROM records WHERE timestamp < ?", (cutoff,)).fetchall()]
+                    cursor.execute("DELETE FROM records WHERE timestamp < ?", (cutoff,))
+                    cursor.execute("COMMIT")
+                except BaseException:
+                    cursor.execute("ROLLBACK")
+                    raise
+            if removed:
+                self._writer.execute("PRAGMA incremental_vacuum")
+            self._writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return removed
+
+    def flush(self) -> None:
+        """WAL 체크포인트 (커밋은 append_many에서 이미 완료됨)"""
+        with self._write_lock:
+            self._writer.execute("PRAGMA wal_checkpoint(PASSIVE)")
+
+    def close(self) -> None:
+        with self._write_lock, self._read_lock:
+            self._reader.close()
+            self._writer.close()
+
+    def stats(self) -> Dict[str, Any]:
+        counters = asdict(self.counters)
+        counters["last_id"] = self.last_id
+        counters["backend"] = "sqlite"
+        return counters
@@ -0,0 +1,124 @@
+"""
+Recorder 저장소 생성
+- config/a2a/recorder_agent.json 의 executorParams.storage 블록으로 저장소를 구성
+- backend: "sqlite" (인덱스 조회, 기본) | "log" (append-only 세그먼트 로그)
+    "storage": {
+        "backend": "sqlite",
+        "path": "data/recorder.db",
+        "synchronous": "NORMAL",
+        "write_behind": {"max_pending": 1024, "batch_size": 256, "flush_interval": 1.0, "put_timeout": 5},
+        "text_index": {"enabled": true, "k1": 1.2, "b": 0.75, "compact_threshold": 5000},
+        "rollups": {"enabled": true},
+        "deliveries": {"enabled": true, "max_entries": 10000},
+        "retention": {"enabled": true, "max_age_days": 365, "hourly_rollup_days": 30, "interval": 3600}
+    }
+    "storage": {
+        "backend": "log",
+        "path": "data/recorder_log",
+        "segment_size": 67108864,
+        "fsync": "batch", "fsync_batch": 64, "fsync_interval": 1.0,
+        "compress": false
+    }
+"""
+from __future__ import annotations
+
+import os
+from typing import Any, Dict, Optional, Union
+
+from .deliveries import DeliveryLedger
+from .log_store import LogStoreSettings, SegmentedLogStore
+from .sqlite_store import SQLiteRecordStore, SQLiteStoreSettings
+from .retention import RetentionManager, RetentionSettings
+from .rollups import RecordRollups
+from .text_index import TextIndex, TextIndexSettings
+from .write_behind import WriteBehindQueue, WriteBehindSettings
+
+RecordStore = Union[SegmentedLogStore, SQLiteRecordStore]
+
+STORE_BACKENDS = {
+    "log": (SegmentedLogStore, LogStoreSettings),
+    "sqlite": (SQLiteRecordStore, SQLiteStoreSettings),
+}
+
+
+def _base_dir() -> str:
+    return os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def _pick(data: Dict[str, Any], cls) -> Dict[str, Any]:
+    return {k: v for k, v in (data or {}).items() if k in cls.__dataclass_fields__}
+
+
+def create_record_store(settings: Optional[Dict[str, Any]] = None) -> RecordStore:
+    """storage 설정으로 Recorder 저장소 인스턴스를 생성"""
+    settings = dict(settings or {})
+    backend = settings.pop("backend", "log")
+    if backend not in STORE_BACKENDS:
+        raise ValueError(f"지원하지 않는 Recorder 저장소입니다: {backend}")
+    store_class, settings_class = STORE_BACKENDS[backend]
+
+    path = settings.get("path")
+    if path and not os.path.isabs(path):
+        settings["path"] = os.path.join(_base_dir(), path)
+    return store_class(settings_class(**_pick(settings, settings_class)))
+
+
+def create_text_index(store: RecordStore, settings: Optional[Dict[str, Any]] = None) -> Optional[TextIndex]:
+    """storage.text_index 설정으로 저장소 옆(<저장소 경로>.index)에 전문 검색 인덱스를 엶 (비활성화면 None)"""
+    index_settings = TextIndexSettings(**_pick(settings, TextIndexSettings))
+    if not index_settings.enabled:
+        return None
+    path = index_settings.path or store.settings.path.rstrip(os.sep) + ".index"
+    if not os.path.isabs(path):
+        path = os.path.join(_base_dir(), path)
+    return TextIndex(path, index_settings)
+
+
+def create_rollups(store: RecordStore, settings: Optional[Dict[str, Any]] = None) -> Optional[RecordRollups]:
+    """storage.rollups 설정으로 저장소 옆(<저장소 경로>.rollups.json)의 집계를 엶 (비활성화면 None)"""
+    settings = settings or {}
+    if not settings.get("enabled", True):
+        return None
+    path = settings.get("path") or store.settings.path.rstrip(os.sep) + ".rollups.json"
+    if not os.path.isabs(path):
+        path = os.path.join(_base_dir(), path)
+    return RecordRollups(path)
+
+
+def create_delivery_ledger(store: RecordStore, settings: Optional[Dict[str, Any]] = None) -> Optional[DeliveryLedger]:
+    """storage.deliveries 설정으로 저장소 옆(<저장소 경로>.deliveries.json)의 전달 기록을 엶 (비활성화면 None)"""
+    settings = settings or {}
+    if not settings.get("enabled", True):
+        return None
+    path = settings.get("path") or store.settings.path.rstrip(os.sep) + ".deliveries.json"
+    if not os.path.isabs(path):
+        path = os.path.join(_base_dir(), path)
+    return DeliveryLedger(path, int(settings.get("max_entries", 10000)))
+
+
+def rollup_totals(settings: Optional[Dict[str, Any]] = None) -> Optional[Dict[str, Dict[str, int]]]:
+    """저장소를 열지 않고 집계 파일에서 에이전트별 합계를 읽음 (status 명령용, 집계가 없으면 None)"""
+    settings = settings or {}
+    rollup_settings = settings.get("rollups") or {}
+    if not rollup_settings.get("enabled", True):
+        return None
+    path = rollup_settings.get("path") or (settings.get("path") or "").rstrip(os.sep) + ".rollups.json"
+    if not os.path.isabs(path):
+        path = os.path.join(_base_dir(), path)
+    if not os.path.exists(path):
+        return None
+    return RecordRollups(path).totals()
+
+
+def create_record_writer(settings: Optional[Dict[str, Any]] = None) -> WriteBehindQueue:
+    """storage 설정으로 저장소(+검색 인덱스, 집계, 보존 정책)를 만들고 write-behind 큐로 감싸서 반환"""
+    settings = settings or {}
+    store = create_record_store(settings)
+    index = create_text_index(store, settings.get("text_index"))
+    rollups = create_rollups(store, settings.get("rollups"))
+    deliveries = create_delivery_ledger(store, settings.get("deliveries"))
+    retention_settings = RetentionSettings(**_pick(settings.get("retention"), RetentionSettings))
+    retention = RetentionManager(store, retention_settings, index=index, rollups=rollups) \
+        if retention_settings.enabled else None
+    return WriteBehindQueue(store, WriteBehindSettings(**_pick(settings.get("write_behind"), WriteBehindSettings)),
+                            index=index, rollups=rollups, retention=retention, deliveries=deliveries)
@@ -0,0 +1,280 @@
+"""
+Recorder 전문 검색 인덱스 (역색인 + BM25)
+- 토큰화: 영어/숫자는 소문자 단어, 한글은 음절 bigram (조사가 붙어도 매칭되도록, 1음절 단어는 그대로)
+- 레코드가 저장될 때마다 증분 추가 (write-behind writer 스레드에서 호출)
+- 영속화: 스냅샷(snapshot.json) + 증분 로그(delta.jsonl). 시작 시 스냅샷에 로그를 재생
+- compact(): 현재 상태로 스냅샷을 다시 쓰고 로그를 비움 (로그가 compact_threshold건을 넘으면 자동)
+- 저장소보다 뒤처진 경우 catch_up()으로 빠진 레코드를 다시 색인 (인덱스는 저장소로부터 재구성 가능)
+"""
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+_WORD_RE = re.compile(r'[a-z0-9]+|[가-힣]+')
+_HANGUL_RE = re.compile(r'^[가-힣]+$')
+
+INDEX_VERSION = 1
+
+
+def tokenize(text: str) -> List[str]:
+    """한국어/영어 혼합 텍스트를 색인 토큰으로 분리"""
+    tokens: List[str] = []
+    for word in _WORD_RE.findall(unicodedata.normalize('NFC', text or '').lower()):
+        if _HANGUL_RE.match(word):
+            if len(word) == 1:
+                tokens.append(word)
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+        elif len(word) > 1 or word.isdigit():
+            tokens.append(word)
+    return tokens
+
+
+def record_text(record: Dict[str, Any]) -> str:
+    """레코드에서 색인할 텍스트 (입력 + 응답)"""
+    return f"{record.get('input') or ''}\n{record.get('response') or ''}"
+
+
+@dataclass
+class TextIndexSettings:
+    """executorParams.storage.text_index 설정"""
+    enabled: bool = True
+    # 비우면 저장소 옆 (<저장소 경로>.index)
+    path: Optional[str] = None
+    k1: float = 1.2
+    b: float = 0.75
+    # 증분 로그가 이 건수를 넘으면 자동 compact
+    compact_threshold: int = 5000
+
+
+@dataclass
+class TextIndexStats:
+    indexed: int = 0
+    removed: int = 0
+    searches: int = 0
+    compactions: int = 0
+
+
+class TextIndex:
+    """증분 역색인 + BM25 검색 (스레드 안전)"""
+
+    def __init__(self, directory: str, settings: Optional[TextIndexSettings] = None):
+        self.settings = settings or TextIndexSettings()
+        self.directory = directory
+        self.counters = TextIndexStats()
+        self._lock = threading.RLock()
+        # term -> {doc_id: tf}
+        self._postings: Dict[str, Dict[int, int]] = {}
+        # doc_id -> (문서 길이, timestamp, 고유 term 목록)
+        self._docs: Dict[int, Tuple[int, str, List[str]]] = {}
+        self._total_len = 0
+        self._last_id = 0
+        self._delta_entries = 0
+        self._delta = None
+        os.makedirs(directory, exist_ok=True)
+        self._load()
+        self._delta = open(self._delta_path, 'a', encoding='utf-8')
+
+    # ---- 영속화 ----
+    @property
+    def _snapshot_path(self) -> str:
+        return os.path.join(self.directory, "snapshot.json")
+
+    @property
+    def _delta_path(self) -> str:
+        return os.path.join(self.directory, "delta.jsonl")
+
+    def _load(self) -> None:
+        if os.path.exists(self._snapshot_path):
+            try:
+                with open(self._snapshot_path, 'r', encoding='utf-8') as f:
+                    snapshot = json.load(f)
+                if snapshot.get("version") == INDEX_VERSION:
+                    for doc_id, (length, ts, tf) in snapshot["docs"].items():
+                        self._apply_add(int(doc_id), ts, tf, length)
+                    self._last_id = max(self._last_id, snapshot.get("last_id", 0))
+            except Exception as e:
+                print(f"⚠️ 검색 인덱스 스냅샷 로드 실패 (저장소에서 다시 색인합니다): {e}")
+                self._postings, self._docs, self._total_len, self._last_id = {}, {}, 0, 0
+
+        if os.path.exists(self._delta_path):
+            valid_end, skipped = 0, 0
+            with open(self._delta_path, 'rb') as f:
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        # 충돌로 잘린 마지막 줄 (아래에서 잘라냄)
+                        break
+                    valid_end += len(line)
+                    try:
+                        entry = json.loads(line)
+                        self._replay(entry)
+                    except (ValueError, KeyError, TypeError, AttributeError):
+                        skipped += 1
+                        continue
+                    self._delta_entries += 1
+            if os.path.getsize(self._delta_path) != valid_end:
+                # 잘린 줄 뒤에 이어 쓰면 다음 항목까지 한 줄로 합쳐져 유실되므로 마지막 정상 줄까지 잘라냄
+                print("⚠️ 검색 인덱스: 증분 로그 끝의 불완전한 줄을 잘라냅니다.")
+                with open(self._delta_path, 'r+b') as f:
+                    f.truncate(valid_end)
+            if skipped:
+                print(f"⚠️ 검색 인덱스: 읽을 수 없는 증분 로그 {skipped}줄을 건너뜁니다.")
+
+    def _replay(self, entry: Dict[str, Any]) -> None:
+        if entry["op"] == "add":
+            self._apply_add(entry["id"], entry.get("ts", ""), entry["tf"], entry["len"])
+        elif entry["op"] == "del":
+            self._apply_remove(entry["id"])
+
+    def _write_delta(self, entries: Iterable[Dict[str, Any]]) -> None:
+        lines = [json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries]
+        if not lines:
+            return
+        self._delta.write("".join(lines))
+        self._delta_entries += len(lines)
+        if self._delta_entries >= self.settings.compact_threshold:
+            self.compact()
+
+    # ---- 색인 ----
+    def _apply_add(self, doc_id: int, timestamp: str, tf: Dict[str, int], length: int) -> None:
+        if doc_id in self._docs:
+            return
+        for term, count in tf.items():
+            self._postings.setdefault(term, {})[doc_id] = count
+        self._docs[doc_id] = (length, timestamp, list(tf))
+        self._total_len += length
+        self._last_id = max(self._last_id, doc_id)
+
+    def _apply_remove(self, doc_id: int) -> bool:
+        doc = self._docs.pop(doc_id, None)
+        if doc is None:
+            return False
+        length, _, terms = doc
+        for term in terms:
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(doc_id, None)
+                if not postings:
+                    del self._postings[term]
+        self._total_len -= length
+        return True
+
+    def add_many(self, records: Iterable[Dict[str, Any]]) -> int:
+        """id가 있는 레코드들을 색인 (이미 색인된 id는 건너뜀)"""
+        entries = []
+        with self._lock:
+            for record in records:
+                doc_id = record["id"]
+                if doc_id in self._docs:
+                    continue
+                tokens = tokenize(record_text(record))
+                tf = dict(Counter(tokens))
+                timestamp = record.get("timestamp") or ""
+                self._apply_add(doc_id, timestamp, tf, len(tokens))
+                entries.append({"op": "add", "id": doc_id, "ts": timestamp, "tf": tf, "len": len(tokens)})
+            self._write_delta(entries)
+            self.counters.indexed += len(entries)
+        return len(entries)
+
+    def remove_many(self, doc_ids: Iterable[int]) -> int:
+        """색인에서 문서 제거 (보존 기간 정리 등)"""
+        entries = []
+        with self._lock:
+            for doc_id in doc_ids:
+                if self._apply_remove(doc_id):
+                    entries.append({"op": "del", "id": doc_id})
+            self._write_delta(entries)
+            self.counters.removed += len(entries)
+        return len(entries)
+
+    def catch_up(self, store: Any, batch_size: int = 1000) -> int:
+        """저장소에 있지만 아직 색인되지 않은 레코드(마지막 색인 ID 이후)를 색인"""
+        indexed, batch = 0, []
+        for record in store.iter_records(self._last_id + 1):
+            batch.append(record)
+            if len(batch) >= batch_size:
+                indexed += self.add_many(batch)
+                batch = []
+        indexed += self.add_many(batch)
+        return indexed
+
+    # ---- 검색 ----
+    def search(self, text: str, limit: int = 10, start: Optional[str] = None,
+               end: Optional[str] = None) -> List[Tuple[int, float]]:
+        """BM25 점수 순으로 (doc_id, score) 반환. start/end는 timestamp 범위 [start, end)"""
+        terms = set(tokenize(text))
+        with self._lock:
+            self.counters.searches += 1
+            n_docs = len(self._docs)
+            if not terms or n_docs == 0:
+                return []
+            avgdl = self._total_len / n_docs or 1.0
+            k1, b = self.settings.k1, self.settings.b
+            scores: Dict[int, float] = {}
+            for term in terms:
+                postings = self._postings.get(term)
+                if not postings:
+                    continue
+                idf = math.log(1 + (n_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+                for doc_id, tf in postings.items():
+                    length, timestamp, _ = self._docs[doc_id]
+                    if (start is not None and timestamp < start) or (end is not None and timestamp >= end):
+                        continue
+                    norm = tf + k1 * (1 - b + b * length / avgdl)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + idf * tf * (k1 + 1) / norm
+        ranked = sorted(scores.items(), key=lambda item: (-item[1], -item[0]))
+        return [(doc_id, round(score, 4)) for doc_id, score in ranked[:max(1, int(limit))]]
+
+    # ---- 유지 관리 ----
+    def compact(self) -> None:
+        """현재 상태를 스냅샷으로 쓰고 증분 로그를 비움"""
+        with self._lock:
+            snapshot = {
+                "version": INDEX_VERSION,
+                "last_id": self._last_id,
+                "docs": {doc_id: [length, ts, {t: self._postings[t][doc_id] for t in terms}]
+                         for doc_id, (length, ts, terms) in self._docs.items()},
+            }
+            tmp_path = self._snapshot_path + ".tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self._snapshot_path)
+            if self._delta is not None:
+                self._delta.close()
+            self._delta = open(self._delta_path, 'w', encoding='utf-8')
+            self._delta_entries = 0
+            self.counters.compactions += 1
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._delta is not None:
+                self._delta.flush()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._delta is None:
+                return
+            if self._delta_entries:
+                self.compact()
+            self._delta.close()
+            self._delta = None
+
+    @property
+    def last_id(self) -> int:
+        return self._last_id
+
+    def stats(self) -> Dict[str, Any]:
+        counters = asdict(self.counters)
+        counters["documents"] = len(self._docs)
+        counters["terms"] = len(self._postings)
+        counters["delta_entries"] = self._delta_entries
+        return counters
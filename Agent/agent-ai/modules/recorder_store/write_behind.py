@@ -0,0 +1,238 @@
+"""
+Recorder write-behind 큐
+- 이벤트 루프는 레코드를 제한된 크기의 큐에 넣기만 하고 바로 반환
+- 전용 writer 스레드가 큐를 비우면서 batch_size건씩 append_many로 묶어 기록
+- 큐가 가득 차면 put_timeout초까지 기다리고(backpressure), 그래도 자리가 없으면 WriteBehindFull 발생
+- flush_interval초마다 저장소를 flush하고, close() 시 남은 레코드를 모두 기록한 뒤 저장소를 닫음
+- 전문 검색 인덱스/집계가 있으면 기록된 레코드를 같은 스레드에서 증분 반영 (시작 시 빠진 레코드부터 따라잡음)
+- 전달 기록이 있으면 이미 저장된 outbox_id의 레코드는 다시 기록하지 않고 기존 레코드 ID로 완료
+- 보존 정책이 있으면 주기적으로 별도 스레드에서 정리/compaction 실행 (기록을 막지 않음)
+
+Recorder의 A2A 응답 지연이 디스크 지연과 무관해집니다.
+"""
+from __future__ import annotations
+
+import asyncio
+import atexit
+import queue
+import threading
+from concurrent.futures import Future
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, List, Optional, Tuple
+
+_STOP = object()
+
+
+def _chain(source: Future, target: Future) -> None:
+    if source.exception() is not None:
+        target.set_exception(source.exception())
+    else:
+        target.set_result(source.result())
+
+
+class WriteBehindFull(RuntimeError):
+    """큐가 가득 차서 put_timeout 안에 레코드를 넣지 못했을 때 발생"""
+
+
+@dataclass
+class WriteBehindSettings:
+    """executorParams.storage.write_behind 설정"""
+    max_pending: int = 1024
+    batch_size: int = 256
+    flush_interval: float = 1.0
+    # 큐가 가득 찼을 때 기다리는 최대 시간 (초, None이면 무기한)
+    put_timeout: Optional[float] = 5.0
+
+
+@dataclass
+class WriteBehindStats:
+    submitted: int = 0
+    written: int = 0
+    batches: int = 0
+    backpressure_waits: int = 0
+    rejected: int = 0
+    errors: int = 0
+    duplicates: int = 0
+
+
+class WriteBehindQueue:
+    """저장소(append_many/flush/close 제공) 앞단의 비동기 쓰기 큐"""
+
+    def __init__(self, store: Any, settings: Optional[WriteBehindSettings] = None, name: str = "recorder",
+                 index: Optional[Any] = None, rollups: Optional[Any] = None, retention: Optional[Any] = None,
+                 deliveries: Optional[Any] = None):
+        self.store = store
+        self.index = index
+        self.rollups = rollups
+        self.retention = retention
+        self.deliveries = deliveries
+        # 기록된 레코드를 증분 반영하는 파생 데이터 (catch_up/add_many/flush/close 제공)
+        self._derived = [(label, target) for label, target in (("검색 인덱스", index), ("집계", rollups),
+                                                               ("전달 기록", deliveries))
+                         if target is not None]
+        self.settings = settings or WriteBehindSettings()
+        self.counters = WriteBehindStats()
+        self._queue: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, self.settings.max_pending))
+        self._closed = False
+        self._close_lock = threading.Lock()
+        self._thread = threading.Thread(target=self._run, name=f"{name}-writer", daemon=True)
+        self._thread.start()
+        # 종료 이벤트 없이 프로세스가 끝나도 남은 레코드를 기록
+        atexit.register(self.close)
+
+    # ---- 공개 API ----
+    async def submit(self, record: Dict[str, Any]) -> Future:
+        """레코드를 큐에 넣고 바로 반환 (Future는 기록 후 레코드 ID로 완료)
+
+        큐가 가득 차 있으면 이벤트 루프를 막지 않고 자리가 날 때까지 기다립니다.
+        """
+        if self._closed:
+            raise RuntimeError("write-behind 큐가 닫혔습니다.")
+        future: Future = Future()
+        item = (record, future)
+        try:
+            self._queue.put_nowait(item)
+        except queue.Full:
+            self.counters.backpressure_waits += 1
+            try:
+                await asyncio.to_thread(self._queue.put, item, True, self.settings.put_timeout)
+            except queue.Full:
+                self.counters.rejected += 1
+                raise WriteBehindFull(
+                    f"Recorder 쓰기 큐가 가득 찼습니다 ({self.settings.max_pending}건 대기 중)") from None
+        self.counters.submitted += 1
+        return future
+
+    @property
+    def pending(self) -> int:
+        return self._queue.qsize()
+
+    def close(self, timeout: Optional[float] = 30.0) -> None:
+        """남은 레코드를 모두 기록하고 writer 스레드와 저장소를 종료"""
+        with self._close_lock:
+            if self._closed:
+                return
+            self._closed = True
+        self._queue.put(_STOP)
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            print(f"⚠️ Recorder writer가 {timeout}s 안에 끝나지 않았습니다 (남은 레코드 {self.pending}건)")
+            return
+        # 종료 직전에 backpressure 대기 중이던 submit이 넣은 레코드
+        leftovers = []
+        while True:
+            try:
+                item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _STOP:
+                leftovers.append(item)
+        if leftovers:
+            self._write(leftovers)
+        if self.retention is not None and not self.retention.wait(timeout):
+            print(f"⚠️ Recorder 보존 기간 정리가 {timeout}s 안에 끝나지 않았습니다")
+            return
+        try:
+            for _, target in self._derived:
+                target.close()
+            self.store.close()
+        except Exception as e:
+            print(f"⚠️ Recorder 저장소 닫기 실패: {e}")
+        atexit.unregister(self.close)
+
+    def stats(self) -> Dict[str, Any]:
+        counters = asdict(self.counters)
+        counters["pending"] = self.pending
+        counters["max_pending"] = self.settings.max_pending
+        return counters
+
+    # ---- writer 스레드 ----
+    def _run(self) -> None:
+        for label, target in self._derived:
+            try:
+                caught_up = target.catch_up(self.store)
+                if caught_up:
+                    print(f"🔎 {label}: 누락된 레코드 {caught_up}건 반영")
+            except Exception as e:
+                print(f"⚠️ {label} 따라잡기 실패: {e}")
+        stopping = False
+        while not stopping:
+            self._maintain()
+            try:
+                item = self._queue.get(timeout=self.settings.flush_interval)
+            except queue.Empty:
+                self._flush()
+                continue
+
+            batch: List[Tuple[Dict[str, Any], Future]] = []
+            while True:
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+                if stopping or len(batch) >= self.settings.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[Tuple[Dict[str, Any], Future]]) -> None:
+        if self.deliveries is not None:
+            batch = self._skip_delivered(batch)
+            if not batch:
+                return
+        try:
+            ids = self.store.append_many([record for record, _ in batch])
+        except Exception as e:
+            self.counters.errors += 1
+            print(f"❌ Recorder 일괄 기록 실패 ({len(batch)}건): {e}")
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        self.counters.written += len(batch)
+        self.counters.batches += 1
+        written = [{**record, "id": record_id} for (record, _), record_id in zip(batch, ids)]
+        for label, target in self._derived:
+            try:
+                target.add_many(written)
+            except Exception as e:
+                # 인덱스/집계는 저장소에서 다시 따라잡을 수 있으므로 기록 자체는 성공으로 처리
+                self.counters.errors += 1
+                print(f"⚠️ {label} 갱신 실패: {e}")
+        for (_, future), record_id in zip(batch, ids):
+            future.set_result(record_id)
+
+    def _skip_delivered(self, batch: List[Tuple[Dict[str, Any], Future]]) -> List[Tuple[Dict[str, Any], Future]]:
+        """이미 저장된(또는 같은 배치에 먼저 나온) outbox_id의 레코드를 빼고, 그 Future는 기존 레코드 ID로 완료"""
+        kept: List[Tuple[Dict[str, Any], Future]] = []
+        first: Dict[str, Future] = {}
+        for record, future in batch:
+            outbox_id = record.get("outbox_id")
+            record_id = self.deliveries.get(outbox_id)
+            if record_id is not None:
+                self.counters.duplicates += 1
+                future.set_result(record_id)
+            elif outbox_id and outbox_id in first:
+                self.counters.duplicates += 1
+                first[outbox_id].add_done_callback(lambda done, future=future: _chain(done, future))
+            else:
+                if outbox_id:
+                    first[outbox_id] = future
+                kept.append((record, future))
+        return kept
+
+    def _flush(self) -> None:
+        try:
+            self.store.flush()
+            for _, target in self._derived:
+                target.flush()
+        except Exception as e:
+            self.counters.errors += 1
+            print(f"⚠️ Recorder 저장소 flush 실패: {e}")
+
+    def _maintain(self) -> None:
+        if self.retention is not None:
+            self.retention.run_if_due()
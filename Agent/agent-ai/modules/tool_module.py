@@ -1,13 +1,16 @@
 import asyncio
-from typing import List, Dict, Any, Coroutine
+from typing import List, Dict, Any, Coroutine, Callable, Optional
 from langchain_core.tools import BaseTool
 from langchain_core.messages import ToolMessage
 from concurrent.futures import ThreadPoolExecutor
 from .a2a_manager import get_a2a_manager
+from .a2a_core.a2a_client import StreamAggregator
 
 class ToolNode:
-    def __init__(self,tools: List[BaseTool]):
+    def __init__(self,tools: List[BaseTool], stream_sink: Optional[Callable[[str], Any]] = None):
         self.tools_by_name = {tool.name: tool for tool in tools}
+        # 원격 에이전트 응답을 부분 출력할 출력기 팩토리 (예: OutputNode.open_stream)
+        self.stream_sink = stream_sink
 
     async def _execute_tool(self, tool_call: Dict[str, Any]) -> ToolMessage:
         """단일 도구 호출을 비동기적으로 실행하고 결과를 ToolMessage로 반환"""
@@ -22,6 +25,11 @@ class ToolNode:
                 observation = await self._handle_a2a_send(tool_args)
             except Exception as e:
                 observation = f"Error during a2a_send: {e}"
+        elif tool_name == "a2a_send_many":
+            try:
+                observation = await self._handle_a2a_send_many(tool_args)
+            except Exception as e:
+                observation = f"Error during a2a_send_many: {e}"
         else:
             tool_to_invoke = self.tools_by_name.get(tool_name)
             if not tool_to_invoke:
@@ -49,7 +57,10 @@ class ToolNode:
             return "오류: agent_name과 text가 필요합니다."
         try:
             manager = get_a2a_manager()
-            response = await manager.send(agent_name, text)
+            if self.stream_sink is not None:
+                response = await self._stream_a2a_send(manager, agent_name, text)
+            else:
+                response = await manager.send(agent_name, text)
             if response:
                 return f"✅ '{agent_name}'에게 메시지 전송 완료. 응답: {response}"
             else:
@@ -57,6 +68,52 @@ class ToolNode:
         except Exception as e:
             return f"❌ A2A 전송 오류: {str(e)}"
 
+    async def _stream_a2a_send(self, manager, agent_name: str, text: str) -> Optional[List[str]]:
+        """원격 에이전트 응답을 청크 단위로 출력하면서 최종 결과를 모읍니다"""
+        printer = self.stream_sink(f"📡 {agent_name}")
+        aggregator = StreamAggregator()
+        try:
+            async for chunk in manager.stream(agent_name, text):
+                aggregator.add(chunk)
+                if chunk.kind in ("artifact", "message"):
+                    printer.write(chunk.text)
+        finally:
+            printer.close()
+
+        if aggregator.failed:
+            print(f"❌ A2A 전송 오류: {aggregator.error}")
+            return None
+        result = aggregator.result()
+        return [str(p) for p in result] if result else None
+
+    async def _handle_a2a_send_many(self, args: Dict[str, Any]) -> str:
+        """여러 에이전트에게 동시에 전송하고, 완료되는 순서대로 결과를 수집"""
+        requests = []
+        for item in args.get("requests") or []:
+            agent_name = item.get("agent_name") or item.get("agent")
+            text = item.get("text") or item.get("message")
+            if agent_name and text:
+                requests.append((agent_name, text))
+        if not requests:
+            return "오류: requests에 agent_name과 text가 필요합니다."
+
+        manager = get_a2a_manager()
+        results = []
+        async for result in manager.send_many(requests):
+            if result.ok:
+                print(f"  ✅ [{result.agent_name}] 응답 수신 ({result.elapsed:.2f}s)")
+            else:
+                print(f"  ⚠️ [{result.agent_name}] 실패: {result.error}")
+            results.append(result)
+
+        lines = []
+        for result in sorted(results, key=lambda r: r.index):
+            if result.ok:
+                lines.append(f"✅ '{result.agent_name}' 응답: {result.response}")
+            else:
+                lines.append(f"❌ '{result.agent_name}' 전송 실패: {result.error}")
+        return "\n".join(lines)
+
     async def process(self, state: Dict[str, Any]) -> Dict[str, Any]:
         """상태(state)에서 tool_calls를 찾아 모든 도구를 병렬로 실행"""
         messages = state.get("messages", [])
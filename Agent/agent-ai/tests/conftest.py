@@ -0,0 +1,5 @@
+import os
+import sys
+
+# agent-ai 디렉터리를 import 경로에 추가 (modules.*, workflows.*)
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
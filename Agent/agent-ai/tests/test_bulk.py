@@ -0,0 +1,82 @@
+import threading
+import time
+
+from modules.memory_store.bulk import BulkSettings, MemoryCounters, bulk_delete, clear_all, iter_memories
+from modules.memory_store.vector_store import create_local_memory
+
+
+class _CloudClient:
+    """page/page_size 조회와 batch_delete를 지원하는 mem0 클라우드 클라이언트"""
+    api_key = "test"
+
+    def __init__(self, count):
+        self.items = [{"id": f"m{i}", "memory": f"메모리 {i}"} for i in range(count)]
+        self.pages = []
+        self.batches = []
+
+    def get_all(self, version, filters, page, page_size):
+        self.pages.append(page)
+        return {"results": self.items[(page - 1) * page_size:page * page_size]}
+
+    def batch_delete(self, memories):
+        self.batches.append(len(memories))
+
+
+class _Memory:
+    """개별 delete만 지원하는 mem0 Memory (동시 호출 수 기록)"""
+
+    def __init__(self, count):
+        self.items = [{"id": f"m{i}"} for i in range(count)]
+        self.deleted = []
+        self.running = self.peak = 0
+        self._lock = threading.Lock()
+
+    def get_all(self, user_id, limit):
+        return {"results": list(self.items)}
+
+    def delete(self, memory_id):
+        with self._lock:
+            self.running += 1
+            self.peak = max(self.peak, self.running)
+        time.sleep(0.01)
+        with self._lock:
+            self.running -= 1
+            self.deleted.append(memory_id)
+
+
+def test_cloud_client_is_paged_and_deleted_in_batches():
+    client = _CloudClient(250)
+    assert [len(page) for page in iter_memories(client, "alice", page_size=100)] == [100, 100, 50]
+    assert client.pages == [1, 2, 3]
+    assert clear_all(client, "alice", BulkSettings(page_size=100, batch_size=120)) == 250
+    assert sorted(client.batches) == [10, 120, 120]
+
+
+def test_single_deletes_run_concurrently():
+    memory = _Memory(12)
+    assert clear_all(memory, "alice", BulkSettings(workers=4)) == 12
+    assert sorted(memory.deleted) == sorted(item["id"] for item in memory.items)
+    assert 1 < memory.peak <= 4
+
+
+def test_local_memory_uses_delete_many(tmp_path):
+    memory = create_local_memory({"path": str(tmp_path)})
+    memory.add(["커피를 좋아함", "서울 거주", "고양이를 키움"], user_id="alice", infer=False)
+    ids = [item["id"] for page in iter_memories(memory, "alice", page_size=2) for item in page]
+    assert len(ids) == 3
+    assert bulk_delete(memory, ids[:2]) == 2
+    assert memory.count("alice") == 1
+
+
+def test_counters_count_once_then_track_events():
+    memory = _Memory(5)
+    counters = MemoryCounters(memory)
+    assert counters.get("alice") == 5
+    memory.items.clear()
+    counters.apply_add("alice", {"results": [{"event": "ADD"}, {"event": "ADD"}, {"event": "DELETE"}]})
+    assert counters.get("alice") == 6
+    counters.apply_delete("alice", 2)
+    assert counters.get("alice") == 4
+    # 삭제 개수를 모르면 다음 조회 때 다시 셈
+    counters.apply_delete("alice", -1)
+    assert counters.get("alice") == 0
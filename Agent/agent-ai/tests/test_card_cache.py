@@ -0,0 +1,88 @@
+import asyncio
+import json
+
+import httpx
+
+from modules.a2a_core.card_cache import AgentCardCache, AgentCardETagMiddleware
+
+BASE_URL = "http://summarize.test/"
+CARD = {
+    "name": "Summarize Agent", "description": "요약 에이전트", "url": BASE_URL, "version": "1.0.0",
+    "capabilities": {}, "default_input_modes": ["text"], "default_output_modes": ["text"], "skills": [],
+}
+
+
+class _CardApp:
+    """카드 요청 수를 세는 ASGI 앱"""
+
+    def __init__(self):
+        self.requests = 0
+
+    async def __call__(self, scope, receive, send):
+        self.requests += 1
+        body = json.dumps(CARD).encode()
+        await send({"type": "http.response.start", "status": 200,
+                    "headers": [(b"content-type", b"application/json")]})
+        await send({"type": "http.response.body", "body": body})
+
+
+def _client(app, max_age=300):
+    return httpx.AsyncClient(transport=httpx.ASGITransport(app=AgentCardETagMiddleware(app, max_age=max_age)))
+
+
+def test_fresh_card_is_served_from_the_cache(tmp_path):
+    app = _CardApp()
+
+    async def scenario():
+        async with _client(app) as client:
+            cache = AgentCardCache(cache_dir=str(tmp_path))
+            first = await cache.get_card(BASE_URL, client)
+            await cache.get_card(BASE_URL, client)
+            # 디스크에서 다시 읽은 캐시도 네트워크 없이 응답
+            await AgentCardCache(cache_dir=str(tmp_path)).get_card(BASE_URL, client)
+            return cache, first
+
+    cache, card = asyncio.run(scenario())
+    assert card.name == "Summarize Agent"
+    assert app.requests == 1
+    assert (cache.counters.misses, cache.counters.hits) == (1, 1)
+
+
+async def _record(responses, response):
+    responses.append(response.status_code)
+
+
+def test_expired_card_is_revalidated_with_etag(tmp_path):
+    app = _CardApp()
+    responses = []
+
+    async def scenario():
+        async with _client(app, max_age=0) as client:
+            client.event_hooks["response"].append(lambda response: _record(responses, response))
+            cache = AgentCardCache(cache_dir=str(tmp_path))
+            await cache.get_card(BASE_URL, client)
+            card = await cache.get_card(BASE_URL, client)
+            return cache, card
+
+    cache, card = asyncio.run(scenario())
+    assert card.name == "Summarize Agent"
+    assert responses == [200, 304]
+    assert (cache.counters.revalidations, cache.counters.not_modified) == (1, 1)
+
+
+def test_stale_card_is_served_when_revalidation_fails(tmp_path):
+    async def scenario():
+        async with _client(_CardApp(), max_age=0) as client:
+            cache = AgentCardCache(cache_dir=str(tmp_path))
+            await cache.get_card(BASE_URL, client)
+
+        def refuse(request):
+            raise httpx.ConnectError("연결 거부", request=request)
+
+        async with httpx.AsyncClient(transport=httpx.MockTransport(refuse)) as client:
+            card = await cache.get_card(BASE_URL, client)
+        return cache, card
+
+    cache, card = asyncio.run(scenario())
+    assert card.name == "Summarize Agent"
+    assert (cache.counters.errors, cache.counters.stale_served) == (1, 1)
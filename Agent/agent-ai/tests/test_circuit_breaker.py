@@ -0,0 +1,99 @@
+import asyncio
+import time
+
+import pytest
+
+from modules.a2a_core.a2a_client import A2AClientAgent, A2AServerEntry, StreamChunk
+from modules.a2a_core.resilience import BreakerPolicy, CircuitBreaker, CircuitOpenError
+
+AGENT = "Test Agent"
+
+
+def _half_open(breaker: CircuitBreaker) -> None:
+    for _ in range(breaker.policy.failure_threshold):
+        breaker.record_failure()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_breaker_opens_and_probe_closes():
+    breaker = CircuitBreaker(AGENT, BreakerPolicy(failure_threshold=2, recovery_timeout=60))
+    breaker.record_failure()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+
+    breaker._opened_at -= 60
+    breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+
+def test_half_open_allows_one_probe_and_failed_probe_reopens():
+    breaker = CircuitBreaker(AGENT, BreakerPolicy(failure_threshold=1, recovery_timeout=0))
+    _half_open(breaker)
+    breaker.allow()
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    breaker.record_failure()
+    breaker._opened_at -= 1
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+
+
+def test_released_probe_slot_can_be_reused():
+    breaker = CircuitBreaker(AGENT, BreakerPolicy(failure_threshold=1, recovery_timeout=0))
+    _half_open(breaker)
+    breaker.allow()
+    breaker.release()
+    breaker.allow()
+
+
+def test_stale_probe_slot_is_rearmed():
+    breaker = CircuitBreaker(AGENT, BreakerPolicy(failure_threshold=1, recovery_timeout=0, probe_timeout=0.05))
+    _half_open(breaker)
+    breaker.allow()
+    with pytest.raises(CircuitOpenError):
+        breaker.allow()
+    time.sleep(0.06)
+    breaker.allow()
+
+
+def _client(monkeypatch) -> A2AClientAgent:
+    entry = A2AServerEntry(name=AGENT, url="http://localhost:1",
+                           resilience={"circuit_breaker": {"failure_threshold": 1, "recovery_timeout": 0}})
+    client = A2AClientAgent([entry], auto_init=False)
+    client.remote_agent_connections[AGENT] = object()
+
+    async def _hanging_stream(*args, **kwargs):
+        yield StreamChunk(kind="status", agent_name=AGENT)
+        await asyncio.sleep(3600)
+
+    monkeypatch.setattr(client, "_stream_once", _hanging_stream)
+    _half_open(client.get_breaker(AGENT))
+    return client
+
+
+def test_cancelled_send_message_probe_gives_slot_back(monkeypatch):
+    client = _client(monkeypatch)
+
+    async def run():
+        with pytest.raises(asyncio.TimeoutError):
+            await asyncio.wait_for(client.send_message(AGENT, "hi"), 0.05)
+
+    asyncio.run(run())
+    breaker = client.get_breaker(AGENT)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    breaker.allow()
+
+
+def test_abandoned_stream_probe_gives_slot_back(monkeypatch):
+    client = _client(monkeypatch)
+
+    async def run():
+        stream = client.stream_message(AGENT, "hi")
+        chunk = await stream.__anext__()
+        assert chunk.kind == "status"
+        await stream.aclose()
+
+    asyncio.run(run())
+    client.get_breaker(AGENT).allow()
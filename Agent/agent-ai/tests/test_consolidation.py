@@ -0,0 +1,89 @@
+from modules.memory_store.bulk import MemoryCounters
+from modules.memory_store.consolidation import ConsolidationSettings, MemoryConsolidator
+from modules.memory_store.embeddings import EmbeddingSettings
+from modules.memory_store.vector_store import LocalMemorySettings, LocalVectorMemory, create_local_memory
+
+USER = "tester"
+FACTS = ["사용자는 서울에 살고 있으며 주말마다 한강에서 자전거를 타고 저녁에는 동네 카페에서 책을 읽는다",
+         "사용자는 부산에 살고 있으며 주말마다 한강에서 자전거를 타고 저녁에는 동네 카페에서 책을 읽는다"]
+
+
+def _texts(memory):
+    return sorted(item["memory"] for item in memory.get_all(USER)["results"])
+
+
+class _Mem0Like:
+    """임베딩을 노출하지 않는 mem0 Memory 형태의 저장소"""
+
+    def __init__(self, memories):
+        self.memories = {str(i): {"id": str(i), "memory": text} for i, text in enumerate(memories)}
+
+    def get_all(self, user_id, limit=100):
+        return {"results": list(self.memories.values())[:limit]}
+
+    def delete(self, memory_id):
+        del self.memories[memory_id]
+
+
+def test_mem0_backend_does_not_merge_similar_facts():
+    memory = _Mem0Like(FACTS)
+    consolidator = MemoryConsolidator(memory, threshold=100, settings=ConsolidationSettings(cluster_threshold=0.9))
+    report = consolidator.consolidate(USER)
+    assert report["merged"] == 0
+    assert len(memory.memories) == 2
+    assert consolidator.stats()["merging"] is False
+
+
+def test_mem0_backend_still_evicts_over_threshold():
+    memory = _Mem0Like([f"사실 {i}" for i in range(10)])
+    consolidator = MemoryConsolidator(memory, threshold=5, settings=ConsolidationSettings(target_ratio=0.8))
+    report = consolidator.consolidate(USER)
+    assert (report["merged"], report["evicted"], report["after"]) == (0, 6, 4)
+    assert len(memory.memories) == 4
+
+
+class _SemanticEmbedder:
+    """의미 기반 임베더(google/openai) 자리에 쓰는 임베더 (벡터는 hashing 임베더에서 가져옴)"""
+
+    def __init__(self, embedder):
+        self.dim = embedder.dim
+        self._embedder = embedder
+
+    def embed_documents(self, texts):
+        return self._embedder.embed_documents(texts)
+
+    def embed_query(self, text):
+        return self._embedder.embed_query(text)
+
+
+def test_local_backend_merges_with_semantic_embedder(tmp_path):
+    memory = LocalVectorMemory(LocalMemorySettings(path=str(tmp_path), dedupe_threshold=1.1),
+                               EmbeddingSettings(dim=256))
+    memory.embedder = _SemanticEmbedder(memory.embedder)
+    memory.add(["사용자는 커피를 좋아한다", "사용자는 커피를 좋아한다!", "사용자는 고양이를 키운다"], user_id=USER)
+    consolidator = MemoryConsolidator(memory, threshold=100, settings=ConsolidationSettings(cluster_threshold=0.9))
+    report = consolidator.consolidate(USER)
+    assert report["merged"] == 1
+    assert memory.count(USER) == 2
+    memory.close()
+
+
+def test_default_local_backend_does_not_merge_similar_facts(tmp_path):
+    memory = create_local_memory({"path": str(tmp_path)})
+    memory.add(FACTS, user_id=USER)
+    assert memory.count(USER) == 2
+    consolidator = MemoryConsolidator(memory, threshold=100, settings=ConsolidationSettings())
+    report = consolidator.consolidate(USER)
+    assert report["merged"] == 0
+    assert _texts(memory) == sorted(FACTS)
+    assert consolidator.stats()["merging"] is False
+    memory.close()
+
+
+def test_counter_adjust_keeps_concurrent_adds():
+    counters = MemoryCounters(_Mem0Like(FACTS))
+    assert counters.get(USER) == 2
+    # 정리(2 → 1) 도중에 add 한 건이 반영된 경우
+    counters.apply_add(USER, {"results": [{"event": "ADD"}]})
+    counters.adjust(USER, 1 - 2)
+    assert counters.get(USER) == 2
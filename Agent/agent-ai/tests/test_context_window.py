@@ -0,0 +1,71 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+
+from modules.llm_core.context_window import ContextWindowManager, ContextWindowSettings, TRUNCATED_MARK
+
+
+def _manager(**kwargs):
+    return ContextWindowManager(ContextWindowSettings(reserve_tokens=0, **kwargs))
+
+
+def _tokens(manager, messages):
+    return sum(manager.counter.count_message(message) for message in messages)
+
+
+def _history(turns):
+    history = []
+    for i in range(turns):
+        history += [HumanMessage(content=f"질문 {i} " + "내용 " * 20), AIMessage(content=f"답변 {i} " + "설명 " * 20)]
+    return history + [HumanMessage(content="마지막 질문")]
+
+
+def test_recent_history_fills_the_budget():
+    manager = _manager(max_tokens=400)
+    history = _history(10)
+    messages = manager.pack("시스템", history)
+
+    assert isinstance(messages[0], SystemMessage)
+    assert messages[-1].content == "마지막 질문"
+    assert _tokens(manager, messages) <= manager.budget
+    # 오래된 대화부터 빠지고, 남은 기록은 중간이 비지 않는 최신 구간
+    kept = messages[1:]
+    assert 1 < len(kept) < len(history)
+    assert kept == history[-len(kept):]
+    assert manager.last_report["dropped_groups"] > 0
+
+
+def test_tool_call_and_result_stay_together():
+    manager = _manager(max_tokens=300, tool_result_tokens=20)
+    call = AIMessage(content="", tool_calls=[{"name": "search", "args": {"q": "날씨"}, "id": "call-1"}])
+    result = ToolMessage(content="맑음 " * 200, tool_call_id="call-1")
+    history = _history(3)[:-1] + [HumanMessage(content="날씨 알려줘"), call, result]
+    messages = manager.pack("시스템", history)
+
+    assert messages[-3:-1] == [history[-3], call]
+    # 긴 도구 결과는 tool_result_tokens로 잘림
+    assert messages[-1].content.endswith(TRUNCATED_MARK)
+    assert manager.counter.count(messages[-1].content) <= 20
+    # 앞 메시지가 잘려 나간 ToolMessage는 단독으로 들어가지 않음
+    orphan = manager.pack("시스템", [result, HumanMessage(content="다음 질문")])
+    assert [type(m) for m in orphan] == [SystemMessage, HumanMessage]
+
+
+def test_memories_and_context_respect_their_limits():
+    manager = _manager(max_tokens=2000, memory_tokens=40, context_tokens=30)
+    memories = [f"기억 {i}: " + "커피 " * 10 for i in range(10)]
+    system = manager.pack("시스템", [HumanMessage(content="질문")], memories=memories,
+                          context="참고 " * 200, summary="이전 요약")[0].content
+
+    assert "[이전 대화 요약]\n이전 요약" in system
+    assert 0 < manager.last_report["memories"] < len(memories)
+    # 앞쪽(중요한) 메모리부터 포함
+    assert "기억 0:" in system and "기억 9:" not in system
+    assert system.endswith(TRUNCATED_MARK)
+
+
+def test_token_counts_are_cached_across_turns():
+    manager = _manager(max_tokens=2000)
+    history = _history(3)
+    manager.pack("시스템", history)
+    hits = manager.counter.hits
+    manager.pack("시스템", history)
+    assert manager.counter.hits > hits
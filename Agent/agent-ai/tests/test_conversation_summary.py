@@ -0,0 +1,76 @@
+import asyncio
+
+from langchain_core.messages import AIMessage, HumanMessage
+
+from modules.llm_core.conversation_summary import RollingSummary, SummarySettings
+
+SESSION = "tester"
+
+
+class _SlowLLM:
+    def __init__(self):
+        self.release = asyncio.Event()
+
+    async def ainvoke(self, prompt):
+        await self.release.wait()
+        return AIMessage(content="- 사용자는 커피를 좋아한다")
+
+
+def _history(turns):
+    messages = []
+    for index in range(turns):
+        messages += [HumanMessage(content=f"질문 {index}"), AIMessage(content=f"답변 {index}")]
+    return messages
+
+
+def _summary(llm=None):
+    return RollingSummary(llm, SummarySettings(trigger_messages=4, keep_messages=2, path=None))
+
+
+def test_evicted_messages_stay_until_summary_is_saved():
+    async def scenario():
+        llm = _SlowLLM()
+        summary = _summary(llm)
+        messages = _history(3)
+        assert summary.compact(SESSION, messages) is None
+        await asyncio.sleep(0)
+        # 요약 중에는 기록을 줄이지 않음
+        assert summary.compact(SESSION, messages + _history(1)) is None
+        assert summary.get(SESSION) == ""
+
+        llm.release.set()
+        await summary.flush()
+        kept = summary.compact(SESSION, messages)
+        return summary, kept
+
+    summary, kept = asyncio.run(scenario())
+    assert [m.content for m in kept] == ["질문 2", "답변 2"]
+    assert summary.get(SESSION) == "- 사용자는 커피를 좋아한다"
+    assert summary.counters.summarized_messages == 4
+
+
+def test_failed_update_keeps_messages():
+    async def scenario():
+        summary = _summary()
+
+        async def _fail(*args):
+            raise RuntimeError("요약 실패")
+
+        summary._summarize = _fail
+        messages = _history(3)
+        assert summary.compact(SESSION, messages) is None
+        await summary.flush()
+        return summary.compact(SESSION, messages)
+
+    # 실패하면 아무것도 빼지 않고 다시 요약을 시도
+    assert asyncio.run(scenario()) is None
+
+
+def test_reset_history_is_not_trimmed():
+    async def scenario():
+        summary = _summary()
+        assert summary.compact(SESSION, _history(3)) is None
+        await summary.flush()
+        return summary.compact(SESSION, [HumanMessage(content="새 대화")])
+
+    assert asyncio.run(scenario()) is None
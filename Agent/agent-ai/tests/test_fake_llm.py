@@ -0,0 +1,78 @@
+import asyncio
+import random
+import statistics
+import time
+
+import pytest
+from langchain_core.messages import HumanMessage, SystemMessage, ToolMessage
+
+from modules.llm_core.fake_llm import create_fake_llm, sample
+
+PROMPT = [SystemMessage(content="시스템"), HumanMessage(content="diffusion 모델 설명해 줘")]
+TOOLS = [{"type": "function", "function": {
+    "name": "a2a_send",
+    "parameters": {"properties": {"agent_name": {"type": "string"}, "text": {"type": "string"}},
+                   "required": ["agent_name", "text"]}}}]
+
+
+def test_same_seed_and_prompt_give_the_same_response():
+    first = create_fake_llm({"seed": 7, "response_tokens": {"distribution": "uniform", "min": 5, "max": 50}})
+    second = create_fake_llm({"seed": 7, "response_tokens": {"distribution": "uniform", "min": 5, "max": 50}})
+    other_seed = create_fake_llm({"seed": 8, "response_tokens": {"distribution": "uniform", "min": 5, "max": 50}})
+
+    reply = first.invoke(PROMPT)
+    assert reply.content.startswith("[fake] diffusion 모델 설명해 줘 →")
+    assert second.invoke(PROMPT).content == reply.content
+    assert asyncio.run(first.ainvoke(PROMPT)).content == reply.content
+    assert other_seed.invoke(PROMPT).content != reply.content
+
+
+def test_stream_matches_invoke():
+    llm = create_fake_llm({"seed": 1})
+
+    async def stream():
+        return [chunk.content async for chunk in llm.astream(PROMPT)]
+
+    chunks = asyncio.run(stream())
+    assert len(chunks) == 41
+    assert "".join(chunks) == llm.invoke(PROMPT).content
+    assert llm.stats()["streamed_calls"] == 1
+
+
+def test_tool_rules_call_bound_tools():
+    llm = create_fake_llm({"tool_rules": [{"match": "기록", "name": "a2a_send",
+                                            "args": {"agent_name": "Recorder Agent", "text": "{input}"}}]})
+    reply = llm.bind_tools(TOOLS).invoke([HumanMessage(content="회의 내용 기록해 줘")])
+    assert [(call["name"], call["args"]) for call in reply.tool_calls] == \
+        [("a2a_send", {"agent_name": "Recorder Agent", "text": "회의 내용 기록해 줘"})]
+    assert reply.content == ""
+    # 도구 결과를 받은 뒤에는 텍스트로 답함
+    after = [HumanMessage(content="회의 내용 기록해 줘"), reply, ToolMessage(content="저장됨", tool_call_id="x")]
+    assert not llm.bind_tools(TOOLS).invoke(after).tool_calls
+    # 바인딩되지 않은 도구는 호출하지 않음
+    assert not llm.invoke([HumanMessage(content="회의 내용 기록해 줘")]).tool_calls
+
+
+def test_random_tool_calls_fill_the_schema():
+    llm = create_fake_llm({"tool_call_rate": 1.0}).bind_tools(TOOLS)
+    call = llm.invoke([HumanMessage(content="아무 질문")]).tool_calls[0]
+    assert call["args"] == {"agent_name": "아무 질문", "text": "아무 질문"}
+
+
+def test_latency_is_applied():
+    llm = create_fake_llm({"latency": {"distribution": "fixed", "value": 0.05},
+                           "throughput": 400, "response_tokens": 20})
+    started = time.perf_counter()
+    asyncio.run(llm.ainvoke(PROMPT))
+    assert time.perf_counter() - started >= 0.05 + 20 / 400
+
+
+def test_distributions():
+    rng = random.Random(0)
+    values = [sample({"distribution": "lognormal", "mean": 0.2, "stddev": 0.05}, rng) for _ in range(5000)]
+    assert statistics.mean(values) == pytest.approx(0.2, rel=0.05)
+    assert statistics.stdev(values) == pytest.approx(0.05, rel=0.1)
+    assert 1 <= sample({"distribution": "uniform", "min": 1, "max": 2}, rng) <= 2
+    assert sample({"distribution": "normal", "mean": -5, "stddev": 0}, rng) == 0.0
+    with pytest.raises(ValueError):
+        sample({"distribution": "pareto"}, rng)
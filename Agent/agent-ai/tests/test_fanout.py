@@ -0,0 +1,99 @@
+import asyncio
+
+import pytest
+
+from modules.a2a_core.fanout import FanOutRequest, fan_out
+
+
+class _Sender:
+    """동시 실행 수와 넘겨받은 timeout을 기록하는 송신 함수"""
+
+    def __init__(self, delay=0.02, fail=None):
+        self.delay = delay
+        self.fail = fail or {}
+        self.running = {}
+        self.peak = {}
+        self.peak_total = 0
+        self.timeouts = []
+
+    async def __call__(self, agent_name, text, timeout):
+        self.timeouts.append(timeout)
+        self.running[agent_name] = self.running.get(agent_name, 0) + 1
+        self.peak[agent_name] = max(self.peak.get(agent_name, 0), self.running[agent_name])
+        self.peak_total = max(self.peak_total, sum(self.running.values()))
+        try:
+            await asyncio.sleep(self.delay)
+            if agent_name in self.fail:
+                raise self.fail[agent_name]
+            return [f"{agent_name}: {text}"]
+        finally:
+            self.running[agent_name] -= 1
+
+
+def _requests(agents, count):
+    return [FanOutRequest(agent_name=agent, text=f"메시지 {i}") for agent in agents for i in range(count)]
+
+
+async def _collect(sender, requests, **kwargs):
+    return [result async for result in fan_out(sender, requests, **kwargs)]
+
+
+def test_concurrency_limits():
+    sender = _Sender()
+    results = asyncio.run(_collect(sender, _requests(["A", "B", "C"], 4),
+                                   concurrency=4, per_agent_concurrency={"A": 1}))
+    assert len(results) == 12 and all(result.ok for result in results)
+    assert sender.peak_total == 4
+    assert sender.peak["A"] == 1
+    assert sender.timeouts == [None] * 12
+
+
+def test_per_agent_limit_applies_to_every_agent():
+    sender = _Sender()
+    asyncio.run(_collect(sender, _requests(["A", "B"], 5), per_agent_concurrency=2))
+    assert sender.peak == {"A": 2, "B": 2}
+
+
+def test_deadline_passes_remaining_time_and_reports_late_requests():
+    sender = _Sender(delay=0.1)
+    results = asyncio.run(_collect(sender, _requests(["A"], 3), per_agent_concurrency=1, timeout=0.15))
+    results.sort(key=lambda result: result.index)
+    assert results[0].ok
+    assert [result.error for result in results[1:]] == ["데드라인 초과 (0.15s)"] * 2
+    # 두 번째 요청은 첫 요청을 기다린 만큼 줄어든 데드라인을 받음
+    assert sender.timeouts[0] == pytest.approx(0.15, abs=0.02)
+    assert sender.timeouts[1] == pytest.approx(0.05, abs=0.02)
+
+
+def test_sender_errors_reach_the_result():
+    sender = _Sender(fail={"B": ConnectionRefusedError("연결 거부: localhost:10003"), "C": TimeoutError()})
+    results = {result.agent_name: result for result in asyncio.run(_collect(sender, _requests(["A", "B", "C"], 1)))}
+    assert results["A"].ok
+    assert results["B"].error == "연결 거부: localhost:10003"
+    assert results["C"].error is not None
+
+
+def test_manager_send_many_reports_the_real_failure():
+    A2AManager = pytest.importorskip("modules.a2a_manager", exc_type=ImportError).A2AManager
+
+    class _Client:
+        ready = True
+        client_agent = None
+
+        def __init__(self):
+            self.timeouts = []
+
+        async def send(self, agent_name, text, config_dir=None, timeout=None):
+            self.timeouts.append(timeout)
+            raise RuntimeError(f"'{agent_name}' 회로 차단 중")
+
+    async def scenario():
+        manager = A2AManager(config_dir=".")
+        manager._client = _Client()
+        manager._ready = True
+        results = [r async for r in manager.send_many([("Summarize Agent", "요약해 줘")], timeout=5)]
+        return manager, results
+
+    manager, results = asyncio.run(scenario())
+    assert results[0].error == "'Summarize Agent' 회로 차단 중"
+    assert 0 < manager._client.timeouts[0] <= 5
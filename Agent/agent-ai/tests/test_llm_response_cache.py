@@ -0,0 +1,92 @@
+import asyncio
+import threading
+
+from modules.llm_core.response_cache import LLMCacheSettings, LLMResponseCache
+
+
+def _cache(tmp_path, **kwargs):
+    return LLMResponseCache(LLMCacheSettings(enabled=True, path=str(tmp_path / "llm_cache.db"), **kwargs))
+
+
+def test_async_access_runs_off_the_event_loop(tmp_path):
+    cache = _cache(tmp_path)
+    threads = []
+    get = cache.get
+
+    def _get(key):
+        threads.append(threading.current_thread())
+        return get(key)
+
+    cache.get = _get
+
+    async def scenario():
+        await cache.aput("k", {"content": "답변"})
+        return await cache.aget("k")
+
+    assert asyncio.run(scenario()) == {"content": "답변"}
+    assert threads and threads[0] is not threading.main_thread()
+    cache.close()
+
+
+def test_eviction_counts_entries_written_by_other_processes(tmp_path):
+    # 같은 파일을 쓰는 두 프로세스의 캐시
+    first = _cache(tmp_path, max_entries=3)
+    second = _cache(tmp_path, max_entries=3)
+    for index in range(3):
+        first.put(f"a{index}", {"content": "첫 번째"})
+    for index in range(3):
+        second.put(f"b{index}", {"content": "두 번째"})
+
+    assert first.stats()["entries"] == 3
+    assert second.stats()["entries"] == 3
+    assert [second.get(f"b{index}") is not None for index in range(3)] == [True, True, True]
+    assert second.counters.evictions == 3
+    first.close()
+    second.close()
+
+
+def test_eviction_respects_max_bytes(tmp_path):
+    cache = _cache(tmp_path, max_bytes=100)
+    for index in range(5):
+        cache.put(f"k{index}", {"content": "x" * 30})
+    stats = cache.stats()
+    assert stats["bytes"] <= 100
+    assert cache.get("k4") is not None
+    cache.close()
+
+
+def _counted(cache):
+    return cache._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache").fetchone()
+
+
+def test_put_keeps_totals_without_scanning_the_table(tmp_path):
+    cache = _cache(tmp_path, max_entries=3, ttl=60)
+    statements = []
+    cache._conn.set_trace_callback(statements.append)
+    for index in range(5):
+        cache.put(f"k{index}", {"content": "값" * index})
+    cache.put("k4", {"content": "덮어쓴 값"})
+    cache._conn.set_trace_callback(None)
+
+    assert not any("COUNT(" in statement for statement in statements)
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"]) == _counted(cache)
+    assert stats["entries"] == 3
+    cache.clear()
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+    cache.close()
+
+
+def test_totals_are_initialized_for_an_existing_database(tmp_path):
+    cache = _cache(tmp_path)
+    for index in range(4):
+        cache.put(f"k{index}", {"content": "기존 항목"})
+    # 합계 행이 없던 이전 버전의 DB
+    cache._conn.executescript("DROP TABLE llm_cache_totals;")
+    cache.close()
+
+    cache = _cache(tmp_path)
+    stats = cache.stats()
+    assert (stats["entries"], stats["bytes"]) == _counted(cache)
+    assert stats["entries"] == 4
+    cache.close()
@@ -0,0 +1,86 @@
+import asyncio
+
+from a2a.server.events import EventQueue
+from a2a.server.tasks import TaskUpdater
+
+from modules.a2a_core import server_executor
+from modules.a2a_core.server_executor import can_stream_llm, stream_llm_response
+
+
+class _Handler:
+    """토큰 사이마다 이벤트 루프에 양보하는 스트리밍 LLM 핸들러"""
+
+    def __init__(self, tokens, fail_after=None):
+        self.tokens = tokens
+        self.fail_after = fail_after
+
+    async def stream_message(self, user_message):
+        for i, token in enumerate(self.tokens):
+            if i == self.fail_after:
+                raise RuntimeError("모델 연결 끊김")
+            await asyncio.sleep(0.01)
+            yield token
+
+
+def _use_handlers(monkeypatch, handlers):
+    monkeypatch.setattr(server_executor, "LLM_AVAILABLE", True)
+    monkeypatch.setattr(server_executor, "get_agent_llm_handler", handlers.__getitem__, raising=False)
+
+
+async def _stream(agent_name, text):
+    queue = EventQueue()
+    result = await stream_llm_response(agent_name, text, TaskUpdater(queue, "t1", "c1"))
+    events = []
+    while not queue.queue.empty():
+        events.append(await queue.dequeue_event(no_wait=True))
+    return result, events
+
+
+def test_tokens_are_sent_as_one_appended_artifact(monkeypatch):
+    _use_handlers(monkeypatch, {"Summarize Agent": _Handler(["요약", "된 ", "문장"])})
+    assert can_stream_llm("Summarize Agent")
+
+    result, events = asyncio.run(_stream("Summarize Agent", "요약해 줘"))
+    assert result.response == "요약된 문장" and result.streamed and not result.error_occur
+    assert [e.artifact.parts[0].root.text for e in events] == ["요약", "된 ", "문장"]
+    assert [e.append for e in events] == [False, True, True]
+    assert [e.last_chunk for e in events] == [False, False, True]
+    assert len({e.artifact.artifact_id for e in events}) == 1
+
+
+def test_concurrent_streams_share_the_event_loop(monkeypatch):
+    order = []
+
+    class _Recording(_Handler):
+        def __init__(self, name, tokens):
+            super().__init__(tokens)
+            self.name = name
+
+        async def stream_message(self, user_message):
+            async for token in super().stream_message(user_message):
+                order.append(self.name)
+                yield token
+
+    _use_handlers(monkeypatch, {"A": _Recording("A", ["a"] * 3), "B": _Recording("B", ["b"] * 3)})
+
+    async def scenario():
+        return await asyncio.gather(_stream("A", "질문"), _stream("B", "질문"))
+
+    (a, _), (b, _) = asyncio.run(scenario())
+    assert (a.response, b.response) == ("aaa", "bbb")
+    # 한 작업의 스트리밍이 다른 작업을 막지 않고 번갈아 진행됨
+    assert order[:2] in (["A", "B"], ["B", "A"])
+
+
+def test_stream_failure_reports_partial_response(monkeypatch):
+    _use_handlers(monkeypatch, {"Summarize Agent": _Handler(["앞", "뒤"], fail_after=1)})
+    result, events = asyncio.run(_stream("Summarize Agent", "요약해 줘"))
+    assert result.error_occur and result.error_message == "모델 연결 끊김"
+    assert result.response == "앞"
+    # 마지막 청크 여부를 알 수 없었던 토큰은 전송되지 않음
+    assert events == []
+
+
+def test_cannot_stream_without_the_handler(monkeypatch):
+    monkeypatch.setattr(server_executor, "LLM_AVAILABLE", False)
+    assert not can_stream_llm("Summarize Agent")
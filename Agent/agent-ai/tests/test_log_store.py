@@ -0,0 +1,168 @@
+import os
+import threading
+import traceback
+
+from modules.recorder_store.log_store import LogStoreSettings, SegmentedLogStore
+from modules.recorder_store.retention import RetentionManager, RetentionSettings
+
+
+def _store(tmp_path, **kwargs):
+    return SegmentedLogStore(LogStoreSettings(path=str(tmp_path), **kwargs))
+
+
+def _record(index, timestamp="2026-01-01T00:00:00"):
+    return {"timestamp": timestamp, "agent": "Recorder Agent", "text": f"기록 {index}"}
+
+
+def _counting_reads(store):
+    reads = []
+    original = store._read_segment
+
+    def _read_segment(path):
+        reads.append(os.path.basename(path))
+        return original(path)
+
+    store._read_segment = _read_segment
+    return reads
+
+
+def test_group_commit_assigns_unique_ids(tmp_path):
+    store = _store(tmp_path, fsync="always")
+    ids = []
+    lock = threading.Lock()
+
+    def _writer(worker):
+        for index in range(50):
+            record_id = store.append(_record(f"{worker}-{index}"))
+            with lock:
+                ids.append(record_id)
+
+    threads = [threading.Thread(target=_writer, args=(worker,)) for worker in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(ids) == list(range(1, 401))
+    assert store.counters.appended == 400
+    assert store.counters.commits <= 400
+    assert [r["id"] for r in store.iter_records()] == list(range(1, 401))
+    store.close()
+
+
+def test_recovery_truncates_partial_last_line(tmp_path):
+    store = _store(tmp_path)
+    store.append_many([_record(i) for i in range(3)])
+    store.close()
+    (segment,) = [p for p in os.listdir(tmp_path) if p.startswith("segment-")]
+    with open(os.path.join(tmp_path, segment), 'ab') as f:
+        f.write('{"timestamp": "2026-01-01T00:00:00", "text": "잘린'.encode('utf-8'))
+
+    store = _store(tmp_path)
+    assert store.last_id == 3
+    assert store.append(_record(3)) == 4
+    store.close()
+
+    store = _store(tmp_path)
+    assert [r["id"] for r in store.iter_records()] == [1, 2, 3, 4]
+    assert store.append(_record(4)) == 5
+    store.close()
+
+
+def test_compact_skips_segments_with_nothing_to_do(tmp_path):
+    store = _store(tmp_path, segment_size=200)
+    for index in range(6):
+        store.append(_record(index))
+    store.compact()
+
+    reads = _counting_reads(store)
+    assert store.compact() == []
+    assert store.compact("2025-01-01T00:00:00") == []
+    assert reads == []
+    store.close()
+
+    # 재시작 후에도 메타를 다시 계산하지 않음
+    store = _store(tmp_path, segment_size=200)
+    reads = _counting_reads(store)
+    assert store.compact("2025-01-01T00:00:00") == []
+    assert reads == []
+    store.close()
+
+
+def test_compact_expires_records_in_active_segment(tmp_path):
+    store = _store(tmp_path)
+    old = store.append(_record(0, "2025-01-01T00:00:00"))
+    new = store.append(_record(1, "2026-06-01T00:00:00"))
+
+    assert store.compact("2026-01-01T00:00:00") == [old]
+    assert [r["id"] for r in store.iter_records()] == [new]
+    assert store.append(_record(2, "2026-06-02T00:00:00")) == new + 1
+    store.close()
+
+    store = _store(tmp_path)
+    assert [r["id"] for r in store.iter_records()] == [new, new + 1]
+    store.close()
+
+
+def test_compact_keeps_records_appended_concurrently(tmp_path):
+    store = _store(tmp_path)
+    store.append(_record(0, "2025-01-01T00:00:00"))
+    writers = []
+    original = store._segments
+
+    def _segments():
+        # 활성 세그먼트를 봉인한 뒤 병합할 세그먼트를 나열하는 순간 다른 스레드가 새 세그먼트에 쓰는 경우
+        if store._file is None and not writers and "_save_meta" not in {f.name for f in traceback.extract_stack()}:
+            writer = threading.Thread(target=store.append_many,
+                                      args=([_record(i, "2026-06-01T00:00:00") for i in range(1, 4)],))
+            writers.append(writer)
+            writer.start()
+            writer.join(0.2)
+        return original()
+
+    store._segments = _segments
+    assert store.compact("2026-01-01T00:00:00") == [1]
+    writers[0].join()
+    assert store.append(_record(4, "2026-06-01T00:00:00")) == 5
+    assert [r["id"] for r in store.iter_records()] == [2, 3, 4, 5]
+    store.close()
+
+    store = _store(tmp_path)
+    assert store.last_id == 5
+    assert [r["id"] for r in store.iter_records()] == [2, 3, 4, 5]
+    store.close()
+
+
+def test_compact_compressed_segments(tmp_path):
+    store = _store(tmp_path, segment_size=200, compress=True)
+    for index in range(6):
+        store.append(_record(index, f"2025-0{index + 1}-01T00:00:00"))
+    store.append(_record(6, "2026-06-01T00:00:00"))
+
+    removed = store.compact("2025-04-01T00:00:00")
+    assert removed == [1, 2, 3]
+    assert [r["id"] for r in store.iter_records()] == [4, 5, 6, 7]
+    reads = _counting_reads(store)
+    assert store.compact("2025-04-01T00:00:00") == []
+    assert reads == []
+    store.close()
+
+
+def test_retention_runs_off_the_calling_thread(tmp_path):
+    store = _store(tmp_path)
+    store.append(_record(0, "2000-01-01T00:00:00"))
+    threads = []
+    original = store.compact
+
+    def _compact(cutoff=None):
+        threads.append(threading.current_thread().name)
+        return original(cutoff)
+
+    store.compact = _compact
+    retention = RetentionManager(store, RetentionSettings(max_age_days=1))
+    retention.run_if_due()
+    assert retention.wait(5)
+    assert threads == ["recorder-retention"]
+    assert retention.counters.removed == 1
+    assert list(store.iter_records()) == []
+    store.close()
@@ -0,0 +1,96 @@
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from modules.memory_store.search import PendingSearch, aresolve_related_memories, resolve_related_memories
+from modules.memory_store.write_behind import MemoryWriteBehind, MemoryWriteSettings
+
+
+def _pending(pool, release, timeout=1.0):
+    def _search():
+        release.wait(2)
+        return {"results": [{"memory": "사용자는 커피를 좋아한다"}]}
+
+    return PendingSearch(pool.submit(_search), timeout=timeout)
+
+
+def test_awaiting_search_does_not_block_event_loop():
+    async def scenario(pending, release):
+        ticks = 0
+
+        async def _ticker():
+            nonlocal ticks
+            for _ in range(5):
+                await asyncio.sleep(0.01)
+                ticks += 1
+            release.set()
+
+        ticker = asyncio.create_task(_ticker())
+        memories = await aresolve_related_memories({"status": "active", "pending_search": pending})
+        await ticker
+        return ticks, memories
+
+    release = threading.Event()
+    with ThreadPoolExecutor(1) as pool:
+        ticks, memories = asyncio.run(scenario(_pending(pool, release), release))
+    assert ticks == 5
+    assert memories == [{"memory": "사용자는 커피를 좋아한다"}]
+
+
+def test_search_timeout_returns_empty_and_keeps_result():
+    release = threading.Event()
+    with ThreadPoolExecutor(1) as pool:
+        pending = _pending(pool, release, timeout=0.05)
+        assert asyncio.run(pending.aresult()) == []
+        assert not pending.future.cancelled()
+        release.set()
+        assert pending.result() == []
+
+
+def test_resolve_uses_stored_memories_without_pending_search():
+    assert resolve_related_memories({"status": "inactive", "related_memories": [{"memory": "x"}]}) == []
+    assert resolve_related_memories({"status": "active", "related_memories": [{"memory": "x"}]}) == [{"memory": "x"}]
+    with ThreadPoolExecutor(1) as pool:
+        failed = PendingSearch(pool.submit(_raise), timeout=1.0)
+        assert resolve_related_memories({"status": "active", "pending_search": failed}) == []
+
+
+def _raise():
+    raise ConnectionError("벡터 저장소 연결 실패")
+
+
+class _Backend:
+    def __init__(self, fail_user=None):
+        self.calls = []
+        self.fail_user = fail_user
+
+    def add_batch(self, user_id, contents):
+        if user_id == self.fail_user:
+            raise RuntimeError("추출 LLM 오류")
+        self.calls.append((user_id, contents))
+        return {"results": len(contents)}
+
+
+def test_write_behind_groups_messages_by_user():
+    backend = _Backend()
+    writer = MemoryWriteBehind(backend.add_batch, MemoryWriteSettings(flush_interval=0.2))
+    futures = [writer.submit(user, text) for user, text in
+               [("alice", "커피를 좋아함"), ("bob", "서울 거주"), ("alice", "고양이를 키움")]]
+    assert [future.result(2) for future in futures] == [{"results": 2}, {"results": 1}, {"results": 2}]
+    assert sorted(backend.calls) == [("alice", ["커피를 좋아함", "고양이를 키움"]), ("bob", ["서울 거주"])]
+    assert writer.stats()["add_calls"] == 2
+    writer.close()
+
+
+def test_write_behind_failure_reaches_only_that_user():
+    backend = _Backend(fail_user="bob")
+    writer = MemoryWriteBehind(backend.add_batch, MemoryWriteSettings(flush_interval=0.1))
+    alice, bob = writer.submit("alice", "커피를 좋아함"), writer.submit("bob", "서울 거주")
+    writer.close()
+    assert alice.result(0) == {"results": 1}
+    assert isinstance(bob.exception(0), RuntimeError)
+    assert writer.stats()["errors"] == 1
+    with pytest.raises(RuntimeError):
+        writer.submit("alice", "닫힌 뒤")
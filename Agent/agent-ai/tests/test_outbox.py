@@ -0,0 +1,121 @@
+import asyncio
+import os
+
+from modules.a2a_core.outbox import ForwardingOutbox, OutboxSettings
+
+OWNER = "Summarize Agent"
+RECORDER = "Recorder Agent"
+
+
+def _settings(tmp_path, **kwargs):
+    values = {"path": str(tmp_path), "batch_window": 0, "retry_backoff": 0.01, "max_backoff": 0.05}
+    values.update(kwargs)
+    return OutboxSettings(**values)
+
+
+async def _until(condition, timeout=2.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "시간 안에 조건을 만족하지 못함"
+        await asyncio.sleep(0.005)
+
+
+def _files(outbox, dead=False):
+    directory = outbox.dead_directory if dead else outbox.directory
+    return sorted(f for f in os.listdir(directory) if f.endswith(".json")) if os.path.isdir(directory) else []
+
+
+def test_messages_survive_restart(tmp_path):
+    calls = []
+
+    async def _failing(agent_name, text, message_id):
+        raise ConnectionError("연결 거부")
+
+    async def _sender(agent_name, text, message_id):
+        calls.append((agent_name, text, message_id))
+        return ["저장 완료"]
+
+    async def scenario():
+        first = ForwardingOutbox(OWNER, _failing, _settings(tmp_path, retry_backoff=10))
+        message = await first.enqueue(RECORDER, "요약 결과: 하나")
+        await _until(lambda: first.counters.retries == 1)
+        await first.stop()
+        assert _files(first) == [f"{message.id}.json"]
+
+        second = ForwardingOutbox(OWNER, _sender, _settings(tmp_path))
+        second.start()
+        await _until(lambda: second.counters.delivered == 1)
+        await second.stop()
+        return message, second
+
+    message, outbox = asyncio.run(scenario())
+    assert calls == [(RECORDER, "요약 결과: 하나", message.id)]
+    assert outbox.counters.recovered == 1
+    assert _files(outbox) == []
+
+
+def test_retries_with_the_same_message_id(tmp_path):
+    calls = []
+
+    async def _sender(agent_name, text, message_id):
+        calls.append(message_id)
+        # 첫 시도는 응답 유실
+        return None if len(calls) == 1 else ["저장 완료"]
+
+    async def scenario():
+        outbox = ForwardingOutbox(OWNER, _sender, _settings(tmp_path))
+        message = await outbox.enqueue(RECORDER, "요약 결과")
+        await _until(lambda: outbox.counters.delivered == 1)
+        await outbox.stop()
+        return message, outbox
+
+    message, outbox = asyncio.run(scenario())
+    assert calls == [message.id, message.id]
+    assert (outbox.counters.retries, outbox.counters.delivered, outbox.pending_count) == (1, 1, 0)
+    assert _files(outbox) == []
+
+
+def test_dead_letters_after_max_attempts(tmp_path):
+    async def _sender(agent_name, text, message_id):
+        raise ConnectionError("연결 거부")
+
+    async def scenario():
+        outbox = ForwardingOutbox(OWNER, _sender, _settings(tmp_path, max_attempts=3))
+        message = await outbox.enqueue(RECORDER, "요약 결과")
+        await _until(lambda: outbox.counters.dead_lettered == 1)
+        await outbox.stop()
+        return message, outbox
+
+    message, outbox = asyncio.run(scenario())
+    assert outbox.counters.retries == 2
+    assert outbox.pending_count == 0
+    assert _files(outbox) == []
+    assert _files(outbox, dead=True) == [f"{message.id}.json"]
+
+
+def test_slow_send_does_not_hold_back_later_messages(tmp_path):
+    release = None
+    delivered = []
+
+    async def _sender(agent_name, text, message_id):
+        if text == "느린 메시지":
+            await release.wait()
+        delivered.append(text)
+        return ["저장 완료"]
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        outbox = ForwardingOutbox(OWNER, _sender, _settings(tmp_path, batch_size=2))
+        await outbox.enqueue(RECORDER, "느린 메시지")
+        await asyncio.sleep(0.01)
+        for index in range(3):
+            await outbox.enqueue(RECORDER, f"메시지 {index}")
+        await _until(lambda: len(delivered) == 3)
+        assert outbox.stats()["inflight"] == 1
+        release.set()
+        await _until(lambda: outbox.counters.delivered == 4)
+        await outbox.stop()
+
+    asyncio.run(scenario())
+    assert delivered == ["메시지 0", "메시지 1", "메시지 2", "느린 메시지"]
@@ -0,0 +1,63 @@
+from modules.a2a_core.process_supervisor import A2AProcessSupervisor, AgentProcess
+
+
+class _Process:
+    def __init__(self, alive=True, exitcode=None):
+        self.alive = alive
+        self.exitcode = exitcode
+        self.pid = 1234
+
+    def is_alive(self):
+        return self.alive
+
+
+def _supervisor(**kwargs):
+    supervisor = A2AProcessSupervisor(".", **kwargs)
+    supervisor.spawned = []
+
+    def _spawn(agent):
+        agent.process = _Process()
+        supervisor.spawned.append(agent.name)
+
+    supervisor._spawn = _spawn
+    for name in ("Summarize Agent", "Recorder Agent"):
+        supervisor.agents[name] = AgentProcess(name=name, config_path="", host="localhost", port=0,
+                                               process=_Process())
+    return supervisor
+
+
+def _crash(supervisor, name):
+    supervisor.agents[name].process = _Process(alive=False, exitcode=1)
+
+
+def test_backoff_of_one_agent_does_not_delay_another():
+    supervisor = _supervisor(restart_backoff=1.0)
+    # Summarize는 최근에 여러 번 재시작해서 백오프가 김 (1s × 2^3)
+    supervisor.agents["Summarize Agent"].restart_times = [99.0, 99.5, 99.8]
+    _crash(supervisor, "Summarize Agent")
+    supervisor._check_agents(100.0)
+    assert supervisor.agents["Summarize Agent"].next_restart_at == 108.0
+
+    _crash(supervisor, "Recorder Agent")
+    supervisor._check_agents(100.5)
+    supervisor._check_agents(101.5)
+    assert supervisor.spawned == ["Recorder Agent"]
+    assert supervisor.stats()[0]["restart_pending"] is True
+
+    supervisor._check_agents(108.0)
+    assert supervisor.spawned == ["Recorder Agent", "Summarize Agent"]
+    assert [agent.restarts for agent in supervisor.agents.values()] == [1, 1]
+    assert supervisor.agents["Summarize Agent"].last_exit_code == 1
+
+
+def test_gives_up_after_max_restarts_in_window():
+    supervisor = _supervisor(max_restarts=2, restart_window=60.0, restart_backoff=0.0)
+    now = 100.0
+    for _ in range(2):
+        _crash(supervisor, "Recorder Agent")
+        supervisor._check_agents(now)
+        now += 1
+    _crash(supervisor, "Recorder Agent")
+    supervisor._check_agents(now)
+    assert supervisor.spawned == ["Recorder Agent", "Recorder Agent"]
+    assert supervisor.agents["Recorder Agent"].process is None
@@ -0,0 +1,73 @@
+import asyncio
+import socket
+import threading
+import time
+
+from modules.a2a_core.readiness import StartupTimeline, wait_for_server
+from modules.a2a_core.transport import close_shared_http_client
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def _reply_ok(reader, writer):
+    await reader.readuntil(b"\r\n\r\n")
+    writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: close\r\n\r\n{}")
+    await writer.drain()
+    writer.close()
+
+
+async def _wait(*args, **kwargs):
+    try:
+        return await wait_for_server(*args, **kwargs)
+    finally:
+        await close_shared_http_client()
+
+
+def test_ready_once_started_and_probe_succeeds():
+    port = _free_port()
+    started = threading.Event()
+
+    async def scenario():
+        # 시작 이벤트와 헬스 엔드포인트가 조금 늦게 준비되는 서버
+        threading.Timer(0.1, started.set).start()
+        waiter = asyncio.create_task(_wait("Summarize Agent", started, f"http://127.0.0.1:{port}/", 5.0))
+        await asyncio.sleep(0.2)
+        server = await asyncio.start_server(_reply_ok, "127.0.0.1", port)
+        result = await waiter
+        server.close()
+        return result
+
+    result = asyncio.run(scenario())
+    assert result.ready and result.error is None
+    assert 0.05 < result.started_after <= result.healthy_after < 5.0
+
+
+def test_dead_server_fails_without_waiting_for_the_deadline():
+    begin = time.monotonic()
+    result = asyncio.run(_wait("Recorder Agent", threading.Event(), "http://127.0.0.1:9/", 5.0,
+                               is_alive=lambda: False))
+    assert not result.ready
+    assert result.error == "서버가 시작 중 종료됨"
+    assert time.monotonic() - begin < 1.0
+
+
+def test_probe_gives_up_at_the_deadline():
+    begin = time.monotonic()
+    result = asyncio.run(_wait("Recorder Agent", None, f"http://127.0.0.1:{_free_port()}/", 0.3))
+    assert not result.ready
+    assert result.error == "0.3s 안에 헬스 프로브 실패"
+    assert time.monotonic() - begin < 1.0
+
+
+def test_timeline_records_phases():
+    timeline = StartupTimeline()
+    with timeline.phase("config"):
+        pass
+    timeline.record("server", timeline.origin, timeline.origin + 0.5)
+    data = timeline.to_dict()
+    assert [phase["name"] for phase in data["phases"]] == ["config", "server"]
+    assert data["total"] >= 0.5
@@ -0,0 +1,183 @@
+import asyncio
+import time
+
+import pytest
+
+from modules.a2a_core.a2a_client import StreamChunk
+from modules.a2a_core.response_cache import CachePolicy, ResponseCache, configure_response_cache
+
+AGENT = "Summarize Agent"
+
+
+class _ClientAgent:
+    def get_cache_policy(self, agent_name):
+        return CachePolicy()
+
+    def get_config_version(self, agent_name):
+        return "v1"
+
+
+class _Client:
+    """원격 호출 횟수를 세는 가짜 A2A 클라이언트"""
+
+    def __init__(self):
+        self.ready = True
+        self.client_agent = _ClientAgent()
+        self.calls = 0
+        self.release = asyncio.Event()
+
+    async def stream(self, agent_name, text, config_dir=None):
+        self.calls += 1
+        yield StreamChunk(kind="artifact", agent_name=agent_name, parts=["요약"], artifact_id="a")
+        await self.release.wait()
+        yield StreamChunk(kind="artifact", agent_name=agent_name, parts=[" 결과"], artifact_id="a", append=True)
+        yield StreamChunk(kind="status", agent_name=agent_name, state="completed", final=True)
+
+    async def send(self, agent_name, text, config_dir=None, timeout=None):
+        self.calls += 1
+        await self.release.wait()
+        return ["전송 결과"]
+
+
+def _manager():
+    # A2AManager는 서버 모듈(uvicorn)을 함께 불러옴
+    A2AManager = pytest.importorskip("modules.a2a_manager", exc_type=ImportError).A2AManager
+    manager = A2AManager(config_dir=".")
+    manager._client = _Client()
+    manager._ready = True
+    return manager
+
+
+async def _collect(manager, text):
+    return [chunk async for chunk in manager.stream(AGENT, text)]
+
+
+def test_concurrent_streams_share_one_remote_call():
+    async def scenario():
+        cache = configure_response_cache({"enabled": True})
+        manager = _manager()
+        leader = asyncio.create_task(_collect(manager, "긴 문서를 요약해 줘"))
+        await asyncio.sleep(0)
+        followers = [asyncio.create_task(_collect(manager, "긴 문서를  요약해 줘")) for _ in range(3)]
+        await asyncio.sleep(0.01)
+        manager._client.release.set()
+        results = await asyncio.gather(leader, *followers)
+        return cache, manager, results
+
+    cache, manager, results = asyncio.run(scenario())
+    assert manager._client.calls == 1
+    assert [chunk.text for chunk in results[0] if chunk.kind == "artifact"] == ["요약", " 결과"]
+    for chunks in results[1:]:
+        assert [chunk.parts for chunk in chunks if chunk.kind == "artifact"] == [["요약 결과"]]
+        assert chunks[-1].state == "completed"
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"], stats["inflight"]) == (1, 3, 0, 0)
+
+    async def cached():
+        return await _collect(manager, "긴 문서를 요약해 줘")
+
+    asyncio.run(cached())
+    assert manager._client.calls == 1
+    assert cache.stats()["hits"] == 1
+
+
+def test_stream_joins_inflight_send():
+    async def scenario():
+        configure_response_cache({"enabled": True})
+        manager = _manager()
+        send = asyncio.create_task(manager.send(AGENT, "질문"))
+        await asyncio.sleep(0)
+        stream = asyncio.create_task(_collect(manager, "질문"))
+        await asyncio.sleep(0.01)
+        manager._client.release.set()
+        return manager, await send, await stream
+
+    manager, sent, chunks = asyncio.run(scenario())
+    assert manager._client.calls == 1
+    assert sent == ["전송 결과"]
+    assert chunks[0].parts == ["전송 결과"]
+
+
+def test_abandoned_leader_stream_releases_followers():
+    async def scenario():
+        cache = configure_response_cache({"enabled": True})
+        manager = _manager()
+        leader = manager.stream(AGENT, "질문")
+        await leader.__anext__()
+        follower = asyncio.create_task(_collect(manager, "질문"))
+        await asyncio.sleep(0.01)
+        # 리더가 첫 청크만 받고 스트림을 닫음 → 팔로워는 직접 스트리밍
+        await leader.aclose()
+        manager._client.release.set()
+        return cache, manager, await asyncio.wait_for(follower, 1)
+
+    cache, manager, chunks = asyncio.run(scenario())
+    assert manager._client.calls == 2
+    assert [chunk.text for chunk in chunks if chunk.kind == "artifact"] == ["요약", " 결과"]
+    assert cache.stats()["inflight"] == 0
+
+
+class _Loader:
+    def __init__(self, result=("응답",), error=None):
+        self.calls = 0
+        self.result = list(result) if result is not None else None
+        self.error = error
+        self.release = asyncio.Event()
+
+    async def __call__(self):
+        self.calls += 1
+        await self.release.wait()
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+async def _load_many(cache, loader, texts, policy=None):
+    tasks = [asyncio.create_task(cache.get_or_load(AGENT, text, loader, version="v1", policy=policy))
+             for text in texts]
+    await asyncio.sleep(0.01)
+    loader.release.set()
+    return await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def test_get_or_load_coalesces_and_caches():
+    cache = ResponseCache(enabled=True)
+    loader = _Loader()
+    results = asyncio.run(_load_many(cache, loader, ["질문", " 질문 ", "질문"]))
+    assert results == [["응답"]] * 3
+    assert loader.calls == 1
+    assert asyncio.run(_load_many(cache, loader, ["질문"])) == [["응답"]]
+    assert loader.calls == 1
+    stats = cache.stats()
+    assert (stats["misses"], stats["coalesced"], stats["hits"], stats["inflight"]) == (1, 2, 1, 0)
+
+
+def test_failed_load_is_shared_but_not_cached():
+    cache = ResponseCache(enabled=True)
+    loader = _Loader(error=ConnectionError("연결 거부"))
+    results = asyncio.run(_load_many(cache, loader, ["질문", "질문"]))
+    assert [type(result) for result in results] == [ConnectionError, ConnectionError]
+    loader = _Loader(result=None)
+    assert asyncio.run(_load_many(cache, loader, ["질문"])) == [None]
+    assert loader.calls == 1
+    assert cache.stats()["entries"] == 0
+
+
+def test_disabled_policy_bypasses_the_cache():
+    cache = ResponseCache(enabled=True)
+    loader = _Loader()
+    asyncio.run(_load_many(cache, loader, ["기록해 줘", "기록해 줘"], policy=CachePolicy(enabled=False)))
+    assert loader.calls == 2
+    assert cache.stats()["bypassed"] == 2
+
+
+def test_entries_expire_and_evict():
+    cache = ResponseCache(enabled=True, ttl=0.05, max_entries=2)
+    keys = [cache.make_key(AGENT, f"질문 {i}", "v1") for i in range(3)]
+    for key in keys:
+        cache.put(key, ["응답"])
+    assert cache.get(keys[0]) is None
+    assert cache.stats()["evictions"] == 1
+    time.sleep(0.06)
+    assert cache.get(keys[2]) is None
+    assert cache.stats()["expirations"] == 1
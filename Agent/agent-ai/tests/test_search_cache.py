@@ -0,0 +1,55 @@
+import time
+
+from modules.memory_store.search_cache import MemorySearchCache, SearchCacheSettings, add_changed_memory
+
+RESULTS = [{"memory": "사용자는 커피를 좋아한다"}]
+
+
+def test_hit_after_put_with_normalized_query():
+    cache = MemorySearchCache()
+    generation = cache.generation("alice")
+    cache.put("alice", "커피  좋아해?", 5, RESULTS, generation)
+    assert cache.get("alice", " 커피 좋아해? ", 5) == RESULTS
+    assert cache.get("alice", "커피 좋아해?", 10) is None
+    assert cache.get("bob", "커피 좋아해?", 5) is None
+    assert cache.stats("alice")["hits"] == 1
+
+
+def test_search_started_before_invalidation_is_not_cached():
+    cache = MemorySearchCache()
+    generation = cache.generation("alice")
+    # 검색이 진행되는 동안 새 메모리가 저장됨
+    cache.invalidate("alice")
+    cache.put("alice", "커피", 5, RESULTS, generation)
+    assert cache.get("alice", "커피", 5) is None
+    assert cache.stats("alice")["stale_skips"] == 1
+
+    cache.put("alice", "커피", 5, RESULTS, cache.generation("alice"))
+    assert cache.get("alice", "커피", 5) == RESULTS
+
+
+def test_invalidation_is_per_user():
+    cache = MemorySearchCache()
+    for user in ("alice", "bob"):
+        cache.put(user, "커피", 5, RESULTS, cache.generation(user))
+    cache.invalidate("alice")
+    assert cache.get("alice", "커피", 5) is None
+    assert cache.get("bob", "커피", 5) == RESULTS
+
+
+def test_entries_expire_and_evict_least_recent():
+    cache = MemorySearchCache(SearchCacheSettings(max_entries=2, ttl=0.05))
+    for query in ("a", "b"):
+        cache.put("alice", query, 5, RESULTS, 0)
+    cache.get("alice", "a", 5)
+    cache.put("alice", "c", 5, RESULTS, 0)
+    assert cache.get("alice", "b", 5) is None
+    time.sleep(0.06)
+    assert cache.get("alice", "a", 5) is None
+    assert cache.stats()["expired"] == 1
+
+
+def test_add_without_changes_does_not_invalidate():
+    assert not add_changed_memory({"results": [{"event": "NONE"}]})
+    assert add_changed_memory({"results": [{"event": "NONE"}, {"event": "ADD"}]})
+    assert add_changed_memory(None)
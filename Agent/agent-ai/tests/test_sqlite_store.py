@@ -0,0 +1,84 @@
+import json
+
+import pytest
+
+from modules.a2a_core.server_executor import normalize_record_request
+from modules.recorder_store.migrate import migrate_legacy_records
+from modules.recorder_store.store_factory import create_record_store
+
+RECORDS = [
+    {"timestamp": "2026-01-01T09:00:00", "agent": "Recorder Agent", "source_agent": "Summarize Agent",
+     "context_id": "c1", "input": "아침 요약"},
+    {"timestamp": "2026-01-01T12:00:00", "agent": "Recorder Agent", "source_agent": "Search Agent",
+     "context_id": "c2", "input": "점심 검색"},
+    {"timestamp": "2026-01-02T09:00:00", "agent": "Recorder Agent", "source_agent": "Summarize Agent",
+     "context_id": "c1", "input": "다음 날 요약"},
+    {"timestamp": "2026-01-01T09:00:00", "agent": "Other Agent", "input": "같은 시각"},
+]
+
+
+@pytest.fixture(params=["sqlite", "log"])
+def store(request, tmp_path):
+    path = tmp_path / ("recorder.db" if request.param == "sqlite" else "log")
+    store = create_record_store({"backend": request.param, "path": str(path)})
+    yield store
+    store.close()
+
+
+def _inputs(records):
+    return [record["input"] for record in records]
+
+
+def test_append_many_assigns_consecutive_ids(store):
+    assert store.append_many(RECORDS[:2]) == [1, 2]
+    assert store.append_many(RECORDS[2:]) == [3, 4]
+    assert [record["id"] for record in store.get_many([3, 9, 1])] == [3, 1]
+
+
+def test_query_filters_and_orders_by_timestamp(store):
+    store.append_many(RECORDS)
+    assert _inputs(store.query(start="2026-01-01", end="2026-01-02", descending=False)) == \
+        ["아침 요약", "같은 시각", "점심 검색"]
+    assert _inputs(store.query(source_agent="Summarize Agent")) == ["다음 날 요약", "아침 요약"]
+    assert _inputs(store.query(agent="Recorder Agent", context_id="c1", limit=1)) == ["다음 날 요약"]
+    assert store.query(agent="Unknown Agent") == []
+
+
+def test_compact_removes_records_before_cutoff(store):
+    store.append_many(RECORDS)
+    assert sorted(store.compact("2026-01-01T10:00:00")) == [1, 4]
+    assert _inputs(store.query(descending=False)) == ["점심 검색", "다음 날 요약"]
+
+
+def test_sqlite_records_survive_reopen(tmp_path):
+    settings = {"backend": "sqlite", "path": str(tmp_path / "recorder.db")}
+    store = create_record_store(settings)
+    store.append_many(RECORDS)
+    store.close()
+    store = create_record_store(settings)
+    assert store.last_id == 4
+    assert store.append(RECORDS[0]) == 5
+    store.close()
+
+
+def test_migration_skips_already_imported_files(tmp_path):
+    source = tmp_path / "recorder_memory"
+    source.mkdir()
+    for i, record in enumerate(RECORDS[:3]):
+        (source / f"record_{i}.json").write_text(json.dumps({**record, "id": 100 + i}), encoding="utf-8")
+    (source / "broken.json").write_text("{", encoding="utf-8")
+    store = create_record_store({"backend": "sqlite", "path": str(tmp_path / "recorder.db")})
+
+    assert migrate_legacy_records(store, str(source), batch_size=2) == {"imported": 3, "skipped": 0, "failed": 1}
+    assert migrate_legacy_records(store, str(source)) == {"imported": 0, "skipped": 3, "failed": 1}
+    assert [record["id"] for record in store.iter_records()] == [1, 2, 3]
+    store.close()
+
+
+def test_record_request_validation():
+    assert normalize_record_request("query", {"agent": "Recorder Agent", "limit": 5000}) == \
+        {"agent": "Recorder Agent", "limit": 1000}
+    with pytest.raises(ValueError, match="알 수 없는 조건"):
+        normalize_record_request("query", {"agent": "Recorder Agent", "drop": True})
+    with pytest.raises(ValueError, match="검색어"):
+        normalize_record_request("search", {"text": "  "})
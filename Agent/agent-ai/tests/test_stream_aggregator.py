@@ -0,0 +1,96 @@
+import asyncio
+
+from a2a.types import (
+    Artifact,
+    Message,
+    Part,
+    TaskArtifactUpdateEvent,
+    TaskState,
+    TaskStatus,
+    TaskStatusUpdateEvent,
+    TextPart,
+)
+
+from modules.a2a_core.a2a_client import A2AClientAgent, StreamAggregator, StreamChunk
+
+AGENT = "Summarize Agent"
+
+
+def _chunk(kind, *parts, **kwargs):
+    return StreamChunk(kind=kind, agent_name=AGENT, parts=list(parts), **kwargs)
+
+
+def test_appended_artifact_chunks_are_joined():
+    aggregator = StreamAggregator()
+    aggregator.add(_chunk('status', "작업 중", state=TaskState.working.value))
+    aggregator.add(_chunk('artifact', "요약: ", artifact_id="a1"))
+    aggregator.add(_chunk('artifact', "첫 문단", artifact_id="a1", append=True))
+    aggregator.add(_chunk('artifact', {"score": 1}, artifact_id="a2", last_chunk=True))
+    # 아티팩트가 있으면 중간 상태 메시지는 결과에 포함하지 않음
+    assert aggregator.result() == ["요약: 첫 문단", {"score": 1}]
+
+
+def test_failed_status_discards_partial_output():
+    aggregator = StreamAggregator()
+    aggregator.add(_chunk('artifact', "부분 출력", artifact_id="a1"))
+    aggregator.add(_chunk('status', "모델 호출 실패", state=TaskState.failed.value, final=True))
+    assert aggregator.failed and aggregator.error == "모델 호출 실패"
+    assert aggregator.result() is None
+
+
+def test_status_message_is_the_result_without_artifacts():
+    aggregator = StreamAggregator()
+    aggregator.add(_chunk('status', "작업 중", state=TaskState.working.value))
+    aggregator.add(_chunk('status', "완료했습니다", state=TaskState.completed.value, final=True))
+    assert aggregator.result() == ["완료했습니다"]
+
+
+class _Connection:
+    """A2A 스트림 이벤트를 순서대로 돌려주는 원격 연결"""
+
+    def __init__(self, events):
+        self.events = events
+
+    async def stream_message(self, request, task_callback=None):
+        for event in self.events:
+            await asyncio.sleep(0)
+            yield event
+
+
+def _artifact(text, append=False, last_chunk=False):
+    return TaskArtifactUpdateEvent(
+        task_id="t1", context_id="c1", append=append, last_chunk=last_chunk,
+        artifact=Artifact(artifact_id="a1", parts=[Part(root=TextPart(text=text))]),
+    )
+
+
+def _client(events):
+    client = A2AClientAgent([], auto_init=False)
+    client.remote_agent_connections[AGENT] = _Connection(events)
+    return client
+
+
+EVENTS = [
+    TaskStatusUpdateEvent(task_id="t1", context_id="c1", final=False,
+                          status=TaskStatus(state=TaskState.working)),
+    _artifact("첫 번째 "),
+    _artifact("두 번째", append=True, last_chunk=True),
+    TaskStatusUpdateEvent(task_id="t1", context_id="c1", final=True,
+                          status=TaskStatus(state=TaskState.completed)),
+]
+
+
+def test_stream_message_yields_chunks_as_they_arrive():
+    async def scenario():
+        return [chunk async for chunk in _client(EVENTS).stream_message(AGENT, "요약해 줘")]
+
+    chunks = asyncio.run(scenario())
+    assert [chunk.kind for chunk in chunks] == ['status', 'artifact', 'artifact', 'status']
+    assert [chunk.text for chunk in chunks if chunk.kind == 'artifact'] == ["첫 번째 ", "두 번째"]
+    assert chunks[-1].final
+
+
+def test_send_message_aggregates_the_stream():
+    assert asyncio.run(_client(EVENTS).send_message(AGENT, "요약해 줘")) == ["첫 번째 두 번째"]
+    reply = Message(role='agent', message_id="m1", parts=[Part(root=TextPart(text="바로 답변"))])
+    assert asyncio.run(_client([reply]).send_message(AGENT, "질문")) == ["바로 답변"]
@@ -0,0 +1,86 @@
+import os
+
+from modules.recorder_store.search import search_records
+from modules.recorder_store.store_factory import create_record_store
+from modules.recorder_store.text_index import TextIndex, TextIndexSettings, tokenize
+
+
+def _record(doc_id, text, timestamp="2026-01-01T00:00:00"):
+    return {"id": doc_id, "timestamp": timestamp, "input": text, "response": ""}
+
+
+def _index(tmp_path, **kwargs):
+    return TextIndex(str(tmp_path), TextIndexSettings(**kwargs))
+
+
+def _ids(index, text, **kwargs):
+    return [doc_id for doc_id, _ in index.search(text, **kwargs)]
+
+
+def test_torn_delta_tail_keeps_later_entries(tmp_path):
+    index = _index(tmp_path)
+    index.add_many([_record(1, "diffusion 모델 요약"), _record(2, "diffusion 학습 기록")])
+    # close() 없이 종료된 프로세스 (증분 로그만 남음)
+    index.flush()
+    with open(os.path.join(tmp_path, "delta.jsonl"), 'ab') as f:
+        f.write('{"op": "add", "id": 3, "tf": {"잘린'.encode('utf-8'))
+
+    index = _index(tmp_path)
+    assert index.remove_many([1]) == 1
+    index.add_many([_record(3, "diffusion 평가 결과")])
+    index.flush()
+
+    # 보존 기간으로 지운 레코드가 다시 검색되지 않음
+    index = _index(tmp_path)
+    assert sorted(_ids(index, "diffusion")) == [2, 3]
+    assert index.last_id == 3
+    index.close()
+
+
+def test_korean_words_match_with_particles():
+    assert tokenize("회의록을 GPU 2대") == ["회의", "의록", "록을", "gpu", "2", "대"]
+    assert set(tokenize("회의록")) <= set(tokenize("회의록을 정리했습니다"))
+
+
+def test_bm25_ranks_by_term_frequency_and_rarity(tmp_path):
+    index = _index(tmp_path)
+    index.add_many([
+        _record(1, "diffusion 모델 diffusion"),
+        _record(2, "diffusion 모델 평가"),
+        _record(3, "회의 일정 공유"),
+        _record(4, "transformer 모델 학습"),
+    ])
+    assert _ids(index, "diffusion") == [1, 2]
+    # 드문 단어(diffusion)가 흔한 단어(모델)보다 점수에 크게 기여
+    assert _ids(index, "모델 diffusion", limit=3) == [1, 2, 4]
+    assert _ids(index, "없는단어") == []
+    index.close()
+
+
+def test_search_filters_time_range(tmp_path):
+    index = _index(tmp_path)
+    index.add_many([
+        _record(1, "주간 보고", "2026-01-01T09:00:00"),
+        _record(2, "주간 보고", "2026-01-08T09:00:00"),
+        _record(3, "주간 보고", "2026-01-15T09:00:00"),
+    ])
+    assert sorted(_ids(index, "주간 보고", start="2026-01-05", end="2026-01-15T09:00:00")) == [2]
+    index.close()
+
+
+def test_index_catches_up_with_the_store(tmp_path):
+    store = create_record_store({"backend": "sqlite", "path": str(tmp_path / "recorder.db")})
+    store.append_many([{"timestamp": "2026-01-01T00:00:00", "input": text, "response": "저장했습니다"}
+                       for text in ("diffusion 실험 기록", "회의 메모", "diffusion 논문 요약")])
+    index = _index(tmp_path / "index")
+    assert index.catch_up(store) == 3
+    assert index.catch_up(store) == 0
+    index.close()
+
+    # 닫을 때 쓴 스냅샷에서 그대로 복원
+    index = _index(tmp_path / "index")
+    results = search_records(store, index, "diffusion")
+    assert sorted(r["id"] for r in results) == [1, 3]
+    assert all(r["score"] > 0 for r in results)
+    index.close()
+    store.close()
@@ -0,0 +1,56 @@
+import asyncio
+
+from modules.a2a_core.transport import SharedTransport, TransportConfig
+
+
+async def _serve_keepalive():
+    """Connection: keep-alive로 응답하는 최소 HTTP/1.1 서버"""
+    async def handle(reader, writer):
+        while await reader.readuntil(b"\r\n\r\n"):
+            writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\nConnection: keep-alive\r\n\r\nok")
+            await writer.drain()
+
+    async def guarded(reader, writer):
+        try:
+            await handle(reader, writer)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            writer.close()
+
+    server = await asyncio.start_server(guarded, "127.0.0.1", 0)
+    return server, f"http://127.0.0.1:{server.sockets[0].getsockname()[1]}/"
+
+
+def test_requests_on_one_loop_share_a_pooled_connection():
+    transport = SharedTransport(TransportConfig(http2=False))
+
+    async def scenario():
+        server, url = await _serve_keepalive()
+        client = transport.get_client()
+        assert transport.get_client() is client
+        for _ in range(3):
+            assert (await client.get(url)).text == "ok"
+        stats = transport.stats()
+        await transport.aclose()
+        server.close()
+        return client, stats
+
+    client, stats = asyncio.run(scenario())
+    assert client.is_closed
+    assert (stats["requests"], stats["new_connections"], stats["reused_requests"]) == (3, 1, 2)
+    assert stats["active_connections"] == 1
+
+
+def test_each_event_loop_gets_its_own_client():
+    transport = SharedTransport(TransportConfig(http2=False))
+
+    async def get():
+        return transport.get_client()
+
+    first, second = asyncio.run(get()), asyncio.run(get())
+    assert first is not second
+
+
+def test_config_ignores_unknown_keys():
+    config = TransportConfig.from_dict({"max_connections": 10, "unknown": True})
+    assert config.max_connections == 10
+    assert config.http2 is True
@@ -0,0 +1,96 @@
+import os
+
+import numpy as np
+
+from modules.memory_store.embeddings import EmbeddingSettings
+from modules.memory_store.vector_store import ITEMS_FILE, LocalMemorySettings, LocalVectorMemory
+
+USER = "tester"
+
+
+def _memory(tmp_path, **kwargs):
+    settings = LocalMemorySettings(path=str(tmp_path), initial_capacity=4, **kwargs)
+    return LocalVectorMemory(settings, EmbeddingSettings(dim=64))
+
+
+def _items_path(memory):
+    return memory._partition(USER)._path(ITEMS_FILE)
+
+
+def _texts(memory):
+    return sorted(item["memory"] for item in memory.get_all(USER)["results"])
+
+
+FACTS = ["사용자는 커피를 좋아한다", "사용자는 고양이를 키운다", "사용자는 주말에 등산을 간다",
+         "사용자는 파이썬 개발자다", "사용자는 제주도 여행을 계획 중이다"]
+
+
+def test_reopen_after_partial_line_keeps_new_memories(tmp_path):
+    memory = _memory(tmp_path)
+    memory.add(FACTS[:4], user_id=USER)
+    path = _items_path(memory)
+    memory.close()
+    with open(path, 'ab') as f:
+        f.write('{"op": "add", "id": "abc", "memory": "잘린'.encode('utf-8'))
+
+    memory = _memory(tmp_path)
+    assert memory.count(USER) == 4
+    memory.add(FACTS[4], user_id=USER)
+    assert memory.count(USER) == 5
+    memory.close()
+
+    memory = _memory(tmp_path)
+    assert memory.count(USER) == 5
+    assert _texts(memory) == sorted(FACTS)
+    memory.close()
+
+
+def test_reopen_skips_corrupt_lines_and_realigns_vectors(tmp_path):
+    memory = _memory(tmp_path)
+    memory.add(FACTS[:2], user_id=USER)
+    path = _items_path(memory)
+    memory.close()
+    with open(path, 'ab') as f:
+        f.write(b'not json\n')
+    memory = _memory(tmp_path)
+    memory.add(FACTS[2], user_id=USER)
+    memory.close()
+
+    memory = _memory(tmp_path)
+    assert _texts(memory) == sorted(FACTS[:3])
+    for fact in FACTS[:3]:
+        assert memory.search(fact, user_id=USER, limit=1)["results"][0]["memory"] == fact
+    memory.close()
+
+
+def test_compaction_survives_reopen(tmp_path):
+    memory = _memory(tmp_path, compact_min_deleted=2)
+    ids = [r["id"] for r in memory.add(FACTS, user_id=USER)["results"]]
+    generation = memory._partition(USER).generation
+    assert memory.delete_many(ids[:3]) == 3
+    partition = memory._partition(USER)
+    assert partition.generation == generation + 1
+    assert partition.rows == 2
+    memory.add("사용자는 아침형 인간이다", user_id=USER)
+    memory.close()
+
+    memory = _memory(tmp_path, compact_min_deleted=2)
+    assert _texts(memory) == sorted(FACTS[3:] + ["사용자는 아침형 인간이다"])
+    result = memory.search(FACTS[4], user_id=USER, limit=1)["results"][0]
+    assert result["memory"] == FACTS[4]
+    assert np.isclose(result["score"], 1.0, atol=1e-3)
+    # 이전 세대 파일은 남지 않음
+    assert sorted(os.listdir(memory._partition(USER).directory)) == ["items-1.jsonl", "meta.json", "vectors-1.f32"]
+    memory.close()
+
+
+def test_hashing_dedupe_keeps_corrections(tmp_path):
+    memory = _memory(tmp_path)
+    memory.add("User is allergic to peanuts and prefers vegetarian meals when eating out", user_id=USER)
+    result = memory.add("User is not allergic to peanuts and prefers vegetarian meals when eating out", user_id=USER)
+    assert [r["event"] for r in result["results"]] == ["ADD"]
+    # 공백/대소문자만 다른 같은 본문은 여전히 건너뜀
+    result = memory.add(["user is allergic to peanuts and  prefers vegetarian meals when eating out"], user_id=USER)
+    assert [r["event"] for r in result["results"]] == ["NONE"]
+    assert memory.count(USER) == 2
+    memory.close()
@@ -0,0 +1,112 @@
+import asyncio
+import threading
+
+import pytest
+
+from modules.recorder_store.store_factory import create_record_writer
+from modules.recorder_store.write_behind import WriteBehindFull, WriteBehindQueue, WriteBehindSettings
+
+OUTBOX_ID = "1700000000000000000-abcd1234"
+
+
+def _writer(tmp_path, **kwargs):
+    return create_record_writer({"backend": "sqlite", "path": str(tmp_path / "recorder.db"),
+                                 "text_index": {"enabled": False}, "retention": {"enabled": False}, **kwargs})
+
+
+def _record(text, outbox_id=OUTBOX_ID):
+    record = {"timestamp": "2026-01-01T00:00:00", "agent": "Recorder Agent",
+              "source_agent": "Summarize Agent", "input": text, "response": "저장했습니다"}
+    if outbox_id:
+        record["outbox_id"] = outbox_id
+    return record
+
+
+async def _submit(writer, records):
+    futures = [await writer.submit(record) for record in records]
+    return [await asyncio.wrap_future(future) for future in futures]
+
+
+def test_redelivered_outbox_message_is_recorded_once(tmp_path):
+    writer = _writer(tmp_path)
+    first = asyncio.run(_submit(writer, [_record("요약 결과"), _record("요약 결과")]))
+    second = asyncio.run(_submit(writer, [_record("요약 결과"), _record("다른 요약", outbox_id=None)]))
+    assert first == [1, 1]
+    assert second == [1, 2]
+    assert writer.stats()["duplicates"] == 2
+    assert [r["id"] for r in writer.store.iter_records()] == [1, 2]
+    writer.close()
+
+
+def test_ledger_is_rebuilt_from_the_store(tmp_path):
+    writer = _writer(tmp_path, deliveries={"enabled": False})
+    asyncio.run(_submit(writer, [_record("요약 결과")]))
+    writer.close()
+
+    # 전달 기록 파일이 없어도 저장된 레코드의 outbox_id로 다시 채움
+    writer = _writer(tmp_path)
+    assert asyncio.run(_submit(writer, [_record("요약 결과")])) == [1]
+    assert [r["id"] for r in writer.store.iter_records()] == [1]
+    writer.close()
+
+
+class _SlowStore:
+    """release 전까지 append_many가 막혀 있는 저장소"""
+
+    def __init__(self):
+        self.release = threading.Event()
+        self.batches = []
+        self.closed = False
+
+    def append_many(self, records):
+        self.release.wait(5)
+        first = sum(len(batch) for batch in self.batches) + 1
+        self.batches.append(records)
+        return list(range(first, first + len(records)))
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+def test_queued_records_are_written_in_batches():
+    store = _SlowStore()
+    writer = WriteBehindQueue(store, WriteBehindSettings(batch_size=3))
+
+    async def scenario():
+        futures = [await writer.submit({"input": str(i)}) for i in range(7)]
+        # submit은 디스크 기록을 기다리지 않고 반환
+        assert not any(future.done() for future in futures)
+        store.release.set()
+        return [await asyncio.wrap_future(future) for future in futures]
+
+    assert asyncio.run(scenario()) == list(range(1, 8))
+    # 저장소가 막혀 있는 동안 쌓인 레코드는 batch_size씩 묶여 기록됨
+    assert len(store.batches) == 3
+    assert max(len(batch) for batch in store.batches) == 3
+    writer.close()
+    assert store.closed
+    assert writer.stats()["batches"] == 3
+
+
+def test_full_queue_applies_backpressure_then_rejects():
+    store = _SlowStore()
+    writer = WriteBehindQueue(store, WriteBehindSettings(max_pending=1, put_timeout=0.05))
+
+    async def scenario():
+        await writer.submit({"input": "기록 중"})
+        while writer.pending:
+            await asyncio.sleep(0.01)
+        await writer.submit({"input": "대기"})
+        with pytest.raises(WriteBehindFull):
+            await writer.submit({"input": "거부"})
+
+    asyncio.run(scenario())
+    stats = writer.stats()
+    assert (stats["backpressure_waits"], stats["rejected"], stats["submitted"]) == (1, 1, 2)
+    store.release.set()
+    writer.close()
+    # 닫을 때 대기 중이던 레코드까지 모두 기록
+    assert sum(len(batch) for batch in store.batches) == 2
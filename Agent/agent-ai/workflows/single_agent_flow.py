@@ -2,7 +2,6 @@
 from langgraph.graph import StateGraph, END
 from langchain_core.messages import BaseMessage
 from typing import TypedDict, Annotated, Sequence, List
-import operator
 from dotenv import load_dotenv
 
 # 워크플로우 팩토리 import
@@ -10,17 +9,26 @@ from workflows.workflow_factory import WorkflowFactory
 
 load_dotenv()
 
+def replace_messages(current: Sequence[BaseMessage], update: Sequence[BaseMessage]) -> List[BaseMessage]:
+    """노드들은 항상 전체 대화 기록을 반환하므로 이어 붙이지 않고 교체 (요약 후 기록을 줄일 수 있도록)"""
+    return list(update)
+
 class AgentState(TypedDict):
-    messages: Annotated[Sequence[BaseMessage], operator.add]
+    messages: Annotated[Sequence[BaseMessage], replace_messages]
     context: str = ""  
     memory: dict = {} 
     tool_results: list = []
     should_exit: bool = False
     user_id: str = "default_user"
     last_response: str = ""
+    # 마지막 응답을 LLM 노드가 이미 스트리밍으로 출력했는지 여부
+    streamed: bool = False
+    # 마지막 LLM 호출의 첫 토큰/전체 응답 시간
+    llm_metrics: dict = {}
     agent_manager: object  = None
-def create_single_agent_workflow(agent_core, all_tools):
-    factory = WorkflowFactory(agent_core, all_tools)
+def create_single_agent_workflow(agent_core, all_tools, factory=None):
+    """factory를 넘기면 그 노드 인스턴스로 그래프를 구성 (종료 시 factory.aclose() 호출용)"""
+    factory = factory or WorkflowFactory(agent_core, all_tools)
     
 
     workflow = StateGraph(AgentState)
@@ -17,9 +17,10 @@ class WorkflowFactory:
         self.user_input_node = UserInputNode(agent_core)
         self.memory_node = MemoryNode(agent_core)
         self.rag_node = RAGNode(agent_core)
-        self.llm_node = LLMNode(agent_core, self.all_tools)
-        self.tool_node = ToolNode(self.all_tools)
         self.output_node = OutputNode(agent_core)
+        # LLM 응답 토큰과 원격 에이전트 응답을 도착하는 대로 출력
+        self.llm_node = LLMNode(agent_core, self.all_tools, stream_sink=self.output_node.open_stream)
+        self.tool_node = ToolNode(self.all_tools, stream_sink=self.output_node.open_stream)
         self.controller = WorkflowController(agent_core)
 
     def user_input_node_func(self, state):
@@ -34,17 +35,18 @@ class WorkflowFactory:
         """RAG 노드 함수"""
         return self.rag_node.process(state)
 
-    def llm_node_func(self, state):
+    async def llm_node_func(self, state):
         """LLM 노드 함수"""
-        return self.llm_node.process(state)
+        return await self.llm_node.process(state)
     
     async def tool_node_func(self, state):
         """도구 노드 함수"""
         return await self.tool_node.process(state)   
     
-    def output_node_func(self, state):
-        """출력 노드 함수"""
-        return self.output_node.process(state)
+    async def output_node_func(self, state):
+        """출력 노드 함수 (출력 후 오래된 대화를 롤링 요약으로 넘김)"""
+        result = self.output_node.process(state)
+        return {**result, **self.llm_node.compact_history(result)}
     async def post_process_node_func(self, state):
         """후처리 LLM 노드 함수"""
         return await self.llm_node.post_process(state)
@@ -56,3 +58,7 @@ class WorkflowFactory:
     def should_exit(self, state):
         """종료 여부 결정"""
         return "exit" if state.get("should_exit", False) else "continue"
+
+    async def aclose(self):
+        """종료 시 진행 중인 대화 요약 갱신을 기다려 저장"""
+        await self.llm_node.summary.flush()